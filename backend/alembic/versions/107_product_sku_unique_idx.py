@@ -0,0 +1,57 @@
+"""add unique (business_id, sku) index on products
+
+Revision ID: 107_product_sku_unique_idx
+Revises: z9c8d7e6f5a4
+Create Date: 2026-10-18
+
+The streaming product importer upserts with
+INSERT ... ON CONFLICT (business_id, sku), which needs a unique index to
+infer the conflict target.  The index is partial so products without a SKU
+and soft-deleted products are unaffected.
+
+SKU uniqueness was never enforced before, so live duplicates may exist.
+The newest product keeps the SKU; older duplicates get a "-DUP-<id>" suffix
+so nothing is deleted and they can be cleaned up from the product list.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "107_product_sku_unique_idx"
+down_revision: Union[str, None] = "z9c8d7e6f5a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE products p
+        SET sku = LEFT(p.sku, 87) || '-DUP-' || LEFT(p.id::text, 8)
+        FROM (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY business_id, sku
+                       ORDER BY updated_at DESC, created_at DESC
+                   ) AS rn
+            FROM products
+            WHERE sku IS NOT NULL AND deleted_at IS NULL
+        ) ranked
+        WHERE p.id = ranked.id AND ranked.rn > 1
+        """
+    )
+    op.create_index(
+        "uq_products_business_sku",
+        "products",
+        ["business_id", "sku"],
+        unique=True,
+        postgresql_where=sa.text("sku IS NOT NULL AND deleted_at IS NULL"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_products_business_sku", table_name="products", if_exists=True)
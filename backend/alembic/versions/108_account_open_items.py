@@ -0,0 +1,121 @@
+"""add account_open_items for incremental aging
+
+Revision ID: 108_account_open_items
+Revises: 107_product_sku_unique_idx
+Create Date: 2026-10-18
+
+Holds the unpaid amount per customer account and due time.  Debits add to
+the row for their due time and allocations subtract from it, so the
+business-wide aging report is a grouped sum over this table instead of a
+per-charge allocation query for every active account.
+
+Debits are charges and positive balance adjustments.  Credit adjustments
+are allocated to the oldest unpaid debits like payments, so
+payment_allocations gains adjustment_id and payment_id becomes optional;
+exactly one of the two is set.
+
+Backfilled from existing debits less their allocations.  A debit falls due
+at midnight UTC on its explicit due date, otherwise at created_at + the
+account's payment terms, matching AccountAgingService.  Credit adjustments
+made before this revision have no allocations and stay unapplied.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "108_account_open_items"
+down_revision: Union[str, None] = "107_product_sku_unique_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "payment_allocations",
+        sa.Column(
+            "adjustment_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("account_transactions.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_payment_allocations_adjustment_id", "payment_allocations", ["adjustment_id"], if_not_exists=True
+    )
+    op.alter_column("payment_allocations", "payment_id", nullable=True)
+    op.create_check_constraint(
+        "ck_payment_allocations_source",
+        "payment_allocations",
+        "(payment_id IS NULL) <> (adjustment_id IS NULL)",
+    )
+
+    op.create_table(
+        "account_open_items",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "account_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("customer_accounts.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "business_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("businesses.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("due_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("amount", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("account_id", "due_at", name="uq_account_open_items_account_due"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_account_open_items_account_id", "account_open_items", ["account_id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_account_open_items_business_id", "account_open_items", ["business_id"], if_not_exists=True
+    )
+
+    op.execute(
+        """
+        INSERT INTO account_open_items (id, account_id, business_id, due_at, amount)
+        SELECT gen_random_uuid(), items.account_id, items.business_id, items.due_at,
+               SUM(items.open_amount)
+        FROM (
+            SELECT t.account_id,
+                   a.business_id,
+                   COALESCE(
+                       timezone('UTC', CAST(t.due_date AS timestamp)),
+                       timezone('UTC', timezone('UTC', t.created_at)
+                                + make_interval(0, 0, 0, a.payment_terms))
+                   ) AS due_at,
+                   t.amount - COALESCE(SUM(pa.amount), 0) AS open_amount
+            FROM account_transactions t
+            JOIN customer_accounts a ON a.id = t.account_id
+            LEFT JOIN payment_allocations pa ON pa.transaction_id = t.id
+            WHERE (t.transaction_type = 'charge'
+                   OR (t.transaction_type = 'adjustment' AND t.amount > 0))
+              AND t.deleted_at IS NULL
+            GROUP BY t.id, t.account_id, a.business_id, a.payment_terms
+        ) items
+        WHERE items.open_amount > 0
+        GROUP BY items.account_id, items.business_id, items.due_at
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("account_open_items", if_exists=True)
+
+    op.drop_constraint("ck_payment_allocations_source", "payment_allocations", type_="check")
+    op.execute("DELETE FROM payment_allocations WHERE adjustment_id IS NOT NULL")
+    op.alter_column("payment_allocations", "payment_id", nullable=False)
+    op.drop_index("ix_payment_allocations_adjustment_id", table_name="payment_allocations", if_exists=True)
+    op.drop_column("payment_allocations", "adjustment_id")
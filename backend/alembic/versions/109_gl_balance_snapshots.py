@@ -0,0 +1,82 @@
+"""backfill gl_account_balances monthly snapshots
+
+Revision ID: 109_gl_balance_snapshots
+Revises: 108_account_open_items
+Create Date: 2026-10-18
+
+GeneralLedgerService now keeps gl_account_balances up to date when journal
+entries are posted or voided, and the trial balance, balance sheet, income
+statement and account balance read whole months from it plus the raw lines
+of the partial months at either end of the range.
+
+- Adds the deleted_at column the model has always declared (093 omitted it).
+- Rebuilds every snapshot from posted journal lines, one row per account
+  per UTC calendar month, with running opening/closing balances in the
+  account's normal-balance sign.
+- Indexes journal_entries (business_id, entry_date) for the partial-month
+  line scans.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "109_gl_balance_snapshots"
+down_revision: Union[str, None] = "108_account_open_items"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE gl_account_balances ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ")
+    op.create_index(
+        "ix_journal_entries_business_entry_date",
+        "journal_entries",
+        ["business_id", "entry_date"],
+        if_not_exists=True,
+    )
+
+    op.execute("DELETE FROM gl_account_balances")
+    op.execute(
+        """
+        INSERT INTO gl_account_balances (
+            id, business_id, account_id, period_year, period_month,
+            opening_balance, debit_total, credit_total, closing_balance
+        )
+        SELECT gen_random_uuid(), business_id, account_id, period_year, period_month,
+               closing_balance - net, debit_total, credit_total, closing_balance
+        FROM (
+            SELECT m.*,
+                   SUM(m.net) OVER (
+                       PARTITION BY m.account_id
+                       ORDER BY m.period_year, m.period_month
+                   ) AS closing_balance
+            FROM (
+                SELECT e.business_id,
+                       l.account_id,
+                       EXTRACT(YEAR FROM timezone('UTC', COALESCE(e.entry_date, e.created_at)))::int AS period_year,
+                       EXTRACT(MONTH FROM timezone('UTC', COALESCE(e.entry_date, e.created_at)))::int AS period_month,
+                       COALESCE(SUM(l.debit), 0) AS debit_total,
+                       COALESCE(SUM(l.credit), 0) AS credit_total,
+                       CASE WHEN COALESCE(a.normal_balance, 'debit') = 'debit'
+                            THEN COALESCE(SUM(l.debit), 0) - COALESCE(SUM(l.credit), 0)
+                            ELSE COALESCE(SUM(l.credit), 0) - COALESCE(SUM(l.debit), 0)
+                       END AS net
+                FROM journal_lines l
+                JOIN journal_entries e ON e.id = l.entry_id
+                JOIN chart_of_accounts a ON a.id = l.account_id
+                WHERE e.status = 'posted'
+                  AND e.deleted_at IS NULL
+                  AND l.deleted_at IS NULL
+                GROUP BY e.business_id, l.account_id, a.normal_balance, 3, 4
+            ) m
+        ) w
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_journal_entries_business_entry_date", table_name="journal_entries", if_exists=True
+    )
@@ -0,0 +1,41 @@
+"""index unprocessed loyalty earns by expiry
+
+Revision ID: 110_points_pending_expiry_idx
+Revises: 109_gl_balance_snapshots
+Create Date: 2026-10-18
+
+The batch loyalty expiry job scans EARN points_transactions that are past
+expires_at and not yet soft-deleted.  A partial index on exactly that set
+keeps the scan proportional to the backlog rather than the whole ledger.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "110_points_pending_expiry_idx"
+down_revision: Union[str, None] = "109_gl_balance_snapshots"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_points_transactions_pending_expiry",
+        "points_transactions",
+        ["expires_at", "customer_id"],
+        postgresql_where=sa.text(
+            "transaction_type = 'earn' AND deleted_at IS NULL AND expires_at IS NOT NULL"
+        ),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_points_transactions_pending_expiry",
+        table_name="points_transactions",
+        if_exists=True,
+    )
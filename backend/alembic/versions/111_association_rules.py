@@ -0,0 +1,80 @@
+"""association_rules and basket_mining_states
+
+Revision ID: 111_association_rules
+Revises: 110_points_pending_expiry_idx
+Create Date: 2026-10-18
+
+The daily rule generation job now mines market-basket association rules
+(support / confidence / lift per product pair) instead of logging top
+sellers to agent_logs, and keeps the basket counts of each business's
+lookback window so it only counts new and expired orders.
+
+- association_rules: one row per rule, pulled by devices via entity sync
+  (index on business_id, updated_at for delta pulls)
+- basket_mining_states: one row per business with the compressed counts
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "111_association_rules"
+down_revision: Union[str, None] = "110_points_pending_expiry_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "association_rules",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "business_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False, index=True,
+        ),
+        sa.Column("antecedent_product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("consequent_product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("support", sa.Float, nullable=False),
+        sa.Column("confidence", sa.Float, nullable=False),
+        sa.Column("lift", sa.Float, nullable=False),
+        sa.Column("pair_count", sa.Integer, nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint(
+            "business_id", "antecedent_product_id", "consequent_product_id",
+            name="uq_association_rules_business_pair",
+        ),
+    )
+    op.create_index(
+        "ix_association_rules_business_updated",
+        "association_rules",
+        ["business_id", "updated_at"],
+    )
+
+    op.create_table(
+        "basket_mining_states",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "business_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False, unique=True,
+        ),
+        sa.Column("window_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("counted_until", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("rebuilt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("transactions", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("counts", sa.LargeBinary, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("basket_mining_states")
+    op.drop_index("ix_association_rules_business_updated", table_name="association_rules")
+    op.drop_table("association_rules")
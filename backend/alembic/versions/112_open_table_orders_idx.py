@@ -0,0 +1,42 @@
+"""index open orders by table
+
+Revision ID: 112_open_table_orders_idx
+Revises: 111_association_rules
+Create Date: 2026-10-19
+
+The floor plan joins every table to its latest open order in one query
+(TableService.get_floor_state).  A partial index on unpaid, undeleted
+orders that sit on a table keeps that join proportional to the orders
+currently on the floor rather than the business's order history.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "112_open_table_orders_idx"
+down_revision: Union[str, None] = "111_association_rules"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_orders_open_by_table",
+        "orders",
+        ["business_id", "table_id", "created_at"],
+        postgresql_where=sa.text(
+            "table_id IS NOT NULL AND deleted_at IS NULL AND payment_status <> 'paid'"
+        ),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_orders_open_by_table",
+        table_name="orders",
+        if_exists=True,
+    )
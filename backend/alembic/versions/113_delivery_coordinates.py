@@ -0,0 +1,31 @@
+"""add drop-off coordinates to deliveries
+
+Revision ID: 113_delivery_coordinates
+Revises: 112_open_table_orders_idx
+Create Date: 2026-10-19
+
+Route planning orders a driver's assigned deliveries by location, so the
+drop-off coordinates given when a delivery is created (previously only
+used for the fee and the initial assignment) are now stored.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "113_delivery_coordinates"
+down_revision: Union[str, None] = "112_open_table_orders_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("deliveries", sa.Column("delivery_lat", sa.Numeric(10, 7), nullable=True))
+    op.add_column("deliveries", sa.Column("delivery_lng", sa.Numeric(10, 7), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("deliveries", "delivery_lng")
+    op.drop_column("deliveries", "delivery_lat")
@@ -0,0 +1,70 @@
+"""trigram and full-text search indexes
+
+Revision ID: 114_search_indexes
+Revises: 113_delivery_coordinates
+Create Date: 2026-10-19
+
+List searches filter with ILIKE '%term%' (app.core.search), which a b-tree
+cannot serve.  pg_trgm GIN indexes on every searched column can, and the
+to_tsvector expression indexes serve multi-word searches on products,
+customers and orders.  The expressions must stay identical to
+SearchSpec.vector() for the *_SEARCH specs in the corresponding services,
+or the planner will not use them.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "114_search_indexes"
+down_revision: Union[str, None] = "113_delivery_coordinates"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_COLUMNS = {
+    "products": ["name", "description", "sku", "barcode"],
+    "customers": ["first_name", "last_name", "email", "phone", "company_name"],
+    "orders": ["order_number", "notes"],
+    "invoices": ["invoice_number", "notes"],
+    "suppliers": ["name", "contact_name", "email", "phone"],
+    "laybys": ["reference_number"],
+    "pms_guest_cache": ["guest_name"],
+    "production_orders": ["order_number", "notes"],
+    "proforma_invoices": ["quote_number", "notes"],
+    "tags": ["name"],
+}
+
+FULLTEXT_COLUMNS = {
+    "products": ["name", "description"],
+    "customers": ["first_name", "last_name", "company_name"],
+    "orders": ["order_number", "notes"],
+}
+
+
+def _document(columns):
+    return " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+    for table, columns in FULLTEXT_COLUMNS.items():
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_tsv "
+            f"ON {table} USING gin (to_tsvector('simple', {_document(columns)}))"
+        )
+
+
+def downgrade() -> None:
+    for table in FULLTEXT_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_tsv")
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}_trgm")
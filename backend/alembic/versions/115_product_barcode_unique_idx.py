@@ -0,0 +1,57 @@
+"""add unique (business_id, barcode) index on products
+
+Revision ID: 115_product_barcode_unique_idx
+Revises: 114_search_indexes
+Create Date: 2026-10-19
+
+A scan at the till resolves a barcode to exactly one product
+(app.services.scan_lookup), which needs barcodes to be unique per business
+like SKUs (107_product_sku_unique_idx).  The index is partial so products
+without a barcode and soft-deleted products are unaffected.
+
+The newest product keeps a duplicated barcode; older duplicates get a
+"-DUP-<id>" suffix so nothing is deleted and they can be cleaned up from
+the product list.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "115_product_barcode_unique_idx"
+down_revision: Union[str, None] = "114_search_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE products p
+        SET barcode = LEFT(p.barcode, 87) || '-DUP-' || LEFT(p.id::text, 8)
+        FROM (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY business_id, barcode
+                       ORDER BY updated_at DESC, created_at DESC
+                   ) AS rn
+            FROM products
+            WHERE barcode IS NOT NULL AND deleted_at IS NULL
+        ) ranked
+        WHERE p.id = ranked.id AND ranked.rn > 1
+        """
+    )
+    op.create_index(
+        "uq_products_business_barcode",
+        "products",
+        ["business_id", "barcode"],
+        unique=True,
+        postgresql_where=sa.text("barcode IS NOT NULL AND deleted_at IS NULL"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_products_business_barcode", table_name="products", if_exists=True)
@@ -44,6 +44,9 @@ class RedisTTL:
     SESSION_MEMORY = 86400      # 24 hours — conversation window
     HITL_PENDING = 900          # 15 minutes — approval must come quickly
     PLAN_CACHE = 300            # 5 minutes — plan is session-scoped
+    TOOL_RESULT = 120           # 2 minutes — bounds staleness from writes outside the agent
+    INTENT = 86400              # 24 hours — routing of a given phrasing rarely changes
+    MEMORY_COMPACT_LOCK = 60    # 1 minute — one summarization per session at a time
 
 
 class RedisPrefix:
@@ -56,6 +59,33 @@ class RedisPrefix:
     SESSION = "bizpilot:agent:session"      # {user_id}:{session_id}
     HITL = "bizpilot:agent:hitl"            # {session_id}
     PLAN = "bizpilot:agent:plan"            # {session_id}
+    TOOL_RESULT = "bizpilot:agent:tool"     # {business_id}:{data_version}:{tool}:{args_hash}
+    INTENT = "bizpilot:agent:intent"        # {message_hash}
+    DATA_VERSION = "bizpilot:agent:dataver" # {business_id}
+    SUMMARY = "bizpilot:agent:summary"      # {user_id}:{session_id}
+    COMPACT_LOCK = "bizpilot:agent:compact" # {user_id}:{session_id}
+
+
+class SessionMemory:
+    """Token budgets for per-session conversation memory."""
+
+    # Recent messages sent with each prompt; older turns live in the summary
+    HISTORY_TOKEN_BUDGET = 3000
+    # Compaction evicts down to this, so it runs once per several turns
+    COMPACT_TARGET_TOKENS = 1500
+    # A single stored message (e.g. a long tool-backed answer) is cut here
+    MAX_MESSAGE_TOKENS = 1000
+    # Running summary of evicted turns
+    SUMMARY_MAX_TOKENS = 300
+    # Summarization is abandoned after this, well inside the compaction lock TTL
+    SUMMARY_TIMEOUT_SECONDS = 40
+
+
+class IntentRouting:
+    """Thresholds for skipping the LLM intent classifier."""
+
+    # Keyword classifier confidence at or above which its route is used as-is
+    FAST_PATH_CONFIDENCE = 0.85
 
 
 class RiskLevel:
@@ -0,0 +1,5 @@
+"""
+Offline evaluation of the agent pipeline: a seeded database, a scripted
+LLM provider and a harness that replays a message corpus and reports
+per-stage latency, per-tool queries and tokens (see harness.py).
+"""
@@ -0,0 +1,407 @@
+"""
+backend/app/agents/eval/harness.py
+
+Offline evaluation and latency harness for the agent pipeline.
+
+Replays the recorded messages in ``corpus.json`` through ``ChatAgent`` and
+the ``Orchestrator`` against a seeded database (seed.py) and a scripted
+LLM provider (mock_llm.py).  Nothing else is faked: routing, prompt
+building, business context, tool handlers and their queries, the LLM
+transport and agent step logging all run as in production, with Redis
+unavailable so every run takes the uncached path.
+
+Per case it records:
+
+- stage timings: classification (including its LLM call, if any), system
+  prompt build, tool batches, LLM wait and step logging, plus the total
+- every tool call with its time and the SQL statements it executed
+- LLM calls and tokens (the mock reports ~4 characters per token)
+- routing and tool-call checks against the case (a failure otherwise)
+
+``check_thresholds`` compares the aggregated report with
+``thresholds.json``; the CLI exits 1 on a failed case or an exceeded
+threshold so CI can gate on it.
+
+Usage:
+    python -m app.agents.eval.harness
+    python -m app.agents.eval.harness --repeat 20 --llm-latency-ms 150
+    python -m app.agents.eval.harness --database-url postgresql://localhost/bizpilot_eval --json report.json
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import math
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+from sqlalchemy import event
+
+EVAL_DIR = Path(__file__).resolve().parent
+CORPUS_PATH = EVAL_DIR / "corpus.json"
+THRESHOLDS_PATH = EVAL_DIR / "thresholds.json"
+
+STAGES = ("classification", "prompt_build", "tools", "llm_wait", "logging", "total")
+
+# The tool call (or prompt build) whose SQL statements are being counted
+_query_scope: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "eval_query_scope", default=None
+)
+
+
+def load_json(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class CaseRun:
+    case_id: str
+    stages: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+    agents: List[str] = field(default_factory=list)
+    tools: List[Dict[str, Any]] = field(default_factory=list)
+    prompt_queries: int = 0
+    llm_calls: int = 0
+    tokens: int = 0
+    result_type: str = ""
+    errors: List[str] = field(default_factory=list)
+
+
+class _Recorder:
+    """Instrumentation hooks that record into the case being replayed."""
+
+    def __init__(self) -> None:
+        self.run: Optional[CaseRun] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.run is not None:
+                self.run.stages[stage] += (time.perf_counter() - started) * 1000
+
+    def count_query(self, *args: Any) -> None:
+        # before_cursor_execute; tools run in worker threads (to_thread
+        # copies the context, so the scope follows them there)
+        scope = _query_scope.get()
+        if scope is not None:
+            with self._lock:
+                scope["queries"] += 1
+
+    def install(self, stack: ExitStack, transport: Any) -> None:
+        from app.agents import orchestrator
+        from app.agents.orchestrator import Orchestrator
+        from app.agents.tasks import chat_agent
+
+        recorder = self
+        classify = chat_agent._classify_intent
+        run_task = Orchestrator.run_task
+        get_system_prompt = Orchestrator._get_system_prompt
+        execute_batch = Orchestrator._execute_hotl_batch
+        run_tool = Orchestrator._run_tool
+        log_step = orchestrator.log_agent_step
+        chat_completion = transport.chat_completion
+
+        async def timed_classify(message, history):
+            with recorder.timed("classification"):
+                return await classify(message, history)
+
+        async def recorded_run_task(self, *args, **kwargs):
+            recorder.run.agents.append(kwargs.get("agent_name") or args[0])
+            return await run_task(self, *args, **kwargs)
+
+        async def timed_system_prompt(self, agent_def, user, sharing_level):
+            scope = {"queries": 0}
+            token = _query_scope.set(scope)
+            try:
+                with recorder.timed("prompt_build"):
+                    return await get_system_prompt(self, agent_def, user, sharing_level)
+            finally:
+                _query_scope.reset(token)
+                recorder.run.prompt_queries += scope["queries"]
+
+        async def timed_batch(self, batch, user, agent_name):
+            with recorder.timed("tools"):
+                return await execute_batch(self, batch, user, agent_name)
+
+        async def recorded_tool(self, call, db, user, agent_name):
+            record = {"name": call["name"], "ms": 0.0, "queries": 0, "error": None}
+            token = _query_scope.set(record)
+            started = time.perf_counter()
+            try:
+                result = await run_tool(self, call, db, user, agent_name)
+            finally:
+                _query_scope.reset(token)
+                record["ms"] = (time.perf_counter() - started) * 1000
+                recorder.run.tools.append(record)
+            if isinstance(result, dict) and "error" in result:
+                record["error"] = str(result["error"])
+            return result
+
+        def timed_log_step(*args, **kwargs):
+            with recorder.timed("logging"):
+                return log_step(*args, **kwargs)
+
+        async def timed_completion(model, payload, headers=None):
+            with recorder.timed("llm_wait"):
+                response = await chat_completion(model, payload, headers=headers)
+            recorder.run.llm_calls += 1
+            try:
+                recorder.run.tokens += (response.json().get("usage") or {}).get("total_tokens", 0)
+            except ValueError:
+                pass
+            return response
+
+        stack.enter_context(patch.object(chat_agent, "_classify_intent", timed_classify))
+        stack.enter_context(patch.object(Orchestrator, "run_task", recorded_run_task))
+        stack.enter_context(patch.object(Orchestrator, "_get_system_prompt", timed_system_prompt))
+        stack.enter_context(patch.object(Orchestrator, "_execute_hotl_batch", timed_batch))
+        stack.enter_context(patch.object(Orchestrator, "_run_tool", recorded_tool))
+        stack.enter_context(patch.object(orchestrator, "log_agent_step", timed_log_step))
+        stack.enter_context(patch.object(transport, "chat_completion", timed_completion))
+
+
+def _check_case(case: Dict[str, Any], run: CaseRun) -> None:
+    expected_agents = case["agent"] if isinstance(case["agent"], list) else [case["agent"]]
+    if run.agents != expected_agents:
+        run.errors.append(f"routed to {run.agents}, expected {expected_agents}")
+    if run.result_type != "response":
+        run.errors.append(f"ended with {run.result_type!r}, expected a response")
+    expected_tools = sorted(c["name"] for calls in case.get("tool_rounds") or [] for c in calls)
+    called = sorted(t["name"] for t in run.tools)
+    if called != expected_tools:
+        run.errors.append(f"called {called}, expected {expected_tools}")
+    for tool in run.tools:
+        if tool["error"]:
+            run.errors.append(f"{tool['name']} failed: {tool['error'][:200]}")
+
+
+async def run_corpus(
+    cases: List[Dict[str, Any]],
+    db: Any,
+    user: Any,
+    business_id: str,
+    repeat: int = 1,
+    llm_latency_ms: float = 0.0,
+) -> List[CaseRun]:
+    """Replay every case *repeat* times; returns one CaseRun per replay."""
+    from app.agents.eval.mock_llm import ScriptedLLM
+    from app.agents.tasks.chat_agent import ChatAgent
+    from app.core import ai_models
+    from app.core.config import settings
+    from app.core.llm_transport import LLMTransport
+    from app.models.user_settings import AIDataSharingLevel
+
+    llm = ScriptedLLM(latency_ms=llm_latency_ms)
+    transport = LLMTransport(base_url="http://llm.eval/v1", http2=False, http_transport=llm.transport())
+    recorder = _Recorder()
+    runs: List[CaseRun] = []
+
+    engine = db.get_bind()
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(ai_models, "get_llm_transport", lambda: transport))
+        stack.enter_context(patch.object(settings, "GROQ_API_KEY", settings.GROQ_API_KEY or "eval-key"))
+        stack.enter_context(patch.object(settings, "LLM_HEDGE_DELAY_MS", 0))
+        recorder.install(stack, transport)
+        event.listen(engine, "before_cursor_execute", recorder.count_query)
+        stack.callback(event.remove, engine, "before_cursor_execute", recorder.count_query)
+
+        agent = ChatAgent(db)
+        try:
+            for _ in range(repeat):
+                for case in cases:
+                    run = CaseRun(case_id=case["id"])
+                    recorder.run, llm.current = run, case
+                    started = time.perf_counter()
+                    try:
+                        result = await agent.run(
+                            user=user,
+                            message=case["message"],
+                            history=[],
+                            sharing_level=AIDataSharingLevel.FULL_BUSINESS,
+                            session_id=f"eval-{uuid.uuid4().hex[:8]}",
+                            business_id=business_id,
+                        )
+                        run.result_type = result.get("type", "")
+                    except Exception as exc:
+                        db.rollback()
+                        run.result_type = "exception"
+                        run.errors.append(f"{type(exc).__name__}: {exc}")
+                    run.stages["total"] = (time.perf_counter() - started) * 1000
+                    _check_case(case, run)
+                    runs.append(run)
+        finally:
+            recorder.run = llm.current = None
+            await transport.aclose()
+    return runs
+
+
+def build_report(runs: List[CaseRun]) -> Dict[str, Any]:
+    """Aggregate CaseRuns into per-stage percentiles, per-tool and per-case figures."""
+    tools: Dict[str, Dict[str, List[float]]] = {}
+    cases: Dict[str, Dict[str, Any]] = {}
+    for run in runs:
+        for tool in run.tools:
+            entry = tools.setdefault(tool["name"], {"ms": [], "queries": []})
+            entry["ms"].append(tool["ms"])
+            entry["queries"].append(tool["queries"])
+        case = cases.setdefault(run.case_id, {"runs": 0, "llm_calls": 0, "tokens": 0, "queries": 0, "total_ms": []})
+        case["runs"] += 1
+        case["llm_calls"] = max(case["llm_calls"], run.llm_calls)
+        case["tokens"] = max(case["tokens"], run.tokens)
+        case["queries"] = max(case["queries"], run.prompt_queries + sum(t["queries"] for t in run.tools))
+        case["total_ms"].append(run.stages["total"])
+
+    return {
+        "runs": len(runs),
+        "failures": [f"{run.case_id}: {error}" for run in runs for error in run.errors],
+        "stages": {
+            stage: {
+                "p50": round(percentile([r.stages[stage] for r in runs], 50), 2),
+                "p95": round(percentile([r.stages[stage] for r in runs], 95), 2),
+            }
+            for stage in STAGES
+        },
+        "prompt_build_queries": max((r.prompt_queries for r in runs), default=0),
+        "tools": {
+            name: {
+                "calls": len(entry["ms"]),
+                "p50_ms": round(percentile(entry["ms"], 50), 2),
+                "p95_ms": round(percentile(entry["ms"], 95), 2),
+                "queries": max(entry["queries"]),
+            }
+            for name, entry in sorted(tools.items())
+        },
+        "cases": {
+            case_id: {
+                "runs": case["runs"],
+                "p95_ms": round(percentile(case.pop("total_ms"), 95), 2),
+                **case,
+            }
+            for case_id, case in cases.items()
+        },
+    }
+
+
+def check_thresholds(report: Dict[str, Any], thresholds: Dict[str, Any]) -> List[str]:
+    """Human-readable violations of *thresholds*; empty when the run passes."""
+    violations = []
+    failures = len(report["failures"])
+    if failures > thresholds.get("max_failures", 0):
+        violations.append(f"{failures} case failure(s)")
+    for stage, limit in (thresholds.get("stage_p95_ms") or {}).items():
+        value = report["stages"][stage]["p95"]
+        if value > limit:
+            violations.append(f"{stage} p95 {value:.1f}ms > {limit}ms")
+    limit = thresholds.get("prompt_build_max_queries")
+    if limit is not None and report["prompt_build_queries"] > limit:
+        violations.append(f"prompt build ran {report['prompt_build_queries']} queries > {limit}")
+    tool_limits = thresholds.get("tool_max_queries") or {}
+    for name, tool in report["tools"].items():
+        limit = tool_limits.get(name, tool_limits.get("default"))
+        if limit is not None and tool["queries"] > limit:
+            violations.append(f"{name} ran {tool['queries']} queries > {limit}")
+    for key, label in (("case_max_tokens", "tokens"), ("case_max_llm_calls", "llm_calls")):
+        limit = thresholds.get(key)
+        if limit is None:
+            continue
+        for case_id, case in report["cases"].items():
+            if case[label] > limit:
+                violations.append(f"{case_id} used {case[label]} {label.replace('_', ' ')} > {limit}")
+    return violations
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{report['runs']} runs", "", f"{'stage':<16} {'p50 ms':>9} {'p95 ms':>9}"]
+    for stage, value in report["stages"].items():
+        lines.append(f"{stage:<16} {value['p50']:>9.1f} {value['p95']:>9.1f}")
+    lines += ["", f"prompt build queries: {report['prompt_build_queries']}", ""]
+    lines.append(f"{'tool':<26} {'calls':>5} {'p50 ms':>9} {'p95 ms':>9} {'queries':>7}")
+    for name, tool in report["tools"].items():
+        lines.append(f"{name:<26} {tool['calls']:>5} {tool['p50_ms']:>9.1f} {tool['p95_ms']:>9.1f} {tool['queries']:>7}")
+    lines += ["", f"{'case':<28} {'p95 ms':>9} {'llm':>4} {'tokens':>7} {'queries':>7}"]
+    for case_id, case in report["cases"].items():
+        lines.append(
+            f"{case_id:<28} {case['p95_ms']:>9.1f} {case['llm_calls']:>4} {case['tokens']:>7} {case['queries']:>7}"
+        )
+    if report["failures"]:
+        lines += ["", "failures:"] + [f"  {failure}" for failure in report["failures"]]
+    return "\n".join(lines)
+
+
+async def evaluate(
+    corpus_path: Path = CORPUS_PATH,
+    repeat: int = 1,
+    llm_latency_ms: float = 0.0,
+    database_url: Optional[str] = None,
+    scale: int = 1,
+) -> Dict[str, Any]:
+    """Seed a database, replay the corpus and return the aggregated report."""
+    from sqlalchemy.orm import Session
+
+    from app.agents.eval.seed import build_engine, seed_business
+    from app.models.user import User
+
+    cases = load_json(corpus_path)["cases"]
+    engine = build_engine(database_url)
+    db = Session(bind=engine)
+    try:
+        seeded = await asyncio.to_thread(seed_business, db, scale)
+        user = db.get(User, seeded.user_id)
+        runs = await run_corpus(
+            cases, db, user, str(seeded.business_id), repeat=repeat, llm_latency_ms=llm_latency_ms
+        )
+    finally:
+        db.close()
+        engine.dispose()
+    return build_report(runs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH)
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS_PATH)
+    parser.add_argument("--repeat", type=int, default=5, help="replays of the whole corpus")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="fixed delay of the mock provider")
+    parser.add_argument("--database-url", default=None, help="empty database to seed (default: in-memory SQLite)")
+    parser.add_argument("--scale", type=int, default=1, help="multiplier for seeded row counts")
+    parser.add_argument("--json", type=Path, default=None, help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(evaluate(args.corpus, args.repeat, args.llm_latency_ms, args.database_url, args.scale))
+    violations = check_thresholds(report, load_json(args.thresholds))
+    print(format_report(report))
+    if args.json:
+        args.json.write_text(json.dumps({**report, "violations": violations}, indent=2))
+    if violations:
+        print("\nthreshold violations:")
+        for violation in violations:
+            print(f"  {violation}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SECRET_KEY", "eval-secret-key-0123456789abcdef0123")
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+backend/app/agents/eval/mock_llm.py
+
+Deterministic, scripted OpenAI-compatible provider for evaluation runs.
+
+``ScriptedLLM.transport()`` returns an ``httpx.MockTransport`` that is
+plugged into a real ``LLMTransport`` — requests go through the same
+payload building, response parsing, breaker and stats code as production,
+only the network hop is replaced.  The provider answers from the case that
+is currently replayed:
+
+- the intent classifier prompt gets the case's agent name(s)
+- an agent turn gets the next scripted round of tool calls (the round is
+  the number of tool results already in the conversation), then the
+  scripted final answer
+- anything else (e.g. summaries) gets a short fixed reply
+
+Usage is reported with ~4 characters per token over the request payload
+(messages and tool schemas) and the reply, so token counts track prompt
+size deterministically.  ``latency_ms`` adds a fixed provider delay.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+CLASSIFIER_MARKER = "Classify the user message"
+
+
+def _tokens(text: str) -> int:
+    return max(1, (len(text) + 3) // 4)
+
+
+class ScriptedLLM:
+    """Replies for the case set in ``current``; one instance per run."""
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self.latency_ms = latency_ms
+        self.current: Optional[Dict[str, Any]] = None
+        self.requests = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        payload = json.loads(request.content)
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        message = self._reply(payload.get("messages") or [])
+        prompt_tokens = _tokens(json.dumps(payload.get("messages")) + json.dumps(payload.get("tools") or []))
+        completion_tokens = _tokens(json.dumps(message))
+        return httpx.Response(200, json={
+            "model": payload.get("model"),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _reply(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        case = self.current or {}
+        system = (messages[0].get("content") or "") if messages else ""
+        if system.startswith(CLASSIFIER_MARKER):
+            agent = case.get("agent", "chat_agent")
+            return {"role": "assistant", "content": ",".join(agent) if isinstance(agent, list) else agent}
+        if not case:
+            return {"role": "assistant", "content": "OK."}
+
+        done = sum(1 for m in messages if m.get("role") == "tool")
+        seen = 0
+        for number, calls in enumerate(case.get("tool_rounds") or []):
+            if done == seen:
+                return {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": f"call_{number}_{i}",
+                            "type": "function",
+                            "function": {
+                                "name": call["name"],
+                                "arguments": json.dumps(call.get("arguments") or {}),
+                            },
+                        }
+                        for i, call in enumerate(calls)
+                    ],
+                }
+            seen += len(calls)
+        return {"role": "assistant", "content": case.get("answer", "Done.")}
@@ -0,0 +1,209 @@
+"""
+backend/app/agents/eval/seed.py
+
+Seeded database for agent evaluation runs.
+
+``build_engine`` creates the full schema on in-memory SQLite (default) or on
+a given database URL (an empty PostgreSQL database for production-like query
+plans).  SQLite has no ARRAY/JSONB columns, and its UUID binding only
+accepts ``uuid.UUID`` while the services pass ids as strings (which psycopg
+accepts).  The models are left as they are: those types compile to JSON on
+SQLite, and the SQLite engine adapts ARRAY values to JSON and UUIDs to a
+string-tolerant type when binding and reading rows.
+
+``seed_business`` inserts one business with a deterministic data set sized
+by ``scale``: products with inventory, customers, suppliers, sales and
+purchase orders with items, and invoices in every status.
+"""
+
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import ARRAY, CHAR, JSON, Uuid, create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.types import TypeDecorator
+
+import app.models  # noqa: F401  - register all mappers
+import app.models.agent_log  # noqa: F401  - not re-exported by app.models
+from app.core.database import Base
+
+
+@compiles(ARRAY, "sqlite")
+@compiles(postgresql.ARRAY, "sqlite")
+@compiles(postgresql.JSONB, "sqlite")
+def _compile_json_on_sqlite(type_, compiler, **kw) -> str:
+    return "JSON"
+
+
+class _SQLiteUUID(TypeDecorator):
+    """UUID stored as 32 hex chars; binds ``uuid.UUID`` or its string form."""
+
+    impl = CHAR(32)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else uuid.UUID(str(value)).hex
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else uuid.UUID(value)
+
+
+@dataclass
+class SeededBusiness:
+    business_id: uuid.UUID
+    user_id: uuid.UUID
+    counts: Dict[str, int]
+
+
+def build_engine(database_url: Optional[str] = None) -> Engine:
+    """Engine with the full schema created; in-memory SQLite by default."""
+    if database_url and not database_url.startswith("sqlite"):
+        engine = create_engine(database_url)
+    else:
+        engine = create_engine(
+            database_url or "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        _adapt_postgres_types(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _adapt_postgres_types(engine: Engine) -> None:
+    """Bind and read ARRAY as JSON and UUIDs leniently on this engine only.
+
+    The dialect caches the adapted type per type object, so only this
+    engine's dialect instance sees the substitution.
+    """
+    dialect = engine.dialect
+    type_descriptor = dialect.type_descriptor
+
+    def adapt(typeobj):
+        if isinstance(typeobj, ARRAY):
+            return type_descriptor(JSON())
+        if isinstance(typeobj, Uuid) and typeobj.as_uuid:
+            return _SQLiteUUID()
+        return type_descriptor(typeobj)
+
+    dialect.type_descriptor = adapt
+
+
+def seed_business(db: Session, scale: int = 1, seed: int = 7) -> SeededBusiness:
+    """Insert one business and its data; ``scale`` multiplies every row count."""
+    from app.models.business import Business
+    from app.models.business_user import BusinessUser, BusinessUserStatus
+    from app.models.customer import Customer
+    from app.models.inventory import InventoryItem
+    from app.models.invoice import Invoice, InvoiceStatus
+    from app.models.order import Order, OrderDirection, OrderItem, OrderStatus, PaymentStatus
+    from app.models.product import Product
+    from app.models.supplier import Supplier
+    from app.models.user import User
+    from app.models.user_settings import AIDataSharingLevel, UserSettings
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    tag = uuid.uuid4().hex[:8]
+
+    user = User(
+        id=uuid.uuid4(), email=f"owner-{tag}@example.co.za", first_name="Thandi", last_name="Nkosi",
+        is_email_verified=True,
+    )
+    business = Business(
+        id=uuid.uuid4(), name="Corner Cafe", slug=f"corner-cafe-{tag}",
+        organization_id=uuid.uuid4(), currency="ZAR",
+    )
+    db.add_all([user, business])
+    db.flush()
+    db.add(BusinessUser(
+        user_id=user.id, business_id=business.id, status=BusinessUserStatus.ACTIVE, is_primary=True,
+    ))
+    db.add(UserSettings(user_id=user.id, ai_data_sharing_level=AIDataSharingLevel.FULL_BUSINESS))
+
+    products = []
+    for i in range(40 * scale):
+        cost = Decimal(rng.randint(500, 5000)) / 100
+        product = Product(
+            id=uuid.uuid4(), business_id=business.id, name=f"Product {i:04d}", sku=f"SKU-{tag}-{i:04d}",
+            cost_price=cost, selling_price=(cost * Decimal("1.6")).quantize(Decimal("0.01")),
+            quantity=rng.randint(0, 60), low_stock_threshold=10,
+        )
+        products.append(product)
+        db.add(product)
+        db.add(InventoryItem(
+            business_id=business.id, product_id=product.id,
+            quantity_on_hand=product.quantity, reorder_point=10, location="Main",
+        ))
+
+    customers = [
+        Customer(
+            id=uuid.uuid4(), business_id=business.id, first_name=f"Customer{i}", last_name="Dlamini",
+            email=f"c{i}-{tag}@example.co.za", total_orders=rng.randint(0, 30),
+            total_spent=Decimal(rng.randint(0, 500000)) / 100,
+        )
+        for i in range(30 * scale)
+    ]
+    suppliers = [
+        Supplier(id=uuid.uuid4(), business_id=business.id, name=f"Supplier {i}", email=f"s{i}-{tag}@example.co.za")
+        for i in range(8 * scale)
+    ]
+    db.add_all(customers + suppliers)
+
+    orders = []
+    for i in range(120 * scale):
+        outbound = i % 6 == 0
+        order = Order(
+            id=uuid.uuid4(), business_id=business.id, order_number=f"ORD-{tag}-{i:05d}",
+            direction=OrderDirection.OUTBOUND if outbound else OrderDirection.INBOUND,
+            customer_id=None if outbound else rng.choice(customers).id,
+            supplier_id=rng.choice(suppliers).id if outbound else None,
+            status=OrderStatus.DELIVERED, payment_status=rng.choice([PaymentStatus.PAID, PaymentStatus.PENDING]),
+            order_date=now - timedelta(days=rng.randint(0, 45), hours=rng.randint(0, 23)),
+        )
+        total = Decimal(0)
+        for product in rng.sample(products, 3):
+            quantity = rng.randint(1, 4)
+            line = product.selling_price * quantity
+            total += line
+            db.add(OrderItem(
+                order_id=order.id, product_id=product.id, name=product.name, sku=product.sku,
+                unit_price=product.selling_price, quantity=quantity, total=line,
+            ))
+        order.subtotal = order.total = total
+        order.created_at = order.order_date
+        orders.append(order)
+    db.add_all(orders)
+
+    statuses = list(InvoiceStatus)
+    for i, order in enumerate(orders[: 60 * scale]):
+        status = statuses[i % len(statuses)]
+        db.add(Invoice(
+            business_id=business.id, customer_id=order.customer_id, order_id=order.id,
+            invoice_number=f"INV-{tag}-{i:05d}", status=status,
+            issue_date=date.today() - timedelta(days=rng.randint(0, 60)),
+            due_date=date.today() - timedelta(days=rng.randint(-30, 30)),
+            subtotal=order.total, total=order.total,
+            amount_paid=order.total if status == InvoiceStatus.PAID else Decimal(0),
+        ))
+
+    db.commit()
+    return SeededBusiness(
+        business_id=business.id,
+        user_id=user.id,
+        counts={
+            "products": len(products),
+            "customers": len(customers),
+            "suppliers": len(suppliers),
+            "orders": len(orders),
+            "invoices": min(len(orders), 60 * scale),
+        },
+    )
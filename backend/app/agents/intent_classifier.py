@@ -30,6 +30,8 @@ class ClassifiedIntent:
     required_tools: List[str] = field(default_factory=list)
     needs_confirmation: bool = False
     reasoning: str = ""
+    # 0-1: how clearly the keywords point at primary_agent alone
+    confidence: float = 0.0
 
 
 # Patterns for fast classification without LLM (saves tokens)
@@ -65,6 +67,7 @@ def classify_intent(message: str, business_context: dict) -> ClassifiedIntent:
             complexity=IntentComplexity.GREETING,
             primary_agent="chat_agent",
             reasoning="Simple greeting — no tools required",
+            confidence=1.0,
         )
 
     # Score each agent by keyword matches
@@ -99,10 +102,19 @@ def classify_intent(message: str, business_context: dict) -> ClassifiedIntent:
         complexity = IntentComplexity.SIMPLE_QUERY
         needs_confirmation = False
 
+    # Confidence: the primary's share of all specialist keyword hits.
+    # Generic question words (chat_agent) alone are never conclusive.
+    specialist_total = sum(s for a, s in agent_scores.items() if a != "chat_agent")
+    if primary == "chat_agent" or not specialist_total:
+        confidence = 0.0
+    else:
+        confidence = agent_scores[primary] / specialist_total
+
     return ClassifiedIntent(
         complexity=complexity,
         primary_agent=primary,
         supporting_agents=supporting,
         needs_confirmation=needs_confirmation,
         reasoning=f"Matched agent '{primary}' with score {agent_scores.get(primary, 0)}",
+        confidence=round(confidence, 3),
     )
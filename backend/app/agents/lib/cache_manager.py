@@ -2,7 +2,8 @@
 backend/app/agents/lib/cache_manager.py
 
 Redis cache manager for the agent system.
-Handles system prompt caching, session memory windows, and key namespacing.
+Handles system prompt caching, session memory windows (see session_memory),
+and key namespacing.
 All keys are user-isolated — no cross-user leakage is possible.
 """
 
@@ -11,6 +12,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from app.agents.constants import RedisTTL, RedisPrefix
+from app.agents.lib import session_memory
 from app.core.redis import redis_manager
 
 logger = logging.getLogger("bizpilot.agents")
@@ -27,7 +29,7 @@ def _session_key(user_id: str, session_id: str) -> str:
     Including user_id prevents any session key from being guessed
     by a different user even if they know the session_id.
     """
-    return f"{RedisPrefix.SESSION}:{user_id}:{session_id}"
+    return session_memory._list_key(user_id, session_id)
 
 
 def _hitl_key(session_id: str) -> str:
@@ -47,42 +49,21 @@ async def cache_prompt(agent_name: str, prompt: str) -> None:
 
 async def get_session_memory(user_id: str, session_id: str) -> List[Dict[str, Any]]:
     """
-    Retrieve the sliding message window for a user session.
-    Returns an empty list if no session exists yet.
+    Retrieve the conversation window for a user session: the running
+    summary of older turns (if any) plus the newest messages within the
+    token budget.  Returns an empty list if no session exists yet.
     """
-    raw = await redis_manager.get(_session_key(user_id, session_id))
-    if not raw:
-        return []
-    try:
-        return json.loads(raw)
-    except (json.JSONDecodeError, TypeError):
-        logger.warning("Failed to parse session memory for session %s", session_id)
-        return []
+    return await session_memory.get_history(user_id, session_id)
 
 
 async def append_to_session(
     user_id: str, session_id: str, message: Dict[str, Any]
 ) -> None:
     """
-    Append a message to the session memory window and enforce the max size.
-    Evicts the oldest non-system message when the window is full.
+    Append a message to the session memory (atomic RPUSH).
+    Turns beyond the token budget are summarized and evicted in the background.
     """
-    from app.agents.constants import Limits  # avoid circular at module level
-
-    messages = await get_session_memory(user_id, session_id)
-    messages.append(message)
-
-    # Keep only the most recent N messages (system prompt excluded)
-    non_system = [m for m in messages if m.get("role") != "system"]
-    if len(non_system) > Limits.MAX_STEPS * 2:
-        # Drop the oldest non-system message
-        for i, m in enumerate(messages):
-            if m.get("role") != "system":
-                messages.pop(i)
-                break
-
-    key = _session_key(user_id, session_id)
-    await redis_manager.set(key, json.dumps(messages), RedisTTL.SESSION_MEMORY)
+    await session_memory.append_messages(user_id, session_id, message)
 
 
 async def save_hitl_pending(session_id: str, state: Dict[str, Any]) -> None:
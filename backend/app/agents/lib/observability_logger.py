@@ -4,19 +4,231 @@ backend/app/agents/lib/observability_logger.py
 Writes a permanent audit record for every agent step to the agent_logs table.
 Uses SQLAlchemy Session — no direct DB access by agents.
 Fails silently so a logging error never breaks the agent response.
+
+When the application has started the background writer
+(``start_agent_log_writer``), steps are not written on the request's session:
+they go into a bounded in-memory buffer and a background task inserts them
+in batches on its own session.  If the database is slow or down the buffer
+fills up and the oldest steps are dropped (and counted) rather than holding
+up agent responses.  Without the writer (tests, scripts) each step is added
+to the caller's session as before.
+
+Step, token, failure, cost and latency totals are kept in memory per
+business, so metrics never have to query agent_logs.
 """
 
+import asyncio
 import logging
+import threading
 import uuid
-from typing import Optional
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.llm_transport import LATENCY_BUCKETS_MS, Histogram
 from app.models.agent_log import AgentLog
+from app.models.base import utc_now
 
 logger = logging.getLogger("bizpilot.agents")
 
 
+class _StepTotals:
+    def __init__(self) -> None:
+        self.steps = 0
+        self.tokens = 0
+        self.failures = 0
+        self.cost_usd = 0.0
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "steps": self.steps,
+            "tokens": self.tokens,
+            "failures": self.failures,
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_ms": self.latency_ms.snapshot(),
+        }
+
+
+class AgentStepCounters:
+    """In-memory per-business totals of logged agent steps (this worker)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals: Dict[str, _StepTotals] = {}
+
+    def record(
+        self, business_id: str, tokens: int, success: bool, latency_ms: Optional[float]
+    ) -> None:
+        with self._lock:
+            for key in (business_id, "all"):
+                totals = self._totals.setdefault(key, _StepTotals())
+                totals.steps += 1
+                totals.tokens += tokens or 0
+                totals.failures += 0 if success else 1
+                totals.cost_usd += (tokens or 0) / 1000 * settings.LLM_COST_PER_1K_TOKENS
+                if latency_ms is not None:
+                    totals.latency_ms.observe(latency_ms)
+
+    def snapshot(self, business_id: Optional[str] = None) -> Dict[str, Any]:
+        """Totals for one business, or across all businesses when None."""
+        with self._lock:
+            totals = self._totals.get(str(business_id) if business_id else "all")
+            return (totals or _StepTotals()).snapshot()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+class AgentLogBuffer:
+    """
+    Bounded buffer of agent_logs rows drained by a background asyncio task.
+
+    ``put`` never blocks: when the buffer is full the oldest row is dropped.
+    The writer flushes every ``flush_interval`` seconds, or sooner once a
+    full batch is waiting, inserting each batch with one executemany on a
+    fresh session in a worker thread.  A failed batch is logged and
+    discarded so a database outage cannot grow memory.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ) -> None:
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._session_factory = session_factory
+        self._rows: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.dropped = 0
+        self.written = 0
+        self.failed_batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def put(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            if len(self._rows) == self.capacity:
+                self.dropped += 1
+            self._rows.append(row)
+            full_batch = len(self._rows) >= self.batch_size
+        if full_batch and self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._rows))
+            return [self._rows.popleft() for _ in range(count)]
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        db = self._session_factory()
+        try:
+            db.execute(insert(AgentLog), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def flush(self) -> int:
+        """Write everything currently buffered; returns rows written."""
+        written = 0
+        while True:
+            rows = self._take()
+            if not rows:
+                return written
+            try:
+                await asyncio.to_thread(self._write, rows)
+            except Exception as exc:
+                self.failed_batches += 1
+                logger.warning("Failed to write %d agent_log row(s): %s", len(rows), exc)
+                continue
+            self.written += len(rows)
+            written += len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the writer and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self._loop = None
+        self._wakeup = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "buffered": len(self._rows),
+            "capacity": self.capacity,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+        }
+
+
+step_counters = AgentStepCounters()
+log_buffer = AgentLogBuffer(
+    capacity=settings.AGENT_LOG_BUFFER_SIZE,
+    batch_size=settings.AGENT_LOG_BATCH_SIZE,
+    flush_interval=settings.AGENT_LOG_FLUSH_SECONDS,
+)
+
+
+async def start_agent_log_writer() -> None:
+    """Start buffered agent_logs writes (application startup)."""
+    log_buffer.start()
+
+
+async def stop_agent_log_writer() -> None:
+    """Flush buffered agent_logs rows and stop the writer (shutdown)."""
+    await log_buffer.stop()
+
+
+def agent_log_stats(business_id: Optional[str] = None) -> Dict[str, Any]:
+    """Step totals (one business or all) plus the writer's buffer state."""
+    return {"steps": step_counters.snapshot(business_id), "writer": log_buffer.stats()}
+
+
 def log_agent_step(
     db: Session,
     session_id: str,
@@ -31,9 +243,11 @@ def log_agent_step(
     result_summary: Optional[str] = None,
     success: bool = True,
     error_message: Optional[str] = None,
+    latency_ms: Optional[float] = None,
 ) -> None:
     """
-    Write one agent step to the agent_logs table.
+    Record one agent step: update the in-memory totals and queue (or, with
+    no background writer, add) the agent_logs row.
     Intentionally catches all exceptions — a logging failure must never
     prevent the user from getting a response.
     """
@@ -51,7 +265,9 @@ def log_agent_step(
             logger.error(f"Invalid UUID for log: user={user_id}, business={business_id}")
             return
 
-        log_entry = AgentLog(
+        step_counters.record(str(b_id), tokens_used, success, latency_ms)
+
+        row = dict(
             session_id=session_id,
             user_id=u_id,
             business_id=b_id,
@@ -65,7 +281,13 @@ def log_agent_step(
             success=success,
             error_message=safe_error,
         )
-        db.add(log_entry)
+
+        if log_buffer.running:
+            now = utc_now()
+            log_buffer.put({**row, "id": uuid.uuid4(), "created_at": now, "updated_at": now})
+            return
+
+        db.add(AgentLog(**row))
         # Use flush instead of commit so the transaction remains open
         # and doesn't trigger a mid-task commit that might break other logic
         db.flush()
@@ -117,8 +117,8 @@ class ContextProvider:
             "currency": getattr(business, "currency", "ZAR") or "ZAR",
         }
 
-    def get_dynamic_context(self, user: User, sharing_level: Any) -> Dict[str, Any]:
-        """Fetch live metrics — respects the user's data-sharing preference."""
+    async def get_dynamic_context(self, user: User, sharing_level: Any) -> Dict[str, Any]:
+        """Fetch business metrics (from the context snapshot) — respects the user's data-sharing preference."""
         from app.services.ai_context_service import AIContextService
         from app.models.user_settings import AIDataSharingLevel
 
@@ -126,4 +126,4 @@ class ContextProvider:
             return {}
 
         ai_service = AIContextService(self.db)
-        return ai_service.build_business_context(user, sharing_level)
+        return await ai_service.get_business_context(user, sharing_level)
@@ -0,0 +1,181 @@
+"""
+backend/app/agents/lib/result_cache.py
+
+Redis-backed result caches for the agent pipeline.
+
+- Tool results: read-only tool output keyed by (business, tool, normalized
+  args, data version).  The business's data version is bumped whenever an
+  agent runs a mutating tool, which orphans every cached result for that
+  business; a short TTL bounds staleness from writes made elsewhere (POS,
+  API), which do not bump the version.
+- Intents: the LLM router's answer keyed by the normalized message text.
+  Routing depends only on the wording, so this cache is shared by all users
+  and holds agent names only — never business data.
+
+Like the rest of cache_manager, every call degrades to a miss when Redis is
+unavailable.  Hit/miss counts and the LLM tokens and tool time saved are
+kept per worker process and reported by GET /ai/metrics.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Union
+
+from app.agents.constants import RedisPrefix, RedisTTL
+from app.core.redis import redis_manager
+
+logger = logging.getLogger("bizpilot.agents")
+
+
+class _CacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.ms_saved = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "ms_saved": round(self.ms_saved, 1),
+        }
+
+
+_stats: Dict[str, _CacheStats] = {
+    "tool_results": _CacheStats(),
+    "intent": _CacheStats(),
+}
+_fast_path = {"count": 0, "tokens_saved": 0}
+# Running cost of LLM classifications, used to price fast-path skips
+_classifier_cost = {"calls": 0, "tokens": 0}
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def normalize_args(args: Dict[str, Any]) -> str:
+    """Canonical JSON for tool arguments: sorted keys, trimmed strings, no nulls."""
+    def clean(value: Any) -> Any:
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, dict):
+            return {k: clean(v) for k, v in value.items() if v is not None}
+        if isinstance(value, list):
+            return [clean(v) for v in value]
+        return value
+
+    return json.dumps(clean(args or {}), sort_keys=True, default=str)
+
+
+def normalize_message(message: str) -> str:
+    """Lower-case, collapse whitespace and drop surrounding punctuation."""
+    return re.sub(r"\s+", " ", message.lower()).strip(" \t\n?!.,;:")
+
+
+def _data_version_key(business_id: str) -> str:
+    return f"{RedisPrefix.DATA_VERSION}:{business_id}"
+
+
+async def get_data_version(business_id: str) -> str:
+    """Current data version of a business ("0" until the first bump)."""
+    return await redis_manager.get(_data_version_key(business_id)) or "0"
+
+
+async def bump_data_version(business_id: str) -> None:
+    """Invalidate every cached tool result of a business."""
+    await redis_manager.incr(_data_version_key(business_id))
+
+
+def _tool_key(business_id: str, version: str, tool_name: str, args: Dict[str, Any]) -> str:
+    return f"{RedisPrefix.TOOL_RESULT}:{business_id}:{version}:{tool_name}:{_digest(normalize_args(args))}"
+
+
+async def get_tool_result(business_id: str, tool_name: str, args: Dict[str, Any]) -> Optional[Any]:
+    """Return the cached result of a read-only tool call, or None."""
+    version = await get_data_version(business_id)
+    raw = await redis_manager.get(_tool_key(business_id, version, tool_name, args))
+    stats = _stats["tool_results"]
+    if raw:
+        try:
+            entry = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            entry = None
+        if entry is not None:
+            stats.hits += 1
+            stats.ms_saved += entry.get("elapsed_ms", 0)
+            return entry["result"]
+    stats.misses += 1
+    return None
+
+
+async def cache_tool_result(
+    business_id: str, tool_name: str, args: Dict[str, Any], result: Any, elapsed_ms: float = 0.0
+) -> None:
+    """Cache a successful read-only tool result under the current data version."""
+    if isinstance(result, dict) and "error" in result:
+        return
+    version = await get_data_version(business_id)
+    try:
+        raw = json.dumps({"result": result, "elapsed_ms": round(elapsed_ms, 1)}, default=str)
+    except (TypeError, ValueError):
+        return
+    await redis_manager.set(_tool_key(business_id, version, tool_name, args), raw, RedisTTL.TOOL_RESULT)
+
+
+def _intent_key(message: str) -> str:
+    return f"{RedisPrefix.INTENT}:{_digest(normalize_message(message))}"
+
+
+async def get_cached_intent(message: str) -> Optional[Union[str, List[str]]]:
+    """Return the cached LLM routing for a message, or None."""
+    raw = await redis_manager.get(_intent_key(message))
+    stats = _stats["intent"]
+    if raw:
+        try:
+            entry = json.loads(raw)
+            stats.hits += 1
+            stats.tokens_saved += entry.get("tokens", 0)
+            return entry["intent"]
+        except (json.JSONDecodeError, TypeError, KeyError):
+            logger.warning("Failed to parse cached intent")
+    stats.misses += 1
+    return None
+
+
+async def cache_intent(message: str, intent: Union[str, List[str]], tokens: int = 0) -> None:
+    """Cache an LLM routing decision with the tokens it cost."""
+    _classifier_cost["calls"] += 1
+    _classifier_cost["tokens"] += tokens
+    await redis_manager.set(
+        _intent_key(message), json.dumps({"intent": intent, "tokens": tokens}), RedisTTL.INTENT
+    )
+
+
+def record_fast_path() -> None:
+    """Count a routing decision made by the keyword classifier alone."""
+    _fast_path["count"] += 1
+    if _classifier_cost["calls"]:
+        _fast_path["tokens_saved"] += _classifier_cost["tokens"] // _classifier_cost["calls"]
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit rates and savings since this worker started."""
+    return {
+        **{name: stats.snapshot() for name, stats in _stats.items()},
+        "intent_fast_path": dict(_fast_path),
+    }
+
+
+def reset_cache_stats() -> None:
+    """Zero the counters (tests)."""
+    for name in _stats:
+        _stats[name] = _CacheStats()
+    _fast_path.update(count=0, tokens_saved=0)
+    _classifier_cost.update(calls=0, tokens=0)
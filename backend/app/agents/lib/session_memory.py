@@ -0,0 +1,226 @@
+"""
+backend/app/agents/lib/session_memory.py
+
+Token-budgeted conversation memory for agent sessions.
+
+Each session is a Redis list of JSON messages carrying an estimated token
+count.  Appends are a single RPUSH (no read-modify-write, so concurrent
+requests on one session cannot drop each other's messages) and oversized
+messages are truncated before they are stored.
+
+When the stored messages exceed ``SessionMemory.HISTORY_TOKEN_BUDGET`` a
+background compaction summarizes the oldest turns with the summarization
+model tier, folds them into the session's running summary and trims them
+from the list (LTRIM), leaving ``COMPACT_TARGET_TOKENS`` of recent messages.
+A per-session lock (SET NX with a random token) makes sure only one
+compaction trims a list at a time; appends during a compaction land after
+the trimmed range.  Summarization is bounded well inside the lock's TTL,
+and the summary write and trim happen in one script that first checks the
+lock still holds this compaction's token, so a compaction that outlived
+its lock trims nothing.  The lock is released by compare-and-delete.
+
+``get_history`` returns the summary (as a system message) plus the newest
+messages that fit the budget, so prompt size stays bounded however long
+the conversation runs, even before a pending compaction finishes.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+from app.agents.constants import RedisPrefix, RedisTTL, SessionMemory
+from app.core.redis import redis_manager
+
+logger = logging.getLogger("bizpilot.agents")
+
+_SUMMARY_PROMPT = (
+    "You maintain the running summary of a conversation between a business "
+    "owner and their AI assistant. Merge the earlier summary (if any) with the "
+    "new messages into one concise summary. Keep facts, figures, product, "
+    "supplier and customer references, decisions taken and open questions. "
+    "Drop greetings and filler. Write plain sentences, no headings."
+)
+
+# Release the lock only if it still holds this compaction's token
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# While the lock (KEYS[1]) holds the token (ARGV[1]): store the new summary
+# (ARGV[3], unless empty) and drop the ARGV[2] summarized entries
+_COMMIT_COMPACTION = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[3] ~= '' then
+    redis.call('SET', KEYS[3], ARGV[3], 'EX', ARGV[4])
+end
+redis.call('LTRIM', KEYS[2], ARGV[2], -1)
+return 1
+"""
+
+_stats = {"compactions": 0, "messages_evicted": 0, "tokens_evicted": 0, "summary_failures": 0}
+# Strong references to in-flight compactions (asyncio only keeps weak ones)
+_background: Set[asyncio.Task] = set()
+
+
+def _list_key(user_id: str, session_id: str) -> str:
+    return f"{RedisPrefix.SESSION}:{user_id}:{session_id}"
+
+
+def _summary_key(user_id: str, session_id: str) -> str:
+    return f"{RedisPrefix.SUMMARY}:{user_id}:{session_id}"
+
+
+def _lock_key(user_id: str, session_id: str) -> str:
+    return f"{RedisPrefix.COMPACT_LOCK}:{user_id}:{session_id}"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) — no tokenizer round trip."""
+    return max(1, (len(text or "") + 3) // 4)
+
+
+def _encode(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    limit = SessionMemory.MAX_MESSAGE_TOKENS * 4
+    if len(content) > limit:
+        content = content[:limit] + " ...[truncated]"
+    return json.dumps({
+        "role": message.get("role", "user"),
+        "content": content,
+        "tokens": estimate_tokens(content),
+    })
+
+
+def _decode(raw: List[str]) -> List[Dict[str, Any]]:
+    entries = []
+    for item in raw:
+        try:
+            entry = json.loads(item)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        entry.setdefault("tokens", estimate_tokens(entry.get("content", "")))
+        entries.append(entry)
+    return entries
+
+
+async def append_messages(user_id: str, session_id: str, *messages: Dict[str, Any]) -> None:
+    """Append messages to the session and compact in the background if over budget."""
+    if not messages:
+        return
+    key = _list_key(user_id, session_id)
+    length = await redis_manager.rpush(
+        key, *(_encode(m) for m in messages), ttl_seconds=RedisTTL.SESSION_MEMORY
+    )
+    if not length:
+        return
+
+    entries = _decode(await redis_manager.lrange(key))
+    if sum(e["tokens"] for e in entries) > SessionMemory.HISTORY_TOKEN_BUDGET:
+        task = asyncio.create_task(compact_session(user_id, session_id))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+
+async def get_history(
+    user_id: str, session_id: str, budget: int = SessionMemory.HISTORY_TOKEN_BUDGET
+) -> List[Dict[str, Any]]:
+    """
+    Messages to send with the next prompt: the running summary (if any)
+    followed by the newest messages whose tokens fit within *budget*.
+    """
+    entries = _decode(await redis_manager.lrange(_list_key(user_id, session_id)))
+    recent: List[Dict[str, Any]] = []
+    used = 0
+    for entry in reversed(entries):
+        used += entry["tokens"]
+        if used > budget:
+            break
+        recent.append({"role": entry["role"], "content": entry["content"]})
+    recent.reverse()
+
+    summary = await redis_manager.get(_summary_key(user_id, session_id))
+    if summary:
+        recent.insert(0, {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+    return recent
+
+
+async def compact_session(user_id: str, session_id: str) -> bool:
+    """
+    Summarize and trim the oldest messages down to ``COMPACT_TARGET_TOKENS``.
+    Returns False when another compaction holds the lock, nothing is due,
+    or the lock expired before the trim.
+    """
+    lock = _lock_key(user_id, session_id)
+    token = uuid.uuid4().hex
+    if not await redis_manager.set_if_absent(lock, token, RedisTTL.MEMORY_COMPACT_LOCK):
+        return False
+    try:
+        key = _list_key(user_id, session_id)
+        entries = _decode(await redis_manager.lrange(key))
+        total = sum(e["tokens"] for e in entries)
+        if total <= SessionMemory.HISTORY_TOKEN_BUDGET:
+            return False
+
+        evict = 0
+        while evict < len(entries) - 1 and total > SessionMemory.COMPACT_TARGET_TOKENS:
+            total -= entries[evict]["tokens"]
+            evict += 1
+        evicted = entries[:evict]
+
+        summary_key = _summary_key(user_id, session_id)
+        summary = await _summarize(await redis_manager.get(summary_key), evicted)
+        if not summary:
+            _stats["summary_failures"] += 1
+
+        # Only the lock holder trims, and appends go to the right, so the
+        # first `evict` entries are still exactly the ones summarized.
+        committed = await redis_manager.eval(
+            _COMMIT_COMPACTION,
+            [lock, key, summary_key],
+            [token, evict, summary or "", RedisTTL.SESSION_MEMORY],
+        )
+        if not committed:
+            logger.warning("Session memory compaction lost its lock; nothing trimmed")
+            return False
+        _stats["compactions"] += 1
+        _stats["messages_evicted"] += evict
+        _stats["tokens_evicted"] += sum(e["tokens"] for e in evicted)
+        return True
+    finally:
+        await redis_manager.eval(_RELEASE_LOCK, [lock], [token])
+
+
+async def _summarize(previous: Optional[str], evicted: List[Dict[str, Any]]) -> Optional[str]:
+    from app.core.ai_models import execute_summarization_task
+
+    transcript = "\n".join(f"{e['role']}: {e['content']}" for e in evicted)
+    parts = [f"Earlier summary:\n{previous}"] if previous else []
+    parts.append(f"New messages:\n{transcript}")
+    try:
+        response = await asyncio.wait_for(
+            execute_summarization_task(
+                messages=[
+                    {"role": "system", "content": _SUMMARY_PROMPT},
+                    {"role": "user", "content": "\n\n".join(parts)},
+                ],
+                max_tokens=SessionMemory.SUMMARY_MAX_TOKENS,
+            ),
+            SessionMemory.SUMMARY_TIMEOUT_SECONDS,
+        )
+        return (response.content or "").strip() or previous
+    except Exception as exc:
+        # The turns are still trimmed: a bounded prompt matters more than
+        # the detail lost when the summarizer is unavailable.
+        logger.warning("Session memory summarization failed: %r", exc)
+        return None
+
+
+def session_memory_stats() -> Dict[str, Any]:
+    return {**_stats, "compactions_running": len(_background)}
@@ -6,13 +6,19 @@ Implements the full ReAct loop with tool execution and HITL gates.
 
 Flow:
   1. run_task()       → executes ReAct loop: LLM → tool calls → LLM → ... → final answer
+     run_task_stream() → same loop, yielding token / tool events as they happen
+     Independent read-only tool calls from one LLM turn run concurrently,
+     each on its own DB session; results are fed back in call order and
+     cached per business until its data changes (lib/result_cache.py)
   2. HITL pause       → if a tool is HITL, saves state to Redis and returns to user
   3. hitl resume      → execute_tool_and_continue() runs approved tool and continues
 """
 
+import asyncio
 import json
 import logging
-from typing import Any, Dict, List
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -24,10 +30,13 @@ from app.agents.lib.prompt_builder import PromptBuilder, ContextProvider
 from app.agents.lib.runaway_guard import RunawayGuard
 from app.agents.lib.hitl_manager import pause_for_approval
 from app.agents.lib.cache_manager import get_cached_prompt, cache_prompt
+from app.agents.lib.result_cache import bump_data_version, cache_tool_result, get_tool_result
 from app.agents.lib.observability_logger import log_agent_step
 from app.agents.lib.agent_logger import AgentLogger
 from app.agents.constants import ActionType
-from app.core.ai_models import execute_task, TaskType
+from app.agents.tools.common import get_business_id_for_user
+from app.core.ai_models import execute_task, execute_task_stream, TaskType
+from app.core.redis import redis_manager
 
 logger = logging.getLogger("bizpilot.agents")
 
@@ -35,9 +44,16 @@ logger = logging.getLogger("bizpilot.agents")
 class Orchestrator:
     """Runs agent tasks end-to-end with a real ReAct loop."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(
+        self, db: Session, session_factory: Optional[Callable[[], Session]] = None
+    ) -> None:
         self.db = db
         self.context_provider = ContextProvider(db)
+        # Extra sessions for concurrent read-only tools; same engine and pool
+        self.session_factory = session_factory or (
+            lambda: Session(bind=db.get_bind(), autoflush=False)
+        )
+        self._business_ids: Dict[Any, Optional[str]] = {}
 
     async def run_task(
         self,
@@ -54,10 +70,58 @@ class Orchestrator:
         Execute the ReAct loop for an agent task.
         Passes tool schemas to the LLM, executes HOTL tools automatically,
         pauses on HITL tools for user approval.
+        Returns the terminal event (response, hitl_request, stopped or error).
+        """
+        result: Dict[str, Any] = {}
+        async for event in self._react_events(
+            agent_name, user, user_message, session_id, chat_history,
+            sharing_level, business_id, extra_context, stream=False,
+        ):
+            result = event
+        return result
+
+    async def run_task_stream(
+        self,
+        agent_name: str,
+        user: User,
+        user_message: str,
+        session_id: str,
+        chat_history: List[Dict[str, Any]],
+        sharing_level: AIDataSharingLevel,
+        business_id: str,
+        extra_context: Dict[str, Any] | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming run_task: yields events as the ReAct loop progresses.
+
+        - {"type": "token", "content": ...}       model output as it arrives
+        - {"type": "tool_start", "tool", "arguments"} before a HOTL tool runs
+        - {"type": "tool_result", "tool", "result"}   after it returns
+        - a terminal event, the same dict run_task returns
         """
+        async for event in self._react_events(
+            agent_name, user, user_message, session_id, chat_history,
+            sharing_level, business_id, extra_context, stream=True,
+        ):
+            yield event
+
+    async def _react_events(
+        self,
+        agent_name: str,
+        user: User,
+        user_message: str,
+        session_id: str,
+        chat_history: List[Dict[str, Any]],
+        sharing_level: AIDataSharingLevel,
+        business_id: str,
+        extra_context: Dict[str, Any] | None,
+        stream: bool,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """The ReAct loop as an event generator; the last event is terminal."""
         agent_def = agent_registry.get(agent_name)
         if not agent_def:
-            return {"type": "error", "message": f"Agent '{agent_name}' not found"}
+            yield {"type": "error", "message": f"Agent '{agent_name}' not found"}
+            return
 
         guard = RunawayGuard(max_steps=agent_def.max_steps)
         system_prompt = await self._get_system_prompt(
@@ -81,22 +145,34 @@ class Orchestrator:
             step += 1
 
             try:
-                response = await execute_task(
+                llm_kwargs = dict(
                     task_type=agent_def.model_tier,
                     messages=messages,
                     tools=tools_schema if tools_schema else None,
                     max_tokens=2048,
                 )
+                llm_started = time.perf_counter()
+                if stream:
+                    response = None
+                    async for chunk in execute_task_stream(**llm_kwargs):
+                        if chunk.delta:
+                            yield {"type": "token", "content": chunk.delta}
+                        if chunk.response is not None:
+                            response = chunk.response
+                else:
+                    response = await execute_task(**llm_kwargs)
+                llm_ms = (time.perf_counter() - llm_started) * 1000
             except Exception as exc:
                 logger.error(
                     "LLM call failed for agent '%s': %s: %s",
                     agent_name, type(exc).__name__, exc,
                     exc_info=True,
                 )
-                return {
+                yield {
                     "type": "error",
                     "message": "I'm having trouble processing your request right now. Please try again in a moment.",
                 }
+                return
 
             guard_result = guard.record_step(
                 description=f"Step {step}: LLM call",
@@ -104,36 +180,20 @@ class Orchestrator:
             )
 
             if guard_result.stopped:
-                return {"type": "stopped", "message": guard_result.partial_summary}
+                yield {"type": "stopped", "message": guard_result.partial_summary}
+                return
 
             # If LLM returned tool calls, execute them
             if response.tool_calls:
-                for tool_call in response.tool_calls:
-                    tool_name = tool_call["name"]
-                    # Guard against None arguments (LLM may return null JSON)
-                    raw_args = tool_call["arguments"]
-                    tool_args = raw_args if isinstance(raw_args, dict) else {}
-                    tool_def = tool_registry.get(tool_name)
+                for batch in self._batch_tool_calls(response.tool_calls):
+                    first = batch[0]
+                    tool_name, tool_args, tool_def = first["name"], first["arguments"], first["tool_def"]
 
                     if not tool_def:
                         # Unknown tool — append error and let LLM retry
-                        messages.append({
-                            "role": "assistant",
-                            "content": None,
-                            "tool_calls": [{
-                                "id": tool_call["id"],
-                                "type": "function",
-                                "function": {
-                                    "name": tool_name,
-                                    "arguments": json.dumps(tool_args),
-                                },
-                            }],
-                        })
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call["id"],
-                            "content": json.dumps({"error": f"Tool '{tool_name}' not found"}),
-                        })
+                        self._append_tool_messages(
+                            messages, first, {"error": f"Tool '{tool_name}' not found"}
+                        )
                         continue
 
                     # HITL gate — pause for user approval
@@ -149,10 +209,11 @@ class Orchestrator:
                             tokens_used=response.usage.get("total_tokens", 0),
                             tool_name=tool_name,
                             reasoning=f"HITL pause: {tool_name}({tool_args})",
+                            latency_ms=llm_ms,
                         )
                         self.db.commit()
 
-                        return await pause_for_approval(
+                        yield await pause_for_approval(
                             session_id=session_id,
                             agent_name=agent_name,
                             tool_name=tool_name,
@@ -160,49 +221,31 @@ class Orchestrator:
                             messages_so_far=messages,
                             description=tool_def.hitl_description or f"Execute {tool_name}",
                         )
+                        return
+
+                    # HOTL — execute immediately (read-only batches concurrently)
+                    for call in batch:
+                        yield {"type": "tool_start", "tool": call["name"], "arguments": call["arguments"]}
+                    results = await self._execute_hotl_batch(batch, user, agent_name)
 
-                    # HOTL — execute immediately
-                    try:
-                        result = await tool_def.handler(
-                            db=self.db, user=user, **tool_args
+                    # Results go back in the order the LLM asked for them
+                    for call, result in zip(batch, results):
+                        yield {"type": "tool_result", "tool": call["name"], "result": result}
+                        self._append_tool_messages(messages, call, result)
+                        log_agent_step(
+                            db=self.db,
+                            session_id=session_id,
+                            user_id=str(user.id),
+                            business_id=business_id,
+                            agent_name=agent_name,
+                            step_number=step,
+                            action_type=ActionType.HOTL,
+                            tokens_used=response.usage.get("total_tokens", 0),
+                            tool_name=call["name"],
+                            result_summary=str(result)[:500],
+                            success=True,
+                            latency_ms=call.get("elapsed_ms"),
                         )
-                        AgentLogger.tool_result(agent_name, tool_name, result)
-                    except Exception as exc:
-                        AgentLogger.error(f"Tool '{tool_name}' failed", error=exc)
-                        result = {"error": str(exc)}
-
-                    # Append assistant tool call + tool result to messages
-                    messages.append({
-                        "role": "assistant",
-                        "content": None,
-                        "tool_calls": [{
-                            "id": tool_call["id"],
-                            "type": "function",
-                            "function": {
-                                "name": tool_name,
-                                "arguments": json.dumps(tool_args),
-                            },
-                        }],
-                    })
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call["id"],
-                        "content": json.dumps(result, default=str),
-                    })
-
-                    log_agent_step(
-                        db=self.db,
-                        session_id=session_id,
-                        user_id=str(user.id),
-                        business_id=business_id,
-                        agent_name=agent_name,
-                        step_number=step,
-                        action_type=ActionType.HOTL,
-                        tokens_used=response.usage.get("total_tokens", 0),
-                        tool_name=tool_name,
-                        result_summary=str(result)[:500],
-                        success=True,
-                    )
 
                 self.db.commit()
                 # Continue the ReAct loop — LLM will see tool results
@@ -220,10 +263,133 @@ class Orchestrator:
                 action_type=ActionType.HOTL,
                 tokens_used=response.usage.get("total_tokens", 0),
                 reasoning=final_text[:500],
+                latency_ms=llm_ms,
             )
             self.db.commit()
 
-            return {"type": "response", "message": final_text, "steps": step}
+            yield {"type": "response", "message": final_text, "steps": step}
+            return
+
+    @staticmethod
+    def _batch_tool_calls(tool_calls: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Group one LLM turn's tool calls into execution batches, in order.
+
+        Consecutive read-only HOTL calls share a batch and run concurrently;
+        every other call (HITL, mutating HOTL, unknown) is a batch of one,
+        so anything that writes still sees the results of the calls before it.
+        """
+        batches: List[List[Dict[str, Any]]] = []
+        for tool_call in tool_calls:
+            raw_args = tool_call["arguments"]
+            call = {
+                "id": tool_call["id"],
+                "name": tool_call["name"],
+                # Guard against None arguments (LLM may return null JSON)
+                "arguments": raw_args if isinstance(raw_args, dict) else {},
+                "tool_def": tool_registry.get(tool_call["name"]),
+                "read_only": tool_registry.is_read_only(tool_call["name"]),
+            }
+            if call["read_only"] and batches and batches[-1][-1]["read_only"]:
+                batches[-1].append(call)
+            else:
+                batches.append([call])
+        return batches
+
+    async def _run_tool(self, call: Dict[str, Any], db: Session, user: User, agent_name: str) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await call["tool_def"].handler(db=db, user=user, **call["arguments"])
+            AgentLogger.tool_result(agent_name, call["name"], result)
+        except Exception as exc:
+            AgentLogger.error(f"Tool '{call['name']}' failed", error=exc)
+            result = {"error": str(exc)}
+        call["elapsed_ms"] = (time.perf_counter() - started) * 1000
+        return result
+
+    async def _run_tool_in_own_session(self, call: Dict[str, Any], user: User, agent_name: str) -> Any:
+        # Sessions are not safe to share between concurrent to_thread calls
+        db = self.session_factory()
+        try:
+            return await self._run_tool(call, db, user, agent_name)
+        finally:
+            db.rollback()
+            db.close()
+
+    async def _cache_scope(self, user: User) -> Optional[str]:
+        """Business whose data the tools read — the tool result cache key."""
+        if not redis_manager.is_available():
+            return None
+        if user.id not in self._business_ids:
+            self._business_ids[user.id] = await asyncio.to_thread(
+                get_business_id_for_user, self.db, user
+            )
+        return self._business_ids[user.id]
+
+    async def _execute_hotl_batch(
+        self, batch: List[Dict[str, Any]], user: User, agent_name: str
+    ) -> List[Any]:
+        """
+        Run a batch of HOTL calls; returns results in batch order.
+
+        Read-only results come from the tool result cache when possible and
+        are stored after a miss; a mutating call bumps the business's data
+        version so later reads see its effect.
+        """
+        business_id = await self._cache_scope(user)
+        results: List[Any] = [None] * len(batch)
+        pending: List[int] = []
+        for i, call in enumerate(batch):
+            cached = None
+            if business_id and call["read_only"]:
+                cached = await get_tool_result(business_id, call["name"], call["arguments"])
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        if len(pending) == 1:
+            fresh = [await self._run_tool(batch[pending[0]], self.db, user, agent_name)]
+        else:
+            fresh = await asyncio.gather(
+                *(self._run_tool_in_own_session(batch[i], user, agent_name) for i in pending)
+            )
+
+        for i, result in zip(pending, fresh):
+            results[i] = result
+            call = batch[i]
+            if not business_id:
+                continue
+            if call["read_only"]:
+                await cache_tool_result(
+                    business_id, call["name"], call["arguments"], result, call["elapsed_ms"]
+                )
+            else:
+                await bump_data_version(business_id)
+        return results
+
+    @staticmethod
+    def _append_tool_messages(
+        messages: List[Dict[str, Any]], call: Dict[str, Any], result: Any
+    ) -> None:
+        """Append the assistant tool call and its result for the next LLM turn."""
+        messages.append({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": call["id"],
+                "type": "function",
+                "function": {
+                    "name": call["name"],
+                    "arguments": json.dumps(call["arguments"]),
+                },
+            }],
+        })
+        messages.append({
+            "role": "tool",
+            "tool_call_id": call["id"],
+            "content": json.dumps(result, default=str),
+        })
 
     async def execute_tool_and_continue(
         self,
@@ -247,6 +413,9 @@ class Orchestrator:
             safe_args = tool_args if isinstance(tool_args, dict) else {}
             result = await tool_def.handler(db=self.db, user=user, **safe_args)
             AgentLogger.tool_result(agent_name, tool_name, result)
+            cache_business_id = await self._cache_scope(user)
+            if cache_business_id:
+                await bump_data_version(cache_business_id)
 
             log_agent_step(
                 db=self.db,
@@ -324,7 +493,7 @@ class Orchestrator:
             return cached
 
         static_ctx = self.context_provider.get_static_context(user)
-        dynamic_ctx = self.context_provider.get_dynamic_context(user, sharing_level)
+        dynamic_ctx = await self.context_provider.get_dynamic_context(user, sharing_level)
         prompt = PromptBuilder.build(
             role_description=agent_def.role_description,
             capabilities=agent_def.capabilities,
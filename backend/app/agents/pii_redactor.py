@@ -8,13 +8,20 @@ Patterns covered:
 - South African mobile numbers (+27 or 0, followed by 9 digits)
 - Email addresses (RFC-5321 local@domain pattern)
 - Customer names — redacted when the context object exposes known names
+
+All classes are found in a single scan: the fixed patterns and the known
+names are compiled into one alternation, with the names folded into a
+character trie so matching cost depends on the text length and the longest
+name, not on how many names are registered.  Building that pattern for a
+large customer list is the expensive step, so build a redactor once and reuse
+it for every text.
 """
 
 from __future__ import annotations
 
 import re
 import logging
-from typing import Optional
+from typing import Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +46,10 @@ _EMAIL_PATTERN = re.compile(
     r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}"
 )
 
+# Replacement token per named group of the combined pattern, in priority
+# order: at a given position an ID, phone or email wins over a name.
+_TOKENS = {"sa_id": "[SA_ID]", "phone": "[PHONE]", "email": "[EMAIL]", "name": "[NAME]"}
+
 
 class PIIRedactor:
     """
@@ -54,16 +65,25 @@ class PIIRedactor:
         redactor = PIIRedactor(known_names=["Jane Smith", "John Doe"])
         safe_text = redactor.redact("Hi, I'm Jane Smith")
         # → "Hi, I'm [NAME]"
+
+    Names match case-insensitively on word boundaries, longest name first.
     """
 
-    def __init__(self, known_names: Optional[list[str]] = None) -> None:
-        self._name_patterns: list[re.Pattern] = []
-        for name in (known_names or []):
-            if name and len(name.strip()) >= 2:
-                escaped = re.escape(name.strip())
-                self._name_patterns.append(
-                    re.compile(escaped, re.IGNORECASE)
-                )
+    def __init__(self, known_names: Optional[Iterable[str]] = None) -> None:
+        names = {
+            name.strip().lower()
+            for name in (known_names or [])
+            if name and len(name.strip()) >= 2
+        }
+        self.name_count = len(names)
+        alternatives = [
+            f"(?P<sa_id>{_SA_ID_PATTERN.pattern})",
+            f"(?P<phone>{_SA_PHONE_PATTERN.pattern})",
+            f"(?P<email>{_EMAIL_PATTERN.pattern})",
+        ]
+        if names:
+            alternatives.append(f"(?<!\\w)(?P<name>{_trie_pattern(names)})(?!\\w)")
+        self._pattern = re.compile("|".join(alternatives), re.IGNORECASE)
 
     # ------------------------------------------------------------------
     # Public API
@@ -74,42 +94,54 @@ class PIIRedactor:
         if not text:
             return text
 
-        original_len = len(text)
-        text = self._redact_sa_ids(text)
-        text = self._redact_phones(text)
-        text = self._redact_emails(text)
-        text = self._redact_known_names(text)
+        redacted_count = 0
 
-        redacted_count = self._count_tokens(text)
+        def replace(match: re.Match) -> str:
+            nonlocal redacted_count
+            redacted_count += 1
+            return _TOKENS[match.lastgroup]
+
+        result = self._pattern.sub(replace, text)
         if redacted_count:
             logger.debug(
                 "PIIRedactor: redacted %d token(s) from %d-char input.",
-                redacted_count, original_len,
+                redacted_count, len(text),
             )
 
-        return text
+        return result
 
-    # ------------------------------------------------------------------
-    # Private helpers
-    # ------------------------------------------------------------------
 
-    @staticmethod
-    def _redact_sa_ids(text: str) -> str:
-        return _SA_ID_PATTERN.sub("[SA_ID]", text)
-
-    @staticmethod
-    def _redact_phones(text: str) -> str:
-        return _SA_PHONE_PATTERN.sub("[PHONE]", text)
-
-    @staticmethod
-    def _redact_emails(text: str) -> str:
-        return _EMAIL_PATTERN.sub("[EMAIL]", text)
-
-    def _redact_known_names(self, text: str) -> str:
-        for pattern in self._name_patterns:
-            text = pattern.sub("[NAME]", text)
-        return text
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex source matching any of *words*, factored as a character trie.
 
-    @staticmethod
-    def _count_tokens(text: str) -> int:
-        return text.count("[SA_ID]") + text.count("[PHONE]") + text.count("[EMAIL]") + text.count("[NAME]")
+    ``{"jane", "jane smith", "john"}`` becomes ``j(?:ane(?:\\ smith)?|ohn)``:
+    the engine follows one branch per character instead of trying every
+    word at every position, and optional suffixes keep the longest match.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        branches = []
+        for char in sorted(node):
+            if not char:
+                continue
+            # Follow single-child chains without recursing (name tails)
+            chain, child = [char], node[char]
+            while len(child) == 1 and "" not in child:
+                (next_char, child), = child.items()
+                chain.append(next_char)
+            branches.append(re.escape("".join(chain)) + build(child))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
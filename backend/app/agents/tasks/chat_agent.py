@@ -7,14 +7,17 @@ for requests that span multiple domains.
 """
 
 import logging
-from typing import Any, Dict, List, Union
+from typing import Any, AsyncIterator, Dict, List, Union
 
 from sqlalchemy.orm import Session
 
 from app.models.user import User
 from app.models.user_settings import AIDataSharingLevel
 from app.agents.orchestrator import Orchestrator
+from app.agents.constants import IntentRouting
+from app.agents.intent_classifier import classify_intent
 from app.agents.lib.agent_logger import AgentLogger
+from app.agents.lib.result_cache import cache_intent, get_cached_intent, record_fast_path
 from app.core.ai_models import execute_fast_task
 
 logger = logging.getLogger("bizpilot.agents")
@@ -31,7 +34,22 @@ async def _classify_intent(
     """
     Use a fast LLM call to classify the user's intent.
     Returns the name of the specialist agent, or a list for chaining.
+
+    Skipped when the keyword pre-filter is confident, or when the same
+    (normalized) message has been classified before.
     """
+    keyword_intent = classify_intent(message, {})
+    if (
+        keyword_intent.confidence >= IntentRouting.FAST_PATH_CONFIDENCE
+        and keyword_intent.primary_agent in VALID_AGENTS
+    ):
+        record_fast_path()
+        return keyword_intent.primary_agent
+
+    cached = await get_cached_intent(message)
+    if cached:
+        return cached
+
     system_prompt = (
         "Classify the user message into one or more agent categories.\n"
         "Available agents:\n"
@@ -62,10 +80,13 @@ async def _classify_intent(
         validated = [a for a in agents if a in VALID_AGENTS]
 
         if len(validated) > 1:
-            return validated
+            intent: Union[str, List[str]] = validated
         elif len(validated) == 1:
-            return validated[0]
-        return "chat_agent"
+            intent = validated[0]
+        else:
+            intent = "chat_agent"
+        await cache_intent(message, intent, response.usage.get("total_tokens", 0))
+        return intent
     except Exception as e:
         logger.warning(f"Intent classification failed: {e}. Falling back to keyword matching.")
         return _detect_agent_keywords(message)
@@ -160,6 +181,48 @@ class ChatAgent:
             business_id=business_id,
         )
 
+    async def run_stream(
+        self,
+        user: User,
+        message: str,
+        history: List[Dict[str, Any]],
+        sharing_level: AIDataSharingLevel,
+        session_id: str = "",
+        business_id: str = "",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming run: yields {"type": "agent", "agent": name} when an agent
+        starts, then that agent's Orchestrator.run_task_stream events.
+        Chained agents run in order and stop on HITL, error or stopped.
+        """
+        intent = await _classify_intent(message, history)
+        agent_chain = intent if isinstance(intent, list) else [intent]
+        AgentLogger.info(
+            f"Streaming via {' -> '.join(agent_chain)}",
+            message_preview=message[:100],
+        )
+
+        accumulated_context: Dict[str, Any] = {}
+        for agent_name in agent_chain:
+            yield {"type": "agent", "agent": agent_name}
+            result: Dict[str, Any] = {}
+            async for event in self.orchestrator.run_task_stream(
+                agent_name=agent_name,
+                user=user,
+                user_message=message,
+                session_id=session_id,
+                chat_history=history,
+                sharing_level=sharing_level,
+                business_id=business_id,
+                extra_context=accumulated_context if accumulated_context else None,
+            ):
+                result = event
+                yield event
+            accumulated_context[agent_name] = result
+
+            if result.get("type") in ("hitl_request", "error", "stopped"):
+                return
+
     async def _run_chained(
         self,
         agent_chain: List[str],
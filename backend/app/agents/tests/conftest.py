@@ -8,7 +8,7 @@ deterministic and never hit live services.
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 
 # ---------------------------------------------------------------------------
@@ -56,7 +56,7 @@ def mock_execute_fast_task(mock_llm_response):
 @pytest.fixture
 def fake_redis_store():
     """In-memory dict that behaves like our redis_manager for tests."""
-    store: Dict[str, str] = {}
+    store: Dict[str, Any] = {}
 
     class FakeRedisManager:
         async def get(self, key: str) -> Optional[str]:
@@ -70,6 +70,45 @@ def fake_redis_store():
             store.pop(key, None)
             return True
 
+        async def incr(self, key: str) -> int:
+            store[key] = str(int(store.get(key, 0)) + 1)
+            return int(store[key])
+
+        async def set_if_absent(self, key: str, value: str, ttl_seconds: int) -> bool:
+            if key in store:
+                return False
+            store[key] = value
+            return True
+
+        async def rpush(self, key: str, *values: str, ttl_seconds: Optional[int] = None) -> int:
+            store.setdefault(key, []).extend(values)
+            return len(store[key])
+
+        async def lrange(self, key: str, start: int = 0, end: int = -1) -> list:
+            items = store.get(key, [])
+            return items[start:] if end == -1 else items[start:end + 1]
+
+        async def ltrim(self, key: str, start: int, end: int = -1) -> bool:
+            store[key] = await self.lrange(key, start, end)
+            return True
+
+        async def eval(self, script: str, keys: list, args: list = ()) -> Any:
+            # Emulates the Lua scripts the agents run (no Lua interpreter here)
+            from app.agents.lib import session_memory
+
+            if store.get(keys[0]) != args[0]:
+                return 0
+            if script == session_memory._RELEASE_LOCK:
+                store.pop(keys[0])
+                return 1
+            if script == session_memory._COMMIT_COMPACTION:
+                _, list_key, summary_key = keys
+                if args[2]:
+                    store[summary_key] = args[2]
+                await self.ltrim(list_key, int(args[1]))
+                return 1
+            raise NotImplementedError(script)
+
         def is_available(self) -> bool:
             return True
 
@@ -80,7 +119,8 @@ def fake_redis_store():
 def patch_redis_manager(fake_redis_store):
     """Replace the global redis_manager with a fake for cache tests."""
     fake_manager, _ = fake_redis_store
-    with patch("app.agents.lib.cache_manager.redis_manager", fake_manager):
+    with patch("app.agents.lib.cache_manager.redis_manager", fake_manager), \
+            patch("app.agents.lib.session_memory.redis_manager", fake_manager):
         yield fake_manager
 
 
@@ -0,0 +1,115 @@
+"""
+Unit tests for the offline evaluation harness.
+
+Tests that:
+- The shipped corpus replays cleanly and stays within thresholds.json
+  (the CI regression gate)
+- The scripted provider answers the classifier, then each tool round,
+  then the final answer
+- Misrouted cases and exceeded thresholds are reported
+- Seeding SQLite leaves the shared model metadata untouched
+"""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.agents.eval import harness
+from app.agents.eval.harness import build_report, check_thresholds, evaluate, load_json
+from app.agents.eval.mock_llm import CLASSIFIER_MARKER, ScriptedLLM
+
+
+@pytest.mark.asyncio
+async def test_corpus_within_thresholds():
+    report = await evaluate(repeat=1)
+    cases = load_json(harness.CORPUS_PATH)["cases"]
+
+    assert report["failures"] == []
+    assert set(report["cases"]) == {case["id"] for case in cases}
+    assert report["tools"]["get_dashboard_kpis"]["queries"] > 0
+    assert check_thresholds(report, load_json(harness.THRESHOLDS_PATH)) == []
+
+
+def test_sqlite_seed_leaves_model_types_alone():
+    from app.agents.eval.seed import build_engine, seed_business
+    from app.core.database import Base
+    from sqlalchemy.orm import Session
+
+    before = {(t.name, c.name): c.type for t in Base.metadata.tables.values() for c in t.columns}
+    engine = build_engine()
+    with Session(bind=engine) as db:
+        seeded = seed_business(db)
+        db.commit()
+    engine.dispose()
+
+    after = {(t.name, c.name): c.type for t in Base.metadata.tables.values() for c in t.columns}
+    assert all(after[key] is column_type for key, column_type in before.items())
+    assert seeded.counts["products"] > 0
+
+
+@pytest.mark.asyncio
+async def test_scripted_llm_follows_the_case():
+    llm = ScriptedLLM()
+    llm.current = {
+        "agent": "decision_agent",
+        "tool_rounds": [[{"name": "get_top_customers"}, {"name": "get_invoice_stats"}], [{"name": "get_customers"}]],
+        "answer": "Chase invoices.",
+    }
+
+    async with httpx.AsyncClient(transport=llm.transport(), base_url="http://llm") as client:
+        async def reply(messages):
+            response = await client.post("/chat/completions", json={"messages": messages})
+            body = response.json()
+            assert body["usage"]["total_tokens"] > 0
+            return body["choices"][0]["message"]
+
+        intent = await reply([{"role": "system", "content": f"{CLASSIFIER_MARKER} ..."}])
+        assert intent["content"] == "decision_agent"
+
+        conversation = [{"role": "system", "content": "You are the analyst"}, {"role": "user", "content": "?"}]
+        first = await reply(conversation)
+        assert [c["function"]["name"] for c in first["tool_calls"]] == ["get_top_customers", "get_invoice_stats"]
+
+        conversation += [{"role": "tool", "content": "{}"}, {"role": "tool", "content": "{}"}]
+        second = await reply(conversation)
+        assert [c["function"]["name"] for c in second["tool_calls"]] == ["get_customers"]
+
+        conversation.append({"role": "tool", "content": "{}"})
+        assert (await reply(conversation))["content"] == "Chase invoices."
+
+
+@pytest.mark.asyncio
+async def test_misrouted_case_is_a_failure(tmp_path: Path):
+    corpus = tmp_path / "corpus.json"
+    corpus.write_text(json.dumps({"cases": [
+        {"id": "greeting", "message": "Hi there", "agent": "finance_agent", "tool_rounds": [], "answer": "Hi"},
+    ]}))
+
+    report = await evaluate(corpus_path=corpus)
+
+    assert report["failures"] == ["greeting: routed to ['chat_agent'], expected ['finance_agent']"]
+    assert check_thresholds(report, {"max_failures": 0}) == ["1 case failure(s)"]
+
+
+def test_threshold_violations_are_reported():
+    run = harness.CaseRun(case_id="kpis", llm_calls=3, tokens=5000, prompt_queries=20)
+    run.stages["total"] = 80.0
+    run.tools.append({"name": "get_dashboard_kpis", "ms": 12.0, "queries": 14, "error": None})
+    report = build_report([run])
+
+    violations = check_thresholds(report, {
+        "stage_p95_ms": {"total": 50},
+        "prompt_build_max_queries": 15,
+        "tool_max_queries": {"default": 8},
+        "case_max_tokens": 9000,
+        "case_max_llm_calls": 2,
+    })
+
+    assert violations == [
+        "total p95 80.0ms > 50ms",
+        "prompt build ran 20 queries > 15",
+        "get_dashboard_kpis ran 14 queries > 8",
+        "kpis used 3 llm calls > 2",
+    ]
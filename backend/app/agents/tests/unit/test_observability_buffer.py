@@ -0,0 +1,140 @@
+"""
+Unit tests for buffered agent step logging.
+
+Tests that:
+- With the background writer running, steps bypass the request session and
+  are inserted in batches on the writer's own session
+- The buffer is bounded: the oldest rows are dropped and counted
+- A failing database never raises into the agent and does not grow memory
+- In-memory totals (steps, tokens, failures, cost, latency) are per business
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.agents.lib import observability_logger
+from app.agents.lib.observability_logger import (
+    AgentLogBuffer,
+    AgentStepCounters,
+    log_agent_step,
+)
+from app.core.database import Base
+from app.models.agent_log import AgentLog
+
+
+@pytest.fixture
+def sessions():
+    # StaticPool: the writer thread must see the same in-memory database
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[AgentLog.__table__])
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def _count(sessions):
+    with sessions() as db:
+        return db.execute(select(func.count(AgentLog.id))).scalar_one()
+
+
+def _step(db, business_id, tokens=10, success=True, latency_ms=None):
+    log_agent_step(
+        db=db,
+        session_id="s",
+        user_id=str(uuid4()),
+        business_id=business_id,
+        agent_name="chat_agent",
+        step_number=1,
+        action_type="HOTL",
+        tokens_used=tokens,
+        success=success,
+        latency_ms=latency_ms,
+    )
+
+
+@pytest.mark.asyncio
+async def test_running_writer_batches_off_the_request_session(sessions):
+    buffer = AgentLogBuffer(capacity=100, batch_size=3, flush_interval=60, session_factory=sessions)
+    request_db = MagicMock()
+    business_id = str(uuid4())
+
+    with patch.object(observability_logger, "log_buffer", buffer):
+        buffer.start()
+        try:
+            for _ in range(2):
+                _step(request_db, business_id)
+            await asyncio.sleep(0.05)
+            assert _count(sessions) == 0 and len(buffer) == 2
+
+            _step(request_db, business_id)  # third row completes a batch
+            for _ in range(50):
+                if _count(sessions) == 3:
+                    break
+                await asyncio.sleep(0.02)
+            assert _count(sessions) == 3
+
+            _step(request_db, business_id)
+        finally:
+            await buffer.stop()  # flushes the partial batch
+
+    request_db.add.assert_not_called()
+    request_db.flush.assert_not_called()
+    assert _count(sessions) == 4
+    assert buffer.stats()["written"] == 4
+
+
+def test_without_writer_steps_use_the_request_session():
+    db = MagicMock()
+    _step(db, str(uuid4()))
+    db.add.assert_called_once()
+    db.flush.assert_called_once()
+
+
+def test_buffer_is_bounded():
+    buffer = AgentLogBuffer(capacity=3, batch_size=10)
+    for i in range(5):
+        buffer.put({"step_number": i})
+    assert len(buffer) == 3
+    assert buffer.dropped == 2
+    assert [row["step_number"] for row in buffer._take()] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_database_failure_is_absorbed():
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    buffer = AgentLogBuffer(capacity=100, batch_size=2, session_factory=broken_session)
+    for i in range(5):
+        buffer.put({"step_number": i})
+
+    assert await buffer.flush() == 0
+    assert buffer.failed_batches == 3
+    assert len(buffer) == 0
+
+
+def test_counters_per_business(monkeypatch):
+    monkeypatch.setattr(observability_logger.settings, "LLM_COST_PER_1K_TOKENS", 0.5)
+    counters = AgentStepCounters()
+    monkeypatch.setattr(observability_logger, "step_counters", counters)
+    shop, cafe = str(uuid4()), str(uuid4())
+
+    _step(MagicMock(), shop, tokens=1000, latency_ms=120)
+    _step(MagicMock(), shop, tokens=500, success=False)
+    _step(MagicMock(), cafe, tokens=100, latency_ms=40)
+    _step(MagicMock(), "not-a-uuid", tokens=999)
+
+    shop_totals = counters.snapshot(shop)
+    assert shop_totals["steps"] == 2
+    assert shop_totals["tokens"] == 1500
+    assert shop_totals["failures"] == 1
+    assert shop_totals["cost_usd"] == 0.75
+    assert shop_totals["latency_ms"]["count"] == 1
+
+    overall = counters.snapshot()
+    assert overall["steps"] == 3 and overall["tokens"] == 1600
@@ -0,0 +1,135 @@
+"""
+test_orchestrator_parallel_tools.py
+
+Read-only tool calls returned in one LLM turn run concurrently, each on its
+own DB session, while the tool messages fed back to the LLM keep the order
+of the original calls. Mutating and HITL tools still run one at a time.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.agents.constants import ActionType
+from app.agents.orchestrator import Orchestrator
+from app.agents.tool_registry import ToolDefinition, registry
+from app.core.ai_models import LLMResponse
+from app.models.user_settings import AIDataSharingLevel
+
+TOOL_SECONDS = 0.2
+
+
+def _slow_tool(name, sessions, read_only=True):
+    async def handler(db, user, **kwargs):
+        sessions.append((name, db))
+        await asyncio.to_thread(time.sleep, TOOL_SECONDS)
+        return {"tool": name}
+    return ToolDefinition(
+        name=name, description=name, parameters={}, handler=handler,
+        action_type=ActionType.HOTL, read_only=read_only,
+    )
+
+
+@pytest.fixture
+def tools():
+    sessions = []
+    defs = {
+        "read_a": _slow_tool("read_a", sessions),
+        "read_b": _slow_tool("read_b", sessions),
+        "read_c": _slow_tool("read_c", sessions),
+        "write_x": _slow_tool("write_x", sessions, read_only=False),
+    }
+    with patch.dict(registry._tools, defs):
+        yield sessions
+
+
+def _turn(*names):
+    return LLMResponse(
+        content="", model_used="m", finish_reason="tool_calls", usage={"total_tokens": 1},
+        tool_calls=[{"id": f"call_{i}", "name": n, "arguments": {}} for i, n in enumerate(names)],
+    )
+
+
+async def _run(orchestrator, *names):
+    final = LLMResponse(content="done", model_used="m", finish_reason="stop", usage={"total_tokens": 1})
+    llm = AsyncMock(side_effect=[_turn(*names), final])
+    with patch("app.agents.orchestrator.execute_task", new=llm), \
+            patch("app.agents.orchestrator.get_cached_prompt", new=AsyncMock(return_value="system prompt")), \
+            patch("app.agents.orchestrator.log_agent_step"):
+        started = time.perf_counter()
+        result = await orchestrator.run_task(
+            agent_name="chat_agent",
+            user=MagicMock(id=uuid4()),
+            user_message="status?",
+            session_id=str(uuid4()),
+            chat_history=[],
+            sharing_level=AIDataSharingLevel.FULL_BUSINESS,
+            business_id=str(uuid4()),
+        )
+        elapsed = time.perf_counter() - started
+    return result, elapsed, llm.call_args_list[1].kwargs["messages"]
+
+
+def test_registry_classifies_read_only_tools():
+    assert registry.is_read_only("get_daily_sales")
+    assert registry.is_read_only("get_low_stock_items")
+    # Recomputes and stores metrics before returning them
+    assert not registry.is_read_only("get_customer_metrics")
+    assert not registry.is_read_only("create_order_draft")
+    assert not registry.is_read_only("missing_tool")
+    for name in registry.all_names():
+        if registry.is_read_only(name):
+            assert registry.get(name).action_type == ActionType.HOTL
+
+
+def test_batches_split_around_mutating_calls():
+    with patch.dict(registry._tools, {"write_x": _slow_tool("write_x", [], read_only=False)}):
+        batches = Orchestrator._batch_tool_calls([
+            {"id": "1", "name": "get_daily_sales", "arguments": None},
+            {"id": "2", "name": "get_low_stock_items", "arguments": {}},
+            {"id": "3", "name": "write_x", "arguments": {}},
+            {"id": "4", "name": "get_orders", "arguments": {}},
+        ])
+    assert [[c["id"] for c in b] for b in batches] == [["1", "2"], ["3"], ["4"]]
+    assert batches[0][0]["arguments"] == {}
+
+
+@pytest.mark.asyncio
+async def test_read_only_calls_run_concurrently_on_own_sessions(tools):
+    db = MagicMock()
+    extra_sessions = []
+
+    def factory():
+        session = MagicMock()
+        extra_sessions.append(session)
+        return session
+
+    result, elapsed, messages = await _run(Orchestrator(db, session_factory=factory), "read_a", "read_b", "read_c")
+
+    assert result["type"] == "response"
+    assert elapsed < TOOL_SECONDS * 2
+    used = {name: session for name, session in tools}
+    assert len(set(map(id, used.values()))) == 3 and db not in used.values()
+    assert all(s.close.called for s in extra_sessions)
+
+    tool_messages = [m for m in messages if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_messages] == ["call_0", "call_1", "call_2"]
+    assert [json.loads(m["content"])["tool"] for m in tool_messages] == ["read_a", "read_b", "read_c"]
+
+
+@pytest.mark.asyncio
+async def test_mutating_call_runs_alone_on_request_session(tools):
+    db = MagicMock()
+    result, elapsed, _ = await _run(
+        Orchestrator(db, session_factory=MagicMock), "read_a", "read_b", "write_x", "read_c"
+    )
+
+    assert result["type"] == "response"
+    # read_a+read_b together, then write_x, then read_c
+    assert TOOL_SECONDS * 3 <= elapsed < TOOL_SECONDS * 4
+    assert dict(tools)["write_x"] is db
+    assert dict(tools)["read_c"] is db
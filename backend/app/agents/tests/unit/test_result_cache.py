@@ -0,0 +1,160 @@
+"""
+Unit tests for the agent result caches.
+
+Tests that:
+- Tool results are keyed by business, tool and normalized arguments
+- A data version bump (mutating tool) invalidates a business's results
+- The orchestrator serves repeated read-only calls from the cache
+- Intents are cached by normalized text and the keyword fast path skips the LLM
+- Hit rates and savings are reported
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.agents.constants import ActionType
+from app.agents.intent_classifier import classify_intent
+from app.agents.lib import result_cache
+from app.agents.lib.result_cache import (
+    bump_data_version,
+    cache_stats,
+    cache_tool_result,
+    get_tool_result,
+    normalize_args,
+    normalize_message,
+)
+from app.agents.orchestrator import Orchestrator
+from app.agents.tasks.chat_agent import _classify_intent
+from app.agents.tool_registry import ToolDefinition, registry
+from app.core.ai_models import LLMResponse
+from app.models.user_settings import AIDataSharingLevel
+
+
+@pytest.fixture
+def fake_redis(fake_redis_store):
+    fake_manager, store = fake_redis_store
+    result_cache.reset_cache_stats()
+    with patch("app.agents.lib.result_cache.redis_manager", fake_manager), \
+            patch("app.agents.orchestrator.redis_manager", fake_manager):
+        yield store
+    result_cache.reset_cache_stats()
+
+
+def test_normalization():
+    assert normalize_args({"b": " x ", "a": 1, "c": None}) == normalize_args({"a": 1, "b": "x"})
+    assert normalize_message("  What were   SALES yesterday?? ") == "what were sales yesterday"
+
+
+@pytest.mark.asyncio
+async def test_tool_results_are_scoped_and_invalidated(fake_redis):
+    await cache_tool_result("biz-1", "get_daily_sales", {"target_date": "2026-10-17"}, {"total": 10}, 80)
+
+    assert await get_tool_result("biz-1", "get_daily_sales", {"target_date": " 2026-10-17"}) == {"total": 10}
+    assert await get_tool_result("biz-2", "get_daily_sales", {"target_date": "2026-10-17"}) is None
+    assert await get_tool_result("biz-1", "get_daily_sales", {"target_date": "2026-10-16"}) is None
+
+    await bump_data_version("biz-1")
+    assert await get_tool_result("biz-1", "get_daily_sales", {"target_date": "2026-10-17"}) is None
+
+    stats = cache_stats()["tool_results"]
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["ms_saved"] == 80
+
+
+@pytest.mark.asyncio
+async def test_error_results_are_not_cached(fake_redis):
+    await cache_tool_result("biz-1", "get_orders", {}, {"error": "boom"})
+    assert await get_tool_result("biz-1", "get_orders", {}) is None
+
+
+def _tool(name, handler, read_only):
+    return ToolDefinition(
+        name=name, description=name, parameters={}, handler=handler,
+        action_type=ActionType.HOTL, read_only=read_only,
+    )
+
+
+async def _run_turns(orchestrator, user, *turns):
+    final = LLMResponse(content="done", model_used="m", finish_reason="stop", usage={"total_tokens": 1})
+    responses = []
+    for names in turns:
+        responses.append(LLMResponse(
+            content="", model_used="m", finish_reason="tool_calls", usage={"total_tokens": 1},
+            tool_calls=[{"id": f"c{i}", "name": n, "arguments": {}} for i, n in enumerate(names)],
+        ))
+    responses.append(final)
+    with patch("app.agents.orchestrator.execute_task", new=AsyncMock(side_effect=responses)), \
+            patch("app.agents.orchestrator.get_cached_prompt", new=AsyncMock(return_value="system prompt")), \
+            patch("app.agents.orchestrator.get_business_id_for_user", return_value="biz-1"), \
+            patch("app.agents.orchestrator.log_agent_step"):
+        return await orchestrator.run_task(
+            agent_name="chat_agent",
+            user=user,
+            user_message="sales?",
+            session_id=str(uuid4()),
+            chat_history=[],
+            sharing_level=AIDataSharingLevel.FULL_BUSINESS,
+            business_id="biz-1",
+        )
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_reuses_results_until_a_write(fake_redis):
+    reads = AsyncMock(return_value={"total": 5})
+    writes = AsyncMock(return_value={"ok": True})
+    tools = {"read_sales": _tool("read_sales", reads, True), "write_note": _tool("write_note", writes, False)}
+    user = MagicMock(id=uuid4())
+
+    with patch.dict(registry._tools, tools):
+        orchestrator = Orchestrator(MagicMock())
+        await _run_turns(orchestrator, user, ["read_sales"], ["read_sales"])
+        assert reads.await_count == 1
+
+        await _run_turns(orchestrator, user, ["write_note"], ["read_sales"])
+        assert writes.await_count == 1
+        assert reads.await_count == 2
+
+    assert cache_stats()["tool_results"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_caching_without_redis():
+    reads = AsyncMock(return_value={"total": 5})
+    with patch.dict(registry._tools, {"read_sales": _tool("read_sales", reads, True)}):
+        await _run_turns(Orchestrator(MagicMock()), MagicMock(id=uuid4()), ["read_sales"], ["read_sales"])
+    assert reads.await_count == 2
+
+
+def test_keyword_confidence():
+    assert classify_intent("hello", {}).confidence == 1.0
+    assert classify_intent("what were sales yesterday", {}).confidence == 1.0
+    # Two specialists match (decision + report): not conclusive
+    assert classify_intent("analyse my revenue trends", {}).confidence == 0.5
+    assert classify_intent("how do I get started", {}).confidence == 0.0
+
+
+@pytest.mark.asyncio
+async def test_confident_keywords_skip_the_llm(fake_redis):
+    llm = AsyncMock()
+    with patch("app.agents.tasks.chat_agent.execute_fast_task", new=llm):
+        assert await _classify_intent("What were sales yesterday?", []) == "report_agent"
+    llm.assert_not_awaited()
+    assert cache_stats()["intent_fast_path"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_routing_is_cached_by_normalized_text(fake_redis):
+    response = LLMResponse(
+        content="decision_agent, report_agent", model_used="m", finish_reason="stop", usage={"total_tokens": 120},
+    )
+    llm = AsyncMock(return_value=response)
+    with patch("app.agents.tasks.chat_agent.execute_fast_task", new=llm):
+        first = await _classify_intent("Analyse my revenue trends", [])
+        second = await _classify_intent("  analyse my revenue TRENDS? ", [])
+
+    assert first == second == ["decision_agent", "report_agent"]
+    assert llm.await_count == 1
+    stats = cache_stats()["intent"]
+    assert stats["hits"] == 1 and stats["tokens_saved"] == 120
@@ -0,0 +1,185 @@
+"""
+Unit tests for token-budgeted session memory.
+
+Tests that:
+- Messages are appended to a list with token counts; oversized ones are cut
+- Concurrent appends to one session never lose messages
+- History returns the running summary plus the newest messages in budget
+- Compaction summarizes the oldest turns, trims them and keeps the summary
+- A summarizer failure still trims (bounded prompts) and keeps the old summary
+- Only one compaction runs per session at a time; one that outlives its
+  lock trims nothing and leaves the new holder's lock alone
+- A slow summarizer is cut off inside the lock TTL
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.agents.constants import RedisTTL, SessionMemory
+from app.agents.lib import session_memory
+from app.agents.lib.session_memory import (
+    _list_key,
+    _lock_key,
+    _summary_key,
+    append_messages,
+    compact_session,
+    estimate_tokens,
+    get_history,
+)
+
+
+def _message(i: int, tokens: int = 100) -> dict:
+    role = "user" if i % 2 == 0 else "assistant"
+    return {"role": role, "content": f"m{i:03d}".ljust(tokens * 4, ".")}
+
+
+@pytest.fixture
+def summarizer(mock_llm_response):
+    with patch(
+        "app.core.ai_models.execute_summarization_task",
+        new_callable=AsyncMock,
+        return_value=mock_llm_response(content="Owner asked about stock levels."),
+    ) as mock:
+        yield mock
+
+
+@pytest.mark.asyncio
+async def test_append_and_read_back(patch_redis_manager):
+    await append_messages("u1", "s1", {"role": "user", "content": "hello"}, {"role": "assistant", "content": "hi"})
+    assert await get_history("u1", "s1") == [
+        {"role": "user", "content": "hello"},
+        {"role": "assistant", "content": "hi"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_oversized_message_is_truncated(patch_redis_manager, fake_redis_store):
+    _, store = fake_redis_store
+    await append_messages("u1", "s1", {"role": "assistant", "content": "x" * 100_000})
+    (stored,) = await get_history("u1", "s1")
+    assert stored["content"].endswith("[truncated]")
+    assert estimate_tokens(stored["content"]) <= SessionMemory.MAX_MESSAGE_TOKENS + 10
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_are_not_lost(patch_redis_manager):
+    await asyncio.gather(*(
+        append_messages("u1", "s1", {"role": "user", "content": f"msg {i}"}) for i in range(20)
+    ))
+    history = await get_history("u1", "s1")
+    assert sorted(m["content"] for m in history) == sorted(f"msg {i}" for i in range(20))
+
+
+@pytest.mark.asyncio
+async def test_history_respects_budget_and_prepends_summary(patch_redis_manager, fake_redis_store):
+    _, store = fake_redis_store
+    store[_summary_key("u1", "s1")] = "Earlier: discussed suppliers."
+    for i in range(10):
+        await patch_redis_manager.rpush(_list_key("u1", "s1"), session_memory._encode(_message(i)))
+
+    history = await get_history("u1", "s1", budget=350)
+    assert history[0]["role"] == "system"
+    assert "discussed suppliers" in history[0]["content"]
+    assert [m["content"][:4] for m in history[1:]] == ["m007", "m008", "m009"]
+
+
+@pytest.mark.asyncio
+async def test_compaction_summarizes_and_trims_oldest(patch_redis_manager, fake_redis_store, summarizer):
+    _, store = fake_redis_store
+    store[_summary_key("u1", "s1")] = "Previous summary."
+    count = SessionMemory.HISTORY_TOKEN_BUDGET // 100 + 5
+    for i in range(count):
+        await patch_redis_manager.rpush(_list_key("u1", "s1"), session_memory._encode(_message(i)))
+
+    assert await compact_session("u1", "s1") is True
+
+    remaining = session_memory._decode(store[_list_key("u1", "s1")])
+    assert sum(e["tokens"] for e in remaining) <= SessionMemory.COMPACT_TARGET_TOKENS
+    assert remaining[-1]["content"].startswith(f"m{count - 1:03d}")
+    assert store[_summary_key("u1", "s1")] == "Owner asked about stock levels."
+
+    prompt = summarizer.call_args.kwargs["messages"][1]["content"]
+    assert "Previous summary." in prompt and "m000" in prompt
+    assert f"m{count - 1:03d}" not in prompt
+    assert _lock_key("u1", "s1") not in store
+
+
+@pytest.mark.asyncio
+async def test_summarizer_failure_still_trims(patch_redis_manager, fake_redis_store):
+    _, store = fake_redis_store
+    store[_summary_key("u1", "s1")] = "Previous summary."
+    for i in range(SessionMemory.HISTORY_TOKEN_BUDGET // 100 + 5):
+        await patch_redis_manager.rpush(_list_key("u1", "s1"), session_memory._encode(_message(i)))
+
+    with patch("app.core.ai_models.execute_summarization_task", new_callable=AsyncMock, side_effect=RuntimeError("down")):
+        assert await compact_session("u1", "s1") is True
+
+    remaining = session_memory._decode(store[_list_key("u1", "s1")])
+    assert sum(e["tokens"] for e in remaining) <= SessionMemory.COMPACT_TARGET_TOKENS
+    assert store[_summary_key("u1", "s1")] == "Previous summary."
+
+
+@pytest.mark.asyncio
+async def test_compaction_is_single_flight(patch_redis_manager, fake_redis_store, summarizer):
+    _, store = fake_redis_store
+    store[_lock_key("u1", "s1")] = "1"
+    for i in range(SessionMemory.HISTORY_TOKEN_BUDGET // 100 + 5):
+        await patch_redis_manager.rpush(_list_key("u1", "s1"), session_memory._encode(_message(i)))
+
+    assert await compact_session("u1", "s1") is False
+    summarizer.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_compaction_that_lost_its_lock_trims_nothing(patch_redis_manager, fake_redis_store, mock_llm_response):
+    _, store = fake_redis_store
+    store[_summary_key("u1", "s1")] = "Previous summary."
+    for i in range(SessionMemory.HISTORY_TOKEN_BUDGET // 100 + 5):
+        await patch_redis_manager.rpush(_list_key("u1", "s1"), session_memory._encode(_message(i)))
+    before = list(store[_list_key("u1", "s1")])
+
+    async def slow_summary(**kwargs):
+        # The lock expires and another compaction takes it meanwhile
+        store[_lock_key("u1", "s1")] = "other-token"
+        return mock_llm_response(content="Stale summary.")
+
+    with patch("app.core.ai_models.execute_summarization_task", side_effect=slow_summary):
+        assert await compact_session("u1", "s1") is False
+
+    assert store[_list_key("u1", "s1")] == before
+    assert store[_summary_key("u1", "s1")] == "Previous summary."
+    assert store[_lock_key("u1", "s1")] == "other-token"
+
+
+@pytest.mark.asyncio
+async def test_slow_summarizer_times_out_inside_the_lock(patch_redis_manager, fake_redis_store, monkeypatch):
+    _, store = fake_redis_store
+    assert SessionMemory.SUMMARY_TIMEOUT_SECONDS < RedisTTL.MEMORY_COMPACT_LOCK
+    monkeypatch.setattr(SessionMemory, "SUMMARY_TIMEOUT_SECONDS", 0.01)
+    for i in range(SessionMemory.HISTORY_TOKEN_BUDGET // 100 + 5):
+        await patch_redis_manager.rpush(_list_key("u1", "s1"), session_memory._encode(_message(i)))
+
+    async def hang(**kwargs):
+        await asyncio.sleep(60)
+
+    with patch("app.core.ai_models.execute_summarization_task", side_effect=hang):
+        assert await asyncio.wait_for(compact_session("u1", "s1"), 5) is True
+
+    remaining = session_memory._decode(store[_list_key("u1", "s1")])
+    assert sum(e["tokens"] for e in remaining) <= SessionMemory.COMPACT_TARGET_TOKENS
+    assert _lock_key("u1", "s1") not in store
+
+
+@pytest.mark.asyncio
+async def test_append_over_budget_compacts_in_background(patch_redis_manager, fake_redis_store, summarizer):
+    _, store = fake_redis_store
+    for i in range(SessionMemory.HISTORY_TOKEN_BUDGET // 100 + 1):
+        await append_messages("u1", "s1", _message(i))
+    await asyncio.gather(*list(session_memory._background))
+
+    summarizer.assert_awaited_once()
+    history = await get_history("u1", "s1")
+    assert history[0]["content"].endswith("Owner asked about stock levels.")
+    assert sum(estimate_tokens(m["content"]) for m in history[1:]) <= SessionMemory.COMPACT_TARGET_TOKENS
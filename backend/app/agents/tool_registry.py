@@ -8,6 +8,8 @@ and risk level before any agent can use it.
 To add a new tool:
   1. Write the handler function in /tools/[domain]_tools.py
   2. Add a ToolDefinition entry at the bottom of this file
+     (set read_only=True if it only reads — the orchestrator may then run
+     it concurrently with other read-only calls from the same LLM turn)
   3. Nothing else needed — the agent registry references tools by name
 """
 
@@ -103,6 +105,7 @@ class ToolDefinition:
         action_type: str = ActionType.HOTL,
         risk_level: str = RiskLevel.LOW,
         hitl_description: str = "",
+        read_only: bool = False,
     ) -> None:
         self.name = name
         self.description = description
@@ -112,6 +115,8 @@ class ToolDefinition:
         self.risk_level = risk_level
         # Human-readable description shown in the HITL approval prompt
         self.hitl_description = hitl_description
+        # Pure lookups: safe to run concurrently, each on its own DB session
+        self.read_only = read_only
 
     def to_openai_format(self) -> Dict[str, Any]:
         """Convert to the OpenAI function-calling schema Groq expects."""
@@ -155,6 +160,11 @@ class ToolRegistry:
                 result.append(tool.to_openai_format())
         return result
 
+    def is_read_only(self, name: str) -> bool:
+        """True if the named tool only reads data and needs no approval."""
+        tool = self._tools.get(name)
+        return bool(tool and tool.read_only and tool.action_type == ActionType.HOTL)
+
     def all_names(self) -> List[str]:
         """Return all registered tool names (useful for debugging)."""
         return list(self._tools.keys())
@@ -175,6 +185,7 @@ registry.register(ToolDefinition(
     handler=get_daily_sales,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 # === Order tools ===
@@ -187,6 +198,7 @@ registry.register(ToolDefinition(
     handler=get_orders,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -198,6 +210,7 @@ registry.register(ToolDefinition(
     handler=get_order,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -246,6 +259,7 @@ registry.register(ToolDefinition(
     handler=get_inventory_summary,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -257,6 +271,7 @@ registry.register(ToolDefinition(
     handler=get_low_stock_items,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -280,6 +295,7 @@ registry.register(ToolDefinition(
     handler=get_inventory_value,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -291,6 +307,7 @@ registry.register(ToolDefinition(
     handler=get_reorder_suggestions,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 # === Metrics / reporting tools ===
@@ -303,6 +320,7 @@ registry.register(ToolDefinition(
     handler=get_weekly_report,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -315,6 +333,7 @@ registry.register(ToolDefinition(
     handler=get_monthly_report,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -328,6 +347,7 @@ registry.register(ToolDefinition(
     handler=get_product_performance,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -337,6 +357,7 @@ registry.register(ToolDefinition(
     handler=get_dashboard_kpis,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 # === Customer tools ===
@@ -349,6 +370,7 @@ registry.register(ToolDefinition(
     handler=get_customers,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -360,6 +382,7 @@ registry.register(ToolDefinition(
     handler=get_top_customers,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -372,6 +395,7 @@ registry.register(ToolDefinition(
     handler=search_customers,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -413,6 +437,7 @@ registry.register(ToolDefinition(
     handler=get_suppliers,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 # === Invoice tools ===
@@ -423,6 +448,7 @@ registry.register(ToolDefinition(
     handler=get_invoice_stats,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -435,6 +461,7 @@ registry.register(ToolDefinition(
     handler=get_invoices,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -446,6 +473,7 @@ registry.register(ToolDefinition(
     handler=get_overdue_invoices,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -517,6 +545,7 @@ registry.register(ToolDefinition(
     handler=get_custom_report,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 # === Staff tools ===
@@ -530,6 +559,7 @@ registry.register(ToolDefinition(
     handler=get_staff_summary,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -543,6 +573,7 @@ registry.register(ToolDefinition(
     handler=get_time_entries,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 # === Email tools ===
@@ -623,6 +654,7 @@ registry.register(ToolDefinition(
     handler=get_gl_accounts,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -634,6 +666,7 @@ registry.register(ToolDefinition(
     handler=get_gl_balance,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -658,6 +691,7 @@ registry.register(ToolDefinition(
     handler=get_petty_cash_balance,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -684,6 +718,7 @@ registry.register(ToolDefinition(
     handler=get_expense_summary,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -709,6 +744,7 @@ registry.register(ToolDefinition(
     handler=list_segments,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -756,6 +792,7 @@ registry.register(ToolDefinition(
     handler=get_register_status,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -768,6 +805,7 @@ registry.register(ToolDefinition(
     handler=get_cashup_summary,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -779,6 +817,7 @@ registry.register(ToolDefinition(
     handler=get_shift_summary,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 # === Layby tools ===
@@ -792,6 +831,7 @@ registry.register(ToolDefinition(
     handler=get_laybys,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -803,6 +843,7 @@ registry.register(ToolDefinition(
     handler=get_layby_details,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
 
 registry.register(ToolDefinition(
@@ -843,4 +884,5 @@ registry.register(ToolDefinition(
     handler=get_overdue_laybys,
     action_type=ActionType.HOTL,
     risk_level=RiskLevel.LOW,
+    read_only=True,
 ))
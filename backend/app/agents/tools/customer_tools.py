@@ -23,19 +23,12 @@ async def get_customers(
         return {"error": "No business found for user"}
 
     svc = CustomerService(db)
-    # CustomerService.get_customers returns (List[Customer], int) using page/per_page
-    result = await asyncio.to_thread(
+    page = await asyncio.to_thread(
         svc.get_customers, business_id=business_id, per_page=int(limit)
     )
-    # Handle both (list, total) tuple and plain list return shapes
-    if isinstance(result, tuple):
-        customers, total = result
-    else:
-        customers = result or []
-        total = len(customers)
 
     return {
-        "total": total,
+        "total": page.total,
         "customers": [
             {
                 "id": str(c.id),
@@ -44,7 +37,7 @@ async def get_customers(
                 "total_orders": int(c.total_orders or 0),
                 "total_spent": float(c.total_spent or 0),
             }
-            for c in customers
+            for c in page.items
         ],
     }
 
@@ -88,8 +81,8 @@ async def search_customers(
         )
     except AttributeError:
         # Fallback: filter from full list if search method doesn't exist
-        raw = await asyncio.to_thread(svc.get_customers, business_id=business_id, per_page=100)
-        all_customers = raw[0] if isinstance(raw, tuple) else (raw or [])
+        page = await asyncio.to_thread(svc.get_customers, business_id=business_id, per_page=100)
+        all_customers = page.items
         q = query.lower()
         customers = [
             c for c in all_customers
@@ -38,14 +38,14 @@ async def get_invoices(
 
     svc = InvoiceService(db)
     # Build filter kwargs — status filter is optional
-    filter_kwargs: Dict[str, Any] = {"business_id": business_id, "limit": limit}
+    filter_kwargs: Dict[str, Any] = {"business_id": business_id, "per_page": int(limit)}
     if status:
         filter_kwargs["status"] = status
 
-    invoices = await asyncio.to_thread(svc.get_invoices, **filter_kwargs)
+    page = await asyncio.to_thread(svc.get_invoices, **filter_kwargs)
 
     return {
-        "total": len(invoices),
+        "total": page.total,
         "invoices": [
             {
                 "id": str(inv.id),
@@ -55,7 +55,7 @@ async def get_invoices(
                 "amount_paid": float(getattr(inv, "amount_paid", 0) or 0),
                 "created_at": inv.created_at.isoformat() if inv.created_at else None,
             }
-            for inv in invoices
+            for inv in page.items
         ],
     }
 
@@ -76,7 +76,8 @@ async def get_overdue_invoices(
     except AttributeError:
         # Fallback: get all invoices and filter overdue
         from datetime import datetime, timezone
-        all_invoices = await asyncio.to_thread(svc.get_invoices, business_id=business_id, limit=100)
+        page = await asyncio.to_thread(svc.get_invoices, business_id=business_id, per_page=100)
+        all_invoices = page.items
         now = datetime.now(timezone.utc)
         invoices = [
             inv for inv in all_invoices
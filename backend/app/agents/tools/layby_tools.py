@@ -30,14 +30,14 @@ async def get_laybys(
         from app.services.layby_service import LaybyService
 
         svc = LaybyService(db)
-        laybys, total = await asyncio.to_thread(
+        page = await asyncio.to_thread(
             svc.list_laybys,
             business_id=UUID(business_id),
             status=status,
             per_page=limit,
         )
         return {
-            "total": total,
+            "total": page.total,
             "laybys": [
                 {
                     "id": str(lb.id),
@@ -48,7 +48,7 @@ async def get_laybys(
                     "balance_remaining": float(lb.balance_remaining or 0),
                     "status": lb.status,
                 }
-                for lb in laybys
+                for lb in page.items
             ],
         }
     except Exception as e:
@@ -187,14 +187,14 @@ async def get_overdue_laybys(
         from app.services.layby_service import LaybyService
 
         svc = LaybyService(db)
-        laybys, total = await asyncio.to_thread(
+        page = await asyncio.to_thread(
             svc.list_laybys,
             business_id=UUID(business_id),
             status="overdue",
             per_page=limit,
         )
         return {
-            "total": total,
+            "total": page.total,
             "overdue_laybys": [
                 {
                     "id": str(lb.id),
@@ -203,7 +203,7 @@ async def get_overdue_laybys(
                     "balance_remaining": float(lb.balance_remaining or 0),
                     "status": lb.status,
                 }
-                for lb in laybys
+                for lb in page.items
             ],
         }
     except Exception as e:
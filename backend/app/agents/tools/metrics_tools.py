@@ -79,4 +79,4 @@ async def get_dashboard_kpis(db: Session, user: User) -> Dict[str, Any]:
     from app.services.ai_context_service import AIContextService
     ai_svc = AIContextService(db)
     # Reuse the existing business context builder — it already has all KPIs
-    return await asyncio.to_thread(ai_svc.build_business_context, user, AIDataSharingLevel.METRICS_ONLY)
+    return await ai_svc.get_business_context(user, AIDataSharingLevel.METRICS_ONLY)
@@ -24,7 +24,7 @@ async def get_orders(
         return {"error": "No business found for user"}
 
     svc = OrderService(db)
-    orders = await asyncio.to_thread(svc.get_orders, business_id=business_id, limit=int(limit))
+    page = await asyncio.to_thread(svc.get_orders, business_id=business_id, per_page=int(limit))
 
     return {
         "orders": [
@@ -35,7 +35,7 @@ async def get_orders(
                 "total": float(o.total or 0),
                 "created_at": o.created_at.isoformat() if o.created_at else None,
             }
-            for o in (orders if isinstance(orders, list) else [])
+            for o in page.items
         ]
     }
 
@@ -82,9 +82,9 @@ async def create_order_draft(
     # Resolve supplier
     from app.services.supplier_service import SupplierService
     sup_svc = SupplierService(db)
-    suppliers = await asyncio.to_thread(sup_svc.get_suppliers, business_id=business_id)
+    suppliers = await asyncio.to_thread(sup_svc.get_suppliers, business_id=business_id, per_page=100)
     supplier = next(
-        (s for s in suppliers if supplier_name.lower() in s.name.lower()), None
+        (s for s in suppliers.items if supplier_name.lower() in s.name.lower()), None
     )
     if not supplier:
         return {"error": f"Supplier '{supplier_name}' not found. Check the supplier list."}
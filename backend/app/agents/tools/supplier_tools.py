@@ -23,10 +23,10 @@ async def get_suppliers(
         return {"error": "No business found for user"}
 
     svc = SupplierService(db)
-    suppliers = await asyncio.to_thread(svc.get_suppliers, business_id=business_id)
+    page = await asyncio.to_thread(svc.get_suppliers, business_id=business_id, per_page=int(limit))
 
     return {
-        "total": len(suppliers),
+        "total": page.total,
         "suppliers": [
             {
                 "id": str(s.id),
@@ -35,6 +35,6 @@ async def get_suppliers(
                 "phone": s.phone,
                 "payment_terms": getattr(s, "payment_terms", None),
             }
-            for s in suppliers[:limit]
+            for s in page.items
         ],
     }
@@ -1,182 +1,133 @@
-"""API routers module."""
+"""
+API routers module.
 
-from fastapi import APIRouter
+``ROUTERS`` lists the router modules (``app.api.<name>.router``) in the
+order they are matched.  ``include_routers`` includes each one straight into
+the application: routes are copied once, instead of once into an aggregate
+router and again into the app, which was a large share of startup time.
 
-from app.api.agents import router as agents_router
-from app.api.auth import router as auth_router
-from app.api.oauth import router as oauth_router
-from app.api.business import router as business_router
-from app.api.users import router as users_router
-from app.api.products import router as products_router
-from app.api.customers import router as customers_router
-from app.api.suppliers import router as suppliers_router
-from app.api.orders import router as orders_router
-from app.api.invoices import router as invoices_router
-from app.api.inventory import router as inventory_router
-from app.api.dashboard import router as dashboard_router
-from app.api.reports import router as reports_router
-from app.api.categories import router as categories_router
-from app.api.admin import router as admin_router
-from app.api.subscriptions import router as subscriptions_router
-from app.api.payments_subscription import router as payments_subscription_router
-from app.api.production import router as production_router
-from app.api.time_entries import router as time_entries_router
-from app.api.pos_connections import router as pos_connections_router
-from app.api.roles import router as roles_router
-from app.api.sessions import router as sessions_router
-from app.api.notifications import router as notifications_router
-from app.api.favorites import router as favorites_router
-from app.api.scheduler import router as scheduler_router
-from app.api.departments import router as departments_router
-from app.api.contact import router as contact_router
-from app.api.permissions import router as permissions_router
-from app.api.admin_subscriptions import router as admin_subscriptions_router
-from app.api.admin_audit_logs import router as admin_audit_logs_router
-from app.api.mobile_sync import router as mobile_sync_router
-from app.api.laybys import router as laybys_router
-from app.api.customer_accounts import router as customer_accounts_router
-from app.api.tables import router as tables_router
-from app.api.order_management import router as order_management_router
-from app.api.petty_cash import router as petty_cash_router
-from app.api.loyalty import router as loyalty_router
-from app.api.deliveries import router as deliveries_router
-from app.api.menu import router as menu_router
-from app.api.stock_takes import router as stock_takes_router
-from app.api.reorder import router as reorder_router
-from app.api.crm import router as crm_router
-from app.api.general_ledger import router as general_ledger_router
-from app.api.online_orders import router as online_orders_router
-from app.api.dashboards import router as custom_dashboards_router
-from app.api.bulk_operations import router as bulk_operations_router
-from app.api.addons import router as addons_router
-from app.api.modifiers import router as modifiers_router
-from app.api.combos import router as combos_router
-from app.api.locations import router as locations_router
-from app.api.audit import router as audit_router
-from app.api.tax import router as tax_router
-from app.api.shifts import router as shifts_router
-from app.api.cash_registers import router as cash_registers_router
-from app.api.expenses import router as expenses_router
-from app.api.gift_cards import router as gift_cards_router
-from app.api.quotes import router as quotes_router
-from app.api.reservations import router as reservations_router
-from app.api.staff_targets import router as staff_targets_router
-from app.api.payments import router as payments_router
-from app.api.tags import router as tags_router
-from app.api.delivery_tracking import router as delivery_tracking_router
-from app.api.customer_displays import router as customer_displays_router
-from app.api.signage import router as signage_router
-from app.api.partners import router as partners_router
-from app.api.pms import router as pms_router
-from app.api.xero import router as xero_router
-from app.api.woocommerce import router as woocommerce_router
-from app.api.sync import router as sync_router
-from app.api.entity_sync import router as entity_sync_router
-from app.api.inventory_periods import router as inventory_periods_router
-from app.api.rewards import router as rewards_router
-from app.api.commissions import router as commissions_router
-from app.api.inventory_reports import router as inventory_reports_router
-from app.api.extended_reports import router as extended_reports_router
-from app.api.sage import router as sage_router
-from app.api.pdf import router as pdf_router
-from app.api.webhooks import router as webhooks_router
-from app.api.two_factor import router as two_factor_router
-from app.api.collections import router as collections_router
-from app.api.ai import router as ai_router
-from app.api.stock_reports import router as stock_reports_router
+``router`` - the aggregate APIRouter the app used to include - is still
+available for callers that want one object; it is built on first access.
+"""
 
-router = APIRouter()
+import importlib
+from typing import Any, Dict, Tuple, Union
 
-# Agent system router (auth-protected via check_feature in each endpoint)
-router.include_router(agents_router)
+from fastapi import APIRouter, FastAPI
 
-# AI conversation persistence router
-router.include_router(ai_router)
+# (module name under app.api, include_router options)
+ROUTERS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    # Agent system router (auth-protected via check_feature in each endpoint)
+    ("agents", {}),
+    # AI conversation persistence router
+    ("ai", {}),
+    # Auth and everything else
+    ("auth", {}),
+    ("oauth", {}),
+    ("business", {}),
+    ("users", {}),
+    ("dashboard", {}),
+    ("products", {}),
+    ("customers", {}),
+    ("suppliers", {}),
+    ("orders", {}),
+    ("invoices", {}),
+    ("inventory", {}),
+    ("reports", {}),
+    ("categories", {}),
+    ("admin", {}),
+    ("subscriptions", {}),
+    ("payments_subscription", {}),
+    ("production", {}),
+    ("time_entries", {}),
+    ("pos_connections", {}),
+    ("roles", {}),
+    ("sessions", {}),
+    ("notifications", {}),
+    ("favorites", {}),
+    ("departments", {}),
+    ("contact", {}),
+    ("permissions", {}),
+    ("admin_subscriptions", {}),
+    ("admin_audit_logs", {}),
+    ("mobile_sync", {}),
+    ("laybys", {}),
+    ("customer_accounts", {}),
+    ("tables", {}),
+    ("order_management", {}),
+    ("petty_cash", {}),
+    ("loyalty", {}),
+    ("menu", {}),
+    ("stock_takes", {}),
+    ("deliveries", {}),
+    ("crm", {}),
+    ("reorder", {}),
+    ("general_ledger", {}),
+    ("dashboards", {}),
+    ("bulk_operations", {}),
+    ("online_orders", {}),
+    ("audit", {}),
+    ("locations", {}),
+    ("addons", {}),
+    ("modifiers", {}),
+    ("combos", {}),
+    ("shifts", {}),
+    ("tax", {}),
+    ("cash_registers", {}),
+    ("expenses", {}),
+    ("gift_cards", {}),
+    ("quotes", {}),
+    ("staff_targets", {}),
+    ("reservations", {}),
+    ("payments", {}),
+    ("tags", {}),
+    ("delivery_tracking", {}),
+    ("customer_displays", {}),
+    ("signage", {}),
+    ("partners", {}),
+    ("pms", {}),
+    ("xero", {}),
+    ("woocommerce", {}),
+    ("sync", {}),
+    ("entity_sync", {}),
+    ("inventory_periods", {}),
+    ("rewards", {}),
+    ("commissions", {}),
+    ("inventory_reports", {}),
+    ("extended_reports", {}),
+    ("sage", {}),
+    ("collections", {}),
+    ("stock_reports", {}),
+    ("pdf", {}),
+    ("webhooks", {}),
+    ("two_factor", {}),
+    ("realtime", {}),
+    ("scheduler", {"prefix": "/scheduler", "tags": ["scheduler"]}),
+)
 
-# Include auth routes
-router.include_router(auth_router)
-router.include_router(oauth_router)
-router.include_router(business_router)
-router.include_router(users_router)
-router.include_router(dashboard_router)
-router.include_router(products_router)
-router.include_router(customers_router)
-router.include_router(suppliers_router)
-router.include_router(orders_router)
-router.include_router(invoices_router)
-router.include_router(inventory_router)
-router.include_router(reports_router)
-router.include_router(categories_router)
-router.include_router(admin_router)
-router.include_router(subscriptions_router)
-router.include_router(payments_subscription_router)
-router.include_router(production_router)
-router.include_router(time_entries_router)
-router.include_router(pos_connections_router)
-router.include_router(roles_router)
-router.include_router(sessions_router)
-router.include_router(notifications_router)
-router.include_router(favorites_router)
-router.include_router(departments_router)
-router.include_router(contact_router)
-router.include_router(permissions_router)
-router.include_router(admin_subscriptions_router)
-router.include_router(admin_audit_logs_router)
-router.include_router(mobile_sync_router)
-router.include_router(laybys_router)
-router.include_router(customer_accounts_router)
-router.include_router(tables_router)
-router.include_router(order_management_router)
-router.include_router(petty_cash_router)
-router.include_router(loyalty_router)
-router.include_router(menu_router)
-router.include_router(stock_takes_router)
-router.include_router(deliveries_router)
-router.include_router(crm_router)
-router.include_router(reorder_router)
-router.include_router(general_ledger_router)
-router.include_router(custom_dashboards_router)
-router.include_router(bulk_operations_router)
-router.include_router(online_orders_router)
-router.include_router(audit_router)
-router.include_router(locations_router)
-router.include_router(addons_router)
-router.include_router(modifiers_router)
-router.include_router(combos_router)
-router.include_router(shifts_router)
-router.include_router(tax_router)
-router.include_router(cash_registers_router)
-router.include_router(expenses_router)
-router.include_router(gift_cards_router)
-router.include_router(quotes_router)
-router.include_router(staff_targets_router)
-router.include_router(reservations_router)
-router.include_router(payments_router)
-router.include_router(tags_router)
-router.include_router(delivery_tracking_router)
-router.include_router(customer_displays_router)
-router.include_router(signage_router)
-router.include_router(partners_router)
-router.include_router(pms_router)
-router.include_router(xero_router)
-router.include_router(woocommerce_router)
-router.include_router(sync_router)
-router.include_router(entity_sync_router)
-router.include_router(inventory_periods_router)
-router.include_router(rewards_router)
-router.include_router(commissions_router)
-router.include_router(inventory_reports_router)
-router.include_router(extended_reports_router)
-router.include_router(sage_router)
-router.include_router(collections_router)
-router.include_router(stock_reports_router)
-router.include_router(pdf_router)
-router.include_router(webhooks_router)
-router.include_router(two_factor_router)
-router.include_router(scheduler_router, prefix="/scheduler", tags=["scheduler"])
+root_router = APIRouter()
 
 
-@router.get("/")
+@root_router.get("/")
 async def api_root():
     """API root endpoint."""
     return {"message": "BizPilot API v1", "status": "operational"}
+
+
+def include_routers(target: Union[FastAPI, APIRouter], prefix: str = "") -> None:
+    """Import every API router module and include its router into *target* under *prefix*."""
+    # Import all first, so a failed import leaves *target* untouched and can be retried
+    modules = [(importlib.import_module(f"{__name__}.{name}"), options) for name, options in ROUTERS]
+    for module, options in modules:
+        options = dict(options)
+        target.include_router(module.router, prefix=prefix + options.pop("prefix", ""), **options)
+    target.include_router(root_router, prefix=prefix)
+
+
+def __getattr__(name: str) -> Any:
+    if name == "router":
+        aggregate = APIRouter()
+        include_routers(aggregate)
+        globals()["router"] = aggregate
+        return aggregate
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
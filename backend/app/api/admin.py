@@ -4,13 +4,14 @@ from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import joinedload
-from sqlalchemy import or_, func
+from sqlalchemy import func
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
 
 from app.core.database import get_sync_db
 from app.models.base import utc_now
 from app.core.admin import require_admin
+from app.core.search import contains
 from app.models.user import User, UserStatus, SubscriptionStatus
 from app.models.business_user import BusinessUser
 from app.models.subscription_tier import SubscriptionTier, DEFAULT_TIERS
@@ -199,13 +200,8 @@ async def list_users(
     query = db.query(User).filter(User.deleted_at.is_(None))
     
     if search:
-        search_term = f"%{search}%"
         query = query.filter(
-            or_(
-                User.email.ilike(search_term),
-                User.first_name.ilike(search_term),
-                User.last_name.ilike(search_term),
-            )
+            contains([User.email, User.first_name, User.last_name], search)
         )
     
     if status:
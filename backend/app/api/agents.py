@@ -6,16 +6,20 @@ All endpoints are auth-protected via get_current_active_user.
 
 Endpoints:
   POST /agents/chat           — Send a message; returns plan or response
+  POST /agents/chat/stream    — Same, streamed as Server-Sent Events
   POST /agents/chat/confirm   — Confirm a plan and execute the task
   POST /agents/hitl/{id}/approve — Approve a pending HITL action
   POST /agents/hitl/{id}/reject  — Reject a pending HITL action
 """
 
+import json
+import time
 import uuid
 import logging
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -24,16 +28,30 @@ from app.api.deps import get_current_business_id, check_feature, get_optional_cu
 from app.models.user import User
 from app.models.user_settings import AIDataSharingLevel
 from app.services.ai_service import AIService
-from app.agents.tasks.chat_agent import ChatAgent
 from app.agents.lib.hitl_manager import get_pending_action, reject_hitl
 from app.agents.lib.cache_manager import clear_hitl_pending
-from app.agents.orchestrator import Orchestrator
+from app.agents.lib.session_memory import append_messages, get_history
 
 logger = logging.getLogger("bizpilot.agents")
 
 router = APIRouter(prefix="/agents", tags=["AI Agents"])
 
 
+# The agents and their tool registry import every tool module; load them on
+# the first agent request rather than at application startup.
+
+def _chat_agent(db: Session):
+    from app.agents.tasks.chat_agent import ChatAgent
+
+    return ChatAgent(db)
+
+
+def _orchestrator(db: Session):
+    from app.agents.orchestrator import Orchestrator
+
+    return Orchestrator(db)
+
+
 # ---------------------------------------------------------------------------
 # Request / Response schemas
 # ---------------------------------------------------------------------------
@@ -78,6 +96,55 @@ def _make_session_id(provided: Optional[str]) -> str:
     return provided if provided else str(uuid.uuid4())
 
 
+def _sse(event: Dict[str, Any]) -> str:
+    """Format one agent event as a Server-Sent Event."""
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def _public_stream(message: str) -> AsyncIterator[Dict[str, Any]]:
+    """Guest-mode events: streamed tokens from the public assistant prompt."""
+    from app.core.ai_models import TaskType, execute_task_stream
+
+    messages = [
+        {"role": "system", "content": PUBLIC_AGENT_PROMPT},
+        {"role": "user", "content": message},
+    ]
+    async for chunk in execute_task_stream(TaskType.FAST, messages):
+        if chunk.delta:
+            yield {"type": "token", "content": chunk.delta}
+        if chunk.response is not None:
+            yield {"type": "response", "message": chunk.response.content.strip()}
+
+
+async def _sse_stream(
+    events: AsyncIterator[Dict[str, Any]],
+    session_id: str,
+    conversation_id: Optional[str],
+) -> AsyncIterator[str]:
+    """Wrap agent events in SSE framing, bracketed by session and done events.
+
+    Time to first token is the headline latency for streamed chats: it is
+    logged per request and reported in the closing ``done`` event.
+    """
+    started = time.perf_counter()
+    ttft_ms: Optional[float] = None
+    yield _sse({"type": "session", "session_id": session_id, "conversation_id": conversation_id})
+    try:
+        async for event in events:
+            if ttft_ms is None and event.get("type") == "token":
+                ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+                logger.info("Agent stream session=%s ttft_ms=%.1f", session_id, ttft_ms)
+            yield _sse(event)
+    except Exception as exc:
+        logger.error("Agent stream error for session %s: %s", session_id, exc, exc_info=True)
+        yield _sse({
+            "type": "error",
+            "message": "I encountered an error processing your request. Please try again.",
+        })
+    total_ms = round((time.perf_counter() - started) * 1000, 1)
+    yield _sse({"type": "done", "session_id": session_id, "ttft_ms": ttft_ms, "total_ms": total_ms})
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -101,6 +168,28 @@ Keep responses friendly, concise, and helpful.
 Never make up specific pricing — direct users to the pricing page at bizpilotpro.app/pricing
 """
 
+async def _remember_turn(user: User, session_id: str, message: str, result: Dict[str, Any]) -> None:
+    """Store a completed exchange in session memory (final answers only)."""
+    if result.get("type") != "response" or not result.get("message"):
+        return
+    await append_messages(
+        str(user.id),
+        session_id,
+        {"role": "user", "content": message},
+        {"role": "assistant", "content": result["message"]},
+    )
+
+
+async def _remembering(
+    events: AsyncIterator[Dict[str, Any]], user: User, session_id: str, message: str
+) -> AsyncIterator[Dict[str, Any]]:
+    """Pass stream events through, storing the final answer in session memory."""
+    async for event in events:
+        if event.get("type") == "response":
+            await _remember_turn(user, session_id, message, event)
+        yield event
+
+
 @router.post("/chat", response_model=AgentResponse)
 async def agent_chat(
     request: AgentChatRequest,
@@ -143,16 +232,17 @@ async def agent_chat(
     # ---- Authenticated business mode ----------------------------------------
     try:
         sharing_level = _get_sharing_level(db, current_user)
-        agent = ChatAgent(db)
+        agent = _chat_agent(db)
         result = await agent.run(
             user=current_user,
             message=request.message,
-            history=[],
+            history=await get_history(str(current_user.id), session_id),
             sharing_level=sharing_level,
             session_id=session_id,
             business_id=business_id or "",
             plan_confirmed=True,
         )
+        await _remember_turn(current_user, session_id, request.message, result)
         return AgentResponse(
             type=result.get("type", "response"),
             message=result.get("plan") or result.get("message", ""),
@@ -170,6 +260,51 @@ async def agent_chat(
         )
 
 
+@router.post("/chat/stream")
+async def agent_chat_stream(
+    request: AgentChatRequest,
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    business_id: Optional[str] = Depends(get_optional_business_id),
+    db: Session = Depends(get_sync_db),
+) -> StreamingResponse:
+    """
+    Streaming variant of /agents/chat (text/event-stream).
+
+    Events: session, agent, token, tool_start, tool_result, then the terminal
+    event (response | hitl_request | stopped | error) and finally done.
+    """
+    session_id = _make_session_id(request.session_id)
+
+    if current_user is None:
+        events = _public_stream(request.message)
+    else:
+        sharing_level = _get_sharing_level(db, current_user)
+        events = _remembering(
+            _chat_agent(db).run_stream(
+                user=current_user,
+                message=request.message,
+                history=await get_history(str(current_user.id), session_id),
+                sharing_level=sharing_level,
+                session_id=session_id,
+                business_id=business_id or "",
+            ),
+            current_user,
+            session_id,
+            request.message,
+        )
+
+    return StreamingResponse(
+        _sse_stream(events, session_id, request.conversation_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop proxies and GZipMiddleware from buffering tokens
+            "X-Accel-Buffering": "no",
+            "Content-Encoding": "identity",
+        },
+    )
+
+
 @router.post("/chat/confirm", response_model=AgentResponse)
 async def agent_chat_confirm(
     request: AgentConfirmRequest,
@@ -183,16 +318,17 @@ async def agent_chat_confirm(
     """
     sharing_level = _get_sharing_level(db, current_user)
 
-    agent = ChatAgent(db)
+    agent = _chat_agent(db)
     result = await agent.run(
         user=current_user,
         message=request.message,
-        history=[],
+        history=await get_history(str(current_user.id), request.session_id),
         sharing_level=sharing_level,
         session_id=request.session_id,
         business_id=business_id,
         plan_confirmed=True,
     )
+    await _remember_turn(current_user, request.session_id, request.message, result)
 
     return AgentResponse(
         type=result.get("type", "response"),
@@ -221,7 +357,7 @@ async def hitl_approve(
             detail="No pending approval found. It may have expired (15-minute timeout).",
         )
 
-    orchestrator = Orchestrator(db)
+    orchestrator = _orchestrator(db)
     result = await orchestrator.execute_tool_and_continue(
         session_id=session_id,
         user=current_user,
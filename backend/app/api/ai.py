@@ -22,7 +22,7 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.database import get_sync_db
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, require_superadmin
 from app.models.user import User
 from app.models.ai_conversation import AIConversation
 from app.models.ai_message import AIMessage
@@ -82,15 +82,29 @@ async def get_ai_context(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_sync_db),
 ) -> AIContextOut:
-    """Return AI data-sharing settings and minimal business context for the current user."""
+    """Return AI data-sharing settings and summary business metrics for the current user.
+
+    Metrics come from the business's AI context snapshot (one Redis read when
+    warm) and are capped at the metrics-only level: no product, stock or
+    customer detail is returned here.
+    """
+    from app.models.user_settings import AIDataSharingLevel
+    from app.services.ai_context_service import AIContextService
+
     svc = AIService(db)
     settings = svc.get_or_create_user_settings(str(current_user.id))
     sharing = settings.ai_data_sharing_level
     level_str = sharing.value if hasattr(sharing, "value") else str(sharing)
+    level = (
+        sharing
+        if sharing in (AIDataSharingLevel.NONE, AIDataSharingLevel.APP_ONLY)
+        else AIDataSharingLevel.METRICS_ONLY
+    )
+    business_context = await AIContextService(db).get_business_context(current_user, level)
     return AIContextOut(
         ai_data_sharing_level=level_str,
         app_context={},
-        business_context={"businessName": getattr(current_user, "email", "")},
+        business_context=business_context,
     )
 
 
@@ -172,63 +186,80 @@ async def get_ai_metrics(
 ) -> dict:
     """Return AI usage metrics for the current user's business.
 
-    Aggregates from the agent_logs table:
-    - Total agent steps run
-    - Total tokens consumed
-    - Success vs failure counts
-    - Most recently generated rules (from ai_rule_generator entries)
+    Step, token and success/failure totals are this worker's in-memory
+    counters for the business (no agent_logs query); ``live_steps`` adds
+    their cost and latency.  ``latest_rules_generated_at`` is the last
+    association rule mining run and ``association_rules`` the number of
+    rules it left live.
+
+    ``agent_cache`` adds this worker's tool result / intent cache hit rates
+    and the LLM tokens and tool time they saved;
+    ``context_snapshot`` the AI context snapshot hit rate and refreshes;
+    ``session_memory`` conversation compactions and evicted tokens.
     """
-    from app.models.agent_log import AgentLog
+    from app.agents.lib.observability_logger import step_counters
+    from app.agents.lib.result_cache import cache_stats
+    from app.agents.lib.session_memory import session_memory_stats
+    from app.models.association_rule import AssociationRule, BasketMiningState
+    from app.services.ai_context_snapshot import context_snapshot_stats
     from sqlalchemy import func
 
     business_id_str = getattr(current_user, "business_id", None)
 
     if business_id_str:
-        # Count total steps and tokens
-        total_steps = (
-            db.query(func.count(AgentLog.id))
-            .filter(AgentLog.business_id == business_id_str)
-            .scalar() or 0
-        )
-        total_tokens = (
-            db.query(func.sum(AgentLog.tokens_used))
-            .filter(AgentLog.business_id == business_id_str)
-            .scalar() or 0
-        )
-        success_count = (
-            db.query(func.count(AgentLog.id))
-            .filter(AgentLog.business_id == business_id_str, AgentLog.success.is_(True))
-            .scalar() or 0
+        steps = step_counters.snapshot(business_id_str)
+        rules_generated_at = (
+            db.query(BasketMiningState.counted_until)
+            .filter(BasketMiningState.business_id == business_id_str)
+            .scalar()
         )
-        latest_rules_log = (
-            db.query(AgentLog)
+        rule_count = (
+            db.query(func.count(AssociationRule.id))
             .filter(
-                AgentLog.business_id == business_id_str,
-                AgentLog.agent_name == "ai_rule_generator",
+                AssociationRule.business_id == business_id_str,
+                AssociationRule.deleted_at.is_(None),
             )
-            .order_by(AgentLog.created_at.desc())
-            .first()
+            .scalar() or 0
         )
     else:
-        total_steps = total_tokens = success_count = 0
-        latest_rules_log = None
+        steps = None
+        rules_generated_at = None
+        rule_count = 0
 
     return {
         "business_id": str(business_id_str) if business_id_str else None,
-        "total_agent_steps": int(total_steps),
-        "total_tokens_used": int(total_tokens),
-        "success_count": int(success_count),
-        "failure_count": int(total_steps) - int(success_count),
+        "total_agent_steps": steps["steps"] if steps else 0,
+        "total_tokens_used": steps["tokens"] if steps else 0,
+        "success_count": steps["steps"] - steps["failures"] if steps else 0,
+        "failure_count": steps["failures"] if steps else 0,
         "latest_rules_generated_at": (
-            latest_rules_log.created_at.isoformat()
-            if latest_rules_log and latest_rules_log.created_at else None
-        ),
-        "latest_rules_summary": (
-            latest_rules_log.result_summary if latest_rules_log else None
+            rules_generated_at.isoformat() if rules_generated_at else None
         ),
+        "association_rules": int(rule_count),
+        "agent_cache": cache_stats(),
+        "live_steps": steps,
+        "context_snapshot": context_snapshot_stats(),
+        "session_memory": session_memory_stats(),
     }
 
 
+@router.get("/metrics/models")
+async def get_llm_model_metrics(
+    current_user: User = Depends(require_superadmin),
+) -> dict:
+    """Process-wide LLM transport metrics (SuperAdmin only).
+
+    Per model: circuit breaker state, success/failure counts and latency
+    and total-token histograms since this worker started.  ``agent_log``
+    adds step totals across all businesses and the audit log writer's
+    buffer state (buffered, written, dropped rows).
+    """
+    from app.agents.lib.observability_logger import agent_log_stats
+    from app.core.llm_transport import get_llm_transport
+
+    return {**get_llm_transport().stats(), "agent_log": agent_log_stats()}
+
+
 @router.delete("/conversations/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_conversation(
     conversation_id: str,
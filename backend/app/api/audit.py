@@ -12,6 +12,7 @@ from app.core.database import get_sync_db
 from app.models.audit_log import AuditAction
 from app.models.user import User
 from app.services.audit_service import AuditService
+from app.services.streaming_export_service import csv_streaming_response, iter_csv
 
 router = APIRouter(prefix="/audit", tags=["Audit"])
 
@@ -60,6 +61,9 @@ class CsvRowResponse(PydanticBase):
     created_at: str
 
 
+CSV_EXPORT_FIELDS = list(CsvRowResponse.model_fields)
+
+
 # ---------- Endpoints ----------
 
 
@@ -155,3 +159,28 @@ async def export_activity(
         start_date=start_date,
         end_date=end_date,
     )
+
+
+@router.get("/export/csv")
+async def export_activity_csv_file(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_active_user),
+    business_id: str = Depends(get_current_business_id),
+    db=Depends(get_sync_db),
+):
+    """Stream the activity log as a CSV download.
+
+    Rows are read with a server-side cursor and sent in chunks, so large
+    audit histories are never held in memory.
+    """
+    service = AuditService(db)
+    rows = (
+        [row[field] for field in CSV_EXPORT_FIELDS]
+        for row in service.iter_activity_csv(
+            business_id=business_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    )
+    return csv_streaming_response(iter_csv(CSV_EXPORT_FIELDS, rows), "activity_log.csv")
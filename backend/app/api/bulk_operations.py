@@ -36,6 +36,7 @@ from app.schemas.bulk_operations import (
 from app.services.bulk_operations_service import BulkOperationsService
 from app.services.tracked_bulk_service import TrackedBulkOperationService
 from app.services.bulk_template_service import BulkTemplateService
+from app.services.streaming_export_service import export_job_file, file_download_response
 
 router = APIRouter(prefix="/bulk", tags=["Bulk Operations"])
 
@@ -230,6 +231,26 @@ async def get_operation_progress(
     )
 
 
+@router.get("/operations/{operation_id}/download")
+async def download_operation_file(
+    operation_id: str,
+    current_user: User = Depends(has_permission("products:view")),
+    business_id: str = Depends(get_current_business_id),
+    db=Depends(get_sync_db),
+):
+    """Download the file produced by a completed export job."""
+    service = TrackedBulkOperationService(db)
+    op = service.get_operation(operation_id)
+    if not op or str(op.business_id) != str(business_id):
+        raise HTTPException(status_code=404, detail="Operation not found")
+    export = export_job_file(op)
+    if export is None:
+        raise HTTPException(status_code=409, detail="Export file is not available")
+    return file_download_response(
+        export["path"], export["filename"], export["media_type"], delete_after=False
+    )
+
+
 @router.get("/operations/{operation_id}/items", response_model=BulkOperationItemListResponse)
 async def get_operation_items(
     operation_id: str,
@@ -11,6 +11,7 @@ import math
 from app.core.database import get_sync_db
 from app.api.deps import get_current_active_user, get_current_user_for_onboarding, get_current_business_id
 from app.core.rbac import has_permission
+from app.core.search import contains
 from app.models.user import User
 from app.models.business import Business
 from app.models.business_user import BusinessUser, BusinessUserStatus
@@ -496,14 +497,10 @@ async def list_business_users(
     
     # Search by name, email, or department name
     if search:
-        search_term = f"%{search}%"
         query = query.join(User, BusinessUser.user_id == User.id).outerjoin(
             Department, BusinessUser.department_id == Department.id
         ).filter(
-            (User.first_name.ilike(search_term)) |
-            (User.last_name.ilike(search_term)) |
-            (User.email.ilike(search_term)) |
-            (Department.name.ilike(search_term))
+            contains([User.first_name, User.last_name, User.email, Department.name], search)
         )
     
     total = query.count()
@@ -10,9 +10,9 @@ import math
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
 from app.core.database import get_sync_db
+from app.core.search import contains
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.models.user import User
 from app.models.customer_account import (
@@ -20,6 +20,7 @@ from app.models.customer_account import (
     AccountStatus,
     AccountTransaction,
 )
+from app.services.account_aging_service import AccountAgingService, sum_aging
 from app.services.customer_account_service import CustomerAccountService
 from app.schemas.customer_account import (
     AccountCreate,
@@ -98,12 +99,8 @@ async def list_accounts(
         query = query.filter(CustomerAccount.status == account_status)
 
     if search:
-        term = f"%{search}%"
         query = query.filter(
-            or_(
-                CustomerAccount.account_number.ilike(term),
-                CustomerAccount.notes.ilike(term),
-            )
+            contains([CustomerAccount.account_number, CustomerAccount.notes], search)
         )
 
     total = query.count()
@@ -131,30 +128,10 @@ async def get_aging_report(
     db: Session = Depends(get_sync_db),
 ):
     """Get aging report aggregated across all active accounts."""
-    service = CustomerAccountService(db)
-    accounts = (
-        db.query(CustomerAccount)
-        .filter(
-            CustomerAccount.business_id == UUID(business_id),
-            CustomerAccount.status == AccountStatus.ACTIVE,
-        )
-        .all()
+    aging = AccountAgingService(db).open_items_aging(
+        UUID(business_id), status=AccountStatus.ACTIVE
     )
-
-    totals = {
-        "current": Decimal("0"),
-        "days_30": Decimal("0"),
-        "days_60": Decimal("0"),
-        "days_90_plus": Decimal("0"),
-        "total": Decimal("0"),
-    }
-
-    for account in accounts:
-        aging = service.calculate_aging(account)
-        for key in totals:
-            totals[key] += aging.get(key, Decimal("0"))
-
-    return AgingBreakdown(**totals)
+    return AgingBreakdown(**sum_aging(aging.values()))
 
 
 @router.get("/{account_id}", response_model=AccountResponse)
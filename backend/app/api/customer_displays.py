@@ -1,6 +1,10 @@
 """API endpoints for customer-facing display management.
 
-Provides CRUD for display devices, configuration, and heartbeat tracking.
+Provides CRUD for display devices, configuration, and heartbeat tracking,
+plus the live cart push to a display (over the realtime gateway).
+Heartbeats go through the heartbeat service (presence in Redis, batched
+last-seen writes); online/offline in responses is derived from the
+last-seen time.
 """
 
 import math
@@ -11,6 +15,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.database import get_sync_db
+from app.core.realtime import RealtimeEventType, emit_event
 from app.schemas.customer_display import (
     CustomerDisplayCreate,
     CustomerDisplayUpdate,
@@ -19,12 +24,21 @@ from app.schemas.customer_display import (
     DisplayConfigCreate,
     DisplayConfigUpdate,
     DisplayConfigResponse,
+    DisplayCartUpdate,
 )
 from app.services.customer_display_service import CustomerDisplayService
+from app.services.heartbeat_service import CUSTOMER_DISPLAY, cached_row, presence, record_heartbeat
 
 router = APIRouter(prefix="/displays", tags=["Customer Displays"])
 
 
+def _with_presence(display) -> CustomerDisplayResponse:
+    status, last_seen_at = presence(CUSTOMER_DISPLAY, str(display.id), display.status, display.last_seen_at)
+    return CustomerDisplayResponse.model_validate(display).model_copy(
+        update={"status": status, "last_seen_at": last_seen_at}
+    )
+
+
 # ---------------------------------------------------------------------------
 # Display Devices
 # ---------------------------------------------------------------------------
@@ -42,7 +56,7 @@ def list_displays(
     svc = CustomerDisplayService(db)
     items, total = svc.list_displays(business_id, page=page, per_page=per_page)
     return CustomerDisplayListResponse(
-        items=items,
+        items=[_with_presence(display) for display in items],
         total=total,
         page=page,
         per_page=per_page,
@@ -78,7 +92,7 @@ def get_display(
     display = svc.get_display(display_id)
     if not display:
         raise HTTPException(status_code=404, detail="Display not found")
-    return display
+    return _with_presence(display)
 
 
 @router.patch("/{display_id}", response_model=CustomerDisplayResponse)
@@ -109,20 +123,53 @@ def delete_display(
 
 
 @router.post("/{display_id}/heartbeat", response_model=CustomerDisplayResponse)
-def heartbeat(
+async def heartbeat(
     display_id: UUID,
     db: Session = Depends(get_sync_db),
 ):
     """Record a heartbeat from a display device.
 
+    The display is read from the database at most once per presence TTL
+    (see ``cached_row``); heartbeats refresh its presence key and are
+    written to ``last_seen_at`` in batches.
+
     Note: No auth required — displays authenticate via their ID.
     In production, add device token auth.
     """
+    def load():
+        display = CustomerDisplayService(db).get_display(display_id)
+        return CustomerDisplayResponse.model_validate(display).model_dump(mode="json") if display else None
+
+    row = await cached_row(CUSTOMER_DISPLAY, str(display_id), load)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Display not found")
+    seen_at = await record_heartbeat(CUSTOMER_DISPLAY, str(display_id))
+    return CustomerDisplayResponse.model_validate(row).model_copy(
+        update={"status": "online", "last_seen_at": seen_at}
+    )
+
+
+@router.post("/{display_id}/cart", status_code=202)
+def push_cart(
+    display_id: UUID,
+    payload: DisplayCartUpdate,
+    business_id: str = Depends(get_current_business_id),
+    db: Session = Depends(get_sync_db),
+    _user=Depends(get_current_active_user),
+):
+    """Push the till's current cart to a display connected to /realtime/ws.
+
+    The cart is not stored: a display that reconnects shows the next push.
+    """
     svc = CustomerDisplayService(db)
-    display = svc.heartbeat(display_id)
-    if not display:
+    display = svc.get_display(display_id)
+    if not display or str(display.business_id) != str(business_id):
         raise HTTPException(status_code=404, detail="Display not found")
-    return display
+    emit_event(business_id, RealtimeEventType.DISPLAY_CART_UPDATED, {
+        "display_id": str(display_id),
+        "cart": payload.model_dump(),
+    })
+    return {"detail": "Cart pushed", "display_id": str(display_id)}
 
 
 # ---------------------------------------------------------------------------
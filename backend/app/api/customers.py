@@ -2,12 +2,12 @@
 
 import csv
 import io
-import math
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from fastapi.responses import StreamingResponse
 
 from app.core.database import get_sync_db
+from app.core.pagination import TotalMode, total_mode_query
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.rbac import has_permission
 from app.models.user import User
@@ -63,8 +63,10 @@ async def list_customers(
     search: Optional[str] = None,
     customer_type: Optional[CustomerType] = None,
     tag: Optional[str] = None,
-    sort_by: str = Query("created_at", pattern="^(first_name|last_name|email|company_name|total_spent|total_orders|created_at|updated_at)$"),
+    sort_by: str = Query("created_at", pattern="^(first_name|last_name|email|company_name|total_spent|total_orders|created_at|updated_at|relevance)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: TotalMode = Depends(total_mode_query),
     current_user: User = Depends(get_current_active_user),
     db=Depends(get_sync_db),
     business_id: str = Depends(get_current_business_id),
@@ -73,7 +75,7 @@ async def list_customers(
     List customers with filtering and pagination.
     """
     service = CustomerService(db)
-    customers, total = service.get_customers(
+    result = service.get_customers(
         business_id=business_id,
         page=page,
         per_page=per_page,
@@ -82,14 +84,13 @@ async def list_customers(
         tag=tag,
         sort_by=sort_by,
         sort_order=sort_order,
+        total_mode=total_mode,
+        cursor=cursor,
     )
     
     return CustomerListResponse(
-        items=[_customer_to_response(c) for c in customers],
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=math.ceil(total / per_page) if total > 0 else 0,
+        items=[_customer_to_response(c) for c in result.items],
+        **result.meta(),
     )
 
 
@@ -25,7 +25,9 @@ from app.services.delivery_fee_service import calculate_fee
 from app.services.delivery_zone_service import check_address_in_zone
 from app.services.delivery_assign_service import (
     auto_assign,
+    auto_assign_batch,
     get_driver_workload,
+    plan_driver_route,
     reassign_driver,
 )
 from app.services.delivery_report_service import DeliveryReportService
@@ -162,6 +164,8 @@ class DeliveryResponse(PydanticBase):
     actual_delivery_time: Optional[datetime] = None
     delivery_notes: Optional[str] = None
     proof_of_delivery: Optional[str] = None
+    delivery_lat: Optional[float] = None
+    delivery_lng: Optional[float] = None
     created_at: datetime
     updated_at: datetime
 
@@ -180,6 +184,23 @@ class AssignDriverBody(PydanticBase):
     driver_id: str
 
 
+class BatchAssignItem(PydanticBase):
+    delivery_id: str
+    delivery_lat: Optional[float] = None
+    delivery_lng: Optional[float] = None
+
+
+class BatchAssignBody(PydanticBase):
+    """Deliveries to auto-assign together."""
+
+    deliveries: list[BatchAssignItem] = Field(..., min_length=1, max_length=200)
+
+
+class BatchAssignResult(PydanticBase):
+    delivery_id: str
+    driver_id: Optional[str] = None
+
+
 class ReassignDriverBody(PydanticBase):
     """Schema for driver reassignment with reason."""
 
@@ -209,6 +230,24 @@ class ZoneCheckRequest(PydanticBase):
     postcode: Optional[str] = None
 
 
+class RouteStopResponse(PydanticBase):
+    delivery_id: str
+    sequence: int
+    leg_km: Optional[float] = None
+    cumulative_km: Optional[float] = None
+    eta_minutes: Optional[int] = None
+    eta: Optional[datetime] = None
+
+
+class DriverRouteResponse(PydanticBase):
+    """A driver's drops in visiting order with arrival estimates."""
+
+    driver_id: str
+    stops: list[RouteStopResponse]
+    total_km: float
+    total_minutes: Optional[int] = None
+
+
 class DriverStatsResponse(PydanticBase):
     driver_id: str
     total_deliveries: int
@@ -232,6 +271,13 @@ def _str_id(obj) -> Dict[str, Any]:
     return data
 
 
+def _stored_location(delivery) -> tuple[Optional[float], Optional[float]]:
+    """Drop-off coordinates saved on the delivery, as floats."""
+    if delivery.delivery_lat is None or delivery.delivery_lng is None:
+        return None, None
+    return float(delivery.delivery_lat), float(delivery.delivery_lng)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # Zone endpoints
 # ══════════════════════════════════════════════════════════════════════════════
@@ -408,6 +454,21 @@ async def driver_workload(
     return get_driver_workload(db, business_id)
 
 
+@router.get("/drivers/{driver_id}/route", response_model=DriverRouteResponse)
+async def driver_route(
+    driver_id: str,
+    current_user: User = Depends(has_permission("deliveries:view")),
+    business_id: str = Depends(get_current_business_id),
+    db=Depends(get_sync_db),
+):
+    """Plan the order of a driver's current drops and their ETAs."""
+    service = DeliveryService(db)
+    driver = service.get_driver(driver_id, business_id)
+    if not driver:
+        raise HTTPException(status_code=404, detail="Driver not found")
+    return DriverRouteResponse(**plan_driver_route(db, business_id, driver))
+
+
 @router.get("/drivers/{driver_id}/stats", response_model=DriverStatsResponse)
 async def driver_stats(
     driver_id: str,
@@ -445,6 +506,8 @@ async def create_delivery(
         driver_id=body.driver_id,
         delivery_fee=body.delivery_fee,
         notes=body.delivery_notes,
+        delivery_lat=body.delivery_lat,
+        delivery_lng=body.delivery_lng,
     )
     if body.auto_assign_driver and not body.driver_id:
         auto_assign(
@@ -491,6 +554,38 @@ async def active_deliveries(
     return [DeliveryResponse(**_str_id(d)) for d in items]
 
 
+@router.post("/auto-assign", response_model=list[BatchAssignResult])
+async def auto_assign_batch_endpoint(
+    body: BatchAssignBody,
+    current_user: User = Depends(has_permission("deliveries:manage")),
+    business_id: str = Depends(get_current_business_id),
+    db=Depends(get_sync_db),
+):
+    """Auto-assign several deliveries at once, minimising total driver distance.
+
+    Deliveries left over when drivers run out of capacity get no driver.
+    """
+    service = DeliveryService(db)
+    items = []
+    for item in body.deliveries:
+        delivery = service.get_delivery(item.delivery_id, business_id)
+        if not delivery:
+            raise HTTPException(status_code=404, detail=f"Delivery {item.delivery_id} not found")
+        if item.delivery_lat is None or item.delivery_lng is None:
+            items.append((delivery, *_stored_location(delivery)))
+        else:
+            items.append((delivery, item.delivery_lat, item.delivery_lng))
+
+    assigned = auto_assign_batch(db, business_id, items)
+    return [
+        BatchAssignResult(
+            delivery_id=str(delivery.id),
+            driver_id=str(assigned[delivery.id].id) if assigned[delivery.id] else None,
+        )
+        for delivery, _, _ in items
+    ]
+
+
 @router.get("/{delivery_id}", response_model=DeliveryResponse)
 async def get_delivery(
     delivery_id: str,
@@ -537,6 +632,8 @@ async def auto_assign_endpoint(
     if not delivery:
         raise HTTPException(status_code=404, detail="Delivery not found")
 
+    if delivery_lat is None or delivery_lng is None:
+        delivery_lat, delivery_lng = _stored_location(delivery)
     driver = auto_assign(db, delivery, business_id, delivery_lat, delivery_lng)
     if not driver:
         raise HTTPException(status_code=409, detail="No available drivers")
@@ -14,6 +14,7 @@ from app.models.business_user import BusinessUser, BusinessUserStatus
 from app.services.auth_service import AuthService
 from app.services.permission_service import PermissionService
 from app.services.device_service import DeviceService
+from app.services.heartbeat_service import DEVICE, entity_key, is_present, mark_present, record_heartbeat
 
 # HTTP Bearer token security (auto_error=False to allow cookie fallback)
 security = HTTPBearer(auto_error=False)
@@ -421,6 +422,19 @@ async def check_device_limit(
             detail="Device ID and Device Name headers are required (X-Device-ID, X-Device-Name)"
         )
     
+    # A device seen within the presence TTL is already registered and within
+    # the limit: skip the checks and batch its last_sync_time write
+    presence_key = entity_key(business_id, device_id)
+    if await is_present(DEVICE, presence_key):
+        seen_at = await record_heartbeat(DEVICE, presence_key)
+        return {
+            'device_id': device_id,
+            'device_name': device_name,
+            'is_active': True,
+            'last_sync_time': seen_at.isoformat(),
+            'is_superadmin': False
+        }
+    
     device_service = DeviceService(db)
     
     try:
@@ -448,6 +462,7 @@ async def check_device_limit(
             device_name=device_name,
             user_id=str(current_user.id)
         )
+        await mark_present(DEVICE, presence_key, device.last_sync_time)
         
         # Return device as dict
         return {
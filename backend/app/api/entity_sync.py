@@ -55,15 +55,22 @@ def _build_entity_registry() -> dict[str, Any]:
     from app.models.product import Product, ProductCategory
     from app.models.order import Order
     from app.models.customer import Customer
+    from app.models.association_rule import AssociationRule
 
     return {
         "products": Product,
         "categories": ProductCategory,
         "orders": Order,
         "customers": Customer,
+        "association_rules": AssociationRule,
     }
 
 
+# Generated server-side (scheduler/jobs/ai_rule_generation_job.py): devices
+# pull them but never push
+PULL_ONLY_ENTITIES = frozenset({"association_rules"})
+
+
 # ---------------------------------------------------------------------------
 # Router
 # ---------------------------------------------------------------------------
@@ -152,6 +159,11 @@ async def push_entity_changes(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Unknown entity type '{entity}'. Valid types: {sorted(registry)}",
         )
+    if entity in PULL_ONLY_ENTITIES:
+        raise HTTPException(
+            status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+            detail=f"'{entity}' is generated by the server and cannot be pushed.",
+        )
 
     model_class = registry[entity]
     results: list[PushRecordResult] = []
@@ -13,6 +13,7 @@ from app.schemas.general_ledger import (
     AccountBalanceSummary,
     AccountBalanceResponse,
     AccountBalanceListResponse,
+    AccountBalanceVerifyResponse,
     AccountCreate,
     AccountListResponse,
     AccountResponse,
@@ -408,3 +409,15 @@ async def list_account_balances(
         items=[AccountBalanceResponse.model_validate(i) for i in items],
         total=total, page=page, per_page=per_page, pages=pages,
     )
+
+
+@router.post("/account-balances/verify", response_model=AccountBalanceVerifyResponse)
+async def verify_account_balances(
+    repair: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db=Depends(get_sync_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    """Check period balances against posted journal lines, optionally rebuilding them."""
+    service = GeneralLedgerService(db)
+    return service.verify_account_balances(business_id, repair=repair)
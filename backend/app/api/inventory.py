@@ -2,7 +2,8 @@
 
 import math
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
@@ -10,6 +11,7 @@ from app.core.database import get_sync_db
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.rbac import has_permission
 from app.models.user import User
+from app.models.bulk_operation import BulkOperationType
 from app.models.inventory import TransactionType
 from app.models.product import Product
 from app.schemas.inventory import (
@@ -21,8 +23,21 @@ from app.schemas.inventory import (
     InventoryTransactionResponse,
     InventorySummary,
 )
+from app.schemas.bulk_operations import OperationProgressResponse
 from app.services.inventory_service import InventoryService
 from app.services.inventory_excel_service import InventoryExcelService
+from app.services.streaming_export_service import (
+    file_download_response,
+    run_export_job,
+    save_to_tempfile,
+)
+from app.services.streaming_import_service import (
+    ImportFileError,
+    ImportFileTooLargeError,
+    run_import_job,
+    spool_upload_to_tempfile,
+)
+from app.services.tracked_bulk_service import TrackedBulkOperationService
 from app.core.config import settings
 
 router = APIRouter(prefix="/inventory", tags=["Inventory"])
@@ -188,18 +203,40 @@ async def export_inventory_excel(
     - Cost data (average cost, last cost)
     """
     excel_service = InventoryExcelService(db)
-    output = excel_service.export_inventory(business_id)
-    
-    filename = f"inventory_export_{business_id[:8]}.xlsx"
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}",
-            "Access-Control-Expose-Headers": "Content-Disposition",
-        },
+    path = await run_in_threadpool(
+        save_to_tempfile, lambda target: excel_service.write_inventory_export(business_id, target)
     )
+    return file_download_response(path, f"inventory_export_{business_id[:8]}.xlsx")
+
+
+@router.post(
+    "/export/jobs",
+    response_model=OperationProgressResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_inventory_export_job(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
+    db=Depends(get_sync_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    """
+    Queue an inventory export as a tracked background job.
+
+    Poll `/bulk/operations/{id}/progress`; once completed the file is
+    available from `/bulk/operations/{id}/download`.
+    """
+    operation = TrackedBulkOperationService(db).create_operation(
+        operation_type=BulkOperationType.EXPORT,
+        user_id=str(current_user.id),
+        business_id=business_id,
+        total_records=0,
+        parameters={"entity": "inventory"},
+    )
+    db.commit()
+
+    background_tasks.add_task(run_export_job, str(operation.id), "inventory", business_id)
+    return OperationProgressResponse.model_validate(operation)
 
 
 @router.get("/export/pdf")
@@ -386,6 +423,46 @@ async def import_inventory_excel(
     }
 
 
+@router.post(
+    "/import/jobs",
+    response_model=OperationProgressResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_inventory_import_job(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: User = Depends(has_permission("inventory:edit")),
+    db=Depends(get_sync_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    """
+    Queue a large inventory import (.xlsx or .csv) as a tracked background job.
+
+    Rows are matched to products by SKU and written in chunks.  Poll
+    `/bulk/operations/{id}/progress` for status.
+    """
+    try:
+        file_path = await spool_upload_to_tempfile(file)
+    except ImportFileTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ImportFileError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    operation = TrackedBulkOperationService(db).create_operation(
+        operation_type=BulkOperationType.IMPORT,
+        user_id=str(current_user.id),
+        business_id=business_id,
+        total_records=0,
+        parameters={"entity": "inventory", "filename": file.filename},
+    )
+    db.commit()
+
+    background_tasks.add_task(
+        run_import_job, str(operation.id), "inventory", business_id, file_path, file.filename
+    )
+    return OperationProgressResponse.model_validate(operation)
+
+
 # ==================== Item-specific Routes ====================
 
 @router.get("/{item_id}", response_model=InventoryItemResponse)
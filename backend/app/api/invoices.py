@@ -1,6 +1,5 @@
 """Invoice API endpoints."""
 
-import math
 from typing import Optional
 from datetime import date
 from decimal import Decimal
@@ -8,6 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import Response
 
 from app.core.database import get_sync_db
+from app.core.pagination import TotalMode, total_mode_query
+from app.core.search import contains
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.rbac import has_permission
 from app.models.user import User
@@ -105,15 +106,17 @@ async def list_invoices(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     overdue_only: bool = False,
-    sort_by: str = Query("created_at", pattern="^(invoice_number|total|status|issue_date|due_date|created_at|updated_at)$"),
+    sort_by: str = Query("created_at", pattern="^(invoice_number|total|status|issue_date|due_date|created_at|updated_at|relevance)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: TotalMode = Depends(total_mode_query),
     current_user: User = Depends(get_current_active_user),
     business_id: str = Depends(get_current_business_id),
     db=Depends(get_sync_db),
 ):
     """List invoices with filtering and pagination."""
     service = InvoiceService(db)
-    invoices, total = service.get_invoices(
+    result = service.get_invoices(
         business_id=business_id,
         page=page,
         per_page=per_page,
@@ -125,7 +128,10 @@ async def list_invoices(
         overdue_only=overdue_only,
         sort_by=sort_by,
         sort_order=sort_order,
+        total_mode=total_mode,
+        cursor=cursor,
     )
+    invoices = result.items
     
     # Build a cache of customer IDs to names
     customer_ids = [str(inv.customer_id) for inv in invoices if inv.customer_id]
@@ -155,10 +161,7 @@ async def list_invoices(
     
     return InvoiceListResponse(
         items=invoice_responses,
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=math.ceil(total / per_page) if total > 0 else 0,
+        **result.meta(),
     )
 
 
@@ -203,7 +206,7 @@ async def get_unpaid_invoices(
     
     # Apply invoice_number search filter in SQL if provided
     if search:
-        query = query.filter(Invoice.invoice_number.ilike(f"%{search}%"))
+        query = query.filter(contains([Invoice.invoice_number], search))
     
     invoices = query.order_by(Invoice.created_at.desc()).limit(per_page).all()
     
@@ -12,6 +12,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 
 from app.core.database import get_sync_db
+from app.core.pagination import PaginationError, TotalMode, total_mode_query
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.models.user import User
 from app.models.product import Product
@@ -342,6 +343,8 @@ async def list_laybys(
     status_filter: Optional[str] = Query(None, alias="status"),
     customer_id: Optional[UUID] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: TotalMode = Depends(total_mode_query),
     current_user: User = Depends(get_current_active_user),
     business_id: str = Depends(get_current_business_id),
     db=Depends(get_sync_db),
@@ -349,18 +352,19 @@ async def list_laybys(
     """List laybys with filters and pagination."""
     try:
         service = LaybyService(db)
-        items, total = service.list_laybys(
+        result = service.list_laybys(
             business_id=business_id,
             page=page,
             per_page=per_page,
             status=status_filter,
             customer_id=str(customer_id) if customer_id else None,
             search=search,
+            total_mode=total_mode,
+            cursor=cursor,
         )
-        pages = (total + per_page - 1) // per_page
-        return LaybyListResponse(
-            items=items, total=total, page=page, per_page=per_page, pages=pages
-        )
+        return LaybyListResponse(items=result.items, **result.meta())
+    except PaginationError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -10,6 +10,7 @@ from pydantic import BaseModel as PydanticBase, ConfigDict
 
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.database import get_sync_db
+from app.core.realtime import RealtimeEventType, emit_event
 from app.models.user import User
 from app.services.menu_service import MenuService
 
@@ -292,6 +293,10 @@ async def toggle_availability(
     item = service.toggle_availability(str(item_id), business_id)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu item not found")
+    emit_event(business_id, RealtimeEventType.MENU_AVAILABILITY_CHANGED, {
+        "menu_item_id": str(item.id),
+        "is_available": item.is_available,
+    })
     return item
 
 
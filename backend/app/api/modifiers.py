@@ -18,6 +18,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.database import get_sync_db
+from app.core.realtime import RealtimeEventType, emit_event
 from app.models.user import User
 from app.schemas.modifier import (
     ModifierAvailabilityCreate,
@@ -171,6 +172,11 @@ async def eighty_six_modifier(
         modifier_id=str(modifier_id),
         location_id=str(location_id) if location_id else None,
     )
+    emit_event(business_id, RealtimeEventType.MENU_AVAILABILITY_CHANGED, {
+        "modifier_id": str(modifier_id),
+        "is_available": False,
+        "location_id": str(location_id) if location_id else None,
+    })
     return {"modifier_id": str(modifier_id), "status": "86d", "rule_id": str(rule.id)}
 
 
@@ -195,6 +201,11 @@ async def un_eighty_six_modifier(
         modifier_id=str(modifier_id),
         location_id=str(location_id) if location_id else None,
     )
+    emit_event(business_id, RealtimeEventType.MENU_AVAILABILITY_CHANGED, {
+        "modifier_id": str(modifier_id),
+        "is_available": True,
+        "location_id": str(location_id) if location_id else None,
+    })
     return {
         "modifier_id": str(modifier_id),
         "status": "available",
@@ -9,6 +9,7 @@ from pydantic import BaseModel as PydanticBase, ConfigDict
 
 from app.api.deps import get_current_business_id
 from app.core.database import get_sync_db
+from app.core.realtime import RealtimeEventType, emit_event
 from app.core.rbac import has_permission
 from app.models.online_order import FulfillmentType, OnlineOrderStatus
 from app.models.user import User
@@ -168,6 +169,15 @@ def _order_response(order) -> dict:
     return d
 
 
+def _emit_status_changed(business_id: str, order) -> None:
+    emit_event(business_id, RealtimeEventType.ORDER_STATUS_CHANGED, {
+        "order_id": str(order.id),
+        "order_number": order.order_number,
+        "status": getattr(order.status, "value", order.status),
+        "source": "online",
+    })
+
+
 # ---- Endpoints ----
 
 
@@ -303,6 +313,7 @@ async def update_order_status(
     order = service.update_status(order_id, business_id, body.status)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
+    _emit_status_changed(business_id, order)
     return OrderResponse(**_order_response(order))
 
 
@@ -320,6 +331,7 @@ async def cancel_order(
     order = service.cancel_order(order_id, business_id, reason)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
+    _emit_status_changed(business_id, order)
     return OrderResponse(**_order_response(order))
 
 
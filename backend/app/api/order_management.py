@@ -10,6 +10,7 @@ from pydantic import BaseModel as PydanticBaseModel, ConfigDict
 
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.database import get_sync_db
+from app.core.realtime import RealtimeEventType, emit_event
 from app.services.order_management_service import OrderManagementService
 from app.models.order import OrderStatus, OrderType
 
@@ -93,6 +94,12 @@ def update_order_status(
         user_id=user.id,
         reason=data.reason,
     )
+    emit_event(business_id, RealtimeEventType.ORDER_STATUS_CHANGED, {
+        "order_id": str(order.id),
+        "order_number": order.order_number,
+        "status": order.status.value,
+        "table_id": str(order.table_id) if order.table_id else None,
+    })
     return {"detail": "Status updated", "order_id": str(order.id), "status": order.status.value}
 
 
@@ -1,14 +1,15 @@
 """Order API endpoints."""
 
-import math
 from typing import Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import Response
 
 from app.core.database import get_sync_db
+from app.core.pagination import TotalMode, total_mode_query
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.config import settings
+from app.core.realtime import RealtimeEventType, emit_event
 from app.core.rbac import has_permission
 from app.models.user import User
 from app.models.order import OrderStatus, PaymentStatus, OrderDirection
@@ -139,8 +140,10 @@ async def list_orders(
     payment_status: Optional[PaymentStatus] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
-    sort_by: str = Query("created_at", pattern="^(order_number|total|status|order_date|created_at|updated_at)$"),
+    sort_by: str = Query("created_at", pattern="^(order_number|total|status|order_date|created_at|updated_at|relevance)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: TotalMode = Depends(total_mode_query),
     current_user: User = Depends(get_current_active_user),
     business_id: str = Depends(get_current_business_id),
     db=Depends(get_sync_db),
@@ -149,7 +152,7 @@ async def list_orders(
     List orders with filtering and pagination.
     """
     service = OrderService(db)
-    orders, total = service.get_orders(
+    result = service.get_orders(
         business_id=business_id,
         page=page,
         per_page=per_page,
@@ -163,11 +166,13 @@ async def list_orders(
         date_to=date_to,
         sort_by=sort_by,
         sort_order=sort_order,
+        total_mode=total_mode,
+        cursor=cursor,
     )
     
     # Build responses using eager-loaded relationships (no N+1 queries)
     order_responses = []
-    for order in orders:
+    for order in result.items:
         # Items are eager-loaded via selectin relationship
         items = [item for item in (order.items or []) if item.deleted_at is None]
         
@@ -180,10 +185,7 @@ async def list_orders(
     
     return OrderListResponse(
         items=order_responses,
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=math.ceil(total / per_page) if total > 0 else 0,
+        **result.meta(),
     )
 
 
@@ -499,6 +501,12 @@ async def update_order_status(
         )
     
     order = service.update_order_status(order, data.status)
+    emit_event(business_id, RealtimeEventType.ORDER_STATUS_CHANGED, {
+        "order_id": str(order.id),
+        "order_number": order.order_number,
+        "status": order.status.value,
+        "table_id": str(order.table_id) if order.table_id else None,
+    })
     items = service.get_order_items(str(order.id))
     return _order_to_response(order, items)
 
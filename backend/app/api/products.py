@@ -1,16 +1,19 @@
 """Product API endpoints."""
 
-import math
 from typing import Optional
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 
 from app.core.database import get_sync_db
+from app.core.pagination import TotalMode, total_mode_query
 from app.api.deps import get_current_business_id, get_current_active_user
 from app.core.rbac import has_permission
+from app.models.bulk_operation import BulkOperationType
 from app.models.product import Product, ProductStatus
 from app.models.user import User
+from app.schemas.bulk_operations import OperationProgressResponse
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
@@ -21,9 +24,25 @@ from app.schemas.product import (
     ProductIngredientCreate,
     ProductIngredientUpdate,
     ProductIngredientResponse,
+    ScanLookupRequest,
+    ScanLookupResponse,
+    ScanProductResponse,
 )
-from app.services.product_service import ProductService
+from app.services.product_service import DuplicateProductCodeError, ProductService
+from app.services.scan_lookup import build_codes, lookup_codes
 from app.services.product_excel_service import ProductExcelService
+from app.services.streaming_export_service import (
+    file_download_response,
+    run_export_job,
+    save_to_tempfile,
+)
+from app.services.streaming_import_service import (
+    ImportFileError,
+    ImportFileTooLargeError,
+    run_import_job,
+    spool_upload_to_tempfile,
+)
+from app.services.tracked_bulk_service import TrackedBulkOperationService
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
@@ -85,6 +104,36 @@ def _product_to_response(product: Product) -> ProductResponse:
     )
 
 
+@router.get("/scan/{code}", response_model=ScanProductResponse)
+async def scan_product(
+    code: str,
+    current_user: User = Depends(has_permission("products:view")),
+    business_id: str = Depends(get_current_business_id),
+    db=Depends(get_sync_db),
+):
+    """Resolve a scanned barcode or SKU from the business's in-memory scan map."""
+    found = await lookup_codes(business_id, [code], lambda: build_codes(db, business_id))
+    record = found[code]
+    if record is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    return record
+
+
+@router.post("/scan", response_model=ScanLookupResponse)
+async def scan_products(
+    data: ScanLookupRequest,
+    current_user: User = Depends(has_permission("products:view")),
+    business_id: str = Depends(get_current_business_id),
+    db=Depends(get_sync_db),
+):
+    """Resolve codes buffered by a scanner in one request."""
+    found = await lookup_codes(business_id, data.codes, lambda: build_codes(db, business_id))
+    return ScanLookupResponse(
+        found={code: record for code, record in found.items() if record is not None},
+        missing=[code for code, record in found.items() if record is None],
+    )
+
+
 @router.get("/{product_id}/ingredients", response_model=list[ProductIngredientResponse])
 async def list_product_ingredients(
     product_id: str,
@@ -220,8 +269,10 @@ async def list_products(
     min_price: Optional[Decimal] = None,
     max_price: Optional[Decimal] = None,
     low_stock_only: bool = False,
-    sort_by: str = Query("created_at", pattern="^(name|selling_price|quantity|created_at|updated_at)$"),
+    sort_by: str = Query("created_at", pattern="^(name|selling_price|quantity|created_at|updated_at|relevance)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: TotalMode = Depends(total_mode_query),
     current_user: User = Depends(has_permission("products:view")),
     business_id: str = Depends(get_current_business_id),
     db=Depends(get_sync_db),
@@ -230,7 +281,7 @@ async def list_products(
     List products with filtering and pagination.
     """
     service = ProductService(db)
-    products, total = service.get_products(
+    result = service.get_products(
         business_id=business_id,
         page=page,
         per_page=per_page,
@@ -242,14 +293,13 @@ async def list_products(
         low_stock_only=low_stock_only,
         sort_by=sort_by,
         sort_order=sort_order,
+        total_mode=total_mode,
+        cursor=cursor,
     )
     
     return ProductListResponse(
-        items=[_product_to_response(p) for p in products],
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=math.ceil(total / per_page) if total > 0 else 0,
+        items=[_product_to_response(p) for p in result.items],
+        **result.meta(),
     )
 
 
@@ -282,7 +332,10 @@ async def create_product(
 ):
     """Create a new product."""
     service = ProductService(db)
-    product = service.create_product(business_id, data)
+    try:
+        product = service.create_product(business_id, data)
+    except DuplicateProductCodeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
     return _product_to_response(product)
 
@@ -305,7 +358,10 @@ async def update_product(
             detail="Product not found",
         )
     
-    product = service.update_product(product, data)
+    try:
+        product = service.update_product(product, data)
+    except DuplicateProductCodeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
     return _product_to_response(product)
 
@@ -339,7 +395,10 @@ async def bulk_create_products(
 ):
     """Create multiple products at once."""
     service = ProductService(db)
-    products = service.bulk_create_products(business_id, data.products)
+    try:
+        products = service.bulk_create_products(business_id, data.products)
+    except DuplicateProductCodeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
     return [_product_to_response(p) for p in products]
 
@@ -395,19 +454,45 @@ async def export_products_excel(
     """
     Export all products to Excel spreadsheet.
     
-    Returns an Excel file with all products and their details.
+    Returns an Excel file with all products and their details.  The workbook
+    is written row by row to a temporary file and streamed from disk; use
+    `POST /products/export/jobs` for very large catalogs.
     """
     excel_service = ProductExcelService(db)
-    output = excel_service.export_products(business_id)
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=products_export.xlsx",
-            "Access-Control-Expose-Headers": "Content-Disposition",
-        },
+    path = await run_in_threadpool(
+        save_to_tempfile, lambda target: excel_service.write_products_export(business_id, target)
     )
+    return file_download_response(path, "products_export.xlsx")
+
+
+@router.post(
+    "/export/jobs",
+    response_model=OperationProgressResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_product_export_job(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
+    db=Depends(get_sync_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    """
+    Queue a product export as a tracked background job.
+
+    Poll `/bulk/operations/{id}/progress`; once completed the file is
+    available from `/bulk/operations/{id}/download`.
+    """
+    operation = TrackedBulkOperationService(db).create_operation(
+        operation_type=BulkOperationType.EXPORT,
+        user_id=str(current_user.id),
+        business_id=business_id,
+        total_records=0,
+        parameters={"entity": "products"},
+    )
+    db.commit()
+
+    background_tasks.add_task(run_export_job, str(operation.id), "products", business_id)
+    return OperationProgressResponse.model_validate(operation)
 
 
 @router.post("/import/excel")
@@ -482,6 +567,48 @@ async def import_products_excel(
     return result
 
 
+@router.post(
+    "/import/jobs",
+    response_model=OperationProgressResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_product_import_job(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: User = Depends(has_permission("products:create")),
+    db=Depends(get_sync_db),
+    business_id: str = Depends(get_current_business_id),
+):
+    """
+    Queue a large product import (.xlsx or .csv) as a tracked background job.
+
+    Rows are streamed and upserted by SKU in chunks, so catalogs with
+    hundreds of thousands of rows do not need to fit in memory.  Poll
+    `/bulk/operations/{id}/progress` for status; per-row errors are stored
+    on the operation's parameters once it finishes.
+    """
+    try:
+        file_path = await spool_upload_to_tempfile(file)
+    except ImportFileTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ImportFileError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    operation = TrackedBulkOperationService(db).create_operation(
+        operation_type=BulkOperationType.IMPORT,
+        user_id=str(current_user.id),
+        business_id=business_id,
+        total_records=0,
+        parameters={"entity": "products", "filename": file.filename},
+    )
+    db.commit()
+
+    background_tasks.add_task(
+        run_import_job, str(operation.id), "products", business_id, file_path, file.filename
+    )
+    return OperationProgressResponse.model_validate(operation)
+
+
 # Product-Supplier Relationship Endpoints
 
 @router.get("/{product_id}/suppliers")
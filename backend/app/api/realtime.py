@@ -0,0 +1,233 @@
+"""Real-time push endpoints (WebSocket and Server-Sent Events).
+
+Clients keep one connection open and receive the business's events as
+JSON envelopes ``{"type", "business_id", "data", "ts"}`` instead of
+polling.  Event types are listed in ``RealtimeEventType``; a ``resync``
+event means the client fell behind and should refetch its state, and
+``ping`` events keep idle connections alive through proxies.
+
+- ``/realtime/ws``: staff clients authenticate with the access token
+  (``token`` query parameter, ``access_token`` cookie or Bearer header);
+  customer displays connect with ``display_id`` and receive only their own
+  cart updates, matching how they authenticate for heartbeats.  A
+  connected display counts as heartbeating (on connect and every
+  keepalive), so it need not also poll the heartbeat endpoint.
+- ``/realtime/events``: the same stream as ``text/event-stream`` for
+  clients that cannot use WebSockets (regular cookie / Bearer auth).
+
+The channel is push-only; writes still go through the REST endpoints.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_active_user, get_current_business_id, require_superadmin
+from app.core.config import settings
+from app.core.realtime import RealtimeEventType, Subscription, encode_event, realtime_hub
+from app.core.security import decode_token
+from app.models.user import User
+from app.services.heartbeat_service import CUSTOMER_DISPLAY, record_heartbeat
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/realtime", tags=["Realtime"])
+
+
+def _parse_types(types: Optional[str]) -> Optional[list]:
+    if not types:
+        return None
+    return [t.strip() for t in types.split(",") if t.strip()]
+
+
+def _ws_token(websocket: WebSocket, token: Optional[str]) -> Optional[str]:
+    if token:
+        return token
+    auth_header = websocket.headers.get("authorization", "")
+    if auth_header.startswith("Bearer "):
+        return auth_header[len("Bearer "):]
+    return websocket.cookies.get("access_token")
+
+
+def _resolve_connection(
+    token: Optional[str],
+    display_id: Optional[UUID],
+    requested_business_id: Optional[str],
+) -> Optional[Tuple[str, Optional[str]]]:
+    """(business_id, user_id) the connection may listen to, or None."""
+    from app.core.database import SessionLocal
+    from app.models.business import Business
+    from app.models.business_user import BusinessUser, BusinessUserStatus
+    from app.models.user import UserStatus
+    from app.services.customer_display_service import CustomerDisplayService
+
+    db = SessionLocal()
+    try:
+        if token is None and display_id is not None:
+            display = CustomerDisplayService(db).get_display(display_id)
+            return (str(display.business_id), None) if display else None
+
+        payload = decode_token(token) if token else None
+        if not payload or payload.get("type") != "access" or not payload.get("sub"):
+            return None
+        user = db.get(User, UUID(payload["sub"]))
+        if user is None or user.status != UserStatus.ACTIVE:
+            return None
+
+        if user.is_superadmin:
+            query = db.query(Business.id).filter(Business.deleted_at.is_(None))
+            if requested_business_id:
+                query = query.filter(Business.id == UUID(requested_business_id))
+            business = query.order_by(Business.created_at.asc()).first()
+            return (str(business.id), str(user.id)) if business else None
+
+        membership = (
+            db.query(BusinessUser.business_id)
+            .filter(
+                BusinessUser.user_id == user.id,
+                BusinessUser.status == BusinessUserStatus.ACTIVE,
+            )
+            .first()
+        )
+        return (str(membership.business_id), str(user.id)) if membership else None
+    except ValueError:
+        # Malformed UUID in the token or query
+        return None
+    finally:
+        db.close()
+
+
+async def _send_events(
+    websocket: WebSocket,
+    subscription: Subscription,
+    on_keepalive: Optional[Callable[[], Awaitable]] = None,
+) -> None:
+    keepalive = settings.REALTIME_KEEPALIVE_SECONDS
+    while True:
+        item = await subscription.next_event(keepalive)
+        if item is None:
+            raw = encode_event(RealtimeEventType.PING, subscription.business_id, {})
+            if on_keepalive is not None:
+                await on_keepalive()
+        else:
+            raw = item[1]
+        await websocket.send_text(raw)
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def serve_websocket(
+    websocket: WebSocket,
+    subscription: Subscription,
+    on_keepalive: Optional[Callable[[], Awaitable]] = None,
+) -> None:
+    """Push the subscription's events until either side goes away."""
+    tasks = [
+        asyncio.create_task(_send_events(websocket, subscription, on_keepalive)),
+        asyncio.create_task(_wait_for_disconnect(websocket)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, (WebSocketDisconnect, RuntimeError)):
+                logger.warning("Realtime connection for %s failed: %s", subscription.business_id, exc)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@router.websocket("/ws")
+async def realtime_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    display_id: Optional[UUID] = Query(None),
+    business_id: Optional[str] = Query(None, description="Superadmins only"),
+    types: Optional[str] = Query(None, description="Comma-separated event types; default all"),
+):
+    """Push the business's real-time events over a WebSocket."""
+    resolved = await asyncio.to_thread(
+        _resolve_connection, _ws_token(websocket, token), display_id, business_id
+    )
+    if resolved is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    resolved_business_id, user_id = resolved
+    on_keepalive = None
+    if user_id is None:
+        # Customer display: its own cart updates only
+        subscription = realtime_hub.subscribe(
+            resolved_business_id,
+            event_types=[RealtimeEventType.DISPLAY_CART_UPDATED.value],
+            display_id=display_id,
+        )
+
+        async def on_keepalive():
+            await record_heartbeat(CUSTOMER_DISPLAY, str(display_id))
+
+        await on_keepalive()
+    else:
+        subscription = realtime_hub.subscribe(
+            resolved_business_id, user_id=user_id, event_types=_parse_types(types)
+        )
+    try:
+        await serve_websocket(websocket, subscription, on_keepalive)
+    finally:
+        realtime_hub.unsubscribe(subscription)
+
+
+async def _sse_events(subscription: Subscription):
+    keepalive = settings.REALTIME_KEEPALIVE_SECONDS
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            item = await subscription.next_event(keepalive)
+            if item is None:
+                yield ": keepalive\n\n"
+                continue
+            event_type, raw = item
+            yield f"event: {event_type}\ndata: {raw}\n\n"
+    finally:
+        realtime_hub.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def realtime_events(
+    types: Optional[str] = Query(None, description="Comma-separated event types; default all"),
+    current_user: User = Depends(get_current_active_user),
+    business_id: str = Depends(get_current_business_id),
+) -> StreamingResponse:
+    """Push the business's real-time events as Server-Sent Events."""
+    subscription = realtime_hub.subscribe(
+        business_id, user_id=current_user.id, event_types=_parse_types(types)
+    )
+    return StreamingResponse(
+        _sse_events(subscription),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop proxies and GZipMiddleware from buffering events
+            "X-Accel-Buffering": "no",
+            "Content-Encoding": "identity",
+        },
+    )
+
+
+@router.get("/stats")
+async def realtime_stats(
+    current_user: User = Depends(require_superadmin),
+):
+    """Connection and delivery counters for this worker."""
+    return realtime_hub.stats()
@@ -67,6 +67,13 @@ from app.schemas.custom_report import (
     CustomReportResponse,
 )
 from app.services.custom_report_service import CustomReportService
+from app.services.streaming_export_service import (
+    XLSX_MEDIA_TYPE,
+    add_table_sheet,
+    column_widths,
+    new_export_workbook,
+    workbook_to_bytes,
+)
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -1279,12 +1286,8 @@ async def export_report_excel(
     db=Depends(get_sync_db),
 ):
     """Export sales report data as Excel (.xlsx) with styled headers."""
-    from io import BytesIO
     from datetime import date as date_type
 
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-
     try:
         start = date_type.fromisoformat(start_date)
         end = date_type.fromisoformat(end_date)
@@ -1295,92 +1298,69 @@ async def export_report_excel(
         )
 
     service = SalesReportService(db)
-    wb = Workbook()
-    ws = wb.active
-
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-    header_align = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style="thin"), right=Side(style="thin"),
-        top=Side(style="thin"), bottom=Side(style="thin"),
-    )
-    alt_fill = PatternFill(start_color="F3F4F6", end_color="F3F4F6", fill_type="solid")
-
-    def write_headers(headers: list[str]) -> None:
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_idx, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_align
-            cell.border = thin_border
-
-    def write_row(row_num: int, values: list) -> None:
-        is_alt = row_num % 2 == 0
-        for col_idx, value in enumerate(values, 1):
-            cell = ws.cell(row=row_num, column=col_idx, value=value)
-            cell.border = thin_border
-            if is_alt:
-                cell.fill = alt_fill
 
     if report_type == "products":
-        ws.title = "Product Performance"
+        title = "Product Performance"
         data = service.get_product_performance(business_id, start, end)
-        write_headers(["Rank", "Product", "Quantity Sold", "Revenue", "Order Count", "Revenue %"])
-        for i, p in enumerate(data.get("products", []), 2):
-            write_row(i, [
-                p["rank"], p["product_name"], p["quantity_sold"],
-                p["revenue"], p["order_count"], p["revenue_percentage"],
-            ])
+        headers = ["Rank", "Product", "Quantity Sold", "Revenue", "Order Count", "Revenue %"]
+        rows = [
+            [p["rank"], p["product_name"], p["quantity_sold"],
+             p["revenue"], p["order_count"], p["revenue_percentage"]]
+            for p in data.get("products", [])
+        ]
     elif report_type == "categories":
-        ws.title = "Category Performance"
+        title = "Category Performance"
         data = service.get_category_performance(business_id, start, end)
-        write_headers(["Category", "Quantity Sold", "Revenue", "Order Count", "Revenue %"])
-        for i, c in enumerate(data.get("categories", []), 2):
-            write_row(i, [
-                c["category_name"], c["quantity_sold"],
-                c["revenue"], c["order_count"], c["revenue_percentage"],
-            ])
+        headers = ["Category", "Quantity Sold", "Revenue", "Order Count", "Revenue %"]
+        rows = [
+            [c["category_name"], c["quantity_sold"],
+             c["revenue"], c["order_count"], c["revenue_percentage"]]
+            for c in data.get("categories", [])
+        ]
     elif report_type == "payments":
-        ws.title = "Payment Breakdown"
+        title = "Payment Breakdown"
         data = service.get_payment_breakdown(business_id, start, end)
-        write_headers(["Payment Method", "Count", "Amount", "Amount %", "Count %"])
-        for i, m in enumerate(data.get("methods", []), 2):
-            write_row(i, [
-                m["payment_method"], m["count"], m["amount"],
-                m["percentage_amount"], m["percentage_count"],
-            ])
+        headers = ["Payment Method", "Count", "Amount", "Amount %", "Count %"]
+        rows = [
+            [m["payment_method"], m["count"], m["amount"],
+             m["percentage_amount"], m["percentage_count"]]
+            for m in data.get("methods", [])
+        ]
     elif report_type == "discounts":
-        ws.title = "Discount Analysis"
+        title = "Discount Analysis"
         data = service.get_discount_analysis(business_id, start, end)
-        write_headers(["Product", "Discount Total", "Revenue", "Discount %", "Item Count"])
-        for i, p in enumerate(data.get("by_product", []), 2):
-            write_row(i, [
-                p["product_name"], p["discount_total"], p["revenue"],
-                p["discount_percentage"], p["item_count"],
-            ])
+        headers = ["Product", "Discount Total", "Revenue", "Discount %", "Item Count"]
+        rows = [
+            [p["product_name"], p["discount_total"], p["revenue"],
+             p["discount_percentage"], p["item_count"]]
+            for p in data.get("by_product", [])
+        ]
     elif report_type == "refunds":
-        ws.title = "Refund Analysis"
+        title = "Refund Analysis"
         data = service.get_refund_analysis(business_id, start, end)
-        write_headers(["Product", "Refund Total", "Quantity", "Refund Count", "% of Refunds"])
-        for i, p in enumerate(data.get("by_product", []), 2):
-            write_row(i, [
-                p["product_name"], p["refund_total"], p["quantity"],
-                p["refund_count"], p["percentage_of_refunds"],
-            ])
+        headers = ["Product", "Refund Total", "Quantity", "Refund Count", "% of Refunds"]
+        rows = [
+            [p["product_name"], p["refund_total"], p["quantity"],
+             p["refund_count"], p["percentage_of_refunds"]]
+            for p in data.get("by_product", [])
+        ]
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unknown report type: {report_type}. Use: products, categories, payments, discounts, refunds",
         )
 
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
+    # Aggregated reports are small; a write-only workbook skips the per-cell
+    # style objects that dominated the old export's time and size.
+    wb = new_export_workbook()
+    ws = add_table_sheet(wb, title, headers, column_widths(headers, rows))
+    for row in rows:
+        ws.append(row)
+
     filename = f"{report_type}_report_{start_date}_to_{end_date}.xlsx"
     return Response(
-        content=output.getvalue(),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        content=workbook_to_bytes(wb),
+        media_type=XLSX_MEDIA_TYPE,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
@@ -1661,10 +1641,7 @@ async def export_staff_report_excel(
     db=Depends(get_sync_db),
 ):
     """Export staff report as styled Excel (.xlsx)."""
-    from io import BytesIO
     from datetime import date as date_type
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 
     try:
         start = date_type.fromisoformat(start_date)
@@ -1676,16 +1653,6 @@ async def export_staff_report_excel(
         raise HTTPException(status_code=400, detail=f"Unknown type: {report_type}. Use: {', '.join(STAFF_REPORT_TYPES)}")
 
     service = StaffReportService(db)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"Staff {report_type.replace('-', ' ').title()}"
-
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="3F51B5", end_color="3F51B5", fill_type="solid")
-    thin_border = Border(
-        left=Side(style="thin"), right=Side(style="thin"),
-        top=Side(style="thin"), bottom=Side(style="thin"),
-    )
 
     if report_type == "performance":
         data = service.get_performance_report(business_id, start, end)
@@ -1710,33 +1677,21 @@ async def export_staff_report_excel(
     else:
         raise HTTPException(status_code=400, detail=f"Excel export not supported for: {report_type}")
 
-    for col_idx, h in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_idx, value=h)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
-        cell.border = thin_border
-
-    alt_fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
-    for row_idx, row_data in enumerate(rows, 2):
-        for col_idx, val in enumerate(row_data, 1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=val)
-            cell.border = thin_border
-            if row_idx % 2 == 0:
-                cell.fill = alt_fill
-
-    for col in ws.columns:
-        max_len = max((len(str(cell.value or "")) for cell in col), default=10)
-        ws.column_dimensions[col[0].column_letter].width = min(max_len + 4, 40)
-
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
+    wb = new_export_workbook()
+    ws = add_table_sheet(
+        wb,
+        f"Staff {report_type.replace('-', ' ').title()}",
+        headers,
+        column_widths(headers, rows),
+        header_color="3F51B5",
+    )
+    for row in rows:
+        ws.append(row)
 
     filename = f"staff_{report_type}_{start_date}_to_{end_date}.xlsx"
     return Response(
-        content=buffer.getvalue(),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        content=workbook_to_bytes(wb),
+        media_type=XLSX_MEDIA_TYPE,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
@@ -4,13 +4,13 @@ Provides CRUD for reservations, plus status transitions (seat, cancel, no-show)
 and conflict checking.
 """
 
-import math
 from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core.database import get_sync_db
+from app.core.pagination import TotalMode, total_mode_query
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.models.user import User
 from app.schemas.reservation import (
@@ -82,13 +82,15 @@ async def list_reservations(
     date_to: Optional[datetime] = None,
     reservation_status: Optional[str] = Query(None, alias="status"),
     table_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: TotalMode = Depends(total_mode_query),
     current_user: User = Depends(get_current_active_user),
     db=Depends(get_sync_db),
     business_id: str = Depends(get_current_business_id),
 ):
     """List reservations with optional filters."""
     service = ReservationService(db)
-    items, total = service.list_reservations(
+    result = service.list_reservations(
         business_id=business_id,
         date_from=date_from,
         date_to=date_to,
@@ -96,13 +98,12 @@ async def list_reservations(
         table_id=table_id,
         page=page,
         per_page=per_page,
+        total_mode=total_mode,
+        cursor=cursor,
     )
     return ReservationListResponse(
-        items=[_to_response(r) for r in items],
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=math.ceil(total / per_page) if total > 0 else 0,
+        items=[_to_response(r) for r in result.items],
+        **result.meta(),
     )
 
 
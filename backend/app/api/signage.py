@@ -1,7 +1,10 @@
 """API endpoints for digital signage content management.
 
 Provides CRUD for display groups, displays, content, playlists,
-and playlist items — all scoped to the current business.
+and playlist items — all scoped to the current business.  Publishing
+content and changing a playlist push ``signage.playlist_published`` over
+the realtime gateway so players refetch instead of polling.  Display
+heartbeats go through the heartbeat service, like customer displays.
 """
 
 import math
@@ -13,6 +16,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.database import get_sync_db
+from app.core.realtime import RealtimeEventType, emit_event
 from app.schemas.signage import (
     SignageDisplayGroupCreate,
     SignageDisplayGroupUpdate,
@@ -34,11 +38,21 @@ from app.schemas.signage import (
     SignagePlaylistItemResponse,
     SignagePlaylistItemListResponse,
 )
+from app.services.heartbeat_service import SIGNAGE_DISPLAY, cached_row, entity_key, presence, record_heartbeat
 from app.services.signage_service import SignageService
 
 router = APIRouter(prefix="/signage", tags=["Digital Signage"])
 
 
+def _with_presence(display) -> SignageDisplayResponse:
+    status, last_heartbeat_at = presence(
+        SIGNAGE_DISPLAY, entity_key(display.business_id, display.id), display.status, display.last_heartbeat_at
+    )
+    return SignageDisplayResponse.model_validate(display).model_copy(
+        update={"status": status, "last_heartbeat_at": last_heartbeat_at}
+    )
+
+
 # ---------------------------------------------------------------------------
 # Display Groups
 # ---------------------------------------------------------------------------
@@ -144,7 +158,7 @@ def list_displays(
     items, total = svc.list_displays(UUID(business_id), group_id, page, per_page)
     pages = max(1, math.ceil(total / per_page))
     return SignageDisplayListResponse(
-        items=items, total=total, page=page, per_page=per_page, pages=pages
+        items=[_with_presence(display) for display in items], total=total, page=page, per_page=per_page, pages=pages
     )
 
 
@@ -176,7 +190,7 @@ def get_display(
     display = svc.get_display(UUID(business_id), display_id)
     if not display:
         raise HTTPException(status_code=404, detail="Display not found")
-    return display
+    return _with_presence(display)
 
 
 @router.put("/displays/{display_id}", response_model=SignageDisplayResponse)
@@ -201,18 +215,25 @@ def update_display(
 
 
 @router.post("/displays/{display_id}/heartbeat", response_model=SignageDisplayResponse)
-def display_heartbeat(
+async def display_heartbeat(
     display_id: UUID,
     business_id: str = Depends(get_current_business_id),
     db: Session = Depends(get_sync_db),
     _user=Depends(get_current_active_user),
 ):
-    """Record a heartbeat from a signage display."""
-    svc = SignageService(db)
-    display = svc.record_heartbeat(UUID(business_id), display_id)
-    if not display:
+    """Record a heartbeat from a signage display (batched, see heartbeat_service)."""
+    def load():
+        display = SignageService(db).get_display(UUID(business_id), display_id)
+        return SignageDisplayResponse.model_validate(display).model_dump(mode="json") if display else None
+
+    key = entity_key(business_id, display_id)
+    row = await cached_row(SIGNAGE_DISPLAY, key, load)
+    if row is None:
         raise HTTPException(status_code=404, detail="Display not found")
-    return display
+    seen_at = await record_heartbeat(SIGNAGE_DISPLAY, key)
+    return SignageDisplayResponse.model_validate(row).model_copy(
+        update={"status": "online", "last_heartbeat_at": seen_at, "updated_at": seen_at}
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -310,6 +331,7 @@ def publish_content(
     content = svc.publish_content(UUID(business_id), content_id)
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
+    emit_event(business_id, RealtimeEventType.SIGNAGE_PLAYLIST_PUBLISHED, {"content_id": str(content_id)})
     return content
 
 
@@ -387,6 +409,7 @@ def update_playlist(
     )
     if not playlist:
         raise HTTPException(status_code=404, detail="Playlist not found")
+    emit_event(business_id, RealtimeEventType.SIGNAGE_PLAYLIST_PUBLISHED, {"playlist_id": str(playlist_id)})
     return playlist
 
 
@@ -432,12 +455,14 @@ def add_playlist_item(
     playlist = svc.get_playlist(UUID(business_id), playlist_id)
     if not playlist:
         raise HTTPException(status_code=404, detail="Playlist not found")
-    return svc.add_playlist_item(
+    item = svc.add_playlist_item(
         playlist_id=playlist_id,
         content_id=data.content_id,
         sort_order=data.sort_order,
         duration_seconds=data.duration_seconds,
     )
+    emit_event(business_id, RealtimeEventType.SIGNAGE_PLAYLIST_PUBLISHED, {"playlist_id": str(playlist_id)})
+    return item
 
 
 @router.delete("/playlists/items/{item_id}", status_code=204)
@@ -451,3 +476,4 @@ def remove_playlist_item(
     svc = SignageService(db)
     if not svc.remove_playlist_item(item_id):
         raise HTTPException(status_code=404, detail="Playlist item not found")
+    emit_event(business_id, RealtimeEventType.SIGNAGE_PLAYLIST_PUBLISHED, {"playlist_item_id": str(item_id)})
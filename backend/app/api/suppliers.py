@@ -1,11 +1,11 @@
 """Supplier API endpoints."""
 
-import math
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 
 from app.core.database import get_sync_db
+from app.core.pagination import TotalMode, total_mode_query
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.rbac import has_permission
 from app.models.user import User
@@ -46,14 +46,16 @@ async def list_suppliers(
     per_page: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
     tag: Optional[str] = None,
-    sort_by: str = Query("created_at", pattern="^(name|contact_name|email|created_at|updated_at)$"),
+    sort_by: str = Query("created_at", pattern="^(name|contact_name|email|created_at|updated_at|relevance)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: TotalMode = Depends(total_mode_query),
     current_user: User = Depends(get_current_active_user),
     db=Depends(get_sync_db),
     business_id: str = Depends(get_current_business_id),
 ):
     service = SupplierService(db)
-    suppliers, total = service.get_suppliers(
+    result = service.get_suppliers(
         business_id=business_id,
         page=page,
         per_page=per_page,
@@ -61,14 +63,13 @@ async def list_suppliers(
         tag=tag,
         sort_by=sort_by,
         sort_order=sort_order,
+        total_mode=total_mode,
+        cursor=cursor,
     )
 
     return SupplierListResponse(
-        items=[_supplier_to_response(s) for s in suppliers],
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=math.ceil(total / per_page) if total > 0 else 0,
+        items=[_supplier_to_response(s) for s in result.items],
+        **result.meta(),
     )
 
 
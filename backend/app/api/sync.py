@@ -4,15 +4,16 @@ Provides endpoints for mobile/offline clients to push queued changes,
 check sync status, and manage watermarks.
 """
 
-import math
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel as PydanticBase, Field
 
 from app.core.database import get_sync_db
+from app.core.pagination import TotalMode, total_mode_query
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.models.user import User
+from app.schemas.pagination import PaginatedResponse
 from app.services.sync_queue_service import SyncQueueService
 
 
@@ -47,13 +48,9 @@ class SyncQueueItemResponse(PydanticBase):
     model_config = {"from_attributes": True}
 
 
-class SyncQueueListResponse(PydanticBase):
+class SyncQueueListResponse(PaginatedResponse):
     """Paginated list of sync queue items."""
     items: list[SyncQueueItemResponse]
-    total: int
-    page: int
-    per_page: int
-    pages: int
 
 
 class SyncMetadataResponse(PydanticBase):
@@ -96,17 +93,21 @@ async def list_pending_items(
     entity_type: Optional[str] = None,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: TotalMode = Depends(total_mode_query),
     current_user: User = Depends(get_current_active_user),
     db=Depends(get_sync_db),
     business_id: str = Depends(get_current_business_id),
 ):
     """List pending sync queue items."""
     service = SyncQueueService(db)
-    items, total = service.list_pending(business_id, entity_type=entity_type, page=page, per_page=per_page)
-    pages = max(1, math.ceil(total / per_page))
+    result = service.list_pending(
+        business_id, entity_type=entity_type, page=page, per_page=per_page,
+        total_mode=total_mode, cursor=cursor,
+    )
     return SyncQueueListResponse(
-        items=[SyncQueueItemResponse.model_validate(i) for i in items],
-        total=total, page=page, per_page=per_page, pages=pages,
+        items=[SyncQueueItemResponse.model_validate(i) for i in result.items],
+        **result.meta(),
     )
 
 
@@ -8,6 +8,7 @@ from pydantic import BaseModel as PydanticBaseModel, ConfigDict
 
 from app.api.deps import get_current_active_user, get_current_business_id
 from app.core.database import get_sync_db
+from app.services.floor_state import get_floor_state, with_elapsed
 from app.services.table_service import TableService
 from app.models.restaurant_table import TableStatus
 
@@ -111,32 +112,16 @@ def list_tables(
 
 
 @router.get("/floor-plan")
-def get_floor_plan(
+async def get_floor_plan(
     business_id: UUID = Depends(get_current_business_id),
     db: Session = Depends(get_sync_db),
     _user=Depends(get_current_active_user),
 ):
-    """Get floor plan with table status and order info."""
-    service = TableService(db)
-    tables_with_orders = service.get_tables_with_orders(business_id)
-    result = []
-    for item in tables_with_orders:
-        table = item["table"]
-        order = item["current_order"]
-        result.append({
-            "id": str(table.id),
-            "table_number": table.table_number,
-            "capacity": table.capacity,
-            "status": table.status.value if hasattr(table.status, 'value') else table.status,
-            "section": table.section,
-            "position_x": float(table.position_x or 0),
-            "position_y": float(table.position_y or 0),
-            "has_active_order": item["has_active_order"],
-            "order_number": order.order_number if order else None,
-            "order_total": float(order.total) if order else None,
-            "order_item_count": order.item_count if order else 0,
-        })
-    return result
+    """Get floor plan with table status and order info (cached per business)."""
+    rows = await get_floor_state(
+        business_id, lambda: TableService(db).get_floor_state(business_id)
+    )
+    return with_elapsed(rows)
 
 
 @router.get("/{table_id}", response_model=TableResponse)
@@ -9,10 +9,6 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict
 
-# Import openpyxl at module level for efficiency
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-
 from app.core.database import get_sync_db
 from app.api.deps import get_current_active_user, get_current_business_id, check_feature
 from app.core.rbac import has_permission
@@ -501,8 +497,10 @@ async def export_payroll_report(
     db=Depends(get_sync_db),
 ):
     """Export payroll report to Excel (requires reports:view permission and payroll feature)."""
-    # openpyxl imported at module level for efficiency
-    
+    # openpyxl is only needed by this export; keep it out of startup
+    import openpyxl
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+
     service = TimeTrackingService(db)
     
     # Default to current pay period
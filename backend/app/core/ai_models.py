@@ -10,17 +10,22 @@ Architecture:
 4. Automatic Fallback - Retry logic with fallback chain
 5. Environment Overrides - Production safety controls
 6. Observability - Logging for debugging and cost monitoring
+
+HTTP goes through the shared transport in app/core/llm_transport.py
+(pooled keep-alive client, per-model circuit breakers, optional hedging,
+latency/token histograms).
 """
 
 import json
 import os
 import logging
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 from dataclasses import dataclass, field
 import httpx
 
 from app.core.config import settings
+from app.core.llm_transport import LLMStatusError, get_llm_transport, hedged_call
 
 
 logger = logging.getLogger(__name__)
@@ -129,6 +134,66 @@ class ModelExecutionError(Exception):
         super().__init__(f"Model {model} failed: {error}")
 
 
+@dataclass
+class LLMStreamChunk:
+    """One piece of a streamed completion.
+
+    Content arrives as ``delta`` chunks; the last chunk carries the complete
+    ``response`` (full content, tool calls, usage) and an empty delta.
+    """
+    delta: str = ""
+    response: LLMResponse | None = None
+
+
+def _auth_headers() -> dict[str, str]:
+    return {
+        "Authorization": f"Bearer {settings.GROQ_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+
+def _build_payload(model: str, messages: list[dict[str, Any]], stream: bool, **kwargs) -> dict[str, Any]:
+    """Chat completion request body shared by run_groq and run_groq_stream."""
+    payload: dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "temperature": kwargs.get("temperature", 0.7),
+        "max_tokens": kwargs.get("max_tokens", 2048),
+        "top_p": kwargs.get("top_p", 1.0),
+        "stream": stream,
+    }
+    if stream:
+        # Ask for a final usage chunk (OpenAI); Groq also sends x_groq.usage
+        payload["stream_options"] = {"include_usage": True}
+
+    # Add tools if provided (Groq supports OpenAI-compatible function calling)
+    tools = kwargs.get("tools")
+    if tools:
+        payload["tools"] = tools
+        payload["tool_choice"] = kwargs.get("tool_choice", "auto")
+    return payload
+
+
+def _parse_tool_calls(raw_tool_calls: Optional[list[dict[str, Any]]]) -> list[dict[str, Any]] | None:
+    """Convert OpenAI tool_calls into {id, name, arguments(dict)} entries."""
+    if not raw_tool_calls:
+        return None
+    parsed_tool_calls = []
+    for tc in raw_tool_calls:
+        fn = tc.get("function", {})
+        args_str = fn.get("arguments", "{}")
+        try:
+            parsed_args = json.loads(args_str)
+        except (json.JSONDecodeError, TypeError):
+            parsed_args = {}
+        parsed_tool_calls.append({
+            "id": tc.get("id", ""),
+            "name": fn.get("name", ""),
+            "arguments": parsed_args,
+        })
+    return parsed_tool_calls
+
+
 async def run_groq(model: str, messages: list[dict[str, Any]], **kwargs) -> LLMResponse:
     """
     Execute a Groq model request with error handling.
@@ -150,78 +215,43 @@ async def run_groq(model: str, messages: list[dict[str, Any]], **kwargs) -> LLMR
     if not settings.GROQ_API_KEY:
         raise ModelExecutionError(model, "GROQ_API_KEY not configured")
 
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {settings.GROQ_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    # Build request payload
-    payload: dict[str, Any] = {
-        "model": model,
-        "messages": messages,
-        "temperature": kwargs.get("temperature", 0.7),
-        "max_tokens": kwargs.get("max_tokens", 2048),
-        "top_p": kwargs.get("top_p", 1.0),
-        "stream": False,
-    }
-
-    # Add tools if provided (Groq supports OpenAI-compatible function calling)
-    tools = kwargs.get("tools")
-    if tools:
-        payload["tools"] = tools
-        payload["tool_choice"] = kwargs.get("tool_choice", "auto")
+    headers = _auth_headers()
+    payload = _build_payload(model, messages, stream=False, **kwargs)
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-
-            # Handle HTTP errors
-            if response.status_code != 200:
-                error_detail = response.text
-                raise ModelExecutionError(
-                    model=model,
-                    error=f"HTTP {response.status_code}: {error_detail}",
-                    status_code=response.status_code,
-                )
-
-            data = response.json()
-
-            # Extract response content
-            choice = data.get("choices", [{}])[0]
-            message_data = choice.get("message", {})
-            content = message_data.get("content") or ""
-
-            # Parse tool calls if present
-            raw_tool_calls = message_data.get("tool_calls")
-            parsed_tool_calls = None
-            if raw_tool_calls:
-                parsed_tool_calls = []
-                for tc in raw_tool_calls:
-                    fn = tc.get("function", {})
-                    args_str = fn.get("arguments", "{}")
-                    try:
-                        parsed_args = json.loads(args_str)
-                    except (json.JSONDecodeError, TypeError):
-                        parsed_args = {}
-                    parsed_tool_calls.append({
-                        "id": tc.get("id", ""),
-                        "name": fn.get("name", ""),
-                        "arguments": parsed_args,
-                    })
-
-            # Allow empty content when tool_calls are present
-            if not content and not parsed_tool_calls:
-                raise ModelExecutionError(model, "No content in response")
-
-            return LLMResponse(
-                content=str(content),
-                model_used=model,
-                finish_reason=choice.get("finish_reason", "unknown"),
-                usage=data.get("usage", {}),
-                tool_calls=parsed_tool_calls,
+        response = await get_llm_transport().chat_completion(model, payload, headers=headers)
+
+        # Handle HTTP errors
+        if response.status_code != 200:
+            error_detail = response.text
+            raise ModelExecutionError(
+                model=model,
+                error=f"HTTP {response.status_code}: {error_detail}",
+                status_code=response.status_code,
             )
 
+        data = response.json()
+
+        # Extract response content
+        choice = data.get("choices", [{}])[0]
+        message_data = choice.get("message", {})
+        content = message_data.get("content") or ""
+
+        # Parse tool calls if present
+        parsed_tool_calls = _parse_tool_calls(message_data.get("tool_calls"))
+
+        # Allow empty content when tool_calls are present
+        if not content and not parsed_tool_calls:
+            raise ModelExecutionError(model, "No content in response")
+
+        return LLMResponse(
+            content=str(content),
+            model_used=model,
+            finish_reason=choice.get("finish_reason", "unknown"),
+            usage=data.get("usage", {}),
+            tool_calls=parsed_tool_calls,
+        )
+
     except ModelExecutionError:
         raise
     except httpx.TimeoutException as e:
@@ -232,10 +262,96 @@ async def run_groq(model: str, messages: list[dict[str, Any]], **kwargs) -> LLMR
         raise ModelExecutionError(model, f"Unexpected error: {str(e)}")
 
 
+async def run_groq_stream(
+    model: str, messages: list[dict[str, Any]], **kwargs
+) -> AsyncIterator[LLMStreamChunk]:
+    """
+    Streamed variant of run_groq (provider SSE, ``"stream": true``).
+
+    Yields an LLMStreamChunk per content delta as soon as it arrives, then a
+    final chunk with the assembled LLMResponse.  Tool-call fragments are
+    accumulated and parsed once the stream ends.
+
+    Raises:
+        ModelExecutionError: If the request fails or the stream is empty
+    """
+    if not settings.GROQ_API_KEY:
+        raise ModelExecutionError(model, "GROQ_API_KEY not configured")
+
+    payload = _build_payload(model, messages, stream=True, **kwargs)
+    content_parts: list[str] = []
+    tool_fragments: dict[int, dict[str, Any]] = {}
+    finish_reason = "unknown"
+    usage: dict[str, int] = {}
+
+    try:
+        async for chunk in get_llm_transport().stream_chat_completion(model, payload, headers=_auth_headers()):
+            usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage") or usage
+            for choice in chunk.get("choices") or []:
+                delta = choice.get("delta") or {}
+                if delta.get("content"):
+                    content_parts.append(delta["content"])
+                    yield LLMStreamChunk(delta=delta["content"])
+                for fragment in delta.get("tool_calls") or []:
+                    call = tool_fragments.setdefault(
+                        fragment.get("index", 0), {"id": "", "function": {"name": "", "arguments": ""}}
+                    )
+                    call["id"] = fragment.get("id") or call["id"]
+                    fn = fragment.get("function") or {}
+                    call["function"]["name"] += fn.get("name") or ""
+                    call["function"]["arguments"] += fn.get("arguments") or ""
+                finish_reason = choice.get("finish_reason") or finish_reason
+    except LLMStatusError as e:
+        raise ModelExecutionError(
+            model=model,
+            error=f"HTTP {e.status_code}: {e.body}",
+            status_code=e.status_code,
+        )
+    except httpx.TimeoutException as e:
+        raise ModelExecutionError(model, f"Request timeout: {str(e)}")
+    except httpx.RequestError as e:
+        raise ModelExecutionError(model, f"Request error: {str(e)}")
+    except Exception as e:
+        raise ModelExecutionError(model, f"Unexpected error: {str(e)}")
+
+    content = "".join(content_parts)
+    tool_calls = _parse_tool_calls([tool_fragments[i] for i in sorted(tool_fragments)])
+    if not content and not tool_calls:
+        raise ModelExecutionError(model, "No content in response")
+
+    yield LLMStreamChunk(response=LLMResponse(
+        content=content,
+        model_used=model,
+        finish_reason=finish_reason,
+        usage=usage,
+        tool_calls=tool_calls,
+    ))
+
+
 # ============================================================================
 # 5. AUTOMATIC MODEL FALLBACK (Critical)
 # ============================================================================
 
+def _candidate_models(task_type: TaskType) -> list[str]:
+    """Models to try for a task: task models, then universal fallbacks.
+
+    Models whose circuit is open, or half-open with a probe already out, are
+    skipped; if none is available the whole chain is tried anyway rather
+    than failing without a request.
+    """
+    models = get_models_for_task(task_type)
+    chain = list(models)
+    if task_type != TaskType.FALLBACK:
+        chain += [m for m in MODEL_REGISTRY["fallback"] if m not in chain]
+
+    transport = get_llm_transport()
+    candidates = [m for m in chain if transport.breaker(m).available()] or chain
+    for model in chain:
+        if model not in candidates:
+            logger.warning(f"Skipping model={model}: circuit open")
+    return candidates
+
+
 async def execute_task(
     task_type: TaskType,
     messages: list[dict[str, Any]],
@@ -246,9 +362,10 @@ async def execute_task(
 
     This function:
     1. Gets model list for task type (with env overrides)
-    2. Tries each model in priority order
+    2. Tries each model in priority order, skipping open circuits
     3. Falls back to universal fallback on all failures
-    4. Logs all failures for observability
+    4. Optionally hedges slow models (LLM_HEDGE_DELAY_MS)
+    5. Logs all failures for observability
 
     Args:
         task_type: Type of task (fast, reasoning, tool_calling, summarization)
@@ -261,78 +378,100 @@ async def execute_task(
     Raises:
         RuntimeError: If all models fail (including fallback)
     """
-    # Get models for this task type
-    models = get_models_for_task(task_type)
+    candidates = _candidate_models(task_type)
 
     # Track failures for logging
     failures = []
 
-    # Try each model in priority order
-    for model in models:
-        try:
-            logger.info(f"Attempting task_type={task_type.value} with model={model}")
-            response = await run_groq(model, messages, **kwargs)
+    def record_failure(model: str, e: ModelExecutionError) -> None:
+        # Log failure; hedged_call moves on to the next model
+        logger.warning(
+            f"✗ Model failure: task_type={task_type.value}, model={model}, "
+            f"error={e.error}, status_code={e.status_code}"
+        )
+        failures.append({
+            "model": model,
+            "error": e.error,
+            "status_code": e.status_code,
+        })
+
+    async def attempt(model: str) -> LLMResponse:
+        logger.info(f"Attempting task_type={task_type.value} with model={model}")
+        return await run_groq(model, messages, **kwargs)
+
+    # Try each model in priority order; with LLM_HEDGE_DELAY_MS set, a slow
+    # model is raced against the next one instead of waited out
+    model, response = await hedged_call(
+        candidates,
+        attempt,
+        hedge_delay=settings.LLM_HEDGE_DELAY_MS / 1000,
+        retry_on=(ModelExecutionError,),
+        on_failure=record_failure,
+    )
+    if response is not None:
+        # Log success
+        logger.info(
+            f"✓ Success: task_type={task_type.value}, model={model}, "
+            f"tokens={response.usage.get('total_tokens', 0)}"
+        )
+        return response
 
-            # Log success
-            logger.info(
-                f"✓ Success: task_type={task_type.value}, model={model}, "
-                f"tokens={response.usage.get('total_tokens', 0)}"
-            )
+    # All models failed (including fallback)
+    logger.error(
+        f"CRITICAL: All Groq models failed for task_type={task_type.value}. "
+        f"Failures: {failures}"
+    )
+
+    raise RuntimeError(
+        f"All Groq models failed for task_type={task_type.value}. "
+        f"Attempted {len(failures)} models. Check logs for details."
+    )
+
+
+async def execute_task_stream(
+    task_type: TaskType,
+    messages: list[dict[str, Any]],
+    **kwargs
+) -> AsyncIterator[LLMStreamChunk]:
+    """
+    Streaming execute_task: yields run_groq_stream chunks from the first
+    model that answers.
 
-            return response
+    Uses the same model chain and circuit breakers as execute_task.  A model
+    that fails before its first token falls back to the next one; once
+    tokens have been sent to the caller a failure cannot be retried
+    transparently and raises.  Requests are not hedged.
 
+    Raises:
+        RuntimeError: If all models fail, or a model fails mid-stream
+    """
+    failures = []
+    for model in _candidate_models(task_type):
+        streamed = False
+        try:
+            logger.info(f"Attempting streamed task_type={task_type.value} with model={model}")
+            async for chunk in run_groq_stream(model, messages, **kwargs):
+                streamed = streamed or bool(chunk.delta)
+                if chunk.response is not None:
+                    logger.info(
+                        f"✓ Success: task_type={task_type.value}, model={model}, "
+                        f"tokens={chunk.response.usage.get('total_tokens', 0)}"
+                    )
+                yield chunk
+            return
         except ModelExecutionError as e:
-            # Log failure and continue to next model
             logger.warning(
                 f"✗ Model failure: task_type={task_type.value}, model={model}, "
                 f"error={e.error}, status_code={e.status_code}"
             )
-            failures.append({
-                "model": model,
-                "error": e.error,
-                "status_code": e.status_code,
-            })
-            continue
-
-    # All primary models failed, try universal fallback
-    if task_type != TaskType.FALLBACK:
-        logger.warning(
-            f"All models failed for task_type={task_type.value}, "
-            f"attempting universal fallback"
-        )
+            failures.append({"model": model, "error": e.error, "status_code": e.status_code})
+            if streamed:
+                raise RuntimeError(f"Model {model} failed mid-stream: {e.error}") from e
 
-        fallback_models = MODEL_REGISTRY["fallback"]
-        for model in fallback_models:
-            # Skip if already tried
-            if model in models:
-                continue
-
-            try:
-                logger.info(f"Fallback attempt with model={model}")
-                response = await run_groq(model, messages, **kwargs)
-
-                logger.info(
-                    f"✓ Fallback success: model={model}, "
-                    f"tokens={response.usage.get('total_tokens', 0)}"
-                )
-
-                return response
-
-            except ModelExecutionError as e:
-                logger.warning(f"✗ Fallback failure: model={model}, error={e.error}")
-                failures.append({
-                    "model": model,
-                    "error": e.error,
-                    "status_code": e.status_code,
-                })
-                continue
-
-    # All models failed (including fallback)
     logger.error(
         f"CRITICAL: All Groq models failed for task_type={task_type.value}. "
         f"Failures: {failures}"
     )
-
     raise RuntimeError(
         f"All Groq models failed for task_type={task_type.value}. "
         f"Attempted {len(failures)} models. Check logs for details."
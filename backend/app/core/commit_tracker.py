@@ -0,0 +1,108 @@
+"""Businesses touched by each commit, for caches that follow writes.
+
+Several caches (AI context snapshots, floor state, scan lookups) refresh or
+drop a business's entry when a commit changes its data.  One set of
+SQLAlchemy session hooks serves all of them: after each flush the new,
+dirty and deleted objects are walked once and offered to every subscriber
+that tracks their model, which names the business the object touches.
+After the commit each subscriber receives the businesses it collected; a
+rollback forgets them.
+
+Subscribers register when their cache starts (application startup) and
+leave when it stops.  The session hooks are installed while at least one
+subscriber is registered.
+"""
+
+import itertools
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_SESSION_INFO_KEY = "touched_businesses"
+
+
+@dataclass(frozen=True)
+class CommitSubscriber:
+    """
+    A consumer of touched businesses.
+
+    ``touched(obj, new_or_deleted)`` is called for flushed instances of
+    ``models`` and returns the business key *obj* touches, or None when the
+    change does not concern this subscriber.  ``on_commit`` receives the set
+    of keys once the transaction commits; it runs in the committing thread.
+    """
+
+    name: str
+    models: Tuple[type, ...]
+    touched: Callable[[Any, bool], Optional[Any]]
+    on_commit: Callable[[Set[Any]], None]
+
+
+_subscribers: Dict[str, CommitSubscriber] = {}
+_lock = threading.Lock()
+
+
+def subscribe(subscriber: CommitSubscriber) -> None:
+    with _lock:
+        _subscribers[subscriber.name] = subscriber
+        if not event.contains(Session, "after_flush", _after_flush):
+            event.listen(Session, "after_flush", _after_flush)
+            event.listen(Session, "after_commit", _after_commit)
+            event.listen(Session, "after_rollback", _after_rollback)
+
+
+def unsubscribe(name: str) -> None:
+    with _lock:
+        _subscribers.pop(name, None)
+        if not _subscribers and event.contains(Session, "after_flush", _after_flush):
+            event.remove(Session, "after_flush", _after_flush)
+            event.remove(Session, "after_commit", _after_commit)
+            event.remove(Session, "after_rollback", _after_rollback)
+
+
+def mark_touched(session: Session, name: str, keys: Iterable[Any]) -> None:
+    """Record *keys* for subscriber *name* outside a flush (bulk statements)."""
+    session.info.setdefault(_SESSION_INFO_KEY, {}).setdefault(name, set()).update(keys)
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    subscribers = tuple(_subscribers.values())
+    if not subscribers:
+        return
+    touched = session.info.setdefault(_SESSION_INFO_KEY, {})
+    changes = itertools.chain(
+        ((obj, True) for obj in itertools.chain(session.new, session.deleted)),
+        ((obj, False) for obj in session.dirty),
+    )
+    for obj, new_or_deleted in changes:
+        for subscriber in subscribers:
+            if not isinstance(obj, subscriber.models):
+                continue
+            key = subscriber.touched(obj, new_or_deleted)
+            if key is not None:
+                touched.setdefault(subscriber.name, set()).add(key)
+
+
+def _after_commit(session: Session) -> None:
+    touched = session.info.pop(_SESSION_INFO_KEY, None)
+    if not touched:
+        return
+    for name, keys in touched.items():
+        subscriber = _subscribers.get(name)
+        if subscriber is None or not keys:
+            continue
+        try:
+            subscriber.on_commit(keys)
+        except Exception as exc:
+            # One failing cache must not keep the others stale
+            logger.warning("Commit subscriber %s failed: %s", name, exc)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -114,10 +114,53 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     GROQ_API_KEY: str = ""
 
+    # LLM transport (OpenAI-compatible chat completions, see app/core/llm_transport.py)
+    LLM_BASE_URL: str = "https://api.groq.com/openai/v1"
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_HEDGE_DELAY_MS: int = 0  # 0 = try fallback models strictly one after another
+    LLM_BREAKER_FAILURES: int = 5
+    LLM_BREAKER_RESET_SECONDS: int = 30
+    LLM_COST_PER_1K_TOKENS: float = 0.0  # USD blended price for agent cost counters (0 = untracked)
+
+    # Agent step audit log: buffered and written in batches by a background task
+    AGENT_LOG_BUFFER_SIZE: int = 10000  # oldest steps are dropped beyond this
+    AGENT_LOG_BATCH_SIZE: int = 200
+    AGENT_LOG_FLUSH_SECONDS: float = 1.0
+
+    # AI business context snapshot (Redis): refreshed after commits, expires as a staleness bound
+    AI_CONTEXT_SNAPSHOT_TTL_SECONDS: int = 900
+    AI_CONTEXT_REFRESH_DEBOUNCE_SECONDS: float = 5.0
+
+    # Real-time push gateway (WebSocket / SSE)
+    REALTIME_QUEUE_SIZE: int = 100  # events buffered per connection before a resync
+    REALTIME_KEEPALIVE_SECONDS: float = 25.0
+
+    # Display/device heartbeats: presence in Redis, last-seen written in batches
+    HEARTBEAT_PRESENCE_TTL_SECONDS: int = 90  # online while a heartbeat is this recent
+    HEARTBEAT_FLUSH_SECONDS: float = 30.0
+
+    # Floor plan (tables + open orders) cache; invalidated on table/order commits
+    FLOOR_STATE_TTL_SECONDS: int = 60
+
+    # Barcode/SKU scan lookups: per-business in-memory maps, invalidated on product commits
+    SCAN_INDEX_TTL_SECONDS: int = 300
+    SCAN_INDEX_CHECK_SECONDS: float = 1.0  # how often a worker compares its map's generation in Redis
+    SCAN_INDEX_MAX_BUSINESSES: int = 200
+    SCAN_INDEX_WARM_BUSINESSES: int = 50  # businesses (that sold in the last day) warmed at startup
+
+    # Import and mount the API routers after startup (warmed in the background, or on the
+    # first non-health request) so a worker answers health checks within a second
+    LAZY_API_ROUTERS: bool = False
+
     # Paystack (South Africa Payment Gateway)
     PAYSTACK_SECRET_KEY: str = ""
     PAYSTACK_PUBLIC_KEY: str = ""
     
+    # File exports (background export jobs write here; empty = system temp dir)
+    EXPORT_DIR: str = ""
+    EXPORT_FILE_TTL_HOURS: int = 24
+
     # Frontend URL for callbacks
     FRONTEND_URL: str = "http://localhost:3000"
 
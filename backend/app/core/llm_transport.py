@@ -0,0 +1,387 @@
+"""Shared HTTP transport for OpenAI-compatible chat completion calls.
+
+One process-wide ``httpx.AsyncClient`` serves every LLM request, so the
+classification, ReAct and summary calls of an agent run reuse pooled
+keep-alive connections instead of paying a TCP + TLS handshake each time.
+HTTP/2 is used when the optional ``h2`` package is installed.
+
+On top of the pooled client this module provides:
+
+- a circuit breaker per model: after ``LLM_BREAKER_FAILURES`` consecutive
+  failures the model is skipped for ``LLM_BREAKER_RESET_SECONDS``; after
+  that a single caller probes it and one more failure re-opens the circuit;
+- ``hedged_call``: walks a fallback chain, optionally starting the next
+  model when the current one has not answered within a latency budget
+  (``LLM_HEDGE_DELAY_MS``, 0 = strictly serial) and returning whichever
+  succeeds first;
+- ``stream_chat_completion`` for SSE streaming (``"stream": true``);
+- latency, time-to-first-token and token histograms per model
+  (``LLMTransport.stats``).
+
+The base URL is configurable (``LLM_BASE_URL``) so tests and local
+development can point the transport at a mock server.
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import time
+from bisect import bisect_left
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple, Type
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+
+class LLMStatusError(Exception):
+    """Non-200 response to a streamed request (the body has been read)."""
+
+    def __init__(self, status_code: int, body: str):
+        self.status_code = status_code
+        self.body = body
+        super().__init__(f"HTTP {status_code}: {body}")
+
+
+class Histogram:
+    """Fixed-bucket histogram with cumulative (Prometheus-style) counts."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative, running = {}, 0
+        for bound, count in zip((*self.buckets, "+Inf"), self._counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {"count": self.count, "sum": round(self.sum, 3), "buckets": cumulative}
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def available(self) -> bool:
+        """Whether a call may be attempted now.
+
+        Always when closed.  When half-open only the first caller is let
+        through, as the probe; the rest are refused until its outcome is
+        recorded.  A probe that never reports back (cancelled, or picked but
+        not started) is given up after ``reset_timeout`` and the next caller
+        probes instead.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+        now = self._clock()
+        if self._probe_at is not None and now - self._probe_at < self.reset_timeout:
+            return False
+        self._probe_at = now
+        return True
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_at = None
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning(
+                    "Circuit opened for %s after %d consecutive failures", self.name, self._failures
+                )
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+
+
+class _ModelStats:
+    def __init__(self):
+        self.successes = 0
+        self.failures = 0
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.ttft_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.tokens = Histogram(TOKEN_BUCKETS)
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class LLMTransport:
+    """Pooled, circuit-broken HTTP client for chat completion requests."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 60.0,
+        max_connections: int = 20,
+        breaker_failures: int = 5,
+        breaker_reset_seconds: float = 30.0,
+        http2: Optional[bool] = None,
+        http_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.http2 = http2_available() if http2 is None else http2
+        self._http_transport = http_transport
+        self._breaker_failures = breaker_failures
+        self._breaker_reset = breaker_reset_seconds
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, _ModelStats] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # A pooled client is bound to the event loop that opened its
+        # connections; build a new one if the loop changed (tests, reloads).
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self._http_transport,
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        if model not in self._breakers:
+            self._breakers[model] = CircuitBreaker(
+                model, self._breaker_failures, self._breaker_reset
+            )
+        return self._breakers[model]
+
+    def _model_stats(self, model: str) -> _ModelStats:
+        if model not in self._stats:
+            self._stats[model] = _ModelStats()
+        return self._stats[model]
+
+    def record_failure(self, model: str) -> None:
+        self.breaker(model).record_failure()
+        self._model_stats(model).failures += 1
+
+    async def chat_completion(
+        self, model: str, payload: dict, headers: Optional[dict] = None
+    ) -> httpx.Response:
+        """POST /chat/completions, recording latency, tokens and breaker state.
+
+        Non-200 responses and transport errors count as failures for the
+        model's circuit breaker; httpx errors are re-raised to the caller.
+        """
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().post("/chat/completions", json=payload, headers=headers)
+        except httpx.HTTPError:
+            self.record_failure(model)
+            raise
+
+        stats = self._model_stats(model)
+        stats.latency_ms.observe((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            self.record_failure(model)
+            return response
+
+        self.breaker(model).record_success()
+        stats.successes += 1
+        try:
+            usage = response.json().get("usage") or {}
+        except ValueError:
+            usage = {}
+        if usage.get("total_tokens") is not None:
+            stats.tokens.observe(usage["total_tokens"])
+        return response
+
+    async def stream_chat_completion(
+        self, model: str, payload: dict, headers: Optional[dict] = None
+    ) -> AsyncIterator[dict]:
+        """POST a streaming chat completion and yield each SSE ``data:`` chunk.
+
+        Records time to the first content/tool-call delta, total latency,
+        usage (from a final usage chunk or Groq's ``x_groq.usage``) and the
+        breaker outcome.  Raises LLMStatusError for non-200 responses.
+        """
+        stats = self._model_stats(model)
+        started = time.perf_counter()
+        first_token = False
+        usage: dict = {}
+        try:
+            async with self._get_client().stream(
+                "POST", "/chat/completions", json=payload, headers=headers
+            ) as response:
+                if response.status_code != 200:
+                    body = (await response.aread()).decode(errors="replace")
+                    raise LLMStatusError(response.status_code, body)
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        chunk = json.loads(data)
+                    except ValueError:
+                        continue
+                    if not first_token and any(
+                        (c.get("delta") or {}).get("content") or (c.get("delta") or {}).get("tool_calls")
+                        for c in chunk.get("choices") or []
+                    ):
+                        first_token = True
+                        stats.ttft_ms.observe((time.perf_counter() - started) * 1000)
+                    usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage") or usage
+                    yield chunk
+        except (httpx.HTTPError, LLMStatusError):
+            self.record_failure(model)
+            raise
+
+        stats.latency_ms.observe((time.perf_counter() - started) * 1000)
+        self.breaker(model).record_success()
+        stats.successes += 1
+        if usage.get("total_tokens") is not None:
+            stats.tokens.observe(usage["total_tokens"])
+
+    def stats(self) -> dict:
+        """Per-model breaker state, counters and histograms."""
+        return {
+            "http2": self.http2,
+            "models": {
+                model: {
+                    "circuit": self.breaker(model).state,
+                    "successes": s.successes,
+                    "failures": s.failures,
+                    "latency_ms": s.latency_ms.snapshot(),
+                    "ttft_ms": s.ttft_ms.snapshot(),
+                    "total_tokens": s.tokens.snapshot(),
+                }
+                for model, s in self._stats.items()
+            },
+        }
+
+
+async def hedged_call(
+    models: Iterable[str],
+    call: Callable[[str], Awaitable[Any]],
+    hedge_delay: float = 0.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    on_failure: Optional[Callable[[str, BaseException], None]] = None,
+) -> Tuple[Optional[str], Any]:
+    """Try ``models`` in order and return ``(model, result)`` of the first success.
+
+    A failure (an exception in ``retry_on``) starts the next model at once.
+    With ``hedge_delay > 0`` the next model is also started whenever every
+    in-flight call has been running for that long without an answer; the
+    first success wins and the remaining calls are cancelled.  Returns
+    ``(None, None)`` when every model failed.
+    """
+    queue = list(models)
+    pending: Dict[asyncio.Task, str] = {}
+
+    def launch() -> None:
+        model = queue.pop(0)
+        pending[asyncio.ensure_future(call(model))] = model
+
+    if not queue:
+        return None, None
+    launch()
+    try:
+        while pending:
+            timeout = hedge_delay if hedge_delay > 0 and queue else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.info("Hedging: no answer after %.0fms, starting %s", hedge_delay * 1000, queue[0])
+                launch()
+                continue
+            for task in done:
+                model = pending.pop(task)
+                error = task.exception()
+                if error is None:
+                    return model, task.result()
+                if not isinstance(error, retry_on):
+                    raise error
+                if on_failure:
+                    on_failure(model, error)
+                if queue:
+                    launch()
+        return None, None
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+_transport: Optional[LLMTransport] = None
+
+
+def get_llm_transport() -> LLMTransport:
+    """Process-wide transport, built from settings on first use."""
+    global _transport
+    if _transport is None:
+        _transport = LLMTransport(
+            base_url=settings.LLM_BASE_URL,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            breaker_failures=settings.LLM_BREAKER_FAILURES,
+            breaker_reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+        )
+    return _transport
+
+
+async def close_llm_transport() -> None:
+    """Close the pooled client (application shutdown)."""
+    global _transport
+    if _transport is not None:
+        await _transport.aclose()
+        _transport = None
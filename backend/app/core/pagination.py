@@ -0,0 +1,287 @@
+"""Shared pagination for list endpoints.
+
+List services used to run ``query.count()`` over the whole filtered set and
+then ``offset().limit()`` for the page; on large tables the count cost more
+than the page.  ``paginate`` runs the page query (fetching one extra row to
+tell whether another page exists) and produces the total as the caller
+asks:
+
+- ``TotalMode.EXACT``: ``SELECT count(*)``, as before (the default).
+- ``TotalMode.WINDOW``: ``count(*) OVER ()`` in the page query, so the page
+  and its total come back in one round trip.
+- ``TotalMode.ESTIMATE``: the planner's row estimate - ``pg_class.reltuples``
+  for an unfiltered table, ``EXPLAIN`` otherwise.  Estimates below
+  ``EXACT_BELOW`` are replaced by a count, which is cheap there and where
+  estimates are least reliable.  Other dialects count.
+- ``TotalMode.NONE``: no total (``include_total=false``); clients page on
+  ``has_more``.
+
+In every mode a page that is known to be the last one (``has_more`` false)
+derives the exact total from its offset, without a count.
+
+Keyset pagination: with ``keyset`` columns (the sort column, then the
+primary key) every page carries a ``next_cursor``; passing it back fetches
+the rows after the previous page with a row-value comparison instead of an
+OFFSET, so deep pages cost the same as the first.  Keyset columns must be
+non-null and sorted in one direction.
+"""
+
+import base64
+import enum
+import json
+import math
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, TypeVar
+
+from fastapi import Query as QueryParam, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, literal, text, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+T = TypeVar("T")
+
+# Estimates below this are replaced by an exact count
+EXACT_BELOW = 1000
+
+
+class TotalMode(str, enum.Enum):
+    """How a paginated list produces its total."""
+
+    EXACT = "exact"
+    WINDOW = "window"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+class PaginationError(ValueError):
+    """Invalid cursor, or cursor pagination requested where it is not supported."""
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a list, with its total (None when not requested)."""
+
+    items: List[T]
+    total: Optional[int]
+    page: int
+    per_page: int
+    has_more: bool
+    total_estimated: bool = False
+    next_cursor: Optional[str] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        # Unpacks as ``items, total`` like the tuples list services return
+        return iter((self.items, self.total))
+
+    @property
+    def pages(self) -> Optional[int]:
+        if self.total is None:
+            return None
+        return math.ceil(self.total / self.per_page) if self.total > 0 else 0
+
+    def meta(self) -> Dict[str, Any]:
+        """Response fields besides ``items`` (see PaginatedResponse)."""
+        return {
+            "total": self.total,
+            "page": self.page,
+            "per_page": self.per_page,
+            "pages": self.pages,
+            "has_more": self.has_more,
+            "total_estimated": self.total_estimated,
+            "next_cursor": self.next_cursor,
+        }
+
+
+async def pagination_error_handler(request: Request, exc: PaginationError) -> JSONResponse:
+    """Answer a bad cursor (or an unsupported one) with 400 instead of 500."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+def total_mode_query(
+    include_total: bool = QueryParam(True, description="Set false to skip computing the total"),
+    total_mode: TotalMode = QueryParam(TotalMode.EXACT, description="exact, window, estimate or none"),
+) -> TotalMode:
+    """FastAPI dependency: the requested TotalMode (``include_total=false`` means none)."""
+    return total_mode if include_total else TotalMode.NONE
+
+
+# Cursors --------------------------------------------------------------------
+
+def _tag(value: Any) -> List[Any]:
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, uuid.UUID):
+        return ["u", str(value)]
+    if isinstance(value, Decimal):
+        return ["n", str(value)]
+    if isinstance(value, (str, int, float, bool)):
+        return ["v", value]
+    raise PaginationError(f"Cannot page by a {type(value).__name__} column")
+
+
+def _untag(tagged: List[Any]) -> Any:
+    kind, value = tagged
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "d":
+        return date.fromisoformat(value)
+    if kind == "u":
+        return uuid.UUID(value)
+    if kind == "n":
+        return Decimal(value)
+    if kind == "v":
+        return value
+    raise ValueError(kind)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_tag(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_untag(tagged) for tagged in json.loads(raw)]
+    except (ValueError, TypeError) as exc:
+        raise PaginationError("Invalid cursor") from exc
+    if len(values) != size:
+        raise PaginationError("Invalid cursor")
+    return values
+
+
+def _nullable(column: Any) -> bool:
+    return getattr(getattr(column, "expression", column), "nullable", True)
+
+
+def _after(keyset: Sequence[Any], values: Sequence[Any], descending: bool) -> ColumnElement:
+    columns = tuple_(*keyset)
+    bound = tuple_(*(literal(value, type_=column.type) for column, value in zip(keyset, values)))
+    return columns < bound if descending else columns > bound
+
+
+# Totals ---------------------------------------------------------------------
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON) <statement>``; PostgreSQL only."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Any) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimate_count(query: Query) -> Optional[int]:
+    """The planner's row estimate for *query*, or None where there is none."""
+    session = query.session
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+    statement = query.order_by(None).statement
+    froms = statement.get_final_froms()
+    if statement.whereclause is None and len(froms) == 1 and getattr(froms[0], "name", None):
+        reltuples = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": froms[0].name},
+        ).scalar()
+        # -1 until the table has been analyzed
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+    plan = session.execute(_Explain(statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _windowable(query: Query) -> bool:
+    # count(*) OVER () is evaluated before DISTINCT removes duplicates
+    return not getattr(query.statement, "_distinct", False)
+
+
+def paginate(
+    query: Query,
+    page: int = 1,
+    per_page: int = 20,
+    total_mode: TotalMode = TotalMode.EXACT,
+    cursor: Optional[str] = None,
+    keyset: Optional[Sequence[Any]] = None,
+    descending: bool = False,
+) -> Page:
+    """
+    Fetch one page of *query*.
+
+    Without *keyset*, *query* must already be ordered and pages by OFFSET.
+    With *keyset*, *query* must be unordered: it is ordered by those columns
+    (all ascending, or all descending) and *cursor*, when given, replaces
+    the OFFSET.  A keyset with a nullable column still orders the query,
+    but cursors are refused.
+    """
+    unpaged = query
+    if keyset:
+        query = query.order_by(
+            *(column.desc() if descending else column.asc() for column in keyset)
+        )
+        # Rows with NULL in a keyset column would be skipped by the comparison
+        if any(_nullable(column) for column in keyset):
+            keyset = None
+    if cursor and not keyset:
+        raise PaginationError("Cursor pagination is not supported for this sort order")
+    if cursor:
+        query = query.filter(_after(keyset, decode_cursor(cursor, len(keyset)), descending))
+
+    offset = 0 if cursor else (page - 1) * per_page
+    window = total_mode == TotalMode.WINDOW and _windowable(query)
+    if window:
+        query = query.add_columns(func.count().over().label("_total"))
+    rows = query.offset(offset).limit(per_page + 1).all()
+
+    windowed_total = rows[0][-1] if window and rows else None
+    if window:
+        rows = [row[0] for row in rows]
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+
+    total: Optional[int] = None
+    estimated = False
+    if not has_more and not cursor and (items or offset == 0):
+        total = offset + len(items)
+    elif total_mode == TotalMode.NONE:
+        pass
+    elif windowed_total is not None and not cursor:
+        total = windowed_total
+    elif total_mode == TotalMode.ESTIMATE:
+        estimate = estimate_count(unpaged)
+        if estimate is not None and estimate >= EXACT_BELOW:
+            # At least the rows up to this page exist
+            total, estimated = max(estimate, offset + len(rows)), True
+        else:
+            total = unpaged.order_by(None).count()
+    else:
+        total = unpaged.order_by(None).count()
+
+    next_cursor = None
+    if keyset and has_more:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in keyset])
+
+    return Page(
+        items=items,
+        total=total,
+        page=page,
+        per_page=per_page,
+        has_more=has_more,
+        total_estimated=estimated,
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,311 @@
+"""Real-time push gateway: per-business event fan-out over Redis pub/sub.
+
+POS terminals, customer displays, signage players and kitchen screens keep
+one WebSocket (or SSE stream) open instead of polling.  Events are published
+on a per-business channel (``bizpilot:realtime:<business_id>``); every
+worker holds a single pattern subscription on the prefix and hands each
+message to the connections it serves for that business, so a connection
+costs a bounded queue and no Redis connection of its own.
+
+- ``emit`` is thread-safe and never blocks: sync endpoints, services and
+  scheduler jobs call it after their commit and the hub's publisher task
+  does the Redis PUBLISH.
+- A connection that cannot keep up has its queue replaced by a single
+  ``resync`` event, telling the client to refetch instead of replaying a
+  backlog.
+- Without Redis, events are delivered to this worker's connections only,
+  like the other Redis-backed features degrade to local behaviour.
+"""
+
+import asyncio
+import enum
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.redis import redis_manager
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "bizpilot:realtime"
+
+# Reconnect delay for the pub/sub listener after Redis errors
+_LISTEN_RETRY_SECONDS = 2.0
+
+
+class RealtimeEventType(str, enum.Enum):
+    """Event types pushed to clients."""
+
+    ORDER_STATUS_CHANGED = "order.status_changed"
+    DISPLAY_CART_UPDATED = "display.cart_updated"
+    SIGNAGE_PLAYLIST_PUBLISHED = "signage.playlist_published"
+    MENU_AVAILABILITY_CHANGED = "menu.availability_changed"
+    NOTIFICATION_CREATED = "notification.created"
+    # Sent by the gateway itself
+    RESYNC = "resync"
+    PING = "ping"
+
+
+def _channel(business_id: Any) -> str:
+    return f"{CHANNEL_PREFIX}:{business_id}"
+
+
+def encode_event(
+    event_type: RealtimeEventType,
+    business_id: Any,
+    data: Dict[str, Any],
+    user_id: Optional[Any] = None,
+) -> str:
+    envelope = {
+        "type": event_type.value,
+        "business_id": str(business_id),
+        "data": data,
+        "ts": datetime.now(timezone.utc).isoformat(),
+    }
+    if user_id is not None:
+        envelope["user_id"] = str(user_id)
+    return json.dumps(envelope, separators=(",", ":"), default=str)
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One client connection's view of a business channel."""
+
+    business_id: str
+    user_id: Optional[str] = None
+    # None = every event type
+    event_types: Optional[FrozenSet[str]] = None
+    # Set for customer displays: only their own cart events
+    display_id: Optional[str] = None
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(settings.REALTIME_QUEUE_SIZE))
+    dropped: int = 0
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        target_user = event.get("user_id")
+        if target_user is not None and target_user != self.user_id:
+            return False
+        if self.display_id is not None and event.get("data", {}).get("display_id") != self.display_id:
+            return False
+        return self.event_types is None or event.get("type") in self.event_types
+
+    def offer(self, event_type: str, raw: str) -> None:
+        try:
+            self.queue.put_nowait((event_type, raw))
+        except asyncio.QueueFull:
+            # Too far behind to be worth replaying: ask the client to refetch
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            resync = encode_event(RealtimeEventType.RESYNC, self.business_id, {})
+            self.queue.put_nowait((RealtimeEventType.RESYNC.value, resync))
+
+    async def next_event(self, timeout: float) -> Optional[Tuple[str, str]]:
+        """Next ``(event_type, json)`` or None when idle for *timeout* seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RealtimeHub:
+    """Per-worker registry of connections plus the Redis publisher/listener."""
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._outbox: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: list = []
+        self.published = 0
+        self.delivered = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and not all(task.done() for task in self._tasks)
+
+    @property
+    def connections(self) -> int:
+        return sum(len(subs) for subs in self._subscriptions.values())
+
+    # -- connections -------------------------------------------------------
+
+    def subscribe(
+        self,
+        business_id: Any,
+        user_id: Optional[Any] = None,
+        event_types: Optional[Iterable[str]] = None,
+        display_id: Optional[Any] = None,
+    ) -> Subscription:
+        subscription = Subscription(
+            business_id=str(business_id),
+            user_id=str(user_id) if user_id is not None else None,
+            event_types=frozenset(event_types) if event_types else None,
+            display_id=str(display_id) if display_id is not None else None,
+        )
+        self._subscriptions[subscription.business_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subs = self._subscriptions.get(subscription.business_id)
+        if subs is not None:
+            subs.discard(subscription)
+            if not subs:
+                del self._subscriptions[subscription.business_id]
+
+    # -- publishing --------------------------------------------------------
+
+    def emit(
+        self,
+        business_id: Any,
+        event_type: RealtimeEventType,
+        data: Dict[str, Any],
+        user_id: Optional[Any] = None,
+    ) -> None:
+        """Queue an event for the business's clients (any thread, never blocks)."""
+        if self._loop is None or self._outbox is None:
+            return
+        message = (str(business_id), encode_event(event_type, business_id, data, user_id))
+        try:
+            self._loop.call_soon_threadsafe(self._outbox.put_nowait, message)
+        except RuntimeError:
+            # Loop closed during shutdown
+            pass
+
+    async def publish(
+        self,
+        business_id: Any,
+        event_type: RealtimeEventType,
+        data: Dict[str, Any],
+        user_id: Optional[Any] = None,
+    ) -> None:
+        """Publish immediately from async code."""
+        await self._publish(str(business_id), encode_event(event_type, business_id, data, user_id))
+
+    async def _publish(self, business_id: str, raw: str) -> None:
+        self.published += 1
+        client = redis_manager.get_client()
+        if client is not None:
+            try:
+                # Our own listener delivers it to this worker's connections
+                await client.publish(_channel(business_id), raw)
+                return
+            except Exception as exc:
+                logger.warning("Realtime publish failed for %s: %s", business_id, exc)
+        self.deliver(business_id, raw)
+
+    def deliver(self, business_id: str, raw: str) -> int:
+        """Hand a published event to this worker's matching connections."""
+        subs = self._subscriptions.get(business_id)
+        if not subs:
+            return 0
+        event = json.loads(raw)
+        event_type = event.get("type", "")
+        delivered = 0
+        for subscription in tuple(subs):
+            if subscription.wants(event):
+                subscription.offer(event_type, raw)
+                delivered += 1
+        self.delivered += delivered
+        return delivered
+
+    # -- background tasks --------------------------------------------------
+
+    async def _publisher(self) -> None:
+        while True:
+            business_id, raw = await self._outbox.get()
+            await self._publish(business_id, raw)
+
+    async def _listener(self) -> None:
+        prefix = f"{CHANNEL_PREFIX}:"
+        while True:
+            client = redis_manager.get_client()
+            if client is None:
+                await asyncio.sleep(_LISTEN_RETRY_SECONDS)
+                continue
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{prefix}*")
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    data = message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    try:
+                        self.deliver(channel[len(prefix):], data)
+                    except ValueError:
+                        logger.warning("Discarding unreadable realtime event on %s", channel)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Realtime listener error, resubscribing: %s", exc)
+                await asyncio.sleep(_LISTEN_RETRY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._outbox = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._publisher()),
+            asyncio.create_task(self._listener()),
+        ]
+
+    async def stop(self) -> None:
+        # Flush what was emitted before shutdown
+        while self._outbox is not None and not self._outbox.empty():
+            business_id, raw = self._outbox.get_nowait()
+            await self._publish(business_id, raw)
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._loop = None
+        self._outbox = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "businesses": len(self._subscriptions),
+            "connections": self.connections,
+            "published": self.published,
+            "delivered": self.delivered,
+        }
+
+
+realtime_hub = RealtimeHub()
+
+
+def emit_event(
+    business_id: Any,
+    event_type: RealtimeEventType,
+    data: Dict[str, Any],
+    user_id: Optional[Any] = None,
+) -> None:
+    """Push an event to the business's connected clients (fire-and-forget)."""
+    realtime_hub.emit(business_id, event_type, data, user_id=user_id)
+
+
+async def start_realtime_hub() -> None:
+    """Start the publisher and pub/sub listener (application startup)."""
+    realtime_hub.start()
+
+
+async def stop_realtime_hub() -> None:
+    """Flush pending events and stop (shutdown)."""
+    await realtime_hub.stop()
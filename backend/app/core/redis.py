@@ -7,7 +7,7 @@ Requirements: 17.1, 17.4
 
 import os
 import logging
-from typing import Optional
+from typing import Any, Optional, Sequence
 from urllib.parse import urlparse
 from redis import asyncio as aioredis
 from redis.asyncio import Redis
@@ -214,6 +214,126 @@ class RedisManager:
             logger.warning(f"Redis DELETE failed for key {key}: {e}")
             return False
     
+    async def incr(self, key: str) -> Optional[int]:
+        """
+        Atomically increment an integer key (created as 0 if missing).
+        
+        Args:
+            key: Counter key
+            
+        Returns:
+            The new value, or None if Redis is unavailable
+        """
+        if not self._available or not self._redis:
+            return None
+        
+        try:
+            return await self._redis.incr(key)
+        except (RedisError, Exception) as e:
+            logger.warning(f"Redis INCR failed for key {key}: {e}")
+            return None
+    
+    async def set_if_absent(self, key: str, value: str, ttl_seconds: int) -> bool:
+        """
+        Set a key only if it does not exist (SET NX EX), e.g. a short lock.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Time-to-live in seconds
+            
+        Returns:
+            True if the key was set, False if it existed or Redis is unavailable
+        """
+        if not self._available or not self._redis:
+            return False
+        
+        try:
+            return bool(await self._redis.set(key, value, ex=ttl_seconds, nx=True))
+        except (RedisError, Exception) as e:
+            logger.warning(f"Redis SET NX failed for key {key}: {e}")
+            return False
+    
+    async def rpush(self, key: str, *values: str, ttl_seconds: Optional[int] = None) -> Optional[int]:
+        """
+        Atomically append values to a list and refresh its TTL.
+        
+        Args:
+            key: List key
+            values: Values to append (as strings)
+            ttl_seconds: Time-to-live in seconds (None = unchanged)
+            
+        Returns:
+            The new list length, or None if Redis is unavailable
+        """
+        if not self._available or not self._redis:
+            return None
+        
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.rpush(key, *values)
+                if ttl_seconds:
+                    pipe.expire(key, ttl_seconds)
+                length, *_ = await pipe.execute()
+            return length
+        except (RedisError, Exception) as e:
+            logger.warning(f"Redis RPUSH failed for key {key}: {e}")
+            return None
+    
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> list:
+        """
+        Read a slice of a list (inclusive indexes, negative from the end).
+        
+        Returns:
+            The values, or an empty list if missing or Redis is unavailable
+        """
+        if not self._available or not self._redis:
+            return []
+        
+        try:
+            return await self._redis.lrange(key, start, end)
+        except (RedisError, Exception) as e:
+            logger.warning(f"Redis LRANGE failed for key {key}: {e}")
+            return []
+    
+    async def ltrim(self, key: str, start: int, end: int = -1) -> bool:
+        """
+        Keep only the given slice of a list.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self._available or not self._redis:
+            return False
+        
+        try:
+            await self._redis.ltrim(key, start, end)
+            return True
+        except (RedisError, Exception) as e:
+            logger.warning(f"Redis LTRIM failed for key {key}: {e}")
+            return False
+    
+    async def eval(self, script: str, keys: Sequence[str], args: Sequence[Any] = ()) -> Any:
+        """
+        Run a Lua script atomically (EVAL), e.g. a compare-and-delete.
+        
+        Args:
+            script: Lua source
+            keys: Keys the script touches (KEYS[1..n])
+            args: Further arguments (ARGV[1..n])
+            
+        Returns:
+            The script's result, or None if Redis is unavailable or it failed
+        """
+        if not self._available or not self._redis:
+            return None
+        
+        try:
+            return await self._redis.eval(script, len(keys), *keys, *args)
+        except (RedisError, Exception) as e:
+            logger.warning(f"Redis EVAL failed for keys {list(keys)}: {e}")
+            return None
+    
     async def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching a pattern.
@@ -0,0 +1,137 @@
+"""Shared text search for list endpoints.
+
+List services used to build ``ILIKE '%term%'`` filters by hand, with the
+user's ``%`` and ``_`` passed through as wildcards.  They now go through
+``contains`` / ``apply_search``:
+
+- Substring matching escapes LIKE wildcards.  On PostgreSQL every searched
+  column has a pg_trgm GIN index (migration 114), which serves
+  ``ILIKE '%term%'`` without scanning the table.
+- Multi-word terms also match rows containing every word.  For models with
+  full-text columns, PostgreSQL does that through a ``to_tsvector`` GIN
+  expression index; ``SearchSpec.vector`` builds the identical expression
+  so the planner can use it.  Other dialects (SQLite in tests) require each
+  word as a substring of some column instead.
+- Exact codes (SKU, barcode, document numbers) match by equality, which
+  their b-tree indexes serve, and rank first.
+- ``search_rank`` orders results: exact code, then prefix of the primary
+  column, then text relevance (``ts_rank`` plus trigram similarity on
+  PostgreSQL, substring of the primary column elsewhere).
+"""
+
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, func, literal_column, or_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+TS_CONFIG = "simple"
+
+_ESCAPE = "/"
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so *term* matches literally."""
+    return (
+        term.replace(_ESCAPE, _ESCAPE * 2)
+        .replace("%", _ESCAPE + "%")
+        .replace("_", _ESCAPE + "_")
+    )
+
+
+def contains(columns: Sequence[ColumnElement], term: str) -> ColumnElement:
+    """Case-insensitive substring match of *term* on any of *columns*."""
+    pattern = f"%{escape_like(term)}%"
+    return or_(*(column.ilike(pattern, escape=_ESCAPE) for column in columns))
+
+
+def starts_with(column: ColumnElement, term: str) -> ColumnElement:
+    return column.ilike(f"{escape_like(term)}%", escape=_ESCAPE)
+
+
+class SearchSpec:
+    """
+    How one model is searched.
+
+    *columns* are matched by substring (the first is the primary column
+    used for ranking), *fulltext* are the columns of the model's tsvector
+    index, in index order, and *exact* are code columns matched by
+    equality.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[ColumnElement],
+        fulltext: Sequence[ColumnElement] = (),
+        exact: Sequence[ColumnElement] = (),
+    ) -> None:
+        self.columns = list(columns)
+        self.fulltext = list(fulltext)
+        self.exact = list(exact)
+
+    @property
+    def primary(self) -> ColumnElement:
+        return self.columns[0]
+
+    def vector(self) -> ColumnElement:
+        """``to_tsvector('simple', coalesce(a, '') || ' ' || ...)`` as indexed.
+
+        Constants are rendered inline, not as bind parameters, so the
+        statement text matches the index expression.
+        """
+        document = None
+        for column in self.fulltext:
+            part = func.coalesce(column, literal_column("''"))
+            document = part if document is None else document.op("||")(literal_column("' '")).op("||")(part)
+        return func.to_tsvector(literal_column(f"'{TS_CONFIG}'"), document)
+
+    def tsquery(self, term: str) -> ColumnElement:
+        return func.plainto_tsquery(literal_column(f"'{TS_CONFIG}'"), term)
+
+
+def is_postgres(query: Query) -> bool:
+    try:
+        return query.session.get_bind().dialect.name == "postgresql"
+    except Exception:
+        return False
+
+
+def search_filter(spec: SearchSpec, term: str, postgres: bool = False) -> ColumnElement:
+    """Rows matching *term*: substring, every word, or an exact code."""
+    clauses = [contains(spec.columns, term)]
+    clauses.extend(column == term for column in spec.exact)
+    words = term.split()
+    if len(words) > 1:
+        if postgres and spec.fulltext:
+            clauses.append(spec.vector().op("@@")(spec.tsquery(term)))
+        else:
+            clauses.append(and_(*(contains(spec.columns, word) for word in words)))
+    return or_(*clauses)
+
+
+def search_rank(spec: SearchSpec, term: str, postgres: bool = False) -> ColumnElement:
+    """Relevance of a matching row; higher is better."""
+    rank = case((starts_with(spec.primary, term), 2.0), else_=0.0)
+    if spec.exact:
+        rank = rank + case((or_(*(column == term for column in spec.exact)), 4.0), else_=0.0)
+    if postgres:
+        rank = rank + func.similarity(func.coalesce(spec.primary, literal_column("''")), term)
+        if spec.fulltext:
+            rank = rank + func.ts_rank(spec.vector(), spec.tsquery(term))
+    else:
+        rank = rank + case((contains([spec.primary], term), 1.0), else_=0.0)
+    return rank
+
+
+def apply_search(query: Query, spec: SearchSpec, term: Optional[str]) -> Tuple[Query, Optional[ColumnElement]]:
+    """
+    Filter *query* to rows matching *term*.
+
+    Returns the filtered query and a rank expression for ordering by
+    relevance (None when there is nothing to search for).
+    """
+    term = (term or "").strip()
+    if not term:
+        return query, None
+    postgres = is_postgres(query)
+    return query.filter(search_filter(spec, term, postgres)), search_rank(spec, term, postgres)
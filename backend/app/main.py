@@ -1,28 +1,35 @@
 """Main FastAPI application entry point."""
 
-import time
-import uuid
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-import traceback
 
-from app.api import router as api_router
+from app.api import include_routers
 from app.core.config import settings
 from app.core.rate_limit import limiter
 from app.core.redis import startup_redis, shutdown_redis
+from app.core.pagination import PaginationError, pagination_error_handler
+from app.core.llm_transport import close_llm_transport
+from app.middleware.lazy_routers import LazyRouters, LazyRoutersMiddleware
+from app.middleware.request_pipeline import RequestPipelineMiddleware
+from app.agents.lib.observability_logger import start_agent_log_writer, stop_agent_log_writer
+from app.services.ai_context_snapshot import start_context_snapshot_refresher, stop_context_snapshot_refresher
+from app.core.realtime import start_realtime_hub, stop_realtime_hub
+from app.services.heartbeat_service import start_heartbeat_buffer, stop_heartbeat_buffer
+from app.services.floor_state import start_floor_state_invalidation, stop_floor_state_invalidation
+from app.services.scan_lookup import start_scan_index, stop_scan_index
 from app.scheduler.config import SchedulerConfig
 from app.scheduler.manager import SchedulerManager
 from app.scheduler.jobs.overdue_invoice_job import check_overdue_invoices_job
 from app.scheduler.jobs.auto_clockout_job import auto_clock_out_job
 from app.scheduler.jobs.device_cleanup_job import device_cleanup_job
 from app.scheduler.jobs.demo_expiry_job import demo_expiry_job
+from app.scheduler.jobs.loyalty_expiry_job import loyalty_points_expiry_job
 from app.scheduler.jobs.layby_jobs import (
     layby_reminders_job,
     layby_overdue_check_job,
@@ -40,91 +47,6 @@ logger = logging.getLogger("bizpilot.performance")
 scheduler_manager = None
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to add unique request ID for distributed tracing.
-    
-    - Generates UUID for each request if not provided
-    - Adds X-Request-ID header to response
-    - Stores request_id in request.state for logging
-    """
-    async def dispatch(self, request: Request, call_next):
-        # Use provided request ID or generate new one
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
-
-
-class TimingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to log request timing for performance monitoring.
-    Logs slow requests (>500ms) as warnings.
-    Includes request ID in logs.
-    """
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = (time.perf_counter() - start_time) * 1000
-        
-        # Add timing header for debugging
-        response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-        
-        # Get request ID if available
-        request_id = getattr(request.state, "request_id", "unknown")
-        
-        # Log slow requests
-        if duration_ms > 500:
-            logger.warning(
-                f"[{request_id}] SLOW REQUEST: {request.method} {request.url.path} took {duration_ms:.2f}ms"
-            )
-        elif settings.DEBUG:
-            logger.info(
-                f"[{request_id}] Request: {request.method} {request.url.path} - {duration_ms:.2f}ms"
-            )
-        
-        return response
-
-
-class CORSDebugMiddleware(BaseHTTPMiddleware):
-    """
-    Custom middleware to ensure CORS headers are added to ALL responses,
-    including error responses (500, 422, etc.).
-    """
-    async def dispatch(self, request: Request, call_next):
-        # Handle preflight OPTIONS requests
-        if request.method == "OPTIONS":
-            response = JSONResponse(content={"detail": "OK"}, status_code=200)
-        else:
-            try:
-                response = await call_next(request)
-            except Exception as e:
-                # Log the error for debugging with full traceback
-                logger.error(f"Error processing request {request.method} {request.url.path}: {e}", exc_info=True)
-                print(f"Error processing request: {e}")
-                traceback.print_exc()
-                response = JSONResponse(
-                    content={"detail": "Internal server error"},
-                    status_code=500
-                )
-        
-        # Add CORS headers to all responses
-        origin = request.headers.get("origin", "")
-        if origin in settings.CORS_ORIGINS or "*" in settings.CORS_ORIGINS:
-            response.headers["Access-Control-Allow-Origin"] = origin
-            response.headers["Access-Control-Allow-Credentials"] = "true"
-            response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-            response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, X-Client-Type, X-Requested-With"
-        
-        return response
-
-
 app = FastAPI(
     title=settings.APP_NAME,
     description="BizPilot v2.0 - Modern Multi-Business Management Platform API",
@@ -138,73 +60,16 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Bad list cursors are client errors
+app.add_exception_handler(PaginationError, pagination_error_handler)
+
 # Add GZip compression middleware (compress responses > 500 bytes)
 app.add_middleware(GZipMiddleware, minimum_size=500)
 
-# Add CSRF protection for cookie-based authentication
-# Note: This protects state-changing operations (POST, PUT, DELETE, PATCH)
-# GET requests and endpoints with X-Client-Type: mobile are exempt
+# Request ID, timing, CORS headers and CSRF protection in one pure-ASGI layer.
+# CSRF reads the session, so SessionMiddleware (added after it) wraps it.
+app.add_middleware(RequestPipelineMiddleware)
 
-# Custom CSRF middleware that exempts mobile clients
-class CSRFMiddleware(BaseHTTPMiddleware):
-    """
-    CSRF protection for cookie-based authentication.
-    
-    Protection:
-    - Validates CSRF token on state-changing requests (POST, PUT, DELETE, PATCH)
-    - Exempts mobile clients (X-Client-Type: mobile header)
-    - Exempts safe methods (GET, HEAD, OPTIONS)
-    - Exempts auth endpoints (login, register, etc.)
-    - Exempts Bearer token authenticated requests (API clients)
-    """
-    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
-    EXEMPT_PATHS = {
-        "/api/v1/auth/login",
-        "/api/v1/auth/register",
-        "/api/v1/auth/refresh",
-        "/api/v1/oauth/",
-        "/health",
-        "/api/health",
-        "/api/v1/payments/webhook",  # Webhooks don't have CSRF
-        "/api/v1/contact",  # Public contact form
-        "/api/v1/ai/guest-chat",  # Guest AI chat
-    }
-    
-    async def dispatch(self, request: Request, call_next):
-        # Skip CSRF check for safe methods
-        if request.method in self.SAFE_METHODS:
-            return await call_next(request)
-        
-        # Skip CSRF check for exempt paths
-        if any(request.url.path.startswith(path) for path in self.EXEMPT_PATHS):
-            return await call_next(request)
-        
-        # Skip CSRF check for mobile clients
-        client_type = request.headers.get("X-Client-Type", "").lower()
-        if client_type == "mobile":
-            return await call_next(request)
-        
-        # Skip CSRF check for Bearer token authenticated requests
-        # These are API clients that don't use cookie-based auth
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
-            return await call_next(request)
-        
-        # Validate CSRF token for cookie-based web clients only
-        csrf_token = request.headers.get("X-CSRF-Token")
-        session_csrf = request.session.get("csrf_token")
-        
-        if not csrf_token or not session_csrf or csrf_token != session_csrf:
-            return JSONResponse(
-                status_code=403,
-                content={"detail": "CSRF token missing or invalid"}
-            )
-        
-        return await call_next(request)
-
-app.add_middleware(CSRFMiddleware)
-
-# Add session middleware for CSRF (must be added AFTER CSRFMiddleware so it processes first)
 app.add_middleware(
     SessionMiddleware,
     secret_key=settings.SECRET_KEY,
@@ -214,15 +79,6 @@ app.add_middleware(
     https_only=settings.COOKIE_SECURE or settings.is_production,
 )
 
-# Add request ID middleware (before timing to include in timing logs)
-app.add_middleware(RequestIDMiddleware)
-
-# Add timing middleware (outermost - measures total request time)
-app.add_middleware(TimingMiddleware)
-
-# Add custom CORS middleware 
-app.add_middleware(CORSDebugMiddleware)
-
 # Configure standard CORS middleware with stricter settings
 app.add_middleware(
     CORSMiddleware,
@@ -339,14 +195,21 @@ async def root():
     }
 
 
-# Include API routers
-app.include_router(api_router, prefix="/api/v1")
+# Include API routers (with LAZY_API_ROUTERS, after startup; see app.middleware.lazy_routers)
+api_routers = LazyRouters(lambda: include_routers(app, prefix="/api/v1"))
+if settings.LAZY_API_ROUTERS:
+    app.add_middleware(LazyRoutersMiddleware, routers=api_routers)
+else:
+    api_routers.load()
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize Redis and scheduler on application startup."""
     global scheduler_manager
+
+    if settings.LAZY_API_ROUTERS:
+        api_routers.start_background_load()
     
     # Initialize Redis connection
     try:
@@ -356,6 +219,24 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to initialize Redis: {e}", exc_info=True)
         # Don't fail application startup if Redis fails (fallback mode)
+
+    # Buffered agent step audit log
+    await start_agent_log_writer()
+
+    # Refresh AI context snapshots after business data commits
+    await start_context_snapshot_refresher()
+
+    # Real-time push gateway (Redis pub/sub fan-out)
+    await start_realtime_hub()
+
+    # Batched last-seen writes for display/device heartbeats
+    await start_heartbeat_buffer()
+
+    # Drop cached floor plans when tables or table orders change
+    await start_floor_state_invalidation()
+
+    # Barcode/SKU scan maps: warmed in the background, dropped on product commits
+    await start_scan_index()
     
     # Initialize scheduler
     try:
@@ -404,6 +285,15 @@ async def startup_event():
             name='Demo Expiry Check'
         )
 
+        # Register loyalty points expiry job (daily at 00:30 UTC)
+        scheduler_manager.add_job(
+            loyalty_points_expiry_job,
+            trigger='cron',
+            cron_expression='30 0 * * *',
+            job_id='loyalty_points_expiry',
+            name='Loyalty Points Expiry'
+        )
+
         # Register auto clock-out job (runs hourly, checks each business's local timezone)
         scheduler_manager.add_job(
             auto_clock_out_job,
@@ -482,6 +372,12 @@ async def startup_event():
 async def shutdown_event():
     """Shutdown Redis and scheduler on application shutdown."""
     global scheduler_manager
+
+    # Publish pending realtime events while Redis is still connected
+    try:
+        await stop_realtime_hub()
+    except Exception as e:
+        logger.error(f"Error stopping realtime hub: {e}", exc_info=True)
     
     # Shutdown Redis connection
     try:
@@ -491,6 +387,33 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error shutting down Redis: {e}", exc_info=True)
     
+    # Close pooled LLM connections
+    try:
+        await close_llm_transport()
+    except Exception as e:
+        logger.error(f"Error closing LLM transport: {e}", exc_info=True)
+
+    # Flush buffered agent step logs
+    try:
+        await stop_agent_log_writer()
+    except Exception as e:
+        logger.error(f"Error flushing agent logs: {e}", exc_info=True)
+
+    try:
+        await stop_context_snapshot_refresher()
+    except Exception as e:
+        logger.error(f"Error stopping AI context snapshot refresher: {e}", exc_info=True)
+
+    # Write buffered heartbeats
+    try:
+        await stop_heartbeat_buffer()
+    except Exception as e:
+        logger.error(f"Error flushing heartbeats: {e}", exc_info=True)
+
+    await stop_floor_state_invalidation()
+
+    await stop_scan_index()
+
     # Shutdown scheduler
     if scheduler_manager:
         try:
@@ -0,0 +1,94 @@
+"""
+Lazy API router mounting.
+
+Importing the API router modules (and the services and models behind them)
+and building their routes is most of a worker's start time.  With
+``LAZY_API_ROUTERS`` the app starts without them: ``LazyRouters.load`` runs
+in a worker thread, started in the background at startup, and any request
+that needs the API waits for it.  Liveness probes are answered at once, so
+a recycled or newly scaled worker is not restarted while it loads;
+readiness (``/health``) waits, so traffic arrives once the API is mounted.
+
+A load that raises is logged and forgotten: the requests waiting on it
+fail, and the next request starts a new load.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Paths answered without waiting for the routers
+DEFAULT_SKIP_PATHS = ("/health/liveness", "/api/health/liveness")
+
+
+class LazyRouters:
+    """Runs *load* (which includes the routers) exactly once."""
+
+    def __init__(self, load: Callable[[], None]) -> None:
+        self._load = load
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Future] = None
+        self.loaded = False
+        self.load_seconds: Optional[float] = None
+
+    def load(self) -> None:
+        """Include the routers now (blocking); later calls do nothing."""
+        with self._lock:
+            if self.loaded:
+                return
+            started = time.perf_counter()
+            self._load()
+            self.load_seconds = time.perf_counter() - started
+            self.loaded = True
+        logger.info("API routers loaded in %.2fs", self.load_seconds)
+
+    async def ensure_loaded(self) -> None:
+        """Load in a worker thread; concurrent callers share one load."""
+        if self.loaded:
+            return
+        if self._task is None:
+            self._task = self._start_load()
+        await asyncio.shield(self._task)
+
+    def start_background_load(self) -> None:
+        """Begin loading without waiting (application startup)."""
+        if not self.loaded and self._task is None:
+            self._task = self._start_load()
+
+    def _start_load(self) -> asyncio.Future:
+        task = asyncio.ensure_future(asyncio.to_thread(self.load))
+        task.add_done_callback(self._load_done)
+        return task
+
+    def _load_done(self, task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is None:
+            return
+        # Keep no failed load around; the next request tries again
+        if self._task is task:
+            self._task = None
+        if not task.cancelled():
+            logger.error("Loading the API routers failed", exc_info=task.exception())
+
+
+class LazyRoutersMiddleware:
+    """Holds requests (other than liveness probes) until the routers are loaded."""
+
+    def __init__(self, app: ASGIApp, routers: LazyRouters, skip_paths: Iterable[str] = DEFAULT_SKIP_PATHS) -> None:
+        self.app = app
+        self.routers = routers
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not self.routers.loaded
+            and scope["type"] in ("http", "websocket")
+            and scope["path"] not in self.skip_paths
+        ):
+            await self.routers.ensure_loaded()
+        await self.app(scope, receive, send)
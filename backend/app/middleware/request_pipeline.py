@@ -0,0 +1,183 @@
+"""
+Request pipeline middleware: request ID, timing, CORS headers and CSRF in
+one pure-ASGI layer.
+
+These used to be four ``BaseHTTPMiddleware`` classes.  Each of those runs
+the rest of the app in a separate task and re-wraps the response body
+stream, which costs time on every request and buffers streaming
+responses.  This layer only wraps ``send`` to add headers to
+``http.response.start``, and lets body messages through untouched.
+
+It must run inside ``SessionMiddleware``, which provides the session that
+holds the CSRF token.
+"""
+
+import logging
+import time
+import uuid
+from typing import Dict, Iterable, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("bizpilot.performance")
+
+# Requests slower than this are logged as warnings
+SLOW_REQUEST_MS = 500
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Paths (and everything below them) that skip CSRF validation
+CSRF_EXEMPT_PATHS = (
+    "/api/v1/auth/login",
+    "/api/v1/auth/register",
+    "/api/v1/auth/refresh",
+    "/api/v1/oauth/",
+    "/health",
+    "/api/health",
+    "/api/v1/payments/webhook",  # Webhooks don't have CSRF
+    "/api/v1/contact",  # Public contact form
+    "/api/v1/ai/guest-chat",  # Guest AI chat
+)
+
+CORS_ALLOW_METHODS = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
+CORS_ALLOW_HEADERS = "Content-Type, Authorization, X-Client-Type, X-Requested-With"
+
+# Request headers the pipeline reads
+_WANTED = frozenset({b"x-request-id", b"origin", b"x-client-type", b"authorization", b"x-csrf-token"})
+
+
+class PathPrefixTrie:
+    """
+    Character trie of path prefixes.
+
+    ``matches(path)`` is true when *path* starts with any of the prefixes,
+    like ``any(path.startswith(p) for p in prefixes)``, in time bounded by
+    the longest prefix rather than the number of prefixes.
+    """
+
+    _END = ""
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        self._root: Dict[str, dict] = {}
+        for prefix in prefixes:
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[self._END] = {}
+
+    def matches(self, path: str) -> bool:
+        node = self._root
+        if self._END in node:
+            return True
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+
+class RequestPipelineMiddleware:
+    """
+    Per-request bookkeeping for every HTTP request.
+
+    - Request ID: the client's ``X-Request-ID`` or a new UUID, stored as
+      ``request.state.request_id`` and echoed in the response
+    - Timing: ``X-Response-Time`` header; slow requests are logged
+    - CORS: answers OPTIONS directly and adds CORS headers to every
+      response for allowed origins, including error responses (500, 422)
+    - CSRF: state-changing requests from cookie-authenticated web clients
+      need an ``X-CSRF-Token`` matching the session.  Safe methods, exempt
+      paths, mobile clients (``X-Client-Type: mobile``) and Bearer tokens
+      are exempt.
+    """
+
+    def __init__(self, app: ASGIApp, exempt_paths: Iterable[str] = CSRF_EXEMPT_PATHS) -> None:
+        self.app = app
+        self.exempt = PathPrefixTrie(exempt_paths)
+        self.origins = frozenset(settings.CORS_ORIGINS)
+        self.any_origin = "*" in self.origins
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        headers: Dict[bytes, bytes] = {}
+        for name, value in scope["headers"]:
+            if name in _WANTED:
+                headers.setdefault(name, value)
+        request_id = _header(headers, b"x-request-id") or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        origin = _header(headers, b"origin") or ""
+        cors = origin in self.origins or self.any_origin
+        started = False
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Request-ID"] = request_id
+                response_headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
+                if cors:
+                    response_headers["Access-Control-Allow-Origin"] = origin
+                    response_headers["Access-Control-Allow-Credentials"] = "true"
+                    response_headers["Access-Control-Allow-Methods"] = CORS_ALLOW_METHODS
+                    response_headers["Access-Control-Allow-Headers"] = CORS_ALLOW_HEADERS
+                self._log(scope, request_id, duration_ms)
+            await send(message)
+
+        method = scope["method"]
+        if method == "OPTIONS":
+            response = JSONResponse(content={"detail": "OK"}, status_code=200)
+            await response(scope, receive, send_with_headers)
+            return
+
+        if method not in SAFE_METHODS and not self._csrf_ok(scope, headers):
+            response = JSONResponse(status_code=403, content={"detail": "CSRF token missing or invalid"})
+            await response(scope, receive, send_with_headers)
+            return
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        except Exception as e:
+            logger.error(f"Error processing request {method} {scope['path']}: {e}", exc_info=True)
+            if started:
+                raise
+            response = JSONResponse(content={"detail": "Internal server error"}, status_code=500)
+            await response(scope, receive, send_with_headers)
+
+    def _csrf_ok(self, scope: Scope, headers: Dict[bytes, bytes]) -> bool:
+        if self.exempt.matches(scope["path"]):
+            return True
+        if (_header(headers, b"x-client-type") or "").lower() == "mobile":
+            return True
+        # API clients authenticate with Bearer tokens, not cookies
+        if (_header(headers, b"authorization") or "").startswith("Bearer "):
+            return True
+        csrf_token = _header(headers, b"x-csrf-token")
+        session_csrf = scope.get("session", {}).get("csrf_token")
+        return bool(csrf_token and session_csrf and csrf_token == session_csrf)
+
+    @staticmethod
+    def _log(scope: Scope, request_id: str, duration_ms: float) -> None:
+        if duration_ms > SLOW_REQUEST_MS:
+            logger.warning(
+                f"[{request_id}] SLOW REQUEST: {scope['method']} {scope['path']} took {duration_ms:.2f}ms"
+            )
+        elif settings.DEBUG:
+            logger.info(f"[{request_id}] Request: {scope['method']} {scope['path']} - {duration_ms:.2f}ms")
+
+
+def _header(headers: Dict[bytes, bytes], name: bytes) -> Optional[str]:
+    value = headers.get(name)
+    return value.decode("latin-1") if value is not None else None
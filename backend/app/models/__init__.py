@@ -55,6 +55,7 @@ from app.models.customer_account import (
     TransactionType as AccountTransactionType,
     AccountPayment,
     PaymentAllocation,
+    AccountOpenItem,
     AccountStatement,
     CollectionActivity,
     ActivityType,
@@ -298,6 +299,7 @@ from app.models.sage import (
     SageSyncQueue,
 )
 from app.models.webhook import WebhookSubscription, WebhookDelivery
+from app.models.association_rule import AssociationRule, BasketMiningState
 
 __all__ = [
     "BaseModel",
@@ -405,6 +407,7 @@ __all__ = [
     "AccountTransactionType",
     "AccountPayment",
     "PaymentAllocation",
+    "AccountOpenItem",
     "AccountStatement",
     "CollectionActivity",
     "ActivityType",
@@ -660,4 +663,7 @@ __all__ = [
     "SageSyncQueue",
     "WebhookSubscription",
     "WebhookDelivery",
+    # Market-basket rules
+    "AssociationRule",
+    "BasketMiningState",
 ]
@@ -0,0 +1,70 @@
+"""Market-basket association rules and the counts they are mined from.
+
+``association_rules`` holds one compact row per rule (antecedent ->
+consequent with support, confidence and lift) and is pulled by the POS
+SmartCartAssistant through entity sync.  Rules are updated in place and
+soft-deleted when they no longer hold, so a delta pull sees every change.
+
+``basket_mining_states`` keeps each business's item and pair counts for the
+lookback window (NumPy arrays, compressed) so the daily job only counts the
+orders that entered or left the window since its last run.
+"""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base import BaseModel
+
+
+class AssociationRule(BaseModel):
+    """Customers who buy the antecedent product also buy the consequent."""
+
+    __tablename__ = "association_rules"
+
+    business_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("businesses.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    antecedent_product_id = Column(UUID(as_uuid=True), nullable=False)
+    consequent_product_id = Column(UUID(as_uuid=True), nullable=False)
+    # Fraction of baskets with both products
+    support = Column(Float, nullable=False)
+    # P(consequent | antecedent)
+    confidence = Column(Float, nullable=False)
+    # confidence / P(consequent); > 1 means bought together more than by chance
+    lift = Column(Float, nullable=False)
+    # Baskets with both products (the evidence behind the figures)
+    pair_count = Column(Integer, nullable=False)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "business_id", "antecedent_product_id", "consequent_product_id",
+            name="uq_association_rules_business_pair",
+        ),
+        # Entity sync delta pulls: WHERE business_id = ? AND updated_at > ?
+        Index("ix_association_rules_business_updated", "business_id", "updated_at"),
+    )
+
+
+class BasketMiningState(BaseModel):
+    """Basket counts for a business's lookback window, for incremental runs."""
+
+    __tablename__ = "basket_mining_states"
+
+    business_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("businesses.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    # Orders created in [window_start, counted_until) are in the counts
+    window_start = Column(DateTime(timezone=True), nullable=False)
+    counted_until = Column(DateTime(timezone=True), nullable=False)
+    # Last full recount (catches orders edited or back-dated since counting)
+    rebuilt_at = Column(DateTime(timezone=True), nullable=False)
+    transactions = Column(Integer, nullable=False, default=0)
+    # BasketCounts.to_bytes()
+    counts = Column(LargeBinary, nullable=False)
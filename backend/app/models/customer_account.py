@@ -1,6 +1,6 @@
 """Customer Account models for accounts receivable management."""
 
-from sqlalchemy import Column, String, Text, Numeric, Integer, ForeignKey, Enum as SQLEnum, DateTime, Date
+from sqlalchemy import CheckConstraint, Column, String, Text, Numeric, Integer, ForeignKey, Enum as SQLEnum, DateTime, Date, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -236,12 +236,21 @@ class AccountPayment(BaseModel):
 
 
 class PaymentAllocation(BaseModel):
-    """Payment allocation model for tracking how payments are applied to transactions."""
+    """Payment allocation model for tracking how payments and credit
+    adjustments are applied to transactions."""
 
     __tablename__ = "payment_allocations"
+    __table_args__ = (
+        # Each allocation comes from either a payment or a credit adjustment
+        CheckConstraint(
+            "(payment_id IS NULL) <> (adjustment_id IS NULL)",
+            name="ck_payment_allocations_source",
+        ),
+    )
 
     # Foreign keys
-    payment_id = Column(UUID(as_uuid=True), ForeignKey("account_payments.id", ondelete="CASCADE"), nullable=False, index=True)
+    payment_id = Column(UUID(as_uuid=True), ForeignKey("account_payments.id", ondelete="CASCADE"), nullable=True, index=True)
+    adjustment_id = Column(UUID(as_uuid=True), ForeignKey("account_transactions.id", ondelete="CASCADE"), nullable=True, index=True)
     transaction_id = Column(UUID(as_uuid=True), ForeignKey("account_transactions.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Allocation details
@@ -249,12 +258,37 @@ class PaymentAllocation(BaseModel):
 
     # Relationships
     payment = relationship("AccountPayment", back_populates="allocations")
-    transaction = relationship("AccountTransaction")
+    transaction = relationship("AccountTransaction", foreign_keys=[transaction_id])
 
     def __repr__(self) -> str:
         return f"<PaymentAllocation {self.amount}>"
 
 
+class AccountOpenItem(BaseModel):
+    """Open (unpaid) amount per account and due time.
+
+    Maintained incrementally: charges add to the row for their due time
+    and payment allocations subtract from it.  Aging for a whole business
+    is then a grouped sum over the open rows of each account instead of a
+    scan of every transaction and allocation.  Charges with an explicit
+    due date share the row for midnight UTC on that date.
+    """
+
+    __tablename__ = "account_open_items"
+    __table_args__ = (
+        UniqueConstraint("account_id", "due_at", name="uq_account_open_items_account_due"),
+    )
+
+    account_id = Column(UUID(as_uuid=True), ForeignKey("customer_accounts.id", ondelete="CASCADE"), nullable=False, index=True)
+    business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    amount = Column(Numeric(12, 2), nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<AccountOpenItem {self.due_at} {self.amount}>"
+
+
 class AccountStatement(BaseModel):
     """Account statement model for periodic account summaries."""
 
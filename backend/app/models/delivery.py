@@ -118,3 +118,6 @@ class Delivery(BaseModel):
     actual_delivery_time = Column(DateTime, nullable=True)
     delivery_notes = Column(Text, nullable=True)
     proof_of_delivery = Column(Text, nullable=True)
+    # Drop-off point, used to plan the driver's multi-drop route
+    delivery_lat = Column(Numeric(10, 7), nullable=True)
+    delivery_lng = Column(Numeric(10, 7), nullable=True)
@@ -45,6 +45,9 @@ class ChartOfAccount(BaseModel):
 class JournalEntry(BaseModel):
     """Journal entry header."""
     __tablename__ = "journal_entries"
+    __table_args__ = (
+        sa.Index("ix_journal_entries_business_entry_date", "business_id", "entry_date"),
+    )
 
     business_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     entry_number = Column(String(50), nullable=False, unique=True)
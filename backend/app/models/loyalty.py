@@ -1,7 +1,7 @@
 """Loyalty program models."""
 
 import enum
-from sqlalchemy import Column, String, Integer, Numeric, Boolean, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import Column, String, Integer, Numeric, Boolean, DateTime, ForeignKey, Enum as SQLEnum, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -66,6 +66,16 @@ class CustomerLoyalty(BaseModel):
 class PointsTransaction(BaseModel):
     """Points transaction record."""
     __tablename__ = "points_transactions"
+    __table_args__ = (
+        # Unprocessed earns by expiry date, for the batch expiry job.
+        Index(
+            "ix_points_transactions_pending_expiry",
+            "expires_at",
+            "customer_id",
+            postgresql_where=text("transaction_type = 'earn' AND deleted_at IS NULL AND expires_at IS NOT NULL"),
+            sqlite_where=text("transaction_type = 'earn' AND deleted_at IS NULL AND expires_at IS NOT NULL"),
+        ),
+    )
 
     customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=False, index=True)
     business_id = Column(UUID(as_uuid=True), nullable=False, index=True)
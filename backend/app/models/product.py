@@ -1,7 +1,7 @@
 """Product model for product management."""
 
 from decimal import Decimal
-from sqlalchemy import Column, String, Text, Numeric, Integer, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Numeric, Integer, Boolean, ForeignKey, Index, Enum as SQLEnum, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import enum
@@ -22,6 +22,27 @@ class Product(BaseModel):
     """Product model for inventory management."""
 
     __tablename__ = "products"
+    __table_args__ = (
+        # One live product per SKU per business; also the ON CONFLICT target
+        # for the streaming importer.
+        Index(
+            "uq_products_business_sku",
+            "business_id",
+            "sku",
+            unique=True,
+            postgresql_where=text("sku IS NOT NULL AND deleted_at IS NULL"),
+            sqlite_where=text("sku IS NOT NULL AND deleted_at IS NULL"),
+        ),
+        # One live product per barcode per business, so a scan resolves to one product
+        Index(
+            "uq_products_business_barcode",
+            "business_id",
+            "barcode",
+            unique=True,
+            postgresql_where=text("barcode IS NOT NULL AND deleted_at IS NULL"),
+            sqlite_where=text("barcode IS NOT NULL AND deleted_at IS NULL"),
+        ),
+    )
 
     business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False, index=True)
     category_id = Column(UUID(as_uuid=True), ForeignKey("product_categories.id"), nullable=True, index=True)
@@ -1,151 +1,208 @@
-"""Scheduler job for daily AI pricing/rule generation.
-
-Runs every day at 4 AM UTC and:
-1. Queries recent sales data per business.
-2. Identifies top-selling product combinations (association rules).
-3. Stores generated rule summaries in the AI agent log for downstream consumption.
+"""Scheduler job for daily market-basket association rule generation.
+
+Runs every day at 4 AM UTC and, for every business:
+1. Updates the basket counts of its lookback window incrementally: only the
+   sales orders created since the last run are counted and added, and those
+   that fell out of the window are counted and subtracted
+   (``basket_mining_states``; a full recount happens weekly to pick up
+   orders edited or back-dated after they were counted).
+2. Mines single-product rules X -> Y with support, confidence and lift from
+   the counts (app.services.basket_mining).
+3. Upserts them into ``association_rules``; rules that no longer hold are
+   soft-deleted so delta pulls see them go.
 
 This job feeds the SmartCartAssistant mobile widget with fresh rule data so
 offline devices can sync up-to-date suggestions on next connect.
+
+Businesses are processed in chunks on a small thread pool, one database
+session per chunk; a failure only skips that business.
 """
 
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional
 
 from app.core.database import SessionLocal
+from app.services.basket_mining import BasketCounts, count_baskets, mine_rules
 
 logger = logging.getLogger(__name__)
 
-# Minimum number of sales in the lookback window before generating rules
-_MIN_SALES_THRESHOLD = 5
 # Days of history to analyse
 _LOOKBACK_DAYS = 30
-# Max rules to store per business
-_MAX_RULES = 20
+# Minimum baskets in the window before rules are trusted
+_MIN_TRANSACTIONS = 20
+# Rule thresholds (the POS shows confidence >= 0.3 and lift >= 1.2)
+_MIN_SUPPORT = 0.01
+_MIN_PAIR_COUNT = 3
+_MIN_CONFIDENCE = 0.25
+_MIN_LIFT = 1.1
+# Max rules to store per business, and per antecedent product
+_MAX_RULES = 500
+_MAX_RULES_PER_PRODUCT = 5
+# Recount the whole window this often instead of applying deltas
+_FULL_REBUILD_DAYS = 7
+# Businesses per chunk (one session each) and concurrent chunks
+_CHUNK_SIZE = 50
+_MAX_WORKERS = 4
 
 
 def ai_rule_generation_job() -> None:
-    """Generate daily AI pricing and product-association rules for all businesses."""
+    """Generate association rules for all businesses."""
     logger.info("Starting AI rule generation job")
-    db = SessionLocal()
-    businesses_processed = 0
-    rules_generated = 0
-    errors = 0
+    now = datetime.now(timezone.utc)
 
+    db = SessionLocal()
     try:
         from app.models.business import Business
 
-        cutoff = datetime.now(timezone.utc) - timedelta(days=_LOOKBACK_DAYS)
-
-        businesses = db.query(Business).filter(Business.deleted_at.is_(None)).all()
-
-        for business in businesses:
-            try:
-                rules = _generate_rules_for_business(db, business, cutoff)
-                if rules:
-                    _store_rules(db, business, rules)
-                    rules_generated += len(rules)
-                businesses_processed += 1
-            except Exception as exc:
-                logger.error(
-                    "Rule generation failed for business %s: %s", business.id, exc
-                )
-                errors += 1
-
-        logger.info(
-            "AI rule generation job complete: %d businesses, %d rules, %d errors",
-            businesses_processed, rules_generated, errors,
-        )
+        business_ids = [
+            row.id for row in db.query(Business.id).filter(Business.deleted_at.is_(None)).all()
+        ]
     except Exception as exc:
         logger.error("AI rule generation job failed: %s", exc, exc_info=True)
+        return
     finally:
         db.close()
 
+    chunks = [business_ids[i:i + _CHUNK_SIZE] for i in range(0, len(business_ids), _CHUNK_SIZE)]
+    totals: Counter = Counter()
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(chunks))) as pool:
+            for result in pool.map(partial(_process_chunk, now=now), chunks):
+                totals.update(result)
+
+    logger.info(
+        "AI rule generation job complete: %d businesses, %d rules, %d errors",
+        totals["businesses"], totals["rules"], totals["errors"],
+    )
 
-def _generate_rules_for_business(db, business, cutoff: datetime) -> list[dict]:
-    """
-    Analyse recent order items for this business and return association rules.
 
-    Returns a list of dicts like:
-    {"product_id": UUID, "name": str, "frequency": int, "rule_type": "top_seller"}
-    """
+def _process_chunk(business_ids: List[Any], now: datetime) -> Dict[str, int]:
+    totals = {"businesses": 0, "rules": 0, "errors": 0}
+    db = SessionLocal()
     try:
-        from app.models.order import Order, OrderItem
-        from app.models.product import Product
-        from sqlalchemy import func
-
-        # Get top-selling products in the lookback window
-        rows = (
-            db.query(
-                OrderItem.product_id,
-                func.sum(OrderItem.quantity).label("total_qty"),
-            )
-            .join(Order, Order.id == OrderItem.order_id)
-            .filter(
-                Order.business_id == business.id,
-                Order.created_at >= cutoff,
-                Order.deleted_at.is_(None),
-            )
-            .group_by(OrderItem.product_id)
-            .order_by(func.sum(OrderItem.quantity).desc())
-            .limit(_MAX_RULES)
-            .all()
+        for business_id in business_ids:
+            try:
+                totals["rules"] += _refresh_business(db, business_id, now)
+                totals["businesses"] += 1
+            except Exception as exc:
+                db.rollback()
+                logger.error("Rule generation failed for business %s: %s", business_id, exc)
+                totals["errors"] += 1
+    finally:
+        db.close()
+    return totals
+
+
+def _refresh_business(db, business_id, now: datetime) -> int:
+    """Bring one business's counts and rules up to *now*; returns its rule count."""
+    from app.models.association_rule import BasketMiningState
+
+    cutoff = now - timedelta(days=_LOOKBACK_DAYS)
+    state = db.query(BasketMiningState).filter(BasketMiningState.business_id == business_id).first()
+
+    if state is None or now - _utc(state.rebuilt_at) >= timedelta(days=_FULL_REBUILD_DAYS):
+        counts = _count_orders(db, business_id, cutoff, now)
+        rebuilt_at = now
+    else:
+        counted_until = _utc(state.counted_until)
+        counts = BasketCounts.from_bytes(state.counts)
+        counts = counts.combine(_count_orders(db, business_id, max(counted_until, cutoff), now))
+        if _utc(state.window_start) < cutoff:
+            expired = _count_orders(db, business_id, _utc(state.window_start), min(cutoff, counted_until))
+            counts = counts.combine(expired, sign=-1)
+        rebuilt_at = _utc(state.rebuilt_at)
+
+    rules: List[Dict[str, Any]] = []
+    if counts.transactions >= _MIN_TRANSACTIONS:
+        rules = mine_rules(
+            counts,
+            min_support=_MIN_SUPPORT,
+            min_confidence=_MIN_CONFIDENCE,
+            min_lift=_MIN_LIFT,
+            min_pair_count=_MIN_PAIR_COUNT,
+            max_per_antecedent=_MAX_RULES_PER_PRODUCT,
+            max_rules=_MAX_RULES,
         )
-
-        if not rows:
-            return []
-
-        rules = []
-        for product_id, total_qty in rows:
-            if total_qty < _MIN_SALES_THRESHOLD:
-                continue
-            product = db.query(Product).filter(Product.id == product_id).first()
-            name = product.name if product else str(product_id)
-            rules.append({
-                "product_id": str(product_id),
-                "name": name,
-                "frequency": int(total_qty),
-                "rule_type": "top_seller",
-            })
-
-        return rules
-
-    except Exception as exc:
-        logger.warning(
-            "Could not query order data for business %s (may not have orders yet): %s",
-            business.id, exc,
+    _store_rules(db, business_id, rules, now)
+
+    if state is None:
+        state = BasketMiningState(business_id=business_id)
+        db.add(state)
+    state.window_start = cutoff
+    state.counted_until = now
+    state.rebuilt_at = rebuilt_at
+    state.transactions = counts.transactions
+    state.counts = counts.to_bytes()
+    db.commit()
+    logger.debug(
+        "Business %s: %d baskets, %d pairs, %d rules",
+        business_id, counts.transactions, counts.pairs, len(rules),
+    )
+    return len(rules)
+
+
+def _count_orders(db, business_id, start: datetime, end: datetime) -> BasketCounts:
+    """Basket counts of the business's sales orders created in [start, end)."""
+    from app.models.order import Order, OrderDirection, OrderItem, OrderStatus
+
+    if start >= end:
+        return BasketCounts.empty()
+    rows = (
+        db.query(OrderItem.order_id, OrderItem.product_id)
+        .join(Order, Order.id == OrderItem.order_id)
+        .filter(
+            Order.business_id == business_id,
+            Order.direction == OrderDirection.INBOUND,
+            Order.status.notin_([OrderStatus.DRAFT, OrderStatus.CANCELLED, OrderStatus.REFUNDED]),
+            Order.created_at >= start,
+            Order.created_at < end,
+            Order.deleted_at.is_(None),
+            OrderItem.product_id.isnot(None),
+            OrderItem.deleted_at.is_(None),
         )
-        return []
-
-
-def _store_rules(db, business, rules: list[dict]) -> None:
-    """Persist generated rules as an AgentLog entry for downstream consumption."""
-    import json
-    from app.models.agent_log import AgentLog
-
-    summary = json.dumps({
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "rules": rules[:_MAX_RULES],
-    })
-
-    log_entry = AgentLog(
-        session_id=f"rule_gen_{business.id}",
-        user_id=None,
-        business_id=business.id,
-        agent_name="ai_rule_generator",
-        step_number=1,
-        tool_name="generate_rules",
-        reasoning=f"Generated {len(rules)} rules from last {_LOOKBACK_DAYS} days of sales",
-        action_type="HOTL",
-        result_summary=summary[:2000],  # cap stored summary
-        tokens_used=0,
-        success=True,
+        .all()
     )
+    return count_baskets([r.order_id for r in rows], [r.product_id for r in rows])
 
-    # user_id is NOT NULL in the model — use a sentinel zero UUID if no user
+
+def _store_rules(db, business_id, rules: List[Dict[str, Any]], now: datetime) -> None:
+    """Upsert the business's rules; soft-delete the ones no longer mined."""
     import uuid
-    log_entry.user_id = uuid.UUID("00000000-0000-0000-0000-000000000000")
 
-    db.add(log_entry)
-    db.commit()
-    logger.debug("Stored %d rules for business %s", len(rules), business.id)
+    from app.models.association_rule import AssociationRule
+
+    existing = {
+        (str(rule.antecedent_product_id), str(rule.consequent_product_id)): rule
+        for rule in db.query(AssociationRule).filter(AssociationRule.business_id == business_id).all()
+    }
+    for values in rules:
+        key = (values["antecedent_product_id"], values["consequent_product_id"])
+        rule = existing.pop(key, None)
+        if rule is None:
+            rule = AssociationRule(
+                business_id=business_id,
+                antecedent_product_id=uuid.UUID(key[0]),
+                consequent_product_id=uuid.UUID(key[1]),
+            )
+            db.add(rule)
+        rule.support = values["support"]
+        rule.confidence = values["confidence"]
+        rule.lift = values["lift"]
+        rule.pair_count = values["pair_count"]
+        rule.computed_at = now
+        rule.deleted_at = None
+
+    for rule in existing.values():
+        if rule.deleted_at is None:
+            rule.deleted_at = now
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive datetimes for timezone-aware columns
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
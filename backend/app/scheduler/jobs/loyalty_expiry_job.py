@@ -0,0 +1,56 @@
+"""Loyalty points expiry background job.
+
+Runs daily and expires overdue EARN points for every business in one
+set-based pass (chunked by customer, committed per chunk).
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from app.core.database import SessionLocal
+from app.services.loyalty_expiry_service import LoyaltyExpiryService
+
+logger = logging.getLogger(__name__)
+
+
+def loyalty_points_expiry_job() -> dict:
+    """
+    Expire loyalty points whose expiry date has passed, across all businesses.
+
+    Returns:
+        Dict with job execution results
+    """
+    start_time = datetime.now(timezone.utc)
+    result = {
+        "start_time": start_time.isoformat(),
+        "customers": 0,
+        "expire_transactions": 0,
+        "points_expired": 0,
+        "earn_transactions": 0,
+        "errors": [],
+    }
+
+    try:
+        db = SessionLocal()
+        try:
+            result.update(LoyaltyExpiryService(db).expire_points(now=start_time))
+            logger.info(
+                "Loyalty expiry completed: %d points expired for %d customers",
+                result["points_expired"],
+                result["customers"],
+            )
+        except Exception as e:
+            db.rollback()
+            error_msg = f"Error during loyalty points expiry: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            result["errors"].append(error_msg)
+        finally:
+            db.close()
+
+    except Exception as e:
+        error_msg = f"Failed to create database session: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        result["errors"].append(error_msg)
+
+    result["end_time"] = datetime.now(timezone.utc).isoformat()
+    return result
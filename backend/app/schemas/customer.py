@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field, EmailStr
 from datetime import datetime
 
 from app.models.customer import CustomerType
+from app.schemas.pagination import PaginatedResponse
 
 
 class CustomerBase(BaseModel):
@@ -77,14 +78,10 @@ class CustomerResponse(CustomerBase):
     model_config = {"from_attributes": True}
 
 
-class CustomerListResponse(BaseModel):
+class CustomerListResponse(PaginatedResponse):
     """Schema for paginated customer list."""
     
     items: List[CustomerResponse]
-    total: int
-    page: int
-    per_page: int
-    pages: int
 
 
 class CustomerBulkCreate(BaseModel):
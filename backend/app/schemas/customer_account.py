@@ -299,7 +299,8 @@ class PaymentAllocationResponse(BaseModel):
     """Schema for payment allocation response."""
     
     id: UUID
-    payment_id: UUID
+    payment_id: Optional[UUID] = None
+    adjustment_id: Optional[UUID] = None
     transaction_id: UUID
     amount: Decimal
     created_at: datetime
@@ -95,3 +95,30 @@ class DisplayConfigResponse(BaseModel):
     language: str
     created_at: datetime
     updated_at: datetime
+
+
+# ---------------------------------------------------------------------------
+# Live cart (pushed to the display, not stored)
+# ---------------------------------------------------------------------------
+
+
+class DisplayCartLine(BaseModel):
+    """One line of the cart shown on a customer display."""
+
+    name: str
+    quantity: float = 1
+    unit_price: float = 0
+    total: float = 0
+    modifiers: list[str] = Field(default_factory=list)
+
+
+class DisplayCartUpdate(BaseModel):
+    """Current cart of the till paired with a display."""
+
+    items: list[DisplayCartLine] = Field(default_factory=list)
+    subtotal: float = 0
+    discount: float = 0
+    tax: float = 0
+    total: float = 0
+    currency: Optional[str] = None
+    message: Optional[str] = Field(None, max_length=200)
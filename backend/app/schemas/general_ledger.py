@@ -198,6 +198,23 @@ class AccountBalanceListResponse(BaseModel):
     pages: int
 
 
+class AccountBalanceMismatch(BaseModel):
+    """A period balance field that disagrees with the journal lines."""
+    account_id: str
+    period_year: int
+    period_month: int
+    field: str
+    expected: Optional[Decimal] = None
+    actual: Optional[Decimal] = None
+
+
+class AccountBalanceVerifyResponse(BaseModel):
+    """Result of checking period balances against journal lines."""
+    checked: int
+    mismatches: List[AccountBalanceMismatch]
+    repaired: bool
+
+
 # --- Recurring Entries ---
 
 class RecurringEntryCreate(BaseModel):
@@ -5,6 +5,7 @@ from decimal import Decimal
 from pydantic import BaseModel, Field
 from datetime import datetime, date
 from app.models.invoice import InvoiceStatus, InvoiceType
+from app.schemas.pagination import PaginatedResponse
 
 
 class InvoiceItemBase(BaseModel):
@@ -119,14 +120,10 @@ class InvoiceResponse(InvoiceBase):
     model_config = {"from_attributes": True}
 
 
-class InvoiceListResponse(BaseModel):
+class InvoiceListResponse(PaginatedResponse):
     """Schema for paginated invoice list."""
     
     items: List[InvoiceResponse]
-    total: int
-    page: int
-    per_page: int
-    pages: int
 
 
 class PaymentRecord(BaseModel):
@@ -6,6 +6,8 @@ from datetime import datetime, date
 from uuid import UUID
 from decimal import Decimal
 
+from app.schemas.pagination import PaginatedResponse
+
 
 # ── Request Schemas ──────────────────────────────────────────────────────────
 
@@ -130,12 +132,8 @@ class LaybyResponse(BaseModel):
     updated_at: datetime
 
 
-class LaybyListResponse(BaseModel):
+class LaybyListResponse(PaginatedResponse):
     items: List[LaybyResponse]
-    total: int
-    page: int
-    per_page: int
-    pages: int
 
 
 class LaybyConfigResponse(BaseModel):
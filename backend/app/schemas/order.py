@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 
 from app.models.order import OrderStatus, PaymentStatus, OrderDirection
+from app.schemas.pagination import PaginatedResponse
 
 
 class AddressSchema(BaseModel):
@@ -170,14 +171,10 @@ class OrderResponse(OrderBase):
     model_config = {"from_attributes": True}
 
 
-class OrderListResponse(BaseModel):
+class OrderListResponse(PaginatedResponse):
     """Schema for paginated order list."""
     
     items: List[OrderResponse]
-    total: int
-    page: int
-    per_page: int
-    pages: int
 
 
 class OrderStatusUpdate(BaseModel):
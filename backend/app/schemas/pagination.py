@@ -0,0 +1,23 @@
+"""Shared fields of paginated list responses."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PaginatedResponse(BaseModel):
+    """
+    Pagination fields, filled from ``app.core.pagination.Page.meta()``.
+
+    ``total`` and ``pages`` are None when the client asked for no total
+    (``include_total=false``); ``total_estimated`` marks planner estimates.
+    ``next_cursor`` is set when the list can continue by cursor.
+    """
+
+    total: Optional[int] = None
+    page: int
+    per_page: int
+    pages: Optional[int] = None
+    has_more: bool = False
+    total_estimated: bool = False
+    next_cursor: Optional[str] = None
@@ -1,11 +1,12 @@
 """Product schemas for API validation."""
 
-from typing import Optional, List
+from typing import Dict, Optional, List
 from decimal import Decimal
 from pydantic import BaseModel, Field
 from datetime import datetime
 
 from app.models.product import ProductStatus
+from app.schemas.pagination import PaginatedResponse
 
 
 class ProductCategoryBase(BaseModel):
@@ -121,14 +122,10 @@ class ProductResponse(ProductBase):
     model_config = {"from_attributes": True}
 
 
-class ProductListResponse(BaseModel):
+class ProductListResponse(PaginatedResponse):
     """Schema for paginated product list."""
     
     items: List[ProductResponse]
-    total: int
-    page: int
-    per_page: int
-    pages: int
 
 
 class ProductBulkCreate(BaseModel):
@@ -143,6 +140,35 @@ class ProductBulkDelete(BaseModel):
     product_ids: List[str]
 
 
+class ScanProductResponse(BaseModel):
+    """Compact product record returned for a scanned barcode or SKU."""
+
+    id: str
+    name: str
+    sku: Optional[str] = None
+    barcode: Optional[str] = None
+    category_id: Optional[str] = None
+    selling_price: Decimal
+    compare_at_price: Optional[Decimal] = None
+    is_taxable: Optional[bool] = None
+    tax_rate: Optional[Decimal] = None
+    track_inventory: Optional[bool] = None
+    status: Optional[ProductStatus] = None
+
+
+class ScanLookupRequest(BaseModel):
+    """Codes buffered by a scanner, resolved in one request."""
+
+    codes: List[str] = Field(..., min_length=1, max_length=200)
+
+
+class ScanLookupResponse(BaseModel):
+    """Batch scan result: records by code, plus the codes not found."""
+
+    found: Dict[str, ScanProductResponse]
+    missing: List[str]
+
+
 class ProductFilter(BaseModel):
     """Schema for product filtering."""
     
@@ -11,6 +11,8 @@ from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.schemas.pagination import PaginatedResponse
+
 
 # ---------------------------------------------------------------------------
 # Floor Plan Schemas
@@ -138,10 +140,6 @@ class ReservationResponse(BaseModel):
     updated_at: datetime
 
 
-class ReservationListResponse(BaseModel):
+class ReservationListResponse(PaginatedResponse):
     """Paginated reservation list."""
     items: List[ReservationResponse]
-    total: int
-    page: int
-    per_page: int
-    pages: int
@@ -4,6 +4,8 @@ from typing import Optional, List
 from pydantic import BaseModel, Field, EmailStr
 from datetime import datetime
 
+from app.schemas.pagination import PaginatedResponse
+
 
 class SupplierBase(BaseModel):
     """Base schema for supplier."""
@@ -68,11 +70,7 @@ class SupplierResponse(SupplierBase):
     model_config = {"from_attributes": True}
 
 
-class SupplierListResponse(BaseModel):
+class SupplierListResponse(PaginatedResponse):
     """Schema for paginated supplier list."""
 
     items: List[SupplierResponse]
-    total: int
-    page: int
-    per_page: int
-    pages: int
@@ -0,0 +1,335 @@
+"""Set-based aging engine for customer accounts.
+
+Aging buckets (per Requirements 5.3 and 6.1), counted in whole days past
+the due time:
+
+- current: not yet due
+- days_30: 0-30 days past due
+- days_60: 31-60 days past due
+- days_90_plus: 61+ days past due
+
+Only the unpaid part of each charge is aged (charge amount less payment
+allocations).  Positive balance adjustments are aged and paid like charges
+without a due date; credit adjustments are allocated to the oldest unpaid
+debits like payments.  A charge falls due at midnight UTC on its explicit
+``due_date`` or, failing that, at its creation time plus the account's
+payment terms.  Days past due are whole days between the due time and the
+as-of time, so a charge created at 15:00 is a day overdue from 15:00.
+
+Two sources are supported:
+
+- ``aging_for_accounts`` computes buckets for one account or a whole
+  business from the transaction history in a single grouped query
+  (charges LEFT JOIN allocation sums, bucketed by due date in SQL).
+- ``open_items_aging`` reads the incrementally maintained
+  ``account_open_items`` table, which is cheaper still for business-wide
+  reports.  ``rebuild_open_items`` re-derives that table from history.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Union
+from uuid import UUID
+
+from sqlalchemy import DateTime, and_, case, cast, delete, func, insert, or_, select, type_coerce
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.base import utc_now
+from app.models.customer_account import (
+    AccountOpenItem,
+    AccountStatus,
+    AccountTransaction,
+    CustomerAccount,
+    PaymentAllocation,
+    TransactionType,
+)
+
+AGING_BUCKETS = ("current", "days_30", "days_60", "days_90_plus")
+
+# Transactions that are aged and settled by allocations
+DEBIT_TRANSACTIONS = or_(
+    AccountTransaction.transaction_type == TransactionType.CHARGE,
+    and_(
+        AccountTransaction.transaction_type == TransactionType.ADJUSTMENT,
+        AccountTransaction.amount > 0,
+    ),
+)
+
+
+def empty_aging() -> Dict[str, Decimal]:
+    """Zeroed aging breakdown (buckets plus total)."""
+    return {key: Decimal("0") for key in (*AGING_BUCKETS, "total")}
+
+
+def _utc(value: datetime) -> datetime:
+    """Aware UTC datetime (naive datetimes are taken to be UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _midnight_utc(value: date) -> datetime:
+    return datetime.combine(value, time.min, tzinfo=timezone.utc)
+
+
+def aging_as_of(as_of_date: Optional[Union[datetime, date]] = None) -> datetime:
+    """Normalise an as-of value to an aware UTC datetime.
+
+    Defaults to now.  Naive datetimes are UTC and dates mean midnight UTC.
+    """
+    if as_of_date is None:
+        return utc_now()
+    if isinstance(as_of_date, datetime):
+        return _utc(as_of_date)
+    return _midnight_utc(as_of_date)
+
+
+def open_item_due_at(
+    payment_terms: Optional[int],
+    due_date: Optional[Union[datetime, date]] = None,
+    created_at: Optional[datetime] = None,
+) -> datetime:
+    """Due time used for aging, mirroring the SQL expression in the engine."""
+    if due_date is not None:
+        if isinstance(due_date, datetime):
+            due_date = due_date.date()
+        return _midnight_utc(due_date)
+    created = _utc(created_at or utc_now())
+    return created + timedelta(days=payment_terms or 0)
+
+
+def _bucket_columns(due, amount, as_of: datetime) -> list:
+    # Whole days past due: 0-30 until 31 days have passed, 31-60 until 61 days
+    d31 = as_of - timedelta(days=31)
+    d61 = as_of - timedelta(days=61)
+    zero = Decimal("0")
+    return [
+        func.coalesce(func.sum(case((due > as_of, amount), else_=zero)), zero).label("current"),
+        func.coalesce(
+            func.sum(case((and_(due <= as_of, due > d31), amount), else_=zero)), zero
+        ).label("days_30"),
+        func.coalesce(
+            func.sum(case((and_(due <= d31, due > d61), amount), else_=zero)), zero
+        ).label("days_60"),
+        func.coalesce(func.sum(case((due <= d61, amount), else_=zero)), zero).label("days_90_plus"),
+        func.coalesce(func.sum(amount), zero).label("total"),
+    ]
+
+
+def sum_aging(breakdowns: Iterable[Dict[str, Decimal]]) -> Dict[str, Decimal]:
+    """Add up per-account aging breakdowns."""
+    totals = empty_aging()
+    for aging in breakdowns:
+        for key in totals:
+            totals[key] += aging.get(key, Decimal("0"))
+    return totals
+
+
+def _row_to_aging(row) -> Dict[str, Decimal]:
+    return {key: Decimal(str(getattr(row, key) or 0)) for key in (*AGING_BUCKETS, "total")}
+
+
+class AccountAgingService:
+    """Aging calculations and open-item maintenance for customer accounts."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _insert(self, model):
+        """Return a dialect-specific INSERT that supports ON CONFLICT."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return sqlite_insert(model)
+        return pg_insert(model)
+
+    # ── Transaction-history engine ───────────────────────────────────────────
+
+    def _due_at(self):
+        """SQL for a charge's due time, as computed by ``open_item_due_at``."""
+        terms = CustomerAccount.payment_terms
+        created = AccountTransaction.created_at
+        due_date = AccountTransaction.due_date
+        if self.db.get_bind().dialect.name == "sqlite":
+            # Text timestamps in SQLite's own format compare in time order
+            # with bound datetimes
+            fmt = "%Y-%m-%d %H:%M:%f"
+            return type_coerce(
+                func.coalesce(
+                    func.strftime(fmt, due_date),
+                    func.strftime(fmt, created, func.printf("+%d days", terms)),
+                ),
+                DateTime(timezone=True),
+            )
+        # Days are added to the UTC wall time, so DST never shifts a due time;
+        # make_interval(years, months, weeks, days)
+        return func.coalesce(
+            func.timezone("UTC", cast(due_date, DateTime)),
+            func.timezone("UTC", func.timezone("UTC", created) + func.make_interval(0, 0, 0, terms)),
+        )
+
+    def _open_amounts(
+        self,
+        account_ids: Optional[Iterable[UUID]] = None,
+        business_id: Optional[UUID] = None,
+    ):
+        """Subquery of the unpaid amount per debit with its due time."""
+        due = self._due_at()
+        open_amount = AccountTransaction.amount - func.coalesce(func.sum(PaymentAllocation.amount), 0)
+
+        stmt = (
+            select(
+                AccountTransaction.account_id.label("account_id"),
+                CustomerAccount.business_id.label("business_id"),
+                due.label("due_at"),
+                open_amount.label("open_amount"),
+            )
+            .join(CustomerAccount, CustomerAccount.id == AccountTransaction.account_id)
+            .outerjoin(PaymentAllocation, PaymentAllocation.transaction_id == AccountTransaction.id)
+            .where(
+                DEBIT_TRANSACTIONS,
+                AccountTransaction.deleted_at.is_(None),
+            )
+            # Other columns are functionally dependent on the two primary keys
+            .group_by(AccountTransaction.id, CustomerAccount.id)
+        )
+        if account_ids is not None:
+            stmt = stmt.where(AccountTransaction.account_id.in_(list(account_ids)))
+        if business_id is not None:
+            stmt = stmt.where(CustomerAccount.business_id == business_id)
+
+        items = stmt.subquery()
+        # Fully paid charges drop out
+        return select(items).where(items.c.open_amount > 0).subquery()
+
+    def aging_for_accounts(
+        self,
+        account_ids: Optional[Iterable[UUID]] = None,
+        business_id: Optional[UUID] = None,
+        as_of_date: Optional[Union[datetime, date]] = None,
+    ) -> Dict[UUID, Dict[str, Decimal]]:
+        """Aging per account from transaction history in one grouped query.
+
+        Pass ``account_ids``, ``business_id`` or both to scope the query.
+        Accounts with nothing outstanding are omitted from the result.
+        """
+        items = self._open_amounts(account_ids, business_id)
+        stmt = select(
+            items.c.account_id,
+            *_bucket_columns(items.c.due_at, items.c.open_amount, aging_as_of(as_of_date)),
+        ).group_by(items.c.account_id)
+        return {row.account_id: _row_to_aging(row) for row in self.db.execute(stmt)}
+
+    def aging_for_account(
+        self,
+        account_id: UUID,
+        as_of_date: Optional[Union[datetime, date]] = None,
+    ) -> Dict[str, Decimal]:
+        """Aging for a single account (zeros when nothing is outstanding)."""
+        return self.aging_for_accounts([account_id], as_of_date=as_of_date).get(
+            account_id, empty_aging()
+        )
+
+    # ── Open-items table ─────────────────────────────────────────────────────
+
+    def open_items_aging(
+        self,
+        business_id: UUID,
+        as_of_date: Optional[Union[datetime, date]] = None,
+        account_ids: Optional[Iterable[UUID]] = None,
+        status: Optional[AccountStatus] = None,
+    ) -> Dict[UUID, Dict[str, Decimal]]:
+        """Aging per account from ``account_open_items``.
+
+        ``status`` restricts the result to accounts in that status.
+        """
+        stmt = (
+            select(
+                AccountOpenItem.account_id,
+                *_bucket_columns(AccountOpenItem.due_at, AccountOpenItem.amount, aging_as_of(as_of_date)),
+            )
+            .where(
+                AccountOpenItem.business_id == business_id,
+                AccountOpenItem.deleted_at.is_(None),
+            )
+            .group_by(AccountOpenItem.account_id)
+        )
+        if account_ids is not None:
+            stmt = stmt.where(AccountOpenItem.account_id.in_(list(account_ids)))
+        if status is not None:
+            stmt = stmt.join(CustomerAccount, CustomerAccount.id == AccountOpenItem.account_id).where(
+                CustomerAccount.status == status
+            )
+        return {row.account_id: _row_to_aging(row) for row in self.db.execute(stmt)}
+
+    def post_open_item(
+        self,
+        account: CustomerAccount,
+        due_at: datetime,
+        amount: Decimal,
+    ) -> None:
+        """Add ``amount`` (negative to reduce) to the account's open item for ``due_at``.
+
+        A single upsert on (account_id, due_at), so concurrent postings to
+        the same row add up instead of racing to insert it.  Does not
+        commit; callers post inside their own transaction.
+        """
+        stmt = self._insert(AccountOpenItem).values(
+            account_id=account.id,
+            business_id=account.business_id,
+            due_at=due_at,
+            amount=amount,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AccountOpenItem.account_id, AccountOpenItem.due_at],
+            set_={
+                "amount": AccountOpenItem.amount + stmt.excluded.amount,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self.db.execute(stmt)
+
+    def rebuild_open_items(
+        self,
+        account_ids: Optional[Iterable[UUID]] = None,
+        business_id: Optional[UUID] = None,
+    ) -> int:
+        """Re-derive ``account_open_items`` from transaction history.
+
+        Replaces the rows in scope with one row per account and due time.
+        Does not commit.  Returns the number of rows written.
+        """
+        if account_ids is not None:
+            account_ids = list(account_ids)
+        items = self._open_amounts(account_ids, business_id)
+        grouped = (
+            select(
+                items.c.account_id,
+                items.c.business_id,
+                items.c.due_at,
+                func.sum(items.c.open_amount).label("amount"),
+            )
+            .group_by(items.c.account_id, items.c.business_id, items.c.due_at)
+        )
+        rows = self.db.execute(grouped).all()
+
+        stale = delete(AccountOpenItem)
+        if account_ids is not None:
+            stale = stale.where(AccountOpenItem.account_id.in_(account_ids))
+        if business_id is not None:
+            stale = stale.where(AccountOpenItem.business_id == business_id)
+        self.db.execute(stale)
+
+        values = [
+            {
+                "account_id": r.account_id,
+                "business_id": r.business_id,
+                "due_at": r.due_at,
+                "amount": r.amount,
+            }
+            for r in rows
+            if r.amount
+        ]
+        if values:
+            self.db.execute(insert(AccountOpenItem), values)
+        return len(values)
@@ -1,8 +1,9 @@
 """Extracted AI context building methods for use by the agent system."""
 
+import asyncio
 from typing import Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func
 
 from app.models.business import Business
 from app.models.business_user import BusinessUser, BusinessUserStatus
@@ -17,6 +18,35 @@ from app.models.user_settings import AIDataSharingLevel
 from app.services.app_help_kb import AppHelpKnowledgeBase
 from app.core.config import settings
 
+_EMPTY_METRICS: dict[str, Any] = {
+    "totalProducts": 0,
+    "totalInventoryItems": 0,
+    "totalCustomers": 0,
+    "totalSuppliers": 0,
+    "totalOrders": 0,
+    "totalInvoices": 0,
+    "totalPayments": 0,
+    "lowStockItems": 0,
+    "avgMargin": 0,
+    "totalRevenue": 0,
+    "paidRevenue": 0,
+    "outstandingInvoiceAmount": 0,
+    "outstandingInvoiceCount": 0,
+    "totalPurchaseOrders": 0,
+    "totalPurchaseInvoices": 0,
+    "totalPurchasePayments": 0,
+    "totalPurchaseAmount": 0,
+    "totalPurchaseCount": 0,
+}
+
+_OUTSTANDING_INVOICE_STATUSES = [
+    InvoiceStatus.DRAFT,
+    InvoiceStatus.SENT,
+    InvoiceStatus.VIEWED,
+    InvoiceStatus.PARTIAL,
+    InvoiceStatus.OVERDUE,
+]
+
 
 class AIContextService:
     """Service for building AI context without the chat functionality."""
@@ -38,60 +68,44 @@ class AIContextService:
     def build_business_context(self, user: User, level: AIDataSharingLevel) -> dict[str, Any]:
         """Build business context based on data sharing level."""
         business = self._get_business_for_user(user.id)
-        if not business:
-            return {
-                "businessName": "",
-                "currency": "",
-                "totalProducts": 0,
-                "totalInventoryItems": 0,
-                "totalCustomers": 0,
-                "totalSuppliers": 0,
-                "totalOrders": 0,
-                "totalInvoices": 0,
-                "totalPayments": 0,
-                "lowStockItems": 0,
-                "avgMargin": 0,
-                "totalRevenue": 0,
-                "paidRevenue": 0,
-                "outstandingInvoiceAmount": 0,
-                "outstandingInvoiceCount": 0,
-                "totalPurchaseOrders": 0,
-                "totalPurchaseInvoices": 0,
-                "totalPurchasePayments": 0,
-                "totalPurchaseAmount": 0,
-                "totalPurchaseCount": 0,
-            }
+        snapshot = None
+        if business and level not in (AIDataSharingLevel.NONE, AIDataSharingLevel.APP_ONLY):
+            snapshot = self.compute_business_snapshot(business)
+        return self._shape_context(business, snapshot, level)
+
+    async def get_business_context(self, user: User, level: AIDataSharingLevel) -> dict[str, Any]:
+        """
+        Same result as ``build_business_context``, but the metrics and
+        product/stock highlights come from the business's cached context
+        snapshot, so a warm call costs one Redis read instead of the queries.
+        """
+        from app.services.ai_context_snapshot import get_context_snapshot
+
+        business = await asyncio.to_thread(self._get_business_for_user, user.id)
+        if not business or level in (AIDataSharingLevel.NONE, AIDataSharingLevel.APP_ONLY):
+            return self._shape_context(business, None, level)
+
+        snapshot = await get_context_snapshot(
+            business.id, lambda: self.compute_business_snapshot(business)
+        )
+        if level == AIDataSharingLevel.FULL_BUSINESS_WITH_CUSTOMERS:
+            return await asyncio.to_thread(self._shape_context, business, snapshot, level)
+        return self._shape_context(business, snapshot, level)
 
-        if level in (AIDataSharingLevel.NONE, AIDataSharingLevel.APP_ONLY):
-            return {
-                "businessName": business.name,
-                "currency": business.currency,
-                "totalProducts": 0,
-                "totalInventoryItems": 0,
-                "totalCustomers": 0,
-                "totalSuppliers": 0,
-                "totalOrders": 0,
-                "totalInvoices": 0,
-                "totalPayments": 0,
-                "lowStockItems": 0,
-                "avgMargin": 0,
-                "totalRevenue": 0,
-                "paidRevenue": 0,
-                "outstandingInvoiceAmount": 0,
-                "outstandingInvoiceCount": 0,
-                "totalPurchaseOrders": 0,
-                "totalPurchaseInvoices": 0,
-                "totalPurchasePayments": 0,
-                "totalPurchaseAmount": 0,
-                "totalPurchaseCount": 0,
-            }
+    def compute_business_snapshot(self, business: Business) -> dict[str, Any]:
+        """
+        Metrics plus product and low-stock highlights for a business.
 
-        total_products = (
-            self.db.query(func.count(Product.id))
+        Depends only on the business (not the user or sharing level) and
+        holds no customer records, so it is safe to cache per business.
+        """
+        products = (
+            self.db.query(Product)
             .filter(Product.business_id == business.id, Product.deleted_at.is_(None))
-            .scalar()
-            or 0
+            .all()
         )
+        margins = [p.profit_margin for p in products]
+        avg_margin = (sum(margins) / len(margins)) if margins else 0
 
         total_customers = (
             self.db.query(func.count(Customer.id))
@@ -107,223 +121,149 @@ class AIContextService:
             or 0
         )
 
-        total_orders = (
-            self.db.query(func.count(Order.id))
-            .filter(Order.business_id == business.id, Order.deleted_at.is_(None))
-            .scalar()
-            or 0
-        )
-
-        total_invoices = (
-            self.db.query(func.count(Invoice.id))
-            .filter(Invoice.business_id == business.id, Invoice.deleted_at.is_(None))
-            .scalar()
-            or 0
-        )
-
-        # Count paid/partial invoices as "payments"
-        total_payments = (
-            self.db.query(func.count(Invoice.id))
-            .filter(
-                Invoice.business_id == business.id,
-                Invoice.deleted_at.is_(None),
-                Invoice.status.in_([InvoiceStatus.PAID, InvoiceStatus.PARTIAL]),
+        is_purchase = Order.direction == OrderDirection.OUTBOUND
+        (
+            total_orders,
+            total_revenue,
+            paid_revenue,
+            total_purchase_orders,
+            total_purchase_amount,
+        ) = (
+            self.db.query(
+                func.count(Order.id),
+                func.coalesce(func.sum(Order.total), 0),
+                func.coalesce(
+                    func.sum(case((Order.payment_status == OrderPaymentStatus.PAID, Order.total), else_=0)), 0
+                ),
+                func.count(case((is_purchase, Order.id))),
+                func.coalesce(func.sum(case((is_purchase, Order.total), else_=0)), 0),
             )
-            .scalar()
-            or 0
-        )
-
-        total_revenue = (
-            self.db.query(func.coalesce(func.sum(Order.total), 0))
             .filter(Order.business_id == business.id, Order.deleted_at.is_(None))
-            .scalar()
-            or 0
+            .one()
         )
 
-        paid_revenue = (
-            self.db.query(func.coalesce(func.sum(Order.total), 0))
-            .filter(
-                Order.business_id == business.id,
-                Order.deleted_at.is_(None),
-                Order.payment_status == OrderPaymentStatus.PAID,
-            )
-            .scalar()
-            or 0
-        )
-
-        outstanding_invoice_amount = (
-            self.db.query(func.coalesce(func.sum(Invoice.total - Invoice.amount_paid), 0))
-            .filter(
-                Invoice.business_id == business.id,
-                Invoice.deleted_at.is_(None),
-                Invoice.status.in_(
-                    [
-                        InvoiceStatus.DRAFT,
-                        InvoiceStatus.SENT,
-                        InvoiceStatus.VIEWED,
-                        InvoiceStatus.PARTIAL,
-                        InvoiceStatus.OVERDUE,
-                    ]
+        # Count paid/partial invoices as "payments"
+        is_paid = Invoice.status.in_([InvoiceStatus.PAID, InvoiceStatus.PARTIAL])
+        is_outstanding = Invoice.status.in_(_OUTSTANDING_INVOICE_STATUSES)
+        (
+            total_invoices,
+            total_payments,
+            outstanding_invoice_amount,
+            outstanding_invoice_count,
+        ) = (
+            self.db.query(
+                func.count(Invoice.id),
+                func.count(case((is_paid, Invoice.id))),
+                func.coalesce(
+                    func.sum(case((is_outstanding, Invoice.total - Invoice.amount_paid), else_=0)), 0
                 ),
+                func.count(case((is_outstanding, Invoice.id))),
             )
-            .scalar()
-            or 0
+            .filter(Invoice.business_id == business.id, Invoice.deleted_at.is_(None))
+            .one()
         )
 
-        outstanding_invoice_count = (
-            self.db.query(func.count(Invoice.id))
+        total_purchase_invoices, total_purchase_payments = (
+            self.db.query(func.count(Invoice.id), func.count(case((is_paid, Invoice.id))))
+            .join(Order, Invoice.order_id == Order.id)
             .filter(
                 Invoice.business_id == business.id,
                 Invoice.deleted_at.is_(None),
-                Invoice.status.in_(
-                    [
-                        InvoiceStatus.DRAFT,
-                        InvoiceStatus.SENT,
-                        InvoiceStatus.VIEWED,
-                        InvoiceStatus.PARTIAL,
-                        InvoiceStatus.OVERDUE,
-                    ]
-                ),
+                is_purchase,
             )
-            .scalar()
-            or 0
+            .one()
         )
-        total_inventory_items = (
-            self.db.query(func.count(InventoryItem.id))
+
+        is_low_stock = InventoryItem.quantity_on_hand <= InventoryItem.reorder_point
+        total_inventory_items, low_stock_items = (
+            self.db.query(func.count(InventoryItem.id), func.count(case((is_low_stock, InventoryItem.id))))
             .filter(InventoryItem.business_id == business.id, InventoryItem.deleted_at.is_(None))
-            .scalar()
-            or 0
+            .one()
         )
-        low_stock_items = (
-            self.db.query(func.count(InventoryItem.id))
+
+        low_stock_inventory = (
+            self.db.query(InventoryItem)
             .filter(
                 InventoryItem.business_id == business.id,
                 InventoryItem.deleted_at.is_(None),
-                InventoryItem.quantity_on_hand <= InventoryItem.reorder_point,
+                is_low_stock,
             )
-            .scalar()
-            or 0
-        )
-
-        products = (
-            self.db.query(Product)
-            .filter(Product.business_id == business.id, Product.deleted_at.is_(None))
+            .order_by(InventoryItem.quantity_on_hand.asc())
+            .limit(20)
             .all()
         )
-        margins = [p.profit_margin for p in products] if products else []
-        avg_margin = (sum(margins) / len(margins)) if margins else 0
-
-        total_purchase_orders = (
-            self.db.query(func.count(Order.id))
-            .filter(
-                Order.business_id == business.id,
-                Order.deleted_at.is_(None),
-                Order.direction == OrderDirection.OUTBOUND,
-            )
-            .scalar()
-            or 0
-        )
 
-        total_purchase_invoices = (
-            self.db.query(func.count(Invoice.id))
-            .join(Order, Invoice.order_id == Order.id)
-            .filter(
-                Invoice.business_id == business.id,
-                Invoice.deleted_at.is_(None),
-                Order.direction == OrderDirection.OUTBOUND,
-            )
-            .scalar()
-            or 0
-        )
-
-        # Count paid/partial purchase invoices as "payments"
-        total_purchase_payments = (
-            self.db.query(func.count(Invoice.id))
-            .join(Order, Invoice.order_id == Order.id)
-            .filter(
-                Invoice.business_id == business.id,
-                Invoice.deleted_at.is_(None),
-                Order.direction == OrderDirection.OUTBOUND,
-                Invoice.status.in_([InvoiceStatus.PAID, InvoiceStatus.PARTIAL]),
-            )
-            .scalar()
-            or 0
-        )
+        top_products = sorted(products, key=lambda p: p.profit_margin, reverse=True)[:10]
 
-        total_purchase_amount = (
-            self.db.query(func.coalesce(func.sum(Order.total), 0))
-            .filter(
-                Order.business_id == business.id,
-                Order.deleted_at.is_(None),
-                Order.direction == OrderDirection.OUTBOUND,
-            )
-            .scalar()
-            or 0
-        )
+        return {
+            "metrics": {
+                "totalProducts": len(products),
+                "totalInventoryItems": int(total_inventory_items or 0),
+                "totalCustomers": int(total_customers),
+                "totalSuppliers": int(total_suppliers),
+                "totalOrders": int(total_orders or 0),
+                "totalInvoices": int(total_invoices or 0),
+                "totalPayments": int(total_payments or 0),
+                "lowStockItems": int(low_stock_items or 0),
+                "avgMargin": float(avg_margin),
+                "totalRevenue": float(total_revenue or 0),
+                "paidRevenue": float(paid_revenue or 0),
+                "outstandingInvoiceAmount": float(outstanding_invoice_amount or 0),
+                "outstandingInvoiceCount": int(outstanding_invoice_count or 0),
+                "totalPurchaseOrders": int(total_purchase_orders or 0),
+                "totalPurchaseInvoices": int(total_purchase_invoices or 0),
+                "totalPurchasePayments": int(total_purchase_payments or 0),
+                "totalPurchaseAmount": float(total_purchase_amount or 0),
+                "totalPurchaseCount": int(total_purchase_orders or 0),
+            },
+            "topProductsByMargin": [
+                {
+                    "name": p.name,
+                    "sku": p.sku,
+                    "selling_price": float(p.selling_price),
+                    "effective_cost": float(p.effective_cost or 0),
+                    "profit_margin": float(p.profit_margin),
+                    "is_low_stock": bool(p.is_low_stock),
+                }
+                for p in top_products
+            ],
+            "lowStockInventory": [
+                {
+                    "product_id": str(i.product_id),
+                    "quantity_on_hand": int(i.quantity_on_hand),
+                    "reorder_point": int(i.reorder_point),
+                    "location": i.location,
+                }
+                for i in low_stock_inventory
+            ],
+        }
 
-        total_purchase_count = int(total_purchase_orders)
+    def _shape_context(
+        self,
+        business: Optional[Business],
+        snapshot: Optional[dict[str, Any]],
+        level: AIDataSharingLevel,
+    ) -> dict[str, Any]:
+        """Apply the data sharing level to a business snapshot."""
+        if not business:
+            return {"businessName": "", "currency": "", **_EMPTY_METRICS}
 
         context: dict[str, Any] = {
             "businessName": business.name,
             "currency": business.currency,
-            "totalProducts": int(total_products),
-            "totalInventoryItems": int(total_inventory_items),
-            "totalCustomers": int(total_customers),
-            "totalSuppliers": int(total_suppliers),
-            "totalOrders": int(total_orders),
-            "totalInvoices": int(total_invoices),
-            "totalPayments": int(total_payments),
-            "lowStockItems": int(low_stock_items),
-            "avgMargin": float(avg_margin),
-            "totalRevenue": float(total_revenue),
-            "paidRevenue": float(paid_revenue),
-            "outstandingInvoiceAmount": float(outstanding_invoice_amount),
-            "outstandingInvoiceCount": int(outstanding_invoice_count),
-            "totalPurchaseOrders": int(total_purchase_orders),
-            "totalPurchaseInvoices": int(total_purchase_invoices),
-            "totalPurchasePayments": int(total_purchase_payments),
-            "totalPurchaseAmount": float(total_purchase_amount),
-            "totalPurchaseCount": int(total_purchase_count),
+            **_EMPTY_METRICS,
         }
+        if snapshot is None or level in (AIDataSharingLevel.NONE, AIDataSharingLevel.APP_ONLY):
+            return context
 
+        context.update(snapshot["metrics"])
         if level == AIDataSharingLevel.METRICS_ONLY:
             return context
 
-        top_products = sorted(products, key=lambda p: p.profit_margin, reverse=True)[:10]
-        context["topProductsByMargin"] = [
-            {
-                "name": p.name,
-                "sku": p.sku,
-                "selling_price": float(p.selling_price),
-                "effective_cost": float(p.effective_cost or 0),
-                "profit_margin": float(p.profit_margin),
-                "is_low_stock": bool(p.is_low_stock),
-            }
-            for p in top_products
-        ]
-
-        low_stock_inventory = (
-            self.db.query(InventoryItem)
-            .filter(
-                InventoryItem.business_id == business.id,
-                InventoryItem.deleted_at.is_(None),
-                InventoryItem.quantity_on_hand <= InventoryItem.reorder_point,
-            )
-            .order_by(InventoryItem.quantity_on_hand.asc())
-            .limit(20)
-            .all()
-        )
-        context["lowStockInventory"] = [
-            {
-                "product_id": str(i.product_id),
-                "quantity_on_hand": int(i.quantity_on_hand),
-                "reorder_point": int(i.reorder_point),
-                "location": i.location,
-            }
-            for i in low_stock_inventory
-        ]
+        context["topProductsByMargin"] = snapshot["topProductsByMargin"]
+        context["lowStockInventory"] = snapshot["lowStockInventory"]
 
-        # Include customer insights only when allowed
+        # Include customer insights only when allowed (never cached)
         if level == AIDataSharingLevel.FULL_BUSINESS_WITH_CUSTOMERS:
             top_customers = (
                 self.db.query(Customer)
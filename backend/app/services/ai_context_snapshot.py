@@ -0,0 +1,244 @@
+"""Per-business AI context snapshot stored in Redis.
+
+``AIContextService.compute_business_snapshot`` runs the count/sum queries
+behind the AI business context.  Their result only depends on the business,
+so it is stored once per business as compact JSON and every chat, KPI tool
+call and ``GET /ai/context`` reads it back with one Redis GET.
+
+Freshness:
+
+- Write events: while the refresher runs (started with the app), it
+  subscribes to ``app.core.commit_tracker`` for businesses that had
+  products, inventory, customers, suppliers, orders or invoices committed,
+  and recomputes those snapshots in the background.  Bursts of writes (a busy
+  till) are coalesced into one refresh per debounce window.
+- Staleness bound: snapshots expire after ``AI_CONTEXT_SNAPSHOT_TTL_SECONDS``,
+  which covers writes made where no refresher runs (scripts, other tools).
+
+Like the other Redis caches, everything degrades to computing the snapshot
+directly when Redis is unavailable.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core import commit_tracker
+from app.core.config import settings
+from app.core.redis import redis_manager
+from app.models.customer import Customer
+from app.models.inventory import InventoryItem
+from app.models.invoice import Invoice
+from app.models.order import Order
+from app.models.product import Product
+from app.models.product_ingredient import ProductIngredient
+from app.models.supplier import Supplier
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "bizpilot:ai_context"
+
+# Models whose writes change a business's snapshot (all carry business_id)
+_TRACKED_MODELS = (Product, ProductIngredient, InventoryItem, Customer, Supplier, Order, Invoice)
+
+_SUBSCRIBER_NAME = "ai_context_snapshot"
+
+_stats = {"hits": 0, "misses": 0}
+
+
+def _key(business_id: Any) -> str:
+    return f"{SNAPSHOT_PREFIX}:{business_id}"
+
+
+async def store_snapshot(business_id: Any, snapshot: Dict[str, Any]) -> None:
+    await redis_manager.set(
+        _key(business_id),
+        json.dumps(snapshot, separators=(",", ":")),
+        ttl_seconds=settings.AI_CONTEXT_SNAPSHOT_TTL_SECONDS,
+    )
+
+
+async def get_context_snapshot(
+    business_id: Any, compute: Callable[[], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Return the business's snapshot, computing and storing it on a miss.
+
+    *compute* is a blocking callable (it queries the database) and runs in
+    a worker thread.
+    """
+    raw = await redis_manager.get(_key(business_id))
+    if raw:
+        try:
+            snapshot = json.loads(raw)
+            _stats["hits"] += 1
+            return snapshot
+        except ValueError:
+            logger.warning("Discarding unreadable AI context snapshot for %s", business_id)
+
+    _stats["misses"] += 1
+    snapshot = await asyncio.to_thread(compute)
+    await store_snapshot(business_id, snapshot)
+    return snapshot
+
+
+async def invalidate_snapshot(business_id: Any) -> None:
+    await redis_manager.delete(_key(business_id))
+
+
+class ContextSnapshotRefresher:
+    """
+    Recomputes snapshots for businesses whose data was committed.
+
+    ``mark_dirty`` is thread-safe (commits happen in request threads and
+    scheduler jobs); the refresh loop runs on the application's event loop
+    and does each recompute on its own session in a worker thread.
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float = 5.0,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ) -> None:
+        self.debounce_seconds = debounce_seconds
+        self._session_factory = session_factory
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.refreshed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def mark_dirty(self, business_ids: Iterable[Any]) -> None:
+        with self._lock:
+            self._pending.update(business_ids)
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take(self) -> set:
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            return pending
+
+    def _compute(self, business_id: Any) -> Optional[Dict[str, Any]]:
+        from app.models.business import Business
+        from app.services.ai_context_service import AIContextService
+
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        db = self._session_factory()
+        try:
+            business = db.get(Business, business_id)
+            if business is None:
+                return None
+            return AIContextService(db).compute_business_snapshot(business)
+        finally:
+            db.close()
+
+    async def refresh_pending(self) -> int:
+        """Recompute every pending snapshot; returns how many were stored."""
+        refreshed = 0
+        for business_id in self._take():
+            try:
+                snapshot = await asyncio.to_thread(self._compute, business_id)
+                if snapshot is None:
+                    await invalidate_snapshot(business_id)
+                    continue
+                await store_snapshot(business_id, snapshot)
+                refreshed += 1
+            except Exception as exc:
+                self.failed += 1
+                logger.warning("AI context snapshot refresh failed for %s: %s", business_id, exc)
+                # Never leave a snapshot we know is stale
+                await invalidate_snapshot(business_id)
+        self.refreshed += refreshed
+        return refreshed
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.debounce_seconds)
+            self._wakeup.clear()
+            await self.refresh_pending()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        commit_tracker.subscribe(_SUBSCRIBER)
+
+    async def stop(self) -> None:
+        commit_tracker.unsubscribe(_SUBSCRIBER_NAME)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+        self._wakeup = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending": len(self._pending),
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+        }
+
+
+def _touched_business(obj: Any, new_or_deleted: bool) -> Optional[Any]:
+    business_id = getattr(obj, "business_id", None)
+    if business_id is None:
+        return None
+    return business_id if isinstance(business_id, UUID) else str(business_id)
+
+
+def _mark_committed(business_ids: Iterable[Any]) -> None:
+    snapshot_refresher.mark_dirty(business_ids)
+
+
+_SUBSCRIBER = commit_tracker.CommitSubscriber(
+    name=_SUBSCRIBER_NAME,
+    models=_TRACKED_MODELS,
+    touched=_touched_business,
+    on_commit=_mark_committed,
+)
+
+
+snapshot_refresher = ContextSnapshotRefresher(
+    debounce_seconds=settings.AI_CONTEXT_REFRESH_DEBOUNCE_SECONDS,
+)
+
+
+async def start_context_snapshot_refresher() -> None:
+    """Start refreshing snapshots from commits (application startup)."""
+    snapshot_refresher.start()
+
+
+async def stop_context_snapshot_refresher() -> None:
+    """Stop the refresher (shutdown); stored snapshots expire on their own."""
+    await snapshot_refresher.stop()
+
+
+def context_snapshot_stats() -> Dict[str, Any]:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+        "refresher": snapshot_refresher.stats(),
+    }
@@ -2,12 +2,13 @@
 
 import json
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.audit_log import AuditAction, UserAuditLog
+from app.services.streaming_export_service import EXPORT_YIELD_PER
 
 
 class AuditService:
@@ -159,13 +160,12 @@ class AuditService:
             "total": base.count(),
         }
 
-    def export_activity_csv(
+    def _export_query(
         self,
         business_id: str,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> List[Dict[str, Any]]:
-        """Returns list of dicts for CSV export."""
+    ):
         query = (
             self.db.query(UserAuditLog)
             .filter(
@@ -177,18 +177,38 @@ class AuditService:
             query = query.filter(UserAuditLog.created_at >= start_date)
         if end_date:
             query = query.filter(UserAuditLog.created_at <= end_date)
+        return query.order_by(UserAuditLog.created_at.desc())
+
+    @staticmethod
+    def _csv_row(r: UserAuditLog) -> Dict[str, Any]:
+        return {
+            "id": str(r.id),
+            "user_id": str(r.user_id) if r.user_id else "",
+            "action": r.action.value if r.action else "",
+            "resource_type": r.resource_type,
+            "resource_id": r.resource_id or "",
+            "description": r.description or "",
+            "ip_address": r.ip_address or "",
+            "created_at": r.created_at.isoformat() if r.created_at else "",
+        }
+
+    def export_activity_csv(
+        self,
+        business_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Returns list of dicts for CSV export."""
+        rows = self._export_query(business_id, start_date, end_date).all()
+        return [self._csv_row(r) for r in rows]
 
-        rows = query.order_by(UserAuditLog.created_at.desc()).all()
-        return [
-            {
-                "id": str(r.id),
-                "user_id": str(r.user_id) if r.user_id else "",
-                "action": r.action.value if r.action else "",
-                "resource_type": r.resource_type,
-                "resource_id": r.resource_id or "",
-                "description": r.description or "",
-                "ip_address": r.ip_address or "",
-                "created_at": r.created_at.isoformat() if r.created_at else "",
-            }
-            for r in rows
-        ]
+    def iter_activity_csv(
+        self,
+        business_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield CSV rows one at a time from a server-side cursor."""
+        query = self._export_query(business_id, start_date, end_date).yield_per(EXPORT_YIELD_PER)
+        for r in query:
+            yield self._csv_row(r)
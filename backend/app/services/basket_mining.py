@@ -0,0 +1,211 @@
+"""Market-basket mining: item/pair counts and association rules.
+
+Baskets arrive as parallel arrays of (order key, product id) rows — one row
+per order line.  ``count_baskets`` turns them into a sparse order x product
+incidence (duplicates within an order collapse to one) and counts, with
+NumPy only:
+
+- item counts: baskets containing each product
+- pair counts: baskets containing each product pair, generated per basket
+  in COO form and reduced with ``np.unique`` (no Python loop per order)
+
+Counts are additive, so ``BasketCounts.combine`` adds the counts of new
+orders and subtracts those of orders that left the lookback window; this is
+what makes daily runs incremental.  ``mine_rules`` applies the Apriori
+support bound and derives single-item rules X -> Y with support,
+confidence and lift — the shape the POS SmartCartAssistant consumes.
+"""
+
+import io
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+# Baskets with more distinct products than this (bulk / wholesale orders)
+# are left out of pair counting: they add k*(k-1)/2 pairs and say little
+# about what is bought together.
+MAX_BASKET_ITEMS = 40
+
+
+@dataclass
+class BasketCounts:
+    """Sparse basket statistics; pair indices refer to ``products``."""
+
+    products: np.ndarray      # product ids (str), sorted
+    item_counts: np.ndarray   # int64, baskets containing products[i]
+    pair_a: np.ndarray        # int32, index of the smaller product id
+    pair_b: np.ndarray        # int32, index of the larger product id
+    pair_counts: np.ndarray   # int64, baskets containing both
+    transactions: int
+
+    @classmethod
+    def empty(cls) -> "BasketCounts":
+        return cls(
+            products=np.array([], dtype=str),
+            item_counts=np.zeros(0, dtype=np.int64),
+            pair_a=np.zeros(0, dtype=np.int32),
+            pair_b=np.zeros(0, dtype=np.int32),
+            pair_counts=np.zeros(0, dtype=np.int64),
+            transactions=0,
+        )
+
+    @property
+    def pairs(self) -> int:
+        return int(self.pair_counts.size)
+
+    def combine(self, other: "BasketCounts", sign: int = 1) -> "BasketCounts":
+        """Counts of ``self`` plus (``sign=1``) or minus (``sign=-1``) ``other``."""
+        products, inverse = np.unique(np.concatenate([self.products, other.products]), return_inverse=True)
+        mine, theirs = inverse[: self.products.size], inverse[self.products.size:]
+
+        item_counts = np.zeros(products.size, dtype=np.int64)
+        np.add.at(item_counts, mine, self.item_counts)
+        np.add.at(item_counts, theirs, sign * other.item_counts)
+
+        a = np.concatenate([mine[self.pair_a], theirs[other.pair_a]]).astype(np.int64)
+        b = np.concatenate([mine[self.pair_b], theirs[other.pair_b]]).astype(np.int64)
+        counts = np.concatenate([self.pair_counts, sign * other.pair_counts])
+        keys, key_inverse = np.unique(a * products.size + b, return_inverse=True)
+        pair_counts = np.bincount(key_inverse, weights=counts, minlength=keys.size).astype(np.int64)
+
+        keep_pairs = pair_counts > 0
+        keys, pair_counts = keys[keep_pairs], pair_counts[keep_pairs]
+        pair_a, pair_b = keys // max(products.size, 1), keys % max(products.size, 1)
+
+        # Drop products no basket in the window contains any more
+        keep = item_counts > 0
+        remap = np.cumsum(keep) - 1
+        return BasketCounts(
+            products=products[keep],
+            item_counts=item_counts[keep],
+            pair_a=remap[pair_a].astype(np.int32),
+            pair_b=remap[pair_b].astype(np.int32),
+            pair_counts=pair_counts,
+            transactions=self.transactions + sign * other.transactions,
+        )
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            products=self.products.astype("U36"),
+            item_counts=self.item_counts,
+            pair_a=self.pair_a,
+            pair_b=self.pair_b,
+            pair_counts=self.pair_counts,
+            transactions=np.array([self.transactions], dtype=np.int64),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BasketCounts":
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            return cls(
+                products=arrays["products"],
+                item_counts=arrays["item_counts"],
+                pair_a=arrays["pair_a"],
+                pair_b=arrays["pair_b"],
+                pair_counts=arrays["pair_counts"],
+                transactions=int(arrays["transactions"][0]),
+            )
+
+
+def count_baskets(order_keys: Sequence[Any], product_ids: Sequence[Any]) -> BasketCounts:
+    """Item and pair counts for order lines given as parallel sequences."""
+    if len(order_keys) == 0:
+        return BasketCounts.empty()
+
+    orders = np.unique(np.asarray([str(k) for k in order_keys]), return_inverse=True)[1]
+    products, items = np.unique(np.asarray([str(p) for p in product_ids]), return_inverse=True)
+
+    # Sparse order x product incidence: unique (order, product) cells sorted
+    # by order then product, so each basket is a run of increasing indices
+    cells = np.unique(orders.astype(np.int64) * products.size + items)
+    basket, item = cells // products.size, cells % products.size
+    starts = np.flatnonzero(np.r_[True, basket[1:] != basket[:-1]])
+    sizes = np.diff(np.r_[starts, basket.size])
+
+    item_counts = np.bincount(item, minlength=products.size).astype(np.int64)
+
+    # Pairs: each element pairs with the later elements of its basket
+    size_of = np.repeat(sizes, sizes)
+    end_of = np.repeat(starts + sizes, sizes)
+    position = np.arange(basket.size)
+    partners = np.where(size_of <= MAX_BASKET_ITEMS, end_of - position - 1, 0)
+    left = np.repeat(position, partners)
+    offset = np.arange(left.size) - np.repeat(np.cumsum(partners) - partners, partners)
+    right = left + 1 + offset
+
+    keys, pair_counts = np.unique(item[left] * products.size + item[right], return_counts=True)
+    return BasketCounts(
+        products=products,
+        item_counts=item_counts,
+        pair_a=(keys // products.size).astype(np.int32),
+        pair_b=(keys % products.size).astype(np.int32),
+        pair_counts=pair_counts.astype(np.int64),
+        transactions=int(starts.size),
+    )
+
+
+def mine_rules(
+    counts: BasketCounts,
+    min_support: float,
+    min_confidence: float,
+    min_lift: float,
+    min_pair_count: int = 2,
+    max_per_antecedent: int = 5,
+    max_rules: int = 500,
+) -> List[Dict[str, Any]]:
+    """
+    Single-item association rules X -> Y from ``counts``.
+
+    Pairs below the support threshold (or seen in fewer than
+    ``min_pair_count`` baskets) are pruned before any rule is formed; each
+    surviving pair yields up to two rules.  Rules are ranked by lift then
+    confidence, keeping the best ``max_per_antecedent`` per product.
+    """
+    n = counts.transactions
+    if n <= 0 or counts.pairs == 0:
+        return []
+
+    frequent = (counts.pair_counts >= max(min_pair_count, min_support * n))
+    a, b, together = counts.pair_a[frequent], counts.pair_b[frequent], counts.pair_counts[frequent]
+    if together.size == 0:
+        return []
+
+    antecedent = np.concatenate([a, b])
+    consequent = np.concatenate([b, a])
+    together = np.concatenate([together, together]).astype(np.float64)
+    support = together / n
+    confidence = together / counts.item_counts[antecedent]
+    lift = together * n / (counts.item_counts[antecedent] * counts.item_counts[consequent])
+
+    keep = (confidence >= min_confidence) & (lift >= min_lift)
+    antecedent, consequent = antecedent[keep], consequent[keep]
+    support, confidence, lift, together = support[keep], confidence[keep], lift[keep], together[keep]
+
+    # Best first within each antecedent, then cap per antecedent
+    order = np.lexsort((-confidence, -lift, antecedent))
+    antecedent, consequent = antecedent[order], consequent[order]
+    support, confidence, lift, together = support[order], confidence[order], lift[order], together[order]
+    first = np.r_[True, antecedent[1:] != antecedent[:-1]]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(antecedent.size), 0))
+    rank = np.arange(antecedent.size) - group_start
+    keep = rank < max_per_antecedent
+
+    rules = [
+        {
+            "antecedent_product_id": str(counts.products[x]),
+            "consequent_product_id": str(counts.products[y]),
+            "support": round(float(s), 6),
+            "confidence": round(float(c), 6),
+            "lift": round(float(li), 6),
+            "pair_count": int(t),
+        }
+        for x, y, s, c, li, t in zip(
+            antecedent[keep], consequent[keep], support[keep], confidence[keep], lift[keep], together[keep]
+        )
+    ]
+    rules.sort(key=lambda r: (-r["lift"], -r["confidence"]))
+    return rules[:max_rules]
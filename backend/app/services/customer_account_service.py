@@ -5,7 +5,7 @@ from datetime import datetime, date, timezone
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from app.models.customer_account import (
     CustomerAccount,
@@ -15,7 +15,9 @@ from app.models.customer_account import (
     AccountPayment,
     AccountStatement,
 )
+from app.models.base import utc_now
 from app.models.customer import Customer
+from app.services.account_aging_service import DEBIT_TRANSACTIONS, AccountAgingService, open_item_due_at
 from app.schemas.customer_account import (
     AccountCreate,
     AccountUpdate,
@@ -221,6 +223,11 @@ class CustomerAccountService:
         for field, value in update_data.items():
             setattr(account, field, value)
         
+        # Open items for charges without an explicit due date move with the terms
+        if 'payment_terms' in update_data:
+            self.db.flush()
+            AccountAgingService(self.db).rebuild_open_items(account_ids=[account.id])
+        
         self.db.commit()
         self.db.refresh(account)
         return account
@@ -329,10 +336,13 @@ class CustomerAccountService:
         
         Aging categories (per Requirements 5.3 and 6.1):
         - Current: Not yet due (within payment terms)
-        - 30 days: 1-30 days past due
+        - 30 days: 0-30 days past due
         - 60 days: 31-60 days past due
         - 90+ days: 61+ days past due
         
+        Computed by AccountAgingService in a single grouped query rather
+        than one allocation query per charge.
+        
         Args:
             account: Account to calculate aging for
             as_of_date: Date to calculate aging as of (defaults to now)
@@ -340,72 +350,7 @@ class CustomerAccountService:
         Returns:
             dict: Aging breakdown with keys: current, days_30, days_60, days_90_plus, total
         """
-        if as_of_date is None:
-            as_of_date = datetime.now(timezone.utc)
-        elif as_of_date.tzinfo is None:
-            as_of_date = as_of_date.replace(tzinfo=timezone.utc)
-        
-        # Initialize aging buckets
-        aging = {
-            'current': Decimal('0'),
-            'days_30': Decimal('0'),
-            'days_60': Decimal('0'),
-            'days_90_plus': Decimal('0'),
-            'total': Decimal('0'),
-        }
-        
-        # Get all unpaid charge transactions
-        unpaid_charges = self.db.query(AccountTransaction).filter(
-            AccountTransaction.account_id == account.id,
-            AccountTransaction.transaction_type == TransactionType.CHARGE,
-        ).all()
-        
-        # Calculate allocated amounts for each charge
-        from app.models.customer_account import PaymentAllocation
-        
-        for charge in unpaid_charges:
-            # Get total allocated to this charge
-            allocated = self.db.query(func.sum(PaymentAllocation.amount)).filter(
-                PaymentAllocation.transaction_id == charge.id
-            ).scalar() or Decimal('0')
-            
-            # Calculate remaining unpaid amount
-            unpaid_amount = Decimal(str(charge.amount)) - Decimal(str(allocated))
-            
-            if unpaid_amount <= 0:
-                continue  # Fully paid
-            
-            # Determine due date
-            if charge.due_date:
-                due_date = datetime.combine(charge.due_date, datetime.min.time(), tzinfo=timezone.utc)
-            else:
-                # Use payment terms from account
-                from datetime import timedelta
-                created = charge.created_at
-                if created.tzinfo is None:
-                    created = created.replace(tzinfo=timezone.utc)
-                due_date = created + timedelta(days=account.payment_terms)
-            
-            # Calculate days overdue
-            days_overdue = (as_of_date - due_date).days
-            
-            # Categorize into aging buckets per Requirements 5.3 and 6.1
-            if days_overdue < 0:
-                # Not yet due
-                aging['current'] += unpaid_amount
-            elif days_overdue <= 30:
-                # 1-30 days overdue
-                aging['days_30'] += unpaid_amount
-            elif days_overdue <= 60:
-                # 31-60 days overdue
-                aging['days_60'] += unpaid_amount
-            else:
-                # 61+ days overdue (combines 61-90 and 90+)
-                aging['days_90_plus'] += unpaid_amount
-            
-            aging['total'] += unpaid_amount
-        
-        return aging
+        return AccountAgingService(self.db).aging_for_account(account.id, as_of_date)
 
     def calculate_balance_from_transactions(
         self,
@@ -709,6 +654,8 @@ class CustomerAccountService:
             description=description,
             due_date=due_date,
             created_by=user_id,
+            # Set here so the open item's due time matches the stored charge
+            created_at=utc_now(),
         )
         
         # Update account balance
@@ -716,6 +663,11 @@ class CustomerAccountService:
         
         # Add transaction to session
         self.db.add(transaction)
+        AccountAgingService(self.db).post_open_item(
+            account,
+            open_item_due_at(account.payment_terms, due_date, transaction.created_at),
+            amount,
+        )
         self.db.commit()
         self.db.refresh(transaction)
         self.db.refresh(account)
@@ -772,12 +724,15 @@ class CustomerAccountService:
         
         # Create adjustment transaction
         transaction = AccountTransaction(
+            id=uuid4(),
             account_id=account.id,
             transaction_type=TransactionType.ADJUSTMENT,
             amount=amount,
             balance_after=new_balance,
             description=f"Balance adjustment: {reason.strip()}",
             created_by=user_id,
+            # Set here so the open item's due time matches the stored adjustment
+            created_at=utc_now(),
         )
         
         # Update account balance
@@ -785,6 +740,17 @@ class CustomerAccountService:
         
         # Add transaction to session
         self.db.add(transaction)
+        
+        # A debit ages like a charge without a due date; a credit settles
+        # the oldest unpaid debits, like a payment
+        if amount > 0:
+            AccountAgingService(self.db).post_open_item(
+                account,
+                open_item_due_at(account.payment_terms, None, transaction.created_at),
+                amount,
+            )
+        else:
+            self._allocate_fifo(account, -amount, adjustment_id=transaction.id)
         self.db.commit()
         self.db.refresh(transaction)
         self.db.refresh(account)
@@ -921,6 +887,67 @@ class CustomerAccountService:
         
         return payment
 
+    def _allocate_fifo(
+        self,
+        account: CustomerAccount,
+        amount: Decimal,
+        payment_id: Optional[UUID] = None,
+        adjustment_id: Optional[UUID] = None,
+    ) -> list:
+        """
+        Apply an amount to the account's unpaid debits, oldest first.
+        
+        Debits are charges and positive adjustments.  Creates a
+        PaymentAllocation per debit for the given payment or credit
+        adjustment and reduces the matching open items.  Does not commit.
+        
+        Returns:
+            list: List of PaymentAllocation objects created
+        """
+        from app.models.customer_account import PaymentAllocation
+        
+        # Get unpaid debits with their allocated totals, oldest first (FIFO)
+        allocated_total = func.coalesce(func.sum(PaymentAllocation.amount), 0)
+        debit_rows = self.db.query(AccountTransaction, allocated_total).outerjoin(
+            PaymentAllocation, PaymentAllocation.transaction_id == AccountTransaction.id
+        ).filter(
+            AccountTransaction.account_id == account.id,
+            DEBIT_TRANSACTIONS,
+        ).group_by(AccountTransaction.id).order_by(AccountTransaction.created_at.asc()).all()
+        
+        allocations = []
+        remaining = amount
+        aging = AccountAgingService(self.db)
+        
+        for debit, allocated in debit_rows:
+            if remaining <= 0:
+                break
+            
+            unpaid_amount = Decimal(str(debit.amount)) - Decimal(str(allocated or 0))
+            if unpaid_amount <= 0:
+                continue  # Fully paid
+            
+            # Determine allocation amount (lesser of remaining amount or unpaid amount)
+            allocation_amount = min(remaining, unpaid_amount)
+            
+            allocation = PaymentAllocation(
+                payment_id=payment_id,
+                adjustment_id=adjustment_id,
+                transaction_id=debit.id,
+                amount=allocation_amount,
+            )
+            self.db.add(allocation)
+            allocations.append(allocation)
+            aging.post_open_item(
+                account,
+                open_item_due_at(account.payment_terms, debit.due_date, debit.created_at),
+                -allocation_amount,
+            )
+            
+            remaining -= allocation_amount
+        
+        return allocations
+
     def allocate_payment(
         self,
         payment: AccountPayment,
@@ -932,9 +959,9 @@ class CustomerAccountService:
         "For any payment, allocation SHALL apply to oldest unpaid transactions first."
         
         FIFO allocation logic:
-        1. Get all unpaid charge transactions ordered by created_at (oldest first)
-        2. For each charge, calculate remaining unpaid amount
-        3. Allocate payment to charges in order until payment is fully allocated
+        1. Get all unpaid charges and positive adjustments ordered by created_at (oldest first)
+        2. For each one, calculate remaining unpaid amount
+        3. Allocate payment to them in order until payment is fully allocated
         4. Create PaymentAllocation records for each allocation
         5. Create payment transaction to reduce account balance
         6. Update account balance
@@ -948,8 +975,6 @@ class CustomerAccountService:
         Raises:
             ValueError: If payment is already fully allocated or account is closed
         """
-        from app.models.customer_account import PaymentAllocation
-        
         # Get the account
         account = payment.account
         
@@ -961,55 +986,8 @@ class CustomerAccountService:
         if payment.unallocated_amount <= 0:
             raise ValueError("Payment is already fully allocated")
         
-        # Get all unpaid charge transactions ordered by created_at (FIFO)
-        unpaid_charges = self.db.query(AccountTransaction).filter(
-            AccountTransaction.account_id == account.id,
-            AccountTransaction.transaction_type == TransactionType.CHARGE,
-        ).order_by(AccountTransaction.created_at.asc()).all()
-        
-        # Calculate remaining unpaid amount for each charge
-        charges_with_unpaid = []
-        for charge in unpaid_charges:
-            # Get total already allocated to this charge
-            allocated = self.db.query(func.sum(PaymentAllocation.amount)).filter(
-                PaymentAllocation.transaction_id == charge.id
-            ).scalar() or Decimal('0')
-            
-            # Calculate remaining unpaid amount
-            unpaid_amount = Decimal(str(charge.amount)) - Decimal(str(allocated))
-            
-            if unpaid_amount > 0:
-                charges_with_unpaid.append({
-                    'charge': charge,
-                    'unpaid_amount': unpaid_amount,
-                })
-        
-        # Allocate payment to charges using FIFO
-        allocations = []
-        remaining_payment = payment.unallocated_amount
-        
-        for charge_info in charges_with_unpaid:
-            if remaining_payment <= 0:
-                break
-            
-            charge = charge_info['charge']
-            unpaid_amount = charge_info['unpaid_amount']
-            
-            # Determine allocation amount (lesser of remaining payment or unpaid amount)
-            allocation_amount = min(remaining_payment, unpaid_amount)
-            
-            # Create allocation record
-            allocation = PaymentAllocation(
-                payment_id=payment.id,
-                transaction_id=charge.id,
-                amount=allocation_amount,
-            )
-            
-            self.db.add(allocation)
-            allocations.append(allocation)
-            
-            # Reduce remaining payment
-            remaining_payment -= allocation_amount
+        # Allocate payment to unpaid charges using FIFO
+        allocations = self._allocate_fifo(account, payment.unallocated_amount, payment_id=payment.id)
         
         # Create payment transaction to record the payment in transaction history
         new_balance = Decimal(str(account.current_balance)) - Decimal(str(payment.amount))
@@ -1,14 +1,22 @@
 """Customer service for business logic."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
+from app.core.pagination import Page, TotalMode, paginate
+from app.core.search import SearchSpec, apply_search
 from app.models.customer import Customer, CustomerType
 from app.schemas.customer import CustomerCreate, CustomerUpdate
 
 
+CUSTOMER_SEARCH = SearchSpec(
+    columns=[Customer.first_name, Customer.last_name, Customer.email, Customer.phone, Customer.company_name],
+    fulltext=[Customer.first_name, Customer.last_name, Customer.company_name],
+    exact=[Customer.email, Customer.phone],
+)
+
+
 class CustomerService:
     """Service for customer operations."""
 
@@ -25,7 +33,9 @@ class CustomerService:
         tag: Optional[str] = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
-    ) -> Tuple[List[Customer], int]:
+        total_mode: TotalMode = TotalMode.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[Customer]:
         """Get customers with filtering and pagination."""
         query = self.db.query(Customer).filter(
             Customer.business_id == business_id,
@@ -33,17 +43,7 @@ class CustomerService:
         )
         
         # Search filter
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Customer.first_name.ilike(search_term),
-                    Customer.last_name.ilike(search_term),
-                    Customer.email.ilike(search_term),
-                    Customer.phone.ilike(search_term),
-                    Customer.company_name.ilike(search_term),
-                )
-            )
+        query, rank = apply_search(query, CUSTOMER_SEARCH, search)
         
         # Type filter
         if customer_type:
@@ -53,21 +53,17 @@ class CustomerService:
         if tag:
             query = query.filter(Customer.tags.any(tag))
         
-        # Get total count
-        total = query.count()
-        
-        # Sorting
+        # Sorting and pagination
+        if sort_by == "relevance" and rank is not None:
+            return paginate(
+                query.order_by(rank.desc(), Customer.created_at.desc()),
+                page, per_page, total_mode, cursor,
+            )
         sort_column = getattr(Customer, sort_by, Customer.created_at)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        
-        # Pagination
-        offset = (page - 1) * per_page
-        customers = query.offset(offset).limit(per_page).all()
-        
-        return customers, total
+        return paginate(
+            query, page, per_page, total_mode, cursor,
+            keyset=(sort_column, Customer.id), descending=sort_order == "desc",
+        )
 
     def get_customer(self, customer_id: str, business_id: str) -> Optional[Customer]:
         """Get a customer by ID."""
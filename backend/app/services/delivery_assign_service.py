@@ -5,32 +5,90 @@ Assigns pending deliveries to the best available driver using:
 2. Workload balancing (fewest active deliveries first)
 3. Proximity ranking when driver locations are known
 4. Manual reassignment with reason tracking
+5. Batch assignment of many pending deliveries at once, minimising the
+   total driver distance instead of assigning greedily one at a time
+6. Route-aware ranking: with a drop-off location, drivers are ranked by
+   when they would reach it given the drops they already carry
+
+Driver workloads come from one grouped count query, and distances from all
+drivers to a delivery are computed in one vectorised pass.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.delivery import Delivery, DeliveryStatus, Driver
-from app.services.delivery_fee_service import _haversine_km
+from app.services.delivery_route_service import get_zone_speeds, insertion_eta_minutes, plan_route
+from app.services.geo_index import haversine_km_many
+
+_TERMINAL_STATUSES = {DeliveryStatus.DELIVERED, DeliveryStatus.FAILED, DeliveryStatus.RETURNED}
+
+# Cost per delivery already on a driver, as a tie-breaker (km) when
+# distances are equal or unknown: spreads work like the single assignment
+_WORKLOAD_TIEBREAK_KM = 1e-3
+# Cost of pairing a delivery with a driver whose distance is unknown
+_UNKNOWN_DISTANCE_KM = 1e6
 
 
 def _active_delivery_count(db: Session, driver_id: str) -> int:
     """Count non-terminal deliveries currently assigned to a driver."""
-    terminal = {DeliveryStatus.DELIVERED, DeliveryStatus.FAILED, DeliveryStatus.RETURNED}
     return (
         db.query(func.count(Delivery.id))
         .filter(
             Delivery.driver_id == driver_id,
             Delivery.deleted_at.is_(None),
-            ~Delivery.status.in_(terminal),
+            ~Delivery.status.in_(_TERMINAL_STATUSES),
         )
         .scalar()
         or 0
     )
 
 
+def _active_delivery_counts(db: Session, drivers: Sequence[Driver]) -> Dict[str, int]:
+    """Non-terminal delivery counts for many drivers in one grouped query."""
+    if not drivers:
+        return {}
+    rows = (
+        db.query(Delivery.driver_id, func.count(Delivery.id))
+        .filter(
+            Delivery.driver_id.in_([d.id for d in drivers]),
+            Delivery.deleted_at.is_(None),
+            ~Delivery.status.in_(_TERMINAL_STATUSES),
+        )
+        .group_by(Delivery.driver_id)
+        .all()
+    )
+    return {str(driver_id): count for driver_id, count in rows}
+
+
+def _active_stops(db: Session, drivers: Sequence[Driver]) -> Dict[str, List[Dict]]:
+    """Drops each driver still has to make (route planning stops), one query."""
+    if not drivers:
+        return {}
+    rows = (
+        db.query(Delivery.driver_id, Delivery.id, Delivery.delivery_lat, Delivery.delivery_lng, Delivery.zone_id)
+        .filter(
+            Delivery.driver_id.in_([d.id for d in drivers]),
+            Delivery.deleted_at.is_(None),
+            ~Delivery.status.in_(_TERMINAL_STATUSES),
+        )
+        .order_by(Delivery.created_at)
+        .all()
+    )
+    stops: Dict[str, List[Dict]] = {}
+    for driver_id, delivery_id, lat, lng, zone_id in rows:
+        stops.setdefault(str(driver_id), []).append({
+            "delivery_id": str(delivery_id),
+            "lat": float(lat) if lat is not None else None,
+            "lng": float(lng) if lng is not None else None,
+            "zone_id": zone_id,
+        })
+    return stops
+
+
 def get_available_drivers(db: Session, business_id: str) -> List[Dict]:
     """Return available drivers with their current workload, sorted by fewest active.
 
@@ -46,9 +104,10 @@ def get_available_drivers(db: Session, business_id: str) -> List[Dict]:
         )
         .all()
     )
+    counts = _active_delivery_counts(db, drivers)
     result = []
     for d in drivers:
-        count = _active_delivery_count(db, str(d.id))
+        count = counts.get(str(d.id), 0)
         max_c = d.max_concurrent or 5
         if count < max_c:
             result.append({
@@ -81,15 +140,14 @@ def auto_assign(
     if not candidates:
         return None
 
-    # Score candidates: lower is better
-    def score(c: Dict) -> Tuple[float, int]:
-        dist = float("inf")
-        if delivery_lat and delivery_lng and c["lat"] and c["lng"]:
-            dist = _haversine_km(c["lat"], c["lng"], delivery_lat, delivery_lng)
-        return (dist, c["active_count"])
-
-    candidates.sort(key=score)
-    best = candidates[0]["driver"]
+    # Lower is better: time to reach the drop (unknown = inf), then active
+    # deliveries
+    if delivery_lat and delivery_lng:
+        costs = _insertion_etas(db, business_id, candidates, delivery, delivery_lat, delivery_lng)
+    else:
+        costs = _distances_km(candidates, delivery_lat, delivery_lng)
+    active = np.array([c["active_count"] for c in candidates])
+    best = candidates[int(np.lexsort((active, costs))[0])]["driver"]
 
     delivery.driver_id = best.id
     if delivery.status == DeliveryStatus.PENDING:
@@ -99,6 +157,154 @@ def auto_assign(
     return best
 
 
+def _coords(candidates: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Driver coordinates as arrays; missing (or zero) locations are NaN."""
+    lats = np.array([c["lat"] if c["lat"] and c["lng"] else np.nan for c in candidates], dtype=float)
+    lngs = np.array([c["lng"] if c["lat"] and c["lng"] else np.nan for c in candidates], dtype=float)
+    return lats, lngs
+
+
+def _distances_km(
+    candidates: List[Dict],
+    delivery_lat: Optional[float],
+    delivery_lng: Optional[float],
+    coords: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """Distance from every candidate to the delivery; inf when unknown."""
+    if not (delivery_lat and delivery_lng):
+        return np.full(len(candidates), np.inf)
+    lats, lngs = coords if coords is not None else _coords(candidates)
+    distances = haversine_km_many(delivery_lat, delivery_lng, lats, lngs)
+    return np.where(np.isnan(distances), np.inf, distances)
+
+
+def _insertion_etas(
+    db: Session,
+    business_id: str,
+    candidates: List[Dict],
+    delivery: Delivery,
+    delivery_lat: float,
+    delivery_lng: float,
+) -> np.ndarray:
+    """Minutes for each candidate to reach the drop after fitting it into
+    the drops they already carry; inf when the driver's location is unknown."""
+    stops = _active_stops(db, [c["driver"] for c in candidates])
+    speeds = get_zone_speeds(db, business_id)
+    new_stop = {"lat": delivery_lat, "lng": delivery_lng, "zone_id": delivery.zone_id}
+    etas = np.full(len(candidates), np.inf)
+    for i, c in enumerate(candidates):
+        if c["lat"] and c["lng"]:
+            route = stops.get(str(c["driver"].id), [])
+            etas[i] = insertion_eta_minutes((c["lat"], c["lng"]), route, new_stop, speeds)
+    return etas
+
+
+def plan_driver_route(db: Session, business_id: str, driver: Driver) -> Dict:
+    """Visiting order and ETAs for the drops a driver currently carries."""
+    stops = _active_stops(db, [driver]).get(str(driver.id), [])
+    origin = None
+    if driver.current_lat and driver.current_lng:
+        origin = (float(driver.current_lat), float(driver.current_lng))
+    plan = plan_route(origin, stops, get_zone_speeds(db, business_id))
+    return {"driver_id": str(driver.id), **plan}
+
+
+def _min_cost_assignment(cost: np.ndarray) -> List[Tuple[int, int]]:
+    """Rows matched to distinct columns with the least total cost.
+
+    Hungarian algorithm (shortest augmenting paths with potentials), with
+    the inner scans vectorised over columns.  Needs rows <= columns.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=int)  # column -> row (1-based, 0 = free)
+    way = np.zeros(m + 1, dtype=int)
+    for row in range(1, n + 1):
+        match[0] = row
+        col0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[col0] = True
+            i0 = match[col0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = col0
+            candidates = np.where(free, minv[1:], np.inf)
+            col1 = int(np.argmin(candidates)) + 1
+            delta = candidates[col1 - 1]
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            col0 = col1
+            if match[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            match[col0] = match[col1]
+            col0 = col1
+    return [(int(match[col]) - 1, col - 1) for col in range(1, m + 1) if match[col]]
+
+
+def auto_assign_batch(
+    db: Session,
+    business_id: str,
+    deliveries: Sequence[Tuple[Delivery, Optional[float], Optional[float]]],
+) -> Dict[Any, Optional[Driver]]:
+    """Assign many deliveries at once, minimising the total driver distance.
+
+    *deliveries* are ``(delivery, lat, lng)``; coordinates may be None.
+    Each driver takes at most its free capacity (``max_concurrent`` minus
+    active deliveries).  Unlike calling ``auto_assign`` per delivery, a
+    driver close to two deliveries is not spent on the first one when
+    another driver is nearly as close to it.  Among equal distances, less
+    busy drivers win.  Deliveries left over when capacity runs out map to
+    None.  Commits once.
+
+    Returns ``{delivery.id: Driver or None}``.
+    """
+    assigned: Dict[Any, Optional[Driver]] = {delivery.id: None for delivery, _, _ in deliveries}
+    candidates = get_available_drivers(db, business_id)
+    if not deliveries or not candidates:
+        return assigned
+
+    # One column per free slot; the k-th extra delivery on a driver costs a
+    # little more so work is spread when distances tie
+    slots: List[int] = []
+    slot_load: List[int] = []
+    for index, candidate in enumerate(candidates):
+        capacity = (candidate["driver"].max_concurrent or 5) - candidate["active_count"]
+        for k in range(min(capacity, len(deliveries))):
+            slots.append(index)
+            slot_load.append(candidate["active_count"] + k)
+    slots_arr = np.array(slots)
+
+    coords = _coords(candidates)
+    cost = np.empty((len(deliveries), len(slots)))
+    for row, (_, lat, lng) in enumerate(deliveries):
+        distances = _distances_km(candidates, lat, lng, coords)
+        cost[row] = np.minimum(distances, _UNKNOWN_DISTANCE_KM)[slots_arr]
+    cost += _WORKLOAD_TIEBREAK_KM * np.array(slot_load)
+
+    if cost.shape[0] <= cost.shape[1]:
+        pairs = _min_cost_assignment(cost)
+    else:
+        pairs = [(row, col) for col, row in _min_cost_assignment(cost.T)]
+
+    for row, col in pairs:
+        delivery = deliveries[row][0]
+        driver = candidates[slots[col]]["driver"]
+        delivery.driver_id = driver.id
+        if delivery.status == DeliveryStatus.PENDING:
+            delivery.status = DeliveryStatus.ASSIGNED
+        assigned[delivery.id] = driver
+    db.commit()
+    return assigned
+
+
 def reassign_driver(
     db: Session,
     delivery: Delivery,
@@ -141,9 +347,10 @@ def get_driver_workload(db: Session, business_id: str) -> List[Dict]:
         )
         .all()
     )
+    counts = _active_delivery_counts(db, drivers)
     result = []
     for d in drivers:
-        active = _active_delivery_count(db, str(d.id))
+        active = counts.get(str(d.id), 0)
         result.append({
             "driver_id": str(d.id),
             "name": d.name,
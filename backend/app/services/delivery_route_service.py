@@ -0,0 +1,285 @@
+"""Multi-drop route planning and ETAs for drivers.
+
+A driver often carries several orders.  For the drops of one driver this
+service plans the visiting order and the arrival time at each drop:
+
+1. Order: nearest neighbour from the driver's position, then 2-opt moves
+   (reversing a stretch of the route) until none shortens it.  Distances
+   are one NumPy matrix; each 2-opt scan is vectorised, so 200 drops plan
+   in well under a second.
+2. ETAs: each leg is driven at the learned average speed of the zone it
+   ends in, plus a fixed hand-over time at every drop.
+
+Speeds are learned from delivery tracking updates (``add_tracking_update``
+pings with a location): consecutive pings of one delivery give a distance
+over a time, and the median of those per zone (over the last
+``SPEED_LOOKBACK_DAYS``) is that zone's speed.  Zones with too few samples
+use the business-wide median, and businesses without history the same
+30 km/h as ``DeliveryTrackingService.estimate_eta_minutes``.  Learned
+speeds are cached per business for ``SPEED_CACHE_SECONDS``.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.delivery import Delivery
+from app.models.delivery_tracking import DeliveryTracking
+from app.services.geo_index import haversine_km_many
+
+DEFAULT_SPEED_KMH = 30.0
+# Parking and handing the order over at each drop
+STOP_MINUTES = 3.0
+
+SPEED_LOOKBACK_DAYS = 14
+MIN_SPEED_SAMPLES = 5
+SPEED_CACHE_SECONDS = 900
+
+# Legs outside these bounds are GPS noise, a parked driver or a gap in pings
+_MIN_LEG_SECONDS, _MAX_LEG_SECONDS = 30, 1800
+_MIN_SPEED_KMH, _MAX_SPEED_KMH = 3.0, 120.0
+
+MAX_TWO_OPT_PASSES = 50
+
+
+class ZoneSpeeds:
+    """Average driving speed (km/h) per delivery zone, with a fallback."""
+
+    def __init__(self, by_zone: Optional[Dict[str, float]] = None, default: float = DEFAULT_SPEED_KMH) -> None:
+        self.by_zone = by_zone or {}
+        self.default = default
+
+    def for_zone(self, zone_id: Any) -> float:
+        if zone_id is None:
+            return self.default
+        return self.by_zone.get(str(zone_id), self.default)
+
+
+def _location(value: Any) -> Optional[Tuple[float, float]]:
+    if not isinstance(value, dict):
+        return None
+    try:
+        return float(value["lat"]), float(value["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def learn_zone_speeds(db: Session, business_id: str, now: Optional[datetime] = None) -> ZoneSpeeds:
+    """Median speed per zone from recent tracking pings (one query)."""
+    since = (now or datetime.now(timezone.utc)) - timedelta(days=SPEED_LOOKBACK_DAYS)
+    rows = (
+        db.query(
+            DeliveryTracking.delivery_id,
+            Delivery.zone_id,
+            DeliveryTracking.location,
+            DeliveryTracking.recorded_at,
+        )
+        .join(Delivery, Delivery.id == DeliveryTracking.delivery_id)
+        .filter(
+            Delivery.business_id == business_id,
+            DeliveryTracking.recorded_at >= since,
+            DeliveryTracking.location.isnot(None),
+        )
+        .order_by(DeliveryTracking.delivery_id, DeliveryTracking.recorded_at)
+        .all()
+    )
+
+    pings = [(str(d_id), zone_id, _location(loc), at) for d_id, zone_id, loc, at in rows]
+    pings = [p for p in pings if p[2] is not None and p[3] is not None]
+    if len(pings) < 2:
+        return ZoneSpeeds()
+
+    deliveries = np.array([p[0] for p in pings])
+    points = np.array([p[2] for p in pings])
+    seconds = np.array([p[3].timestamp() for p in pings])
+
+    same = deliveries[1:] == deliveries[:-1]
+    km = haversine_km_many(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1])
+    dt = seconds[1:] - seconds[:-1]
+    valid = same & (dt >= _MIN_LEG_SECONDS) & (dt <= _MAX_LEG_SECONDS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kmh = km / (dt / 3600)
+    valid &= (kmh >= _MIN_SPEED_KMH) & (kmh <= _MAX_SPEED_KMH)
+    if np.count_nonzero(valid) < MIN_SPEED_SAMPLES:
+        return ZoneSpeeds()
+
+    zones = np.array([str(p[1]) if p[1] is not None else "" for p in pings[1:]])
+    by_zone = {}
+    for zone in np.unique(zones[valid & (zones != "")]):
+        samples = kmh[valid & (zones == zone)]
+        if samples.size >= MIN_SPEED_SAMPLES:
+            by_zone[str(zone)] = round(float(np.median(samples)), 2)
+    return ZoneSpeeds(by_zone, default=round(float(np.median(kmh[valid])), 2))
+
+
+_speeds: Dict[str, Tuple[float, ZoneSpeeds]] = {}
+_lock = threading.Lock()
+
+
+def get_zone_speeds(db: Session, business_id: str) -> ZoneSpeeds:
+    """Learned speeds for the business, recomputed every ``SPEED_CACHE_SECONDS``."""
+    key = str(business_id)
+    with _lock:
+        cached = _speeds.get(key)
+    if cached is not None and time.monotonic() - cached[0] < SPEED_CACHE_SECONDS:
+        return cached[1]
+    speeds = learn_zone_speeds(db, business_id)
+    with _lock:
+        _speeds[key] = (time.monotonic(), speeds)
+    return speeds
+
+
+def clear_zone_speeds() -> None:
+    with _lock:
+        _speeds.clear()
+
+
+# -- planning --------------------------------------------------------------
+
+def _nearest_neighbour(dist: np.ndarray) -> List[int]:
+    """Visit order of nodes 1..n-2 from node 0, ending at node n-1."""
+    n = dist.shape[0]
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[[0, n - 1]] = False
+    path = [0]
+    while unvisited.any():
+        row = np.where(unvisited, dist[path[-1]], np.inf)
+        nxt = int(np.argmin(row))
+        path.append(nxt)
+        unvisited[nxt] = False
+    path.append(n - 1)
+    return path
+
+
+def _two_opt(dist: np.ndarray, path: List[int]) -> List[int]:
+    """Reverse stretches of *path* while that shortens it (ends stay fixed)."""
+    path = np.array(path)
+    last = len(path) - 2  # last movable position
+    for _ in range(MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(1, last):
+            k = np.arange(i + 1, last + 1)
+            a, b = path[i - 1], path[i]
+            c, d = path[k], path[k + 1]
+            delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                path[i:k[best] + 1] = path[i:k[best] + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return path.tolist()
+
+
+def _has_location(stop: Dict[str, Any]) -> bool:
+    return bool(stop.get("lat") and stop.get("lng"))
+
+
+def _order_located(
+    origin: Optional[Tuple[float, float]], located: Sequence[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[float]]:
+    """Located drops in visiting order, with the length (km) of each leg."""
+    if not located:
+        return [], []
+    n = len(located)
+    lats = np.array([float(s["lat"]) for s in located])
+    lngs = np.array([float(s["lng"]) for s in located])
+    # Nodes: 0 = start, 1..n = drops, n + 1 = end (free, zero distance)
+    dist = np.zeros((n + 2, n + 2))
+    dist[1:n + 1, 1:n + 1] = haversine_km_many(lats[:, None], lngs[:, None], lats[None, :], lngs[None, :])
+    if origin is not None:
+        dist[0, 1:n + 1] = dist[1:n + 1, 0] = haversine_km_many(origin[0], origin[1], lats, lngs)
+    path = _two_opt(dist, _nearest_neighbour(dist))[1:-1]
+    legs = [float(dist[a, b]) for a, b in zip([0] + path[:-1], path)]
+    return [located[node - 1] for node in path], legs
+
+
+def plan_route(
+    origin: Optional[Tuple[float, float]],
+    stops: Sequence[Dict[str, Any]],
+    speeds: Optional[ZoneSpeeds] = None,
+    start: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Visiting order and ETAs for one driver's drops.
+
+    *stops* are dicts with ``delivery_id``, ``lat``, ``lng`` and optionally
+    ``zone_id``.  Drops without coordinates go last, in the given order,
+    with no distance or ETA.  Without an *origin* (driver position unknown)
+    the order is still planned but no ETAs are given.
+
+    Returns ``{"stops": [...], "total_km", "total_minutes"}``; each stop has
+    ``delivery_id``, ``sequence``, ``leg_km``, ``cumulative_km``,
+    ``eta_minutes`` (from *start*) and ``eta``.
+    """
+    speeds = speeds or ZoneSpeeds()
+    start = start or datetime.now(timezone.utc)
+    located = [s for s in stops if _has_location(s)]
+    unlocated = [s for s in stops if not _has_location(s)]
+
+    order, legs = _order_located(origin, located)
+    result_stops = []
+    cumulative_km = 0.0
+    minutes = 0.0
+    for sequence, stop in enumerate(order + unlocated, start=1):
+        entry = {"delivery_id": stop["delivery_id"], "sequence": sequence,
+                 "leg_km": None, "cumulative_km": None, "eta_minutes": None, "eta": None}
+        if sequence <= len(order):
+            leg = legs[sequence - 1]
+            cumulative_km += leg
+            entry["leg_km"] = round(leg, 2)
+            entry["cumulative_km"] = round(cumulative_km, 2)
+            if origin is not None:
+                if sequence > 1:
+                    minutes += STOP_MINUTES
+                minutes += leg / speeds.for_zone(stop.get("zone_id")) * 60
+                entry["eta_minutes"] = round(minutes)
+                entry["eta"] = start + timedelta(minutes=minutes)
+        result_stops.append(entry)
+
+    return {
+        "stops": result_stops,
+        "total_km": round(cumulative_km, 2),
+        "total_minutes": round(minutes) if origin is not None and order else None,
+    }
+
+
+def insertion_eta_minutes(
+    origin: Tuple[float, float],
+    stops: Sequence[Dict[str, Any]],
+    stop: Dict[str, Any],
+    speeds: Optional[ZoneSpeeds] = None,
+) -> float:
+    """
+    Minutes until *stop* is reached if added to a driver's current drops.
+
+    The driver's located *stops* are planned as in ``plan_route``; the new
+    drop goes where it adds the least driving time (cheapest insertion) and
+    the arrival time there is returned, so a nearby driver with a long
+    queue of drops can lose to a free driver slightly further away.
+    """
+    speeds = speeds or ZoneSpeeds()
+    route, _ = _order_located(origin, [s for s in stops if _has_location(s)])
+    lats = np.array([origin[0]] + [float(s["lat"]) for s in route])
+    lngs = np.array([origin[1]] + [float(s["lng"]) for s in route])
+    kmh = np.array([speeds.for_zone(s.get("zone_id")) for s in route])
+    new_kmh = speeds.for_zone(stop.get("zone_id"))
+
+    # Arrival at each existing node (origin first), and when leaving it
+    legs = haversine_km_many(lats[:-1], lngs[:-1], lats[1:], lngs[1:]) / kmh * 60
+    arrival = np.concatenate([[0.0], np.cumsum(legs + STOP_MINUTES) - STOP_MINUTES])
+    depart = arrival + np.where(np.arange(len(arrival)) > 0, STOP_MINUTES, 0.0)
+
+    to_new = haversine_km_many(float(stop["lat"]), float(stop["lng"]), lats, lngs) / new_kmh * 60
+    # Added time for inserting after node p: detour into the new drop and on
+    # to node p + 1, minus the leg it replaces (nothing after the last node)
+    from_new = np.append(to_new[1:] * new_kmh / kmh, 0.0)
+    replaced = np.append(legs, 0.0)
+    has_next = np.arange(len(arrival)) < len(route)
+    added = to_new + np.where(has_next, STOP_MINUTES + from_new - replaced, 0.0)
+    best = int(np.argmin(added))
+    return float(depart[best] + to_new[best])
@@ -112,11 +112,9 @@ class DeliveryService:
             query = query.filter(Driver.is_available.is_(True))
         return query.order_by(Driver.name).all()
 
-    def toggle_driver_availability(
-        self, driver_id: str, business_id: str
-    ) -> Optional[Driver]:
-        """Toggle a driver's availability flag."""
-        driver = (
+    def get_driver(self, driver_id: str, business_id: str) -> Optional[Driver]:
+        """Get a single driver by ID."""
+        return (
             self.db.query(Driver)
             .filter(
                 Driver.id == driver_id,
@@ -125,6 +123,12 @@ class DeliveryService:
             )
             .first()
         )
+
+    def toggle_driver_availability(
+        self, driver_id: str, business_id: str
+    ) -> Optional[Driver]:
+        """Toggle a driver's availability flag."""
+        driver = self.get_driver(driver_id, business_id)
         if not driver:
             return None
         driver.is_available = not driver.is_available
@@ -144,6 +148,8 @@ class DeliveryService:
         driver_id: Optional[str] = None,
         delivery_fee: Optional[Decimal] = None,
         notes: Optional[str] = None,
+        delivery_lat: Optional[float] = None,
+        delivery_lng: Optional[float] = None,
     ) -> Delivery:
         """Create a delivery record."""
         status = DeliveryStatus.ASSIGNED if driver_id else DeliveryStatus.PENDING
@@ -156,6 +162,8 @@ class DeliveryService:
             driver_id=driver_id,
             delivery_fee=delivery_fee or Decimal("0"),
             delivery_notes=notes,
+            delivery_lat=delivery_lat,
+            delivery_lng=delivery_lng,
             status=status,
         )
         self.db.add(delivery)
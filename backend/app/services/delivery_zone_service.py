@@ -5,14 +5,17 @@ Determines which delivery zone an address/coordinate falls into, supporting:
 - **radius**: Point-in-circle using Haversine distance
 - **polygon**: Point-in-polygon using ray-casting algorithm
 - **postcode**: Exact postcode lookup
+
+Coordinate matching goes through the business's prebuilt ``ZoneIndex``
+(see ``geo_index``) rather than testing every zone per lookup.
 """
 
-from typing import List, Optional, Tuple
+from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.models.delivery import DeliveryZone
-from app.services.delivery_fee_service import _haversine_km
+from app.services.geo_index import get_zone_index
 
 
 def _point_in_polygon(lat: float, lng: float, polygon: list) -> bool:
@@ -42,57 +45,17 @@ def match_zone_by_coords(
 ) -> Optional[DeliveryZone]:
     """Find the best matching active zone for given coordinates.
 
-    Checks radius zones first (cheapest match by distance), then polygon zones,
-    then returns the first flat zone as a fallback.
+    Prefers the closest radius zone containing the point, then the first
+    polygon zone containing it, then the first flat zone as a fallback.
     """
-    zones: List[DeliveryZone] = (
-        db.query(DeliveryZone)
-        .filter(
-            DeliveryZone.business_id == business_id,
-            DeliveryZone.is_active.is_(True),
-            DeliveryZone.deleted_at.is_(None),
-        )
-        .all()
-    )
-    if not zones:
+    index, loaded = get_zone_index(db, business_id)
+    zone_id = index.match(lat, lng)
+    if zone_id is None:
         return None
-
-    radius_matches: List[Tuple[float, DeliveryZone]] = []
-    polygon_matches: List[DeliveryZone] = []
-    flat_fallback: Optional[DeliveryZone] = None
-
-    for zone in zones:
-        zt = (zone.zone_type or "flat").lower()
-
-        if zt == "radius":
-            c_lat = float(zone.center_lat or 0)
-            c_lng = float(zone.center_lng or 0)
-            r_km = float(zone.radius_km or 0)
-            if c_lat and c_lng and r_km:
-                dist = _haversine_km(c_lat, c_lng, lat, lng)
-                if dist <= r_km:
-                    radius_matches.append((dist, zone))
-
-        elif zt == "polygon":
-            boundary = zone.boundary
-            if isinstance(boundary, list) and len(boundary) >= 3:
-                if _point_in_polygon(lat, lng, boundary):
-                    polygon_matches.append(zone)
-
-        elif zt == "flat" and flat_fallback is None:
-            flat_fallback = zone
-
-    # Prefer the closest radius zone
-    if radius_matches:
-        radius_matches.sort(key=lambda x: x[0])
-        return radius_matches[0][1]
-
-    # Then polygon zones (first match)
-    if polygon_matches:
-        return polygon_matches[0]
-
-    # Fall back to flat
-    return flat_fallback
+    zone = loaded.get(zone_id)
+    if zone is None:
+        zone = db.query(DeliveryZone).filter(DeliveryZone.id == zone_id).first()
+    return zone
 
 
 def match_zone_by_postcode(
@@ -0,0 +1,140 @@
+"""Per-business floor state (tables and their open orders) cached in Redis.
+
+Waiters' tablets refresh the floor plan constantly during service.  The
+rows come from ``TableService.get_floor_state`` (one query) and are stored
+per business as compact JSON, so a refresh is one Redis GET.
+
+Freshness:
+
+- Write events: while invalidation runs (started with the app), it
+  subscribes to ``app.core.commit_tracker`` for businesses whose restaurant
+  tables, or orders placed on a table, were committed, and deletes their
+  cached floor state, so the next refresh reads the new state.
+- Staleness bound: entries expire after ``FLOOR_STATE_TTL_SECONDS``, which
+  covers writes made where no hooks run (scripts, other tools).
+
+Elapsed times are derived from ``order_opened_at`` when serving, not cached.
+Like the other Redis caches, everything degrades to querying directly when
+Redis is unavailable.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import inspect
+
+from app.core import commit_tracker
+from app.core.config import settings
+from app.core.redis import redis_manager
+from app.models.order import Order
+from app.models.restaurant_table import RestaurantTable
+
+logger = logging.getLogger(__name__)
+
+FLOOR_STATE_PREFIX = "bizpilot:floor_state"
+
+_SUBSCRIBER_NAME = "floor_state"
+
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _key(business_id: Any) -> str:
+    return f"{FLOOR_STATE_PREFIX}:{business_id}"
+
+
+async def get_floor_state(
+    business_id: Any, compute: Callable[[], List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Return the business's floor rows, computing and storing them on a miss.
+
+    *compute* is a blocking callable (it queries the database) and runs in
+    a worker thread.
+    """
+    raw = await redis_manager.get(_key(business_id))
+    if raw:
+        try:
+            rows = json.loads(raw)
+            _stats["hits"] += 1
+            return rows
+        except ValueError:
+            logger.warning("Discarding unreadable floor state for %s", business_id)
+
+    _stats["misses"] += 1
+    rows = await asyncio.to_thread(compute)
+    await redis_manager.set(
+        _key(business_id),
+        json.dumps(rows, separators=(",", ":")),
+        ttl_seconds=settings.FLOOR_STATE_TTL_SECONDS,
+    )
+    return rows
+
+
+async def invalidate_floor_state(business_id: Any) -> None:
+    _stats["invalidations"] += 1
+    await redis_manager.delete(_key(business_id))
+
+
+def with_elapsed(rows: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Add ``elapsed_minutes`` (since the open order was placed) to each row."""
+    now = now or datetime.now(timezone.utc)
+    result = []
+    for row in rows:
+        elapsed = None
+        if row.get("order_opened_at"):
+            opened = datetime.fromisoformat(row["order_opened_at"])
+            if opened.tzinfo is None:
+                opened = opened.replace(tzinfo=timezone.utc)
+            elapsed = max(0, int((now - opened).total_seconds() // 60))
+        result.append({**row, "elapsed_minutes": elapsed})
+    return result
+
+
+def _touched_floor(obj: Any, new_or_deleted: bool) -> Optional[str]:
+    if isinstance(obj, Order):
+        # Orders moved off a table change the floor too
+        history = inspect(obj).attrs.table_id.history
+        if obj.table_id is None and not history.deleted:
+            return None
+    return str(obj.business_id) if obj.business_id is not None else None
+
+
+def _invalidate_committed(business_ids: Iterable[str]) -> None:
+    if _loop is not None:
+        for business_id in business_ids:
+            _loop.call_soon_threadsafe(asyncio.ensure_future, invalidate_floor_state(business_id))
+
+
+_SUBSCRIBER = commit_tracker.CommitSubscriber(
+    name=_SUBSCRIBER_NAME,
+    models=(RestaurantTable, Order),
+    touched=_touched_floor,
+    on_commit=_invalidate_committed,
+)
+
+
+async def start_floor_state_invalidation() -> None:
+    """Invalidate cached floor state on table/order commits (application startup)."""
+    global _loop
+    _loop = asyncio.get_running_loop()
+    commit_tracker.subscribe(_SUBSCRIBER)
+
+
+async def stop_floor_state_invalidation() -> None:
+    """Stop invalidating (shutdown); cached entries expire on their own."""
+    global _loop
+    commit_tracker.unsubscribe(_SUBSCRIBER_NAME)
+    _loop = None
+
+
+def floor_state_stats() -> Dict[str, Any]:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
@@ -17,6 +17,7 @@ from app.models.general_ledger import (
     GLRecurringEntry,
     GLAuditLog,
 )
+from app.services.gl_balance_snapshot_service import GLBalanceSnapshotService
 
 
 class GeneralLedgerService:
@@ -85,26 +86,11 @@ class GeneralLedgerService:
         if not account:
             return {"debit_total": Decimal("0"), "credit_total": Decimal("0"), "balance": Decimal("0")}
 
-        query = (
-            self.db.query(
-                func.coalesce(func.sum(JournalLine.debit), 0).label("debit_total"),
-                func.coalesce(func.sum(JournalLine.credit), 0).label("credit_total"),
-            )
-            .join(JournalEntry, JournalLine.entry_id == JournalEntry.id)
-            .filter(
-                JournalLine.account_id == account_id,
-                JournalEntry.business_id == business_id,
-                JournalEntry.status == JournalEntryStatus.POSTED,
-                JournalEntry.deleted_at.is_(None),
-                JournalLine.deleted_at.is_(None),
-            )
-        )
-        if as_of:
-            query = query.filter(JournalEntry.entry_date <= as_of)
-
-        row = query.one()
-        debit_total = Decimal(str(row.debit_total))
-        credit_total = Decimal(str(row.credit_total))
+        row = GLBalanceSnapshotService(self.db).account_totals(
+            business_id, end=as_of, account_id=account_id,
+        ).first()
+        debit_total = Decimal(str(row.total_debit)) if row else Decimal("0")
+        credit_total = Decimal(str(row.total_credit)) if row else Decimal("0")
 
         # Normal balance determines sign
         if account.normal_balance == "debit":
@@ -205,6 +191,7 @@ class GeneralLedgerService:
         entry.status = JournalEntryStatus.POSTED
         entry.posted_by_id = user_id
         entry.posted_at = datetime.now(timezone.utc)
+        GLBalanceSnapshotService(self.db).apply_entry(entry)
         self.db.commit()
         self.db.refresh(entry)
         return entry
@@ -221,6 +208,8 @@ class GeneralLedgerService:
         if entry.status == JournalEntryStatus.VOIDED:
             raise ValueError("Entry is already voided.")
 
+        if entry.status == JournalEntryStatus.POSTED:
+            GLBalanceSnapshotService(self.db).apply_entry(entry, sign=-1)
         entry.status = JournalEntryStatus.VOIDED
         self.db.commit()
         self.db.refresh(entry)
@@ -259,36 +248,12 @@ class GeneralLedgerService:
     # --- Reports ---
 
     def _posted_lines_query(self, business_id: str, as_of: Optional[datetime] = None):
-        """Base query for posted journal lines with account info."""
-        query = (
-            self.db.query(
-                ChartOfAccount.id.label("account_id"),
-                ChartOfAccount.account_code,
-                ChartOfAccount.name.label("account_name"),
-                ChartOfAccount.account_type,
-                ChartOfAccount.normal_balance,
-                func.coalesce(func.sum(JournalLine.debit), 0).label("total_debit"),
-                func.coalesce(func.sum(JournalLine.credit), 0).label("total_credit"),
-            )
-            .join(JournalLine, JournalLine.account_id == ChartOfAccount.id)
-            .join(JournalEntry, JournalLine.entry_id == JournalEntry.id)
-            .filter(
-                ChartOfAccount.business_id == business_id,
-                JournalEntry.status == JournalEntryStatus.POSTED,
-                JournalEntry.deleted_at.is_(None),
-                JournalLine.deleted_at.is_(None),
-                ChartOfAccount.deleted_at.is_(None),
-            )
-        )
-        if as_of:
-            query = query.filter(JournalEntry.entry_date <= as_of)
-        return query.group_by(
-            ChartOfAccount.id,
-            ChartOfAccount.account_code,
-            ChartOfAccount.name,
-            ChartOfAccount.account_type,
-            ChartOfAccount.normal_balance,
-        )
+        """Per-account totals of posted journal lines up to ``as_of``.
+
+        Served from monthly balance snapshots plus the lines posted since the
+        start of the ``as_of`` month (see GLBalanceSnapshotService).
+        """
+        return GLBalanceSnapshotService(self.db).account_totals(business_id, end=as_of)
 
     def get_trial_balance(self, business_id: str, as_of: Optional[datetime] = None) -> dict:
         """Generate trial balance report."""
@@ -327,37 +292,12 @@ class GeneralLedgerService:
         self, business_id: str, start_date: datetime, end_date: datetime,
     ) -> dict:
         """Generate income statement (P&L) for a date range."""
-        query = (
-            self.db.query(
-                ChartOfAccount.id.label("account_id"),
-                ChartOfAccount.account_code,
-                ChartOfAccount.name.label("account_name"),
-                ChartOfAccount.account_type,
-                ChartOfAccount.normal_balance,
-                func.coalesce(func.sum(JournalLine.debit), 0).label("total_debit"),
-                func.coalesce(func.sum(JournalLine.credit), 0).label("total_credit"),
-            )
-            .join(JournalLine, JournalLine.account_id == ChartOfAccount.id)
-            .join(JournalEntry, JournalLine.entry_id == JournalEntry.id)
-            .filter(
-                ChartOfAccount.business_id == business_id,
-                JournalEntry.status == JournalEntryStatus.POSTED,
-                JournalEntry.entry_date >= start_date,
-                JournalEntry.entry_date <= end_date,
-                JournalEntry.deleted_at.is_(None),
-                JournalLine.deleted_at.is_(None),
-                ChartOfAccount.deleted_at.is_(None),
-                ChartOfAccount.account_type.in_([AccountType.REVENUE, AccountType.EXPENSE]),
-            )
-            .group_by(
-                ChartOfAccount.id,
-                ChartOfAccount.account_code,
-                ChartOfAccount.name,
-                ChartOfAccount.account_type,
-                ChartOfAccount.normal_balance,
-            )
-            .order_by(ChartOfAccount.account_code)
-        )
+        query = GLBalanceSnapshotService(self.db).account_totals(
+            business_id,
+            start=start_date,
+            end=end_date,
+            account_types=[AccountType.REVENUE, AccountType.EXPENSE],
+        ).order_by(ChartOfAccount.account_code)
 
         rows = query.all()
         revenue_items = []
@@ -624,6 +564,20 @@ class GeneralLedgerService:
         )
         return items, total
 
+    def verify_account_balances(self, business_id: str, repair: bool = False) -> dict:
+        """Check the period balance cache against posted journal lines.
+
+        With ``repair=True`` the cache is rebuilt when mismatches are found.
+        """
+        snapshots = GLBalanceSnapshotService(self.db)
+        result = snapshots.verify(business_id)
+        result["repaired"] = False
+        if repair and result["mismatches"]:
+            snapshots.rebuild(business_id)
+            self.db.commit()
+            result["repaired"] = True
+        return result
+
     # ------------------------------------------------------------------
     # GL Audit Log
     # ------------------------------------------------------------------
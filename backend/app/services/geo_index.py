@@ -0,0 +1,180 @@
+"""Prebuilt geometry for delivery zone matching and driver distances.
+
+Zone matching used to load every active zone of the business and run a
+haversine / ray-casting test per zone on each lookup.  Instead:
+
+- ``ZoneIndex`` is built once per business from its active zones: radius
+  zones and polygon zones go into a uniform grid by bounding box, and each
+  polygon keeps its edges as a NumPy array, so a lookup only tests the
+  zones whose box covers the point's cell.
+- ``get_zone_index`` caches the index per business and checks it against
+  a version stamp (count and latest ``updated_at`` of the active zones,
+  one small aggregate query), so zone edits from any worker rebuild it on
+  the next lookup.
+- ``haversine_km_many`` computes distances from one point to many (or
+  whole distance matrices) in one vectorised pass: driver ranking, batch
+  assignment and route planning.
+"""
+
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.delivery import DeliveryZone
+
+EARTH_RADIUS_KM = 6371.0
+
+# Grid cell size in degrees (~5.5 km of latitude)
+GRID_CELL_DEGREES = 0.05
+# Zones covering more cells than this are checked on every lookup instead
+MAX_CELLS_PER_ZONE = 4096
+
+
+def haversine_km_many(lat, lng, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distances (km) from one point to arrays of points.
+
+    Broadcasts like NumPy, so *lat*/*lng* may be arrays too (pairwise or
+    full distance matrices).  NaN coordinates give NaN distances.
+    """
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _polygon_edges(boundary: Sequence[Sequence[Any]]) -> np.ndarray:
+    """Edges of a closed ring as rows of (lat_i, lng_i, lat_j, lng_j), j = i - 1."""
+    points = np.asarray(boundary, dtype=float)[:, :2]
+    previous = np.roll(points, 1, axis=0)
+    return np.hstack([points, previous])
+
+
+def _edges_contain(edges: np.ndarray, lat: float, lng: float) -> bool:
+    """Ray casting over precomputed edges (same rule as ``_point_in_polygon``)."""
+    yi, xi, yj, xj = edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3]
+    crosses = (yi > lat) != (yj > lat)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = (xj - xi) * (lat - yi) / (yj - yi) + xi
+    return bool(np.count_nonzero(crosses & (lng < x_at)) % 2)
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return math.floor(lat / GRID_CELL_DEGREES), math.floor(lng / GRID_CELL_DEGREES)
+
+
+class ZoneIndex:
+    """
+    Coordinate lookup over one business's active zones.
+
+    Matching follows ``match_zone_by_coords``: the closest radius zone that
+    contains the point, else the first polygon zone (in zone order) that
+    contains it, else the first flat zone.  Returns zone ids.
+    """
+
+    def __init__(self, zones: Iterable[DeliveryZone]) -> None:
+        self.flat_zone_id: Optional[Any] = None
+        self._radius: List[Tuple[Any, float, float, float]] = []  # id, lat, lng, km
+        self._polygons: List[Tuple[Any, np.ndarray]] = []  # id, edges
+        self._grid: Dict[Tuple[int, int], List[Tuple[str, int]]] = {}
+        self._wide: List[Tuple[str, int]] = []
+
+        for zone in zones:
+            zone_type = (zone.zone_type or "flat").lower()
+            if zone_type == "radius":
+                c_lat = float(zone.center_lat or 0)
+                c_lng = float(zone.center_lng or 0)
+                r_km = float(zone.radius_km or 0)
+                if c_lat and c_lng and r_km:
+                    d_lat = r_km / 111.32
+                    d_lng = r_km / (111.32 * max(math.cos(math.radians(c_lat)), 0.01))
+                    self._add(("r", len(self._radius)), c_lat - d_lat, c_lat + d_lat, c_lng - d_lng, c_lng + d_lng)
+                    self._radius.append((zone.id, c_lat, c_lng, r_km))
+            elif zone_type == "polygon":
+                boundary = zone.boundary
+                if isinstance(boundary, list) and len(boundary) >= 3:
+                    edges = _polygon_edges(boundary)
+                    self._add(
+                        ("p", len(self._polygons)),
+                        edges[:, 0].min(), edges[:, 0].max(), edges[:, 1].min(), edges[:, 1].max(),
+                    )
+                    self._polygons.append((zone.id, edges))
+            elif zone_type == "flat" and self.flat_zone_id is None:
+                self.flat_zone_id = zone.id
+
+    def _add(self, entry: Tuple[str, int], min_lat, max_lat, min_lng, max_lng) -> None:
+        low, high = _cell(min_lat, min_lng), _cell(max_lat, max_lng)
+        cells = (high[0] - low[0] + 1) * (high[1] - low[1] + 1)
+        if cells > MAX_CELLS_PER_ZONE:
+            self._wide.append(entry)
+            return
+        for i in range(low[0], high[0] + 1):
+            for j in range(low[1], high[1] + 1):
+                self._grid.setdefault((i, j), []).append(entry)
+
+    def match(self, lat: float, lng: float) -> Optional[Any]:
+        candidates = self._grid.get(_cell(lat, lng), []) + self._wide
+
+        radius = [self._radius[i] for kind, i in candidates if kind == "r"]
+        if radius:
+            centers = np.array([(c_lat, c_lng, r_km) for _, c_lat, c_lng, r_km in radius])
+            distances = haversine_km_many(lat, lng, centers[:, 0], centers[:, 1])
+            inside = np.flatnonzero(distances <= centers[:, 2])
+            if inside.size:
+                return radius[inside[np.argmin(distances[inside])]][0]
+
+        for i in sorted(i for kind, i in candidates if kind == "p"):
+            zone_id, edges = self._polygons[i]
+            if _edges_contain(edges, lat, lng):
+                return zone_id
+
+        return self.flat_zone_id
+
+
+_indexes: Dict[str, Tuple[Any, ZoneIndex]] = {}
+_lock = threading.Lock()
+
+
+def _active_zones(db: Session, business_id: str):
+    return db.query(DeliveryZone).filter(
+        DeliveryZone.business_id == business_id,
+        DeliveryZone.is_active.is_(True),
+        DeliveryZone.deleted_at.is_(None),
+    )
+
+
+def get_zone_index(db: Session, business_id: str) -> Tuple[ZoneIndex, Dict[Any, DeliveryZone]]:
+    """
+    The business's zone index, rebuilt when its zones changed.
+
+    Also returns the zones loaded for a rebuild (by id) so the caller can
+    use them without another query; empty when the cached index was used.
+    """
+    stamp = (
+        _active_zones(db, business_id)
+        .with_entities(func.count(DeliveryZone.id), func.max(DeliveryZone.updated_at))
+        .one()
+    )
+    version = (stamp[0], stamp[1])
+    key = str(business_id)
+    with _lock:
+        cached = _indexes.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1], {}
+
+    zones = _active_zones(db, business_id).all()
+    index = ZoneIndex(zones)
+    with _lock:
+        _indexes[key] = (version, index)
+    return index, {zone.id: zone for zone in zones}
+
+
+def clear_zone_indexes() -> None:
+    with _lock:
+        _indexes.clear()
@@ -0,0 +1,395 @@
+"""Monthly account balance snapshots for general ledger reports.
+
+``gl_account_balances`` holds one row per account per calendar month (UTC)
+with that month's debit and credit totals plus running opening and closing
+balances in the account's normal-balance sign.  Rows are adjusted when a
+journal entry is posted or a posted entry is voided.
+
+Reports read whole months from the snapshots and only scan raw journal
+lines for the partial months at the edges of the requested range, so an
+"as of" report is snapshot plus the delta since the start of the month.
+``verify`` compares the snapshots with the raw lines and ``rebuild``
+re-derives them.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, extract, func, insert, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.general_ledger import (
+    AccountType,
+    ChartOfAccount,
+    GLAccountBalance,
+    JournalEntry,
+    JournalEntryStatus,
+    JournalLine,
+)
+
+Period = Tuple[int, int]
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def period_of(value: datetime) -> Period:
+    """(year, month) of a timestamp in UTC."""
+    value = _utc(value)
+    return value.year, value.month
+
+
+def period_index(period: Period) -> int:
+    """Months since year 0, so periods compare and step as integers."""
+    return period[0] * 12 + period[1] - 1
+
+
+def period_start(index: int) -> datetime:
+    """UTC start of the month with the given period index."""
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def entry_time():
+    """When a journal entry counts: its entry date, else when it was created.
+
+    Snapshot periods and raw-line date filters both use this, so a line is
+    never in a snapshot month and outside the raw range (or the reverse).
+    """
+    return func.coalesce(JournalEntry.entry_date, JournalEntry.created_at)
+
+
+def _signed(normal_balance: Optional[str], debit: Decimal, credit: Decimal) -> Decimal:
+    return debit - credit if (normal_balance or "debit") == "debit" else credit - debit
+
+
+class GLBalanceSnapshotService:
+    """Maintain and read monthly ``gl_account_balances`` snapshots."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ── Maintenance ──────────────────────────────────────────────────────────
+
+    def apply_entry(self, entry: JournalEntry, sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) an entry's lines from the snapshots.
+
+        Call when an entry is posted, or when a posted entry is voided.
+        Later months of each touched account have their opening and closing
+        balances shifted by the same amount.  Does not commit.
+        """
+        rows = (
+            self.db.query(
+                JournalLine.account_id,
+                ChartOfAccount.normal_balance,
+                func.coalesce(func.sum(JournalLine.debit), 0).label("debit"),
+                func.coalesce(func.sum(JournalLine.credit), 0).label("credit"),
+            )
+            .join(ChartOfAccount, JournalLine.account_id == ChartOfAccount.id)
+            .filter(
+                JournalLine.entry_id == entry.id,
+                JournalLine.deleted_at.is_(None),
+            )
+            .group_by(JournalLine.account_id, ChartOfAccount.normal_balance)
+            .all()
+        )
+        for row in rows:
+            period = period_of(entry.entry_date or entry.created_at)
+            debit = Decimal(str(row.debit)) * sign
+            credit = Decimal(str(row.credit)) * sign
+            self._post(entry.business_id, row.account_id, row.normal_balance, period, debit, credit)
+
+    def _post(
+        self,
+        business_id,
+        account_id,
+        normal_balance: Optional[str],
+        period: Period,
+        debit: Decimal,
+        credit: Decimal,
+    ) -> None:
+        index = period_index(period)
+        delta = _signed(normal_balance, debit, credit)
+
+        # Opening balance of a new month: the closing balance of the
+        # account's latest earlier month, read inside the INSERT
+        previous_closing = (
+            select(GLAccountBalance.closing_balance)
+            .where(
+                GLAccountBalance.account_id == account_id,
+                self._index_column() < index,
+            )
+            .order_by(GLAccountBalance.period_year.desc(), GLAccountBalance.period_month.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        opening = func.coalesce(previous_closing, 0)
+        stmt = self._insert(GLAccountBalance).values(
+            business_id=business_id,
+            account_id=account_id,
+            period_year=period[0],
+            period_month=period[1],
+            opening_balance=opening,
+            debit_total=debit,
+            credit_total=credit,
+            closing_balance=opening + delta,
+        )
+        # An existing month keeps its opening balance and adds the totals;
+        # excluded.closing - excluded.opening is the delta
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                GLAccountBalance.account_id,
+                GLAccountBalance.period_year,
+                GLAccountBalance.period_month,
+            ],
+            set_={
+                "debit_total": GLAccountBalance.debit_total + stmt.excluded.debit_total,
+                "credit_total": GLAccountBalance.credit_total + stmt.excluded.credit_total,
+                "closing_balance": GLAccountBalance.closing_balance
+                + stmt.excluded.closing_balance
+                - stmt.excluded.opening_balance,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self.db.execute(stmt)
+
+        if delta:
+            self.db.query(GLAccountBalance).filter(
+                GLAccountBalance.account_id == account_id,
+                self._index_column() > index,
+            ).update(
+                {
+                    GLAccountBalance.opening_balance: GLAccountBalance.opening_balance + delta,
+                    GLAccountBalance.closing_balance: GLAccountBalance.closing_balance + delta,
+                },
+                synchronize_session=False,
+            )
+
+    def _insert(self, model):
+        """Return a dialect-specific INSERT that supports ON CONFLICT."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return sqlite_insert(model)
+        return pg_insert(model)
+
+    @staticmethod
+    def _index_column():
+        return GLAccountBalance.period_year * 12 + GLAccountBalance.period_month - 1
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def _posted_line_filters(self, business_id) -> list:
+        return [
+            JournalEntry.business_id == business_id,
+            JournalEntry.status == JournalEntryStatus.POSTED,
+            JournalEntry.deleted_at.is_(None),
+            JournalLine.deleted_at.is_(None),
+        ]
+
+    def account_totals(
+        self,
+        business_id,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        account_types: Optional[Iterable[AccountType]] = None,
+        account_id=None,
+    ):
+        """Query of debit/credit totals per account for posted lines in ``[start, end]``.
+
+        Returns an un-ordered ``Query`` with the same columns the reports
+        always used (account_id, account_code, account_name, account_type,
+        normal_balance, total_debit, total_credit).  Whole months inside the
+        range come from the snapshots; lines outside those months are read
+        directly.
+        """
+        first = None
+        if start is not None:
+            start = _utc(start)
+            first = period_index(period_of(start))
+            if start > period_start(first):
+                first += 1
+        last = None
+        if end is not None:
+            end = _utc(end)
+            last = period_index(period_of(end)) - 1
+
+        parts = []
+        # Filters selecting the raw lines not covered by snapshot months
+        raw_filters: Optional[list] = []
+        if first is None or last is None or first <= last:
+            index = self._index_column()
+            snapshot_filters = [GLAccountBalance.business_id == business_id]
+            if first is not None:
+                snapshot_filters.append(index >= first)
+            if last is not None:
+                snapshot_filters.append(index <= last)
+            if account_id is not None:
+                snapshot_filters.append(GLAccountBalance.account_id == account_id)
+            parts.append(
+                select(
+                    GLAccountBalance.account_id.label("account_id"),
+                    GLAccountBalance.debit_total.label("debit"),
+                    GLAccountBalance.credit_total.label("credit"),
+                ).where(*snapshot_filters)
+            )
+            outside = []
+            if first is not None:
+                outside.append(entry_time() < period_start(first))
+            if last is not None:
+                outside.append(entry_time() >= period_start(last + 1))
+            raw_filters = [or_(*outside)] if outside else None
+
+        if raw_filters is not None:
+            line_filters = self._posted_line_filters(business_id) + raw_filters
+            if start is not None:
+                line_filters.append(entry_time() >= start)
+            if end is not None:
+                line_filters.append(entry_time() <= end)
+            if account_id is not None:
+                line_filters.append(JournalLine.account_id == account_id)
+            parts.append(
+                select(
+                    JournalLine.account_id.label("account_id"),
+                    JournalLine.debit.label("debit"),
+                    JournalLine.credit.label("credit"),
+                )
+                .join(JournalEntry, JournalLine.entry_id == JournalEntry.id)
+                .where(*line_filters)
+            )
+
+        totals = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+        total_debit = func.coalesce(func.sum(totals.c.debit), 0)
+        total_credit = func.coalesce(func.sum(totals.c.credit), 0)
+        query = (
+            self.db.query(
+                ChartOfAccount.id.label("account_id"),
+                ChartOfAccount.account_code,
+                ChartOfAccount.name.label("account_name"),
+                ChartOfAccount.account_type,
+                ChartOfAccount.normal_balance,
+                total_debit.label("total_debit"),
+                total_credit.label("total_credit"),
+            )
+            .join(totals, totals.c.account_id == ChartOfAccount.id)
+            .filter(
+                ChartOfAccount.business_id == business_id,
+                ChartOfAccount.deleted_at.is_(None),
+            )
+        )
+        if account_types is not None:
+            query = query.filter(ChartOfAccount.account_type.in_(list(account_types)))
+        # Snapshot rows left at zero by voids should not surface as accounts
+        return query.group_by(
+            ChartOfAccount.id,
+            ChartOfAccount.account_code,
+            ChartOfAccount.name,
+            ChartOfAccount.account_type,
+            ChartOfAccount.normal_balance,
+        ).having(or_(total_debit != 0, total_credit != 0))
+
+    # ── Consistency ──────────────────────────────────────────────────────────
+
+    def _line_period_columns(self):
+        entry_date = entry_time()
+        if self.db.get_bind().dialect.name != "sqlite":
+            entry_date = func.timezone("UTC", entry_date)
+        return (
+            extract("year", entry_date).label("period_year"),
+            extract("month", entry_date).label("period_month"),
+        )
+
+    def expected_snapshots(self, business_id) -> List[dict]:
+        """Snapshot rows as they should be, derived from posted journal lines."""
+        year, month = self._line_period_columns()
+        rows = (
+            self.db.query(
+                JournalLine.account_id,
+                ChartOfAccount.normal_balance,
+                year,
+                month,
+                func.coalesce(func.sum(JournalLine.debit), 0).label("debit"),
+                func.coalesce(func.sum(JournalLine.credit), 0).label("credit"),
+            )
+            .join(JournalEntry, JournalLine.entry_id == JournalEntry.id)
+            .join(ChartOfAccount, JournalLine.account_id == ChartOfAccount.id)
+            .filter(*self._posted_line_filters(business_id))
+            .group_by(JournalLine.account_id, ChartOfAccount.normal_balance, year, month)
+            .all()
+        )
+
+        by_account: Dict = defaultdict(list)
+        for row in rows:
+            by_account[row.account_id].append(row)
+
+        expected = []
+        for account_id, periods in by_account.items():
+            running = Decimal("0")
+            for row in sorted(periods, key=lambda r: (int(r.period_year), int(r.period_month))):
+                debit = Decimal(str(row.debit))
+                credit = Decimal(str(row.credit))
+                opening = running
+                running += _signed(row.normal_balance, debit, credit)
+                expected.append({
+                    "business_id": business_id,
+                    "account_id": account_id,
+                    "period_year": int(row.period_year),
+                    "period_month": int(row.period_month),
+                    "opening_balance": opening,
+                    "debit_total": debit,
+                    "credit_total": credit,
+                    "closing_balance": running,
+                })
+        return expected
+
+    def verify(self, business_id) -> dict:
+        """Compare stored snapshots with the raw journal lines.
+
+        Returns ``{"checked": n, "mismatches": [...]}``; each mismatch names
+        the account, period and field with expected and stored values.  A
+        stored row with no lines behind it must be all zeros.
+        """
+        fields = ("opening_balance", "debit_total", "credit_total", "closing_balance")
+        expected = {
+            (str(r["account_id"]), r["period_year"], r["period_month"]): r
+            for r in self.expected_snapshots(business_id)
+        }
+        stored = {
+            (str(s.account_id), s.period_year, s.period_month): s
+            for s in self.db.query(GLAccountBalance).filter(GLAccountBalance.business_id == business_id)
+        }
+
+        mismatches = []
+        for key in sorted(set(expected) | set(stored)):
+            want = expected.get(key)
+            have = stored.get(key)
+            for field in fields:
+                want_value = want[field] if want else None
+                have_value = Decimal(str(getattr(have, field) or 0)) if have is not None else None
+                if want is None and have_value == 0:
+                    continue
+                if want_value != have_value:
+                    mismatches.append({
+                        "account_id": key[0],
+                        "period_year": key[1],
+                        "period_month": key[2],
+                        "field": field,
+                        "expected": want_value,
+                        "actual": have_value,
+                    })
+        return {"checked": len(set(expected) | set(stored)), "mismatches": mismatches}
+
+    def rebuild(self, business_id) -> int:
+        """Replace a business's snapshots with ones derived from journal lines.
+
+        Does not commit.  Returns the number of rows written.
+        """
+        rows = self.expected_snapshots(business_id)
+        self.db.execute(delete(GLAccountBalance).where(GLAccountBalance.business_id == business_id))
+        if rows:
+            self.db.execute(insert(GLAccountBalance), rows)
+        return len(rows)
@@ -0,0 +1,320 @@
+"""Coalesced heartbeat ingestion for displays and devices.
+
+Customer displays, signage players and mobile devices report liveness
+every few seconds.  Writing each heartbeat as its own SELECT/UPDATE/COMMIT
+turns hundreds of idle screens into a steady stream of tiny transactions,
+so instead:
+
+- Presence: a heartbeat sets ``bizpilot:presence:<kind>:<key>`` in Redis
+  with a ``HEARTBEAT_PRESENCE_TTL_SECONDS`` TTL; going offline is the key
+  expiring, nothing is written.  Reads derive online/offline from the
+  last-seen time against the same TTL (``presence``) instead of trusting a
+  stored flag.
+- Persistence: the latest heartbeat per entity is kept in memory and
+  ``HeartbeatBuffer`` writes them every ``HEARTBEAT_FLUSH_SECONDS`` as one
+  executemany UPDATE per table, so stored last-seen times lag by at most
+  one flush interval.
+- Existence: an entity with a live presence key was looked up when it came
+  online, so its heartbeats skip the database entirely.  Display heartbeats
+  answer with the display's row, which ``cached_row`` keeps in Redis for
+  the presence TTL (loaded once per TTL, not per heartbeat).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, true, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import redis_manager
+from app.models.customer_display import CustomerDisplay, DisplayStatus
+from app.models.signage import SignageDisplay
+from app.models.subscription import DeviceRegistry
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_PREFIX = "bizpilot:presence"
+ROW_PREFIX = "bizpilot:heartbeat_row"
+
+# Heartbeat kinds and their presence keys
+CUSTOMER_DISPLAY = "customer_display"    # key: display id
+SIGNAGE_DISPLAY = "signage_display"      # key: "<business_id>:<display id>"
+DEVICE = "device"                        # key: "<business_id>:<device_id>"
+
+
+def entity_key(*parts: Any) -> str:
+    return ":".join(str(part) for part in parts)
+
+
+def _presence_key(kind: str, key: str) -> str:
+    return f"{PRESENCE_PREFIX}:{kind}:{key}"
+
+
+def _row_key(kind: str, key: str) -> str:
+    return f"{ROW_PREFIX}:{kind}:{key}"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# -- batched writes --------------------------------------------------------
+
+def _customer_display_updates(rows: List[Tuple[str, datetime]]):
+    table = CustomerDisplay.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"), table.c.deleted_at.is_(None))
+        .values(status=DisplayStatus.ONLINE.value, last_seen_at=bindparam("b_seen"))
+    )
+    return stmt, [{"b_id": UUID(key), "b_seen": seen} for key, seen in rows]
+
+
+def _signage_display_updates(rows: List[Tuple[str, datetime]]):
+    table = SignageDisplay.__table__
+    stmt = (
+        update(table)
+        .where(
+            table.c.business_id == bindparam("b_business"),
+            table.c.id == bindparam("b_id"),
+            table.c.deleted_at.is_(None),
+        )
+        .values(status="online", last_heartbeat_at=bindparam("b_seen"), updated_at=bindparam("b_seen"))
+    )
+    params = []
+    for key, seen in rows:
+        business_id, display_id = key.split(":", 1)
+        params.append({"b_business": UUID(business_id), "b_id": UUID(display_id), "b_seen": seen})
+    return stmt, params
+
+
+def _device_updates(rows: List[Tuple[str, datetime]]):
+    table = DeviceRegistry.__table__
+    stmt = (
+        update(table)
+        .where(table.c.business_id == bindparam("b_business"), table.c.device_id == bindparam("b_device"))
+        .values(last_sync_time=bindparam("b_seen"), is_active=true())
+    )
+    params = []
+    for key, seen in rows:
+        business_id, device_id = key.split(":", 1)
+        params.append({"b_business": UUID(business_id), "b_device": device_id, "b_seen": seen})
+    return stmt, params
+
+
+_UPDATES = {
+    CUSTOMER_DISPLAY: _customer_display_updates,
+    SIGNAGE_DISPLAY: _signage_display_updates,
+    DEVICE: _device_updates,
+}
+
+
+class HeartbeatBuffer:
+    """
+    Latest heartbeat per entity, written to the database in batches.
+
+    ``record`` is thread-safe (sync endpoints run in the threadpool); the
+    flush loop runs on the application's event loop and writes on its own
+    session in a worker thread.
+    """
+
+    def __init__(
+        self,
+        flush_seconds: float = 30.0,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ) -> None:
+        self.flush_seconds = flush_seconds
+        self._session_factory = session_factory
+        self._pending: Dict[Tuple[str, str], datetime] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.received = 0
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def record(self, kind: str, key: str, seen_at: datetime) -> None:
+        with self._lock:
+            self.received += 1
+            previous = self._pending.get((kind, key))
+            if previous is None or seen_at > previous:
+                self._pending[(kind, key)] = seen_at
+
+    def pending_seen(self, kind: str, key: str) -> Optional[datetime]:
+        with self._lock:
+            return self._pending.get((kind, key))
+
+    def _take(self) -> Dict[Tuple[str, str], datetime]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            return pending
+
+    def _requeue(self, pending: Dict[Tuple[str, str], datetime]) -> None:
+        with self._lock:
+            for entry, seen_at in pending.items():
+                current = self._pending.get(entry)
+                if current is None or seen_at > current:
+                    self._pending[entry] = seen_at
+
+    def flush(self) -> int:
+        """Write every pending heartbeat; returns how many were written."""
+        pending = self._take()
+        if not pending:
+            return 0
+
+        by_kind: Dict[str, List[Tuple[str, datetime]]] = defaultdict(list)
+        for (kind, key), seen_at in pending.items():
+            by_kind[kind].append((key, seen_at))
+
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+        db = self._session_factory()
+        try:
+            for kind, rows in by_kind.items():
+                stmt, params = _UPDATES[kind](rows)
+                db.execute(stmt, params)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            self.failed += 1
+            logger.warning("Heartbeat flush of %d entities failed: %s", len(pending), exc)
+            self._requeue(pending)
+            return 0
+        finally:
+            db.close()
+        self.written += len(pending)
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await asyncio.to_thread(self.flush)
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending": len(self._pending),
+            "received": self.received,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+
+heartbeat_buffer = HeartbeatBuffer(flush_seconds=settings.HEARTBEAT_FLUSH_SECONDS)
+
+
+# -- presence --------------------------------------------------------------
+
+async def mark_present(kind: str, key: str, seen_at: Optional[datetime] = None) -> datetime:
+    """Set the entity's presence key (online for the presence TTL)."""
+    seen_at = seen_at or _utc_now()
+    await redis_manager.set(
+        _presence_key(kind, key),
+        seen_at.isoformat(),
+        ttl_seconds=settings.HEARTBEAT_PRESENCE_TTL_SECONDS,
+    )
+    return seen_at
+
+
+async def record_heartbeat(kind: str, key: str, seen_at: Optional[datetime] = None) -> datetime:
+    """Mark the entity online and queue its ``last seen`` write."""
+    seen_at = await mark_present(kind, key, seen_at)
+    heartbeat_buffer.record(kind, key, seen_at)
+    return seen_at
+
+
+async def is_present(kind: str, key: str) -> bool:
+    """Whether the entity has heartbeated within the presence TTL."""
+    return await redis_manager.get(_presence_key(kind, key)) is not None
+
+
+async def cached_row(
+    kind: str, key: str, load: Callable[[], Optional[Dict[str, Any]]]
+) -> Optional[Dict[str, Any]]:
+    """
+    The entity's row as JSON-ready data, or None when it does not exist.
+
+    *load* is a blocking callable (it queries the database) and runs in a
+    worker thread on a miss.  Rows are kept for the presence TTL from when
+    they were loaded, so edits show up in heartbeat responses within it.
+    """
+    raw = await redis_manager.get(_row_key(kind, key))
+    if raw:
+        try:
+            return json.loads(raw)
+        except ValueError:
+            logger.warning("Discarding unreadable heartbeat row for %s %s", kind, key)
+    row = await asyncio.to_thread(load)
+    if row is not None:
+        await redis_manager.set(
+            _row_key(kind, key),
+            json.dumps(row, separators=(",", ":")),
+            ttl_seconds=settings.HEARTBEAT_PRESENCE_TTL_SECONDS,
+        )
+    return row
+
+
+def presence(
+    kind: str, key: str, status: Optional[str], seen_at: Optional[datetime]
+) -> Tuple[Optional[str], Optional[datetime]]:
+    """
+    (status, last seen) of an entity as read from its row.
+
+    The stored timestamp lags by at most one flush interval, which is well
+    inside the presence TTL; this worker's unflushed heartbeat is folded in
+    so a display that just checked in reads as online immediately.
+    Statuses other than online/offline (e.g. pairing) are set by people,
+    not heartbeats, and are kept.
+    """
+    seen_at = latest_seen(seen_at, heartbeat_buffer.pending_seen(kind, key))
+    if status not in (DisplayStatus.ONLINE.value, DisplayStatus.OFFLINE.value):
+        return status, seen_at
+    fresh = seen_at is not None and (
+        _utc_now() - seen_at <= timedelta(seconds=settings.HEARTBEAT_PRESENCE_TTL_SECONDS)
+    )
+    return (DisplayStatus.ONLINE.value if fresh else DisplayStatus.OFFLINE.value), seen_at
+
+
+def latest_seen(*seen: Optional[datetime]) -> Optional[datetime]:
+    """Most recent of the given timestamps (None if there are none)."""
+    return max((_aware(s) for s in seen if s is not None), default=None)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+async def start_heartbeat_buffer() -> None:
+    """Start the periodic heartbeat flush (application startup)."""
+    heartbeat_buffer.start()
+
+
+async def stop_heartbeat_buffer() -> None:
+    """Stop and write what is still buffered (shutdown)."""
+    await heartbeat_buffer.stop()
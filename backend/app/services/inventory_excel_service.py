@@ -2,17 +2,24 @@
 
 from io import BytesIO
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 from uuid import UUID
 
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.cell import Cell
-from openpyxl.utils import get_column_letter
 from sqlalchemy.orm import Session
 
 from app.models.inventory import InventoryItem
 from app.models.product import Product
+from app.services.streaming_export_service import (
+    EXPORT_YIELD_PER,
+    ExportTarget,
+    add_info_sheet,
+    add_table_sheet,
+    new_export_workbook,
+)
+from app.services.streaming_import_service import ImportFileError, open_sheet_rows
+
+if TYPE_CHECKING:
+    from openpyxl.cell import Cell
 
 
 # Column definitions matching database schema
@@ -37,8 +44,10 @@ class InventoryExcelService:
     def __init__(self, db: Session):
         self.db = db
 
-    def _apply_header_style(self, cell: Cell) -> None:
+    def _apply_header_style(self, cell: "Cell") -> None:
         """Apply styling to header cells."""
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
         cell.font = Font(bold=True, color="FFFFFF")
         cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
         cell.alignment = Alignment(horizontal="center", vertical="center")
@@ -49,20 +58,12 @@ class InventoryExcelService:
             bottom=Side(style="thin"),
         )
 
-    def _apply_data_style(self, cell: Cell, is_alternate: bool = False) -> None:
-        """Apply styling to data cells."""
-        if is_alternate:
-            cell.fill = PatternFill(start_color="F3F4F6", end_color="F3F4F6", fill_type="solid")
-        cell.alignment = Alignment(horizontal="left", vertical="center")
-        cell.border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-
     def generate_template(self) -> BytesIO:
         """Generate an empty Excel template with correct column headers."""
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
         wb = Workbook()
         ws = wb.active
         ws.title = "Inventory"
@@ -102,67 +103,95 @@ class InventoryExcelService:
         output.seek(0)
         return output
 
-    def export_inventory(self, business_id: str) -> BytesIO:
-        """Export all inventory items to Excel spreadsheet."""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Inventory"
-
-        # Add headers
-        for col_idx, col_def in enumerate(INVENTORY_COLUMNS, 1):
-            cell = ws.cell(row=1, column=col_idx, value=col_def["header"])
-            self._apply_header_style(cell)
-            ws.column_dimensions[get_column_letter(col_idx)].width = col_def["width"]
-
-        # Get inventory items with product info
-        items = (
-            self.db.query(InventoryItem, Product)
+    def _export_query(self, business_id: str):
+        return (
+            self.db.query(InventoryItem)
             .join(Product, InventoryItem.product_id == Product.id)
             .filter(
                 InventoryItem.business_id == business_id,
                 InventoryItem.deleted_at.is_(None),
                 Product.deleted_at.is_(None),
             )
+        )
+
+    def count_inventory_export(self, business_id: str) -> int:
+        """Number of rows ``write_inventory_export`` will produce."""
+        return self._export_query(business_id).count()
+
+    def write_inventory_export(
+        self,
+        business_id: str,
+        target: ExportTarget,
+        progress: Optional[Callable[[int], bool]] = None,
+    ) -> int:
+        """Stream all inventory items into a write-only workbook at ``target``.
+
+        Only the exported columns are selected and rows are read with a
+        server-side cursor.  ``progress`` is called every
+        ``EXPORT_YIELD_PER`` rows with the running count and may return
+        False to stop early.  Returns the number of rows written.
+        """
+        wb = new_export_workbook()
+        ws = add_table_sheet(
+            wb,
+            "Inventory",
+            [c["header"] for c in INVENTORY_COLUMNS],
+            [c["width"] for c in INVENTORY_COLUMNS],
+        )
+
+        rows = (
+            self._export_query(business_id)
+            .with_entities(
+                Product.sku,
+                Product.name,
+                InventoryItem.quantity_on_hand,
+                InventoryItem.quantity_reserved,
+                InventoryItem.quantity_incoming,
+                InventoryItem.reorder_point,
+                InventoryItem.reorder_quantity,
+                InventoryItem.location,
+                InventoryItem.bin_location,
+                InventoryItem.average_cost,
+                InventoryItem.last_cost,
+            )
             .order_by(Product.sku)
-            .all()
+            .yield_per(EXPORT_YIELD_PER)
         )
 
-        # Add data rows
-        for row_idx, (item, product) in enumerate(items, 2):
-            is_alternate = row_idx % 2 == 0
-            
-            row_data = [
-                product.sku,
-                product.name,
-                item.quantity_on_hand,
-                item.quantity_reserved,
-                item.quantity_incoming,
-                item.reorder_point,
-                item.reorder_quantity,
-                item.location,
-                item.bin_location,
-                float(item.average_cost) if item.average_cost else 0,
-                float(item.last_cost) if item.last_cost else 0,
-            ]
-            
-            for col_idx, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                self._apply_data_style(cell, is_alternate)
+        total = 0
+        for row in rows:
+            ws.append([
+                row.sku,
+                row.name,
+                row.quantity_on_hand,
+                row.quantity_reserved,
+                row.quantity_incoming,
+                row.reorder_point,
+                row.reorder_quantity,
+                row.location,
+                row.bin_location,
+                float(row.average_cost) if row.average_cost else 0,
+                float(row.last_cost) if row.last_cost else 0,
+            ])
+            total += 1
+            if progress and total % EXPORT_YIELD_PER == 0 and progress(total) is False:
+                break
 
-        # Freeze header row
-        ws.freeze_panes = "A2"
+        add_info_sheet(wb, "Export Info", [
+            ("Export Date:", datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")),
+            ("Total Items:", total),
+            ("Business ID:", str(business_id)),
+        ])
+        wb.save(target)
+        return total
 
-        # Add metadata sheet
-        meta = wb.create_sheet("Export Info")
-        meta["A1"] = "Export Date:"
-        meta["B1"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-        meta["A2"] = "Total Items:"
-        meta["B2"] = len(items)
-        meta["A3"] = "Business ID:"
-        meta["B3"] = str(business_id)
+    def export_inventory(self, business_id: str) -> BytesIO:
+        """Export all inventory items to an in-memory Excel spreadsheet.
 
+        Prefer ``write_inventory_export`` to a file for large inventories.
+        """
         output = BytesIO()
-        wb.save(output)
+        self.write_inventory_export(business_id, output)
         output.seek(0)
         return output
 
@@ -192,45 +221,22 @@ class InventoryExcelService:
             "skipped": 0,
         }
 
+        # Read-only mode streams rows instead of materialising the workbook
         try:
-            wb = load_workbook(filename=BytesIO(file_content), data_only=True)
-        except Exception as e:
-            result["success"] = False
-            result["errors"].append(f"Failed to read Excel file: {str(e)}")
-            return result
-
-        # Find the inventory sheet (handle empty workbooks)
-        ws = None
-        if not wb.sheetnames:
-            result["success"] = False
-            result["errors"].append("Excel file contains no sheets")
-            return result
-            
-        for sheet_name in ["Inventory", "Sheet1"]:
-            if sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-                break
-        
-        # Fall back to first sheet if neither found
-        if ws is None:
-            ws = wb[wb.sheetnames[0]]
-
-        if ws is None:
+            sheet = open_sheet_rows(file_content, ["Inventory", "Sheet1"])
+        except ImportFileError as e:
             result["success"] = False
-            result["errors"].append("Could not find Inventory sheet")
+            result["errors"].append(str(e))
             return result
 
-        # Get header row and map columns
-        headers: Dict[str, int] = {}
-        for col_idx, cell in enumerate(ws[1], 1):
-            if cell.value:
-                header_lower = str(cell.value).lower().strip().replace(" ", "_")
-                headers[header_lower] = col_idx
+        # Map columns (1-based, as in the spreadsheet)
+        headers: Dict[str, int] = {name: idx + 1 for name, idx in sheet.headers.items()}
 
         # Validate required columns
         required_headers = {"sku", "quantity_on_hand"}
         missing = required_headers - set(headers.keys())
         if missing:
+            sheet.close()
             result["success"] = False
             result["errors"].append(f"Missing required columns: {', '.join(missing)}")
             return result
@@ -260,11 +266,11 @@ class InventoryExcelService:
         }
 
         # Process data rows
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2), 2):
+        for row_idx, row in sheet.rows:
             try:
                 # Get SKU
                 sku_col = headers.get("sku", 1)
-                sku = row[sku_col - 1].value
+                sku = row[sku_col - 1] if sku_col <= len(row) else None
                 
                 if not sku:
                     result["skipped"] += 1
@@ -294,9 +300,9 @@ class InventoryExcelService:
                 # Update fields from spreadsheet
                 def get_cell_value(header_key: str, default=None):
                     col = headers.get(header_key)
-                    if col is None:
+                    if col is None or col > len(row):
                         return default
-                    val = row[col - 1].value
+                    val = row[col - 1]
                     return val if val is not None else default
 
                 # Required field
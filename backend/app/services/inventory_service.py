@@ -6,6 +6,7 @@ import uuid
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
+from app.core.search import contains
 from app.models.inventory import InventoryItem, InventoryTransaction, TransactionType
 from app.models.product import Product
 from app.models.base import utc_now
@@ -46,11 +47,9 @@ class InventoryService:
         )
 
         if search:
-            term = f"%{search.strip()}%"
             query = query.join(Product, Product.id == InventoryItem.product_id).filter(
                 Product.deleted_at.is_(None),
-                func.lower(Product.name).like(func.lower(term))
-                | func.lower(Product.sku).like(func.lower(term)),
+                contains([Product.name, Product.sku], search.strip()),
             )
         
         if low_stock_only:
@@ -1,16 +1,24 @@
 """Invoice service for business logic."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, date
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import func
 
+from app.core.pagination import Page, TotalMode, paginate
+from app.core.search import SearchSpec, apply_search
 from app.models.invoice import Invoice, InvoiceItem, InvoiceStatus
 from app.schemas.invoice import InvoiceCreate, InvoiceUpdate, InvoiceItemCreate
 
 
+INVOICE_SEARCH = SearchSpec(
+    columns=[Invoice.invoice_number, Invoice.notes],
+    exact=[Invoice.invoice_number],
+)
+
+
 class InvoiceService:
     """Service for invoice operations."""
 
@@ -40,21 +48,16 @@ class InvoiceService:
         overdue_only: bool = False,
         sort_by: str = "created_at",
         sort_order: str = "desc",
-    ) -> Tuple[List[Invoice], int]:
+        total_mode: TotalMode = TotalMode.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[Invoice]:
         """Get invoices with filtering and pagination."""
         query = self.db.query(Invoice).filter(
             Invoice.business_id == business_id,
             Invoice.deleted_at.is_(None),
         )
         
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Invoice.invoice_number.ilike(search_term),
-                    Invoice.notes.ilike(search_term),
-                )
-            )
+        query, rank = apply_search(query, INVOICE_SEARCH, search)
         
         if customer_id:
             query = query.filter(Invoice.customer_id == customer_id)
@@ -73,18 +76,17 @@ class InvoiceService:
                 Invoice.status.notin_([InvoiceStatus.PAID, InvoiceStatus.CANCELLED]),
             )
         
-        total = query.count()
-        
+        # Sorting and pagination
+        if sort_by == "relevance" and rank is not None:
+            return paginate(
+                query.order_by(rank.desc(), Invoice.created_at.desc()),
+                page, per_page, total_mode, cursor,
+            )
         sort_column = getattr(Invoice, sort_by, Invoice.created_at)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        
-        offset = (page - 1) * per_page
-        invoices = query.offset(offset).limit(per_page).all()
-        
-        return invoices, total
+        return paginate(
+            query, page, per_page, total_mode, cursor,
+            keyset=(sort_column, Invoice.id), descending=sort_order == "desc",
+        )
 
     def get_invoice(self, invoice_id: str, business_id: str) -> Optional[Invoice]:
         """Get an invoice by ID."""
@@ -2,12 +2,14 @@
 
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from typing import List, Optional, Tuple
+from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, TotalMode, paginate
+from app.core.search import contains
 from app.models.layby import Layby, LaybyStatus, PaymentFrequency
 from app.models.layby_config import LaybyConfig
 from app.models.layby_item import LaybyItem
@@ -329,11 +331,13 @@ class LaybyService:
         search: Optional[str] = None,
         page: int = 1,
         per_page: int = 20,
-    ) -> Tuple[List[Layby], int]:
-        """List laybys with filtering and pagination.
+        total_mode: TotalMode = TotalMode.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[Layby]:
+        """List laybys with filtering and pagination, newest first.
 
         Returns:
-            Tuple of (list of laybys, total count).
+            Page of laybys; unpacks as (list of laybys, total count).
         """
         query = self.db.query(Layby).filter(
             Layby.business_id == str(business_id),
@@ -345,16 +349,12 @@ class LaybyService:
         if customer_id is not None:
             query = query.filter(Layby.customer_id == str(customer_id))
         if search:
-            query = query.filter(Layby.reference_number.ilike(f"%{search}%"))
+            query = query.filter(contains([Layby.reference_number], search))
 
-        total = query.count()
-        laybys = (
-            query.order_by(Layby.created_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
+        return paginate(
+            query, page, per_page, total_mode, cursor,
+            keyset=(Layby.created_at, Layby.id), descending=True,
         )
-        return laybys, total
 
     def make_payment(
         self,
@@ -0,0 +1,165 @@
+"""Set-based loyalty points expiry.
+
+An EARN transaction whose ``expires_at`` has passed gives up its points:
+each customer loses the sum of their expired earns, capped at their current
+balance (points already redeemed cannot expire twice).  The processed earns
+are soft-deleted so they are not expired again, and one EXPIRE ledger row
+per customer records the deduction.
+
+Customers are processed in chunks of ``batch_size``.  For each chunk:
+
+1. one grouped query sums the expired points per customer and locks their
+   ``customer_loyalty`` rows;
+2. a single ``UPDATE ... FROM`` decrements the balances;
+3. the EXPIRE rows are bulk-inserted and the earns soft-deleted in one
+   ``UPDATE``;
+
+and the chunk is committed, so a large backlog never holds one long
+transaction and an interrupted run simply resumes where it stopped.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.base import utc_now
+from app.models.loyalty import CustomerLoyalty, PointsTransaction, PointsTransactionType
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class LoyaltyExpiryService:
+    """Expire loyalty points in batches for one business or all of them."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _pending_filters(now: datetime, business_id=None) -> list:
+        filters = [
+            PointsTransaction.transaction_type == PointsTransactionType.EARN,
+            PointsTransaction.expires_at.isnot(None),
+            PointsTransaction.expires_at <= now,
+            PointsTransaction.deleted_at.is_(None),
+        ]
+        if business_id is not None:
+            filters.append(PointsTransaction.business_id == business_id)
+        return filters
+
+    def _next_customers(self, filters: list, batch_size: int) -> List:
+        """Customer ids with expired, unprocessed earns (one chunk)."""
+        return list(self.db.execute(
+            select(PointsTransaction.customer_id)
+            .where(*filters)
+            .group_by(PointsTransaction.customer_id)
+            .order_by(PointsTransaction.customer_id)
+            .limit(batch_size)
+        ).scalars())
+
+    def _expire_chunk(self, filters: list, customer_ids: List, now: datetime) -> Dict[str, int]:
+        expired = (
+            select(
+                PointsTransaction.business_id,
+                PointsTransaction.customer_id,
+                func.sum(PointsTransaction.points).label("points"),
+            )
+            .where(*filters, PointsTransaction.customer_id.in_(customer_ids))
+            .group_by(PointsTransaction.business_id, PointsTransaction.customer_id)
+            .subquery()
+        )
+        joined = and_(
+            CustomerLoyalty.customer_id == expired.c.customer_id,
+            CustomerLoyalty.business_id == expired.c.business_id,
+            CustomerLoyalty.deleted_at.is_(None),
+            CustomerLoyalty.points_balance > 0,
+        )
+        deduction = case(
+            (expired.c.points < CustomerLoyalty.points_balance, expired.c.points),
+            else_=CustomerLoyalty.points_balance,
+        )
+
+        members = self.db.execute(
+            select(
+                CustomerLoyalty.id,
+                CustomerLoyalty.business_id,
+                CustomerLoyalty.customer_id,
+                CustomerLoyalty.points_balance,
+                deduction.label("points"),
+            )
+            .join(expired, joined)
+            .with_for_update(of=CustomerLoyalty)
+        ).all()
+
+        ledger = []
+        if members:
+            self.db.execute(
+                update(CustomerLoyalty)
+                .where(joined, CustomerLoyalty.id.in_([m.id for m in members]))
+                .values(
+                    points_balance=CustomerLoyalty.points_balance - deduction,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            ledger = [
+                {
+                    "customer_id": m.customer_id,
+                    "business_id": m.business_id,
+                    "transaction_type": PointsTransactionType.EXPIRE,
+                    "points": -m.points,
+                    "balance_after": m.points_balance - m.points,
+                    "description": f"Expired {m.points} points",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for m in members
+                if m.points > 0
+            ]
+            if ledger:
+                self.db.execute(insert(PointsTransaction), ledger)
+
+        processed = self.db.execute(
+            update(PointsTransaction)
+            .where(*filters, PointsTransaction.customer_id.in_(customer_ids))
+            .values(deleted_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        return {
+            "expire_transactions": len(ledger),
+            "points_expired": sum(-row["points"] for row in ledger),
+            "earn_transactions": processed,
+        }
+
+    def expire_points(
+        self,
+        business_id=None,
+        now: Optional[datetime] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Dict[str, int]:
+        """Expire every overdue earn for one business (or all when None).
+
+        Commits after each chunk of customers.  Returns counts of customers
+        processed, EXPIRE rows written, points removed and earns retired.
+        """
+        now = now or utc_now()
+        filters = self._pending_filters(now, business_id)
+        result = {"customers": 0, "expire_transactions": 0, "points_expired": 0, "earn_transactions": 0}
+
+        while True:
+            customer_ids = self._next_customers(filters, batch_size)
+            if not customer_ids:
+                break
+            try:
+                chunk = self._expire_chunk(filters, customer_ids, now)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            result["customers"] += len(customer_ids)
+            for key, value in chunk.items():
+                result[key] += value
+
+        return result
@@ -14,6 +14,7 @@ from app.models.loyalty import (
     PointsTransactionType,
 )
 from app.models.base import utc_now
+from app.services.loyalty_expiry_service import LoyaltyExpiryService
 
 
 class LoyaltyService:
@@ -230,44 +231,12 @@ class LoyaltyService:
         return transactions, total
 
     def expire_old_points(self, business_id: str) -> int:
-        """Expire points past expiry date. Returns number of transactions expired."""
-        now = utc_now()
-
-        # Find expired earn transactions
-        expired_transactions = self.db.query(PointsTransaction).filter(
-            PointsTransaction.business_id == business_id,
-            PointsTransaction.transaction_type == PointsTransactionType.EARN,
-            PointsTransaction.expires_at.isnot(None),
-            PointsTransaction.expires_at <= now,
-            PointsTransaction.deleted_at.is_(None),
-        ).all()
-
-        expired_count = 0
-        for tx in expired_transactions:
-            loyalty = self.get_customer_loyalty(str(tx.customer_id), business_id)
-            if loyalty and loyalty.points_balance > 0:
-                points_to_expire = min(tx.points, loyalty.points_balance)
-                if points_to_expire > 0:
-                    loyalty.points_balance -= points_to_expire
-
-                    expire_tx = PointsTransaction(
-                        customer_id=tx.customer_id,
-                        business_id=business_id,
-                        transaction_type=PointsTransactionType.EXPIRE,
-                        points=-points_to_expire,
-                        balance_after=loyalty.points_balance,
-                        description=f"Expired {points_to_expire} points",
-                    )
-                    self.db.add(expire_tx)
-                    expired_count += 1
-
-            # Mark original transaction as processed by soft-deleting
-            tx.soft_delete()
-
-        if expired_count > 0:
-            self.db.commit()
+        """Expire points past expiry date. Returns number of EXPIRE transactions written.
 
-        return expired_count
+        Runs the set-based LoyaltyExpiryService for this business: one
+        EXPIRE row per customer covering all of their expired earns.
+        """
+        return LoyaltyExpiryService(self.db).expire_points(business_id=business_id)["expire_transactions"]
 
     def get_top_members(
         self, business_id: str, limit: int = 10
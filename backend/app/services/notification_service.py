@@ -1,10 +1,15 @@
-"""Notification service for managing in-app notifications."""
+"""Notification service for managing in-app notifications.
+
+New notifications are also pushed to the recipient's open realtime
+connections, so clients don't need to poll the unread count.
+"""
 
 from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from uuid import UUID
 
+from app.core.realtime import RealtimeEventType, emit_event
 from app.models.notification import (
     Notification,
     NotificationPreference,
@@ -47,6 +52,7 @@ class NotificationService:
         self.db.add(notification)
         self.db.commit()
         self.db.refresh(notification)
+        _push(notification)
         return notification
 
     def notify_business_users(
@@ -82,6 +88,7 @@ class NotificationService:
         self.db.commit()
         for n in notifications:
             self.db.refresh(n)
+            _push(n)
         return notifications
 
     # ── listing / counts ───────────────────────────────────────
@@ -211,3 +218,17 @@ class NotificationService:
         self.db.refresh(pref)
         return pref
 
+
+def _push(notification: Notification) -> None:
+    emit_event(
+        notification.business_id,
+        RealtimeEventType.NOTIFICATION_CREATED,
+        {
+            "notification_id": str(notification.id),
+            "title": notification.title,
+            "message": notification.message,
+            "notification_type": notification.notification_type,
+            "action_url": notification.action_url,
+        },
+        user_id=notification.user_id,
+    )
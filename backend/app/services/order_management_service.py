@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from fastapi import HTTPException, status
 
+from app.core.search import contains
 from app.models.order import Order, OrderItem, OrderStatus, OrderType
 from app.models.order_status_history import OrderStatusHistory
 from app.models.restaurant_table import RestaurantTable, TableStatus
@@ -351,9 +352,7 @@ class OrderManagementService:
             Order.deleted_at.is_(None),
         )
         if search:
-            query = query.filter(
-                Order.order_number.ilike(f"%{search}%")
-            )
+            query = query.filter(contains([Order.order_number], search))
         if status_filter:
             query = query.filter(Order.status == status_filter)
         if order_type:
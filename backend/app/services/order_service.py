@@ -1,17 +1,26 @@
 """Order service for business logic."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import func
 
+from app.core.pagination import Page, TotalMode, paginate
+from app.core.search import SearchSpec, apply_search
 from app.models.order import Order, OrderItem, OrderStatus, PaymentStatus, OrderDirection
 from app.models.base import utc_now
 from app.schemas.order import OrderCreate, OrderUpdate, OrderItemCreate
 
 
+ORDER_SEARCH = SearchSpec(
+    columns=[Order.order_number, Order.notes],
+    fulltext=[Order.order_number, Order.notes],
+    exact=[Order.order_number],
+)
+
+
 class OrderService:
     """Service for order operations."""
 
@@ -44,7 +53,9 @@ class OrderService:
         date_to: Optional[datetime] = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
-    ) -> Tuple[List[Order], int]:
+        total_mode: TotalMode = TotalMode.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[Order]:
         """Get orders with filtering and pagination."""
         query = self.db.query(Order).filter(
             Order.business_id == business_id,
@@ -52,14 +63,7 @@ class OrderService:
         )
         
         # Search filter
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Order.order_number.ilike(search_term),
-                    Order.notes.ilike(search_term),
-                )
-            )
+        query, rank = apply_search(query, ORDER_SEARCH, search)
         
         # Customer filter
         if customer_id:
@@ -85,21 +89,17 @@ class OrderService:
         if date_to:
             query = query.filter(Order.order_date <= date_to)
         
-        # Get total count
-        total = query.count()
-        
-        # Sorting
+        # Sorting and pagination
+        if sort_by == "relevance" and rank is not None:
+            return paginate(
+                query.order_by(rank.desc(), Order.created_at.desc()),
+                page, per_page, total_mode, cursor,
+            )
         sort_column = getattr(Order, sort_by, Order.created_at)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        
-        # Pagination
-        offset = (page - 1) * per_page
-        orders = query.offset(offset).limit(per_page).all()
-        
-        return orders, total
+        return paginate(
+            query, page, per_page, total_mode, cursor,
+            keyset=(sort_column, Order.id), descending=sort_order == "desc",
+        )
 
     def get_order(self, order_id: str, business_id: str) -> Optional[Order]:
         """Get an order by ID."""
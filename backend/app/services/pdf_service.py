@@ -10,7 +10,6 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from jinja2 import Environment, FileSystemLoader, select_autoescape, TemplateNotFound
-from weasyprint import HTML
 
 from app.models.invoice import Invoice, InvoiceItem
 from app.models.order import Order, OrderItem
@@ -71,6 +70,9 @@ def render_html_from_template(template_name: str, context: dict) -> str:
 
 def generate_pdf_from_html(html_content: str) -> bytes:
     try:
+        # WeasyPrint loads pango/cairo on import; defer that to the first PDF
+        from weasyprint import HTML
+
         return HTML(string=html_content).write_pdf()
     except Exception as e:
         logger.error(f"WeasyPrint error: {str(e)}")
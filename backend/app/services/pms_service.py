@@ -18,6 +18,7 @@ from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from app.core.search import contains
 from app.models.pms import (
     PMSConnection,
     PMSGuestCache,
@@ -331,9 +332,7 @@ class PMSService:
             PMSGuestCache.deleted_at.is_(None),
         )
         if search:
-            query = query.filter(
-                PMSGuestCache.guest_name.ilike(f"%{search}%")
-            )
+            query = query.filter(contains([PMSGuestCache.guest_name], search))
         if room_number:
             query = query.filter(PMSGuestCache.room_number == room_number)
         items = query.order_by(PMSGuestCache.guest_name).limit(50).all()
@@ -3,17 +3,24 @@
 from io import BytesIO
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 from uuid import UUID
 
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.cell import Cell
-from openpyxl.utils import get_column_letter
 from sqlalchemy.orm import Session
 
 from app.models.product import Product, ProductStatus
 from app.models.inventory import InventoryItem
+from app.services.streaming_export_service import (
+    EXPORT_YIELD_PER,
+    ExportTarget,
+    add_info_sheet,
+    add_table_sheet,
+    new_export_workbook,
+)
+from app.services.streaming_import_service import ImportFileError, open_sheet_rows
+
+if TYPE_CHECKING:
+    from openpyxl.cell import Cell
 
 
 # Column definitions for product import/export
@@ -40,8 +47,10 @@ class ProductExcelService:
     def __init__(self, db: Session):
         self.db = db
 
-    def _apply_header_style(self, cell: Cell) -> None:
+    def _apply_header_style(self, cell: "Cell") -> None:
         """Apply styling to header cells."""
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
         cell.font = Font(bold=True, color="FFFFFF")
         cell.fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
         cell.alignment = Alignment(horizontal="center", vertical="center")
@@ -52,20 +61,13 @@ class ProductExcelService:
             bottom=Side(style="thin"),
         )
 
-    def _apply_data_style(self, cell: Cell, is_alternate: bool = False) -> None:
-        """Apply styling to data cells."""
-        if is_alternate:
-            cell.fill = PatternFill(start_color="F3F4F6", end_color="F3F4F6", fill_type="solid")
-        cell.alignment = Alignment(horizontal="left", vertical="center")
-        cell.border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-
     def generate_template(self) -> BytesIO:
         """Generate an empty Excel template with correct column headers."""
+        # openpyxl is imported on first use to keep it out of application startup
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
         wb = Workbook()
         ws = wb.active
         ws.title = "Products"
@@ -107,64 +109,88 @@ class ProductExcelService:
         output.seek(0)
         return output
 
-    def export_products(self, business_id: str) -> BytesIO:
-        """Export all products to Excel spreadsheet."""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Products"
+    def _export_query(self, business_id: str):
+        return self.db.query(Product).filter(
+            Product.business_id == business_id,
+            Product.deleted_at.is_(None),
+        )
 
-        # Add headers
-        for col_idx, col_def in enumerate(PRODUCT_COLUMNS, 1):
-            cell = ws.cell(row=1, column=col_idx, value=col_def["header"])
-            self._apply_header_style(cell)
-            ws.column_dimensions[get_column_letter(col_idx)].width = col_def["width"]
+    def count_products_export(self, business_id: str) -> int:
+        """Number of rows ``write_products_export`` will produce."""
+        return self._export_query(business_id).count()
+
+    def write_products_export(
+        self,
+        business_id: str,
+        target: ExportTarget,
+        progress: Optional[Callable[[int], bool]] = None,
+    ) -> int:
+        """Stream all products into a write-only workbook at ``target``.
+
+        Rows are read with a server-side cursor and appended as they arrive,
+        so memory use does not grow with the catalog size.  ``progress`` is
+        called every ``EXPORT_YIELD_PER`` rows with the running count and may
+        return False to stop early.  Returns the number of rows written.
+        """
+        wb = new_export_workbook()
+        ws = add_table_sheet(
+            wb,
+            "Products",
+            [c["header"] for c in PRODUCT_COLUMNS],
+            [c["width"] for c in PRODUCT_COLUMNS],
+        )
 
-        # Get products
-        products = (
-            self.db.query(Product)
-            .filter(
-                Product.business_id == business_id,
-                Product.deleted_at.is_(None),
+        rows = (
+            self._export_query(business_id)
+            .with_entities(
+                Product.sku,
+                Product.name,
+                Product.description,
+                Product.barcode,
+                Product.selling_price,
+                Product.cost_price,
+                Product.quantity,
+                Product.low_stock_threshold,
+                Product.is_taxable,
+                Product.status,
             )
             .order_by(Product.name)
-            .all()
+            .yield_per(EXPORT_YIELD_PER)
         )
 
-        # Add data rows
-        for row_idx, product in enumerate(products, 2):
-            is_alternate = row_idx % 2 == 0
-            
-            row_data = [
-                product.sku,
-                product.name,
-                product.description,
-                product.barcode,
-                float(product.selling_price) if product.selling_price else 0,
-                float(product.cost_price) if product.cost_price else None,
-                product.quantity,
-                product.low_stock_threshold,
-                "Y" if product.is_taxable else "N",
-                product.status.value if product.status else "active",
-            ]
-            
-            for col_idx, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                self._apply_data_style(cell, is_alternate)
+        total = 0
+        for row in rows:
+            ws.append([
+                row.sku,
+                row.name,
+                row.description,
+                row.barcode,
+                float(row.selling_price) if row.selling_price else 0,
+                float(row.cost_price) if row.cost_price else None,
+                row.quantity,
+                row.low_stock_threshold,
+                "Y" if row.is_taxable else "N",
+                row.status.value if row.status else "active",
+            ])
+            total += 1
+            if progress and total % EXPORT_YIELD_PER == 0 and progress(total) is False:
+                break
 
-        # Freeze header row
-        ws.freeze_panes = "A2"
+        add_info_sheet(wb, "Export Info", [
+            ("Export Date:", datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")),
+            ("Total Products:", total),
+            ("Business ID:", str(business_id)),
+        ])
+        wb.save(target)
+        return total
 
-        # Add metadata sheet
-        meta = wb.create_sheet("Export Info")
-        meta["A1"] = "Export Date:"
-        meta["B1"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-        meta["A2"] = "Total Products:"
-        meta["B2"] = len(products)
-        meta["A3"] = "Business ID:"
-        meta["B3"] = str(business_id)
+    def export_products(self, business_id: str) -> BytesIO:
+        """Export all products to an in-memory Excel spreadsheet.
 
+        Prefer ``write_products_export`` to a file for large catalogs.
+        """
         output = BytesIO()
-        wb.save(output)
+        self.write_products_export(business_id, output)
         output.seek(0)
         return output
 
@@ -194,34 +220,16 @@ class ProductExcelService:
             "skipped": 0,
         }
 
+        # Read-only mode streams rows instead of materialising the workbook
         try:
-            wb = load_workbook(filename=BytesIO(file_content), data_only=True)
-        except Exception as e:
+            sheet = open_sheet_rows(file_content, ["Products", "Sheet1"])
+        except ImportFileError as e:
             result["success"] = False
-            result["errors"].append(f"Failed to read Excel file: {str(e)}")
+            result["errors"].append(str(e))
             return result
 
-        # Find the products sheet
-        ws = None
-        if not wb.sheetnames:
-            result["success"] = False
-            result["errors"].append("Excel file contains no sheets")
-            return result
-            
-        for sheet_name in ["Products", "Sheet1"]:
-            if sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-                break
-        
-        if ws is None:
-            ws = wb[wb.sheetnames[0]]
-
-        # Get header row and map columns
-        headers: Dict[str, int] = {}
-        for col_idx, cell in enumerate(ws[1], 1):
-            if cell.value:
-                header_lower = str(cell.value).lower().strip().replace(" ", "_")
-                headers[header_lower] = col_idx
+        # Map columns (1-based, as in the spreadsheet)
+        headers: Dict[str, int] = {name: idx + 1 for name, idx in sheet.headers.items()}
 
         # Validate required columns
         required_headers = {"product_name", "selling_price"}
@@ -231,6 +239,7 @@ class ProductExcelService:
         
         missing = required_headers - set(headers.keys())
         if missing:
+            sheet.close()
             result["success"] = False
             result["errors"].append(f"Missing required columns: {', '.join(missing)}")
             return result
@@ -247,13 +256,13 @@ class ProductExcelService:
         products_by_sku: Dict[str, Product] = {p.sku: p for p in existing_products if p.sku}
 
         # Process data rows
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2), 2):
+        for row_idx, row in sheet.rows:
             try:
                 def get_cell_value(header_key: str, default=None):
                     col = headers.get(header_key)
-                    if col is None:
+                    if col is None or col > len(row):
                         return default
-                    val = row[col - 1].value
+                    val = row[col - 1]
                     return val if val is not None else default
 
                 # Get product name (required)
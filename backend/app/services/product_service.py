@@ -1,11 +1,13 @@
 """Product service for product management."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional
 from decimal import Decimal
 import uuid
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 
+from app.core.pagination import Page, TotalMode, paginate
+from app.core.search import SearchSpec, apply_search
 from app.models.product import Product, ProductCategory, ProductStatus
 from app.models.product_ingredient import ProductIngredient
 from app.models.inventory import InventoryItem
@@ -19,6 +21,21 @@ from app.schemas.product import (
 )
 
 
+PRODUCT_SEARCH = SearchSpec(
+    columns=[Product.name, Product.description, Product.sku, Product.barcode],
+    fulltext=[Product.name, Product.description],
+    exact=[Product.sku, Product.barcode],
+)
+
+# Codes a business can give only one live product, each backed by a partial
+# unique index on products.  Field name -> label used in error messages.
+UNIQUE_PRODUCT_CODES = {"sku": "SKU", "barcode": "barcode"}
+
+
+class DuplicateProductCodeError(ValueError):
+    """Raised when a product code is already used by another live product."""
+
+
 class ProductService:
     """Service for product operations."""
 
@@ -47,7 +64,9 @@ class ProductService:
         low_stock_only: bool = False,
         sort_by: str = "created_at",
         sort_order: str = "desc",
-    ) -> Tuple[List[Product], int]:
+        total_mode: TotalMode = TotalMode.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[Product]:
         """Get products with filtering and pagination."""
         query = self.db.query(Product).filter(
             Product.business_id == business_id,
@@ -55,15 +74,6 @@ class ProductService:
         )
         
         # Apply filters
-        if search:
-            search_filter = or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.description.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%"),
-                Product.barcode.ilike(f"%{search}%"),
-            )
-            query = query.filter(search_filter)
-        
         if category_id:
             query = query.filter(Product.category_id == category_id)
         
@@ -84,26 +94,68 @@ class ProductService:
                 )
             )
         
-        # Get total count
-        total = query.count()
+        rank = None
+        if search:
+            # A scanned or typed code is answered by an indexed equality
+            # lookup, without running the text search
+            code = search.strip()
+            if code and not any(ch.isspace() for ch in code):
+                exact = query.filter(or_(Product.sku == code, Product.barcode == code)).all()
+                if exact:
+                    offset = (page - 1) * per_page
+                    return Page(
+                        items=exact[offset:offset + per_page], total=len(exact), page=page,
+                        per_page=per_page, has_more=offset + per_page < len(exact),
+                    )
+            query, rank = apply_search(query, PRODUCT_SEARCH, search)
         
         # Apply sorting
+        if sort_by == "relevance" and rank is not None:
+            return paginate(
+                query.order_by(rank.desc(), Product.created_at.desc()),
+                page, per_page, total_mode, cursor,
+            )
         sort_column = getattr(Product, sort_by, Product.created_at)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        
-        # Apply pagination
-        offset = (page - 1) * per_page
-        products = query.offset(offset).limit(per_page).all()
-        
-        return products, total
+        return paginate(
+            query, page, per_page, total_mode, cursor,
+            keyset=(sort_column, Product.id), descending=sort_order == "desc",
+        )
+
+    def _check_codes_available(
+        self,
+        business_id: str,
+        products: List[dict],
+        exclude_id: Optional[str] = None,
+    ) -> None:
+        """Raise DuplicateProductCodeError if a code in *products* is taken.
+
+        Codes are checked against each other and against the business's live
+        products (other than *exclude_id*), like the partial unique indexes.
+        """
+        for field, label in UNIQUE_PRODUCT_CODES.items():
+            values = [p[field] for p in products if p.get(field) is not None]
+            if len(set(values)) < len(values):
+                repeated = next(v for v in values if values.count(v) > 1)
+                raise DuplicateProductCodeError(f"{label} '{repeated}' is used more than once")
+            if not values:
+                continue
+            column = getattr(Product, field)
+            query = self.db.query(column).filter(
+                Product.business_id == business_id,
+                Product.deleted_at.is_(None),
+                column.in_(values),
+            )
+            if exclude_id is not None:
+                query = query.filter(Product.id != exclude_id)
+            taken = query.first()
+            if taken:
+                raise DuplicateProductCodeError(f"A product with {label} '{taken[0]}' already exists")
 
     def create_product(self, business_id: str, data: ProductCreate) -> Product:
         """Create a new product and automatically create an inventory item."""
         ingredient_payloads = data.ingredients
         data_dict = data.model_dump(exclude={"ingredients"})
+        self._check_codes_available(business_id, [data_dict])
         product = Product(
             business_id=business_id,
             **data_dict,
@@ -139,6 +191,7 @@ class ProductService:
         """Update a product."""
         update_data = data.model_dump(exclude_unset=True)
         ingredient_payloads = update_data.pop("ingredients", None)
+        self._check_codes_available(product.business_id, [update_data], exclude_id=product.id)
         for field, value in update_data.items():
             setattr(product, field, value)
 
@@ -232,6 +285,10 @@ class ProductService:
 
     def bulk_create_products(self, business_id: str, products_data: List[ProductCreate]) -> List[Product]:
         """Create multiple products at once."""
+        self._check_codes_available(
+            business_id,
+            [data.model_dump(include=set(UNIQUE_PRODUCT_CODES)) for data in products_data],
+        )
         products = []
         for data in products_data:
             ingredient_payloads = data.ingredients
@@ -4,8 +4,8 @@ from typing import List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
+from app.core.search import contains
 from app.models.production import ProductionOrder, ProductionOrderItem, ProductionStatus
 from app.models.product import Product
 from app.models.inventory import InventoryItem, InventoryTransaction, TransactionType
@@ -61,10 +61,7 @@ class ProductionService:
 
         if search:
             query = query.filter(
-                or_(
-                    ProductionOrder.order_number.ilike(f"%{search}%"),
-                    ProductionOrder.notes.ilike(f"%{search}%"),
-                )
+                contains([ProductionOrder.order_number, ProductionOrder.notes], search)
             )
 
         total = query.count()
@@ -350,11 +347,7 @@ class ProductionService:
 
         if query:
             products_query = products_query.filter(
-                or_(
-                    Product.name.ilike(f"%{query}%"),
-                    Product.sku.ilike(f"%{query}%"),
-                    Product.description.ilike(f"%{query}%"),
-                )
+                contains([Product.name, Product.sku, Product.description], query)
             )
 
         products = products_query.limit(limit * 2).all()
@@ -8,9 +8,10 @@ from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from typing import List, Optional, Tuple
 
-from sqlalchemy import String, func, or_
+from sqlalchemy import String, func
 from sqlalchemy.orm import Session
 
+from app.core.search import contains
 from app.models.proforma import (
     ProformaApproval,
     ProformaAudit,
@@ -208,10 +209,7 @@ class ProformaService:
             query = query.filter(ProformaInvoice.customer_id == customer_id)
         if search:
             query = query.filter(
-                or_(
-                    ProformaInvoice.quote_number.ilike(f"%{search}%"),
-                    ProformaInvoice.notes.ilike(f"%{search}%"),
-                )
+                contains([ProformaInvoice.quote_number, ProformaInvoice.notes], search)
             )
 
         total = query.count()
@@ -2,7 +2,6 @@
 
 import logging
 import io
-import pandas as pd
 
 from app.services.email_service import EmailService, EmailAttachment
 from app.services.report_generator_service import ReportData
@@ -81,6 +80,8 @@ class ReportEmailService:
 
     def generate_excel_attachment(self, report_data: ReportData) -> EmailAttachment:
         """Generate Excel attachment for the report."""
+        import pandas as pd
+
         output = io.BytesIO()
         
         # Flatten metrics for Excel
@@ -10,10 +10,11 @@ floor plan logic.
 
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple, List
+from typing import Optional, List
 
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, TotalMode, paginate
 from app.models.restaurant_table import (
     Reservation,
     ReservationStatus,
@@ -105,8 +106,10 @@ class ReservationService:
         table_id: Optional[str] = None,
         page: int = 1,
         per_page: int = 20,
-    ) -> Tuple[List[Reservation], int]:
-        """List reservations with filters and pagination."""
+        total_mode: TotalMode = TotalMode.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[Reservation]:
+        """List reservations with filters and pagination, soonest first."""
         query = self.db.query(Reservation).filter(
             Reservation.business_id == business_id,
             Reservation.deleted_at.is_(None),
@@ -121,14 +124,10 @@ class ReservationService:
         if table_id:
             query = query.filter(Reservation.table_id == table_id)
 
-        total = query.count()
-        items = (
-            query.order_by(Reservation.date_time.asc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
+        return paginate(
+            query, page, per_page, total_mode, cursor,
+            keyset=(Reservation.date_time, Reservation.id),
         )
-        return items, total
 
     def update_reservation(
         self,
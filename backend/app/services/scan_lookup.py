@@ -0,0 +1,341 @@
+"""Barcode/SKU scan lookups from a per-business in-memory map.
+
+Every scan at the till resolves one code to a product, its price and its
+tax flags.  Those come from a dict per business (code -> compact record)
+held in this worker, so a scan is a dict lookup.  Building the dict is one
+column-only query over the business's live products.
+
+Codes match exactly.  Live products are unique per business by barcode and
+by SKU (migrations 107 and 115); when one product's barcode equals another
+product's SKU, the barcode wins.
+
+Freshness:
+
+- Write events: while invalidation runs (started with the app), it
+  subscribes to ``app.core.commit_tracker`` for businesses whose products
+  were added, deleted or had a scanned field (code, name, price, tax,
+  status) changed.  Stock movements do not count.  After the commit this
+  worker's map is dropped and the business's generation in Redis is bumped.  Bulk UPDATE/DELETE/INSERT
+  statements on products drop every map and bump the global generation.
+- Other workers compare their map's generation with Redis at most every
+  ``SCAN_INDEX_CHECK_SECONDS`` and rebuild on a mismatch.
+- Staleness bound: maps are rebuilt after ``SCAN_INDEX_TTL_SECONDS``, which
+  covers writes made where no hooks run and deployments without Redis.
+
+At most ``SCAN_INDEX_MAX_BUSINESSES`` maps are kept, least recently used
+first out.  Startup warms the maps of businesses that sold in the last day.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core import commit_tracker
+from app.core.config import settings
+from app.core.redis import redis_manager
+from app.models.base import utc_now
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+SCAN_GENERATION_PREFIX = "bizpilot:scan_gen"
+
+# Generation key bumped by bulk statements, which can touch any business
+_ALL = "all"
+
+_SUBSCRIBER_NAME = "scan_lookup"
+
+_RECORD_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.sku,
+    Product.barcode,
+    Product.category_id,
+    Product.selling_price,
+    Product.compare_at_price,
+    Product.is_taxable,
+    Product.tax_rate,
+    Product.track_inventory,
+    Product.status,
+)
+
+# Product attributes whose change makes a cached record stale
+_WATCHED = frozenset(column.key for column in _RECORD_COLUMNS) | {"business_id", "deleted_at"}
+
+Codes = Dict[str, Dict[str, Any]]
+
+
+class ScanIndex:
+    """One business's code -> record map and the generation it was built at."""
+
+    __slots__ = ("codes", "generation", "built_at", "checked_at")
+
+    def __init__(self, codes: Codes, generation: str, now: float) -> None:
+        self.codes = codes
+        self.generation = generation
+        self.built_at = now
+        self.checked_at = now
+
+
+_lock = threading.Lock()
+_indexes: "OrderedDict[str, ScanIndex]" = OrderedDict()
+# Local invalidations per business (and _ALL); a build that raced one is not kept
+_invalidated: Dict[str, int] = defaultdict(int)
+
+_stats = {"hits": 0, "misses": 0, "builds": 0, "invalidations": 0}
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_warm_task: Optional[asyncio.Task] = None
+
+
+def _generation_key(business_id: Any) -> str:
+    return f"{SCAN_GENERATION_PREFIX}:{business_id}"
+
+
+def _record(row: Any) -> Dict[str, Any]:
+    (id_, name, sku, barcode, category_id, selling_price, compare_at_price,
+     is_taxable, tax_rate, track_inventory, status) = row
+    return {
+        "id": str(id_),
+        "name": name,
+        "sku": sku,
+        "barcode": barcode,
+        "category_id": str(category_id) if category_id else None,
+        "selling_price": selling_price,
+        "compare_at_price": compare_at_price,
+        "is_taxable": is_taxable,
+        "tax_rate": tax_rate,
+        "track_inventory": track_inventory,
+        "status": status.value if status is not None else None,
+    }
+
+
+def build_codes(db: Session, business_id: Any) -> Codes:
+    """Map every SKU and barcode of the business's live products to its record."""
+    # Core select: plain rows, without ORM entity loading
+    rows = db.execute(
+        select(*_RECORD_COLUMNS).where(
+            Product.business_id == business_id,
+            Product.deleted_at.is_(None),
+        )
+    ).all()
+    codes: Codes = {}
+    barcodes = []
+    for row in rows:
+        record = _record(row)
+        if row.sku:
+            codes[row.sku] = record
+        if row.barcode:
+            barcodes.append((row.barcode, record))
+    # A barcode wins over another product's identical SKU
+    codes.update(barcodes)
+    return codes
+
+
+async def _current_generation(business_id: str) -> str:
+    own = await redis_manager.get(_generation_key(business_id))
+    everyone = await redis_manager.get(_generation_key(_ALL))
+    return f"{own or 0}:{everyone or 0}"
+
+
+def _local_stamp(key: str) -> Tuple[int, int]:
+    with _lock:
+        return _invalidated[key], _invalidated[_ALL]
+
+
+def _store(key: str, index: ScanIndex) -> None:
+    with _lock:
+        _indexes[key] = index
+        _indexes.move_to_end(key)
+        while len(_indexes) > settings.SCAN_INDEX_MAX_BUSINESSES:
+            _indexes.popitem(last=False)
+
+
+async def get_scan_index(business_id: Any, build: Callable[[], Codes]) -> ScanIndex:
+    """
+    Return the business's scan map, building it when missing or stale.
+
+    *build* is a blocking callable (it queries the database) and runs in a
+    worker thread.
+    """
+    key = str(business_id)
+    now = time.monotonic()
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+
+    if index is not None and now - index.built_at < settings.SCAN_INDEX_TTL_SECONDS:
+        if now - index.checked_at < settings.SCAN_INDEX_CHECK_SECONDS:
+            return index
+        generation = await _current_generation(key)
+        if generation == index.generation:
+            index.checked_at = now
+            return index
+    else:
+        generation = await _current_generation(key)
+
+    stamp = _local_stamp(key)
+    codes = await asyncio.to_thread(build)
+    _stats["builds"] += 1
+    index = ScanIndex(codes, generation, time.monotonic())
+    if _local_stamp(key) == stamp:
+        _store(key, index)
+    return index
+
+
+async def lookup_codes(
+    business_id: Any, codes: Iterable[str], build: Callable[[], Codes]
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Resolve scanned *codes*; unknown codes map to None."""
+    index = await get_scan_index(business_id, build)
+    found = {}
+    for code in codes:
+        record = index.codes.get(code.strip())
+        _stats["hits" if record is not None else "misses"] += 1
+        found[code] = record
+    return found
+
+
+def invalidate_scan_index(business_id: Any = None) -> None:
+    """Drop this worker's map for *business_id*, or every map when None."""
+    key = _ALL if business_id is None else str(business_id)
+    with _lock:
+        if business_id is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(key, None)
+        _invalidated[key] += 1
+    _stats["invalidations"] += 1
+
+
+async def _publish_invalidation(keys: Iterable[str]) -> None:
+    for key in keys:
+        await redis_manager.incr(_generation_key(key))
+
+
+def _touched_scan(obj: Any, new_or_deleted: bool) -> Optional[str]:
+    if obj.business_id is None:
+        return None
+    if not new_or_deleted:
+        attrs = inspect(obj).attrs
+        if not any(attrs[name].history.has_changes() for name in _WATCHED):
+            return None
+    return str(obj.business_id)
+
+
+def _collect_bulk(state: ORMExecuteState) -> None:
+    """do_orm_execute: bulk statements on products may touch any business."""
+    if not (state.is_update or state.is_delete or state.is_insert):
+        return
+    if any(mapper.class_ is Product for mapper in state.all_mappers):
+        commit_tracker.mark_touched(state.session, _SUBSCRIBER_NAME, [_ALL])
+
+
+def _invalidate_committed(touched: Set[str]) -> None:
+    if _ALL in touched:
+        invalidate_scan_index(None)
+        touched = {_ALL}
+    else:
+        for business_id in touched:
+            invalidate_scan_index(business_id)
+    if _loop is not None:
+        _loop.call_soon_threadsafe(asyncio.ensure_future, _publish_invalidation(touched))
+
+
+_SUBSCRIBER = commit_tracker.CommitSubscriber(
+    name=_SUBSCRIBER_NAME,
+    models=(Product,),
+    touched=_touched_scan,
+    on_commit=_invalidate_committed,
+)
+
+
+def _recent_business_codes(session_factory: Callable[[], Session], limit: int) -> List[Tuple[str, Codes]]:
+    from app.models.order import Order
+
+    db = session_factory()
+    try:
+        since = utc_now() - timedelta(days=1)
+        business_ids = [
+            row[0]
+            for row in db.query(Order.business_id)
+            .filter(Order.created_at >= since)
+            .distinct()
+            .limit(limit)
+            .all()
+        ]
+        return [(str(business_id), build_codes(db, business_id)) for business_id in business_ids]
+    finally:
+        db.close()
+
+
+async def warm_scan_indexes(
+    session_factory: Optional[Callable[[], Session]] = None,
+    limit: Optional[int] = None,
+) -> int:
+    """Build the maps of businesses that sold in the last day; returns how many."""
+    limit = settings.SCAN_INDEX_WARM_BUSINESSES if limit is None else limit
+    if limit <= 0:
+        return 0
+    if session_factory is None:
+        from app.core.database import SessionLocal
+        session_factory = SessionLocal
+    built = await asyncio.to_thread(_recent_business_codes, session_factory, limit)
+    for key, codes in built:
+        _store(key, ScanIndex(codes, await _current_generation(key), time.monotonic()))
+    _stats["builds"] += len(built)
+    return len(built)
+
+
+async def _warm() -> None:
+    try:
+        warmed = await warm_scan_indexes()
+        logger.info("Warmed scan lookup maps for %d businesses", warmed)
+    except Exception as exc:
+        logger.warning("Warming scan lookup maps failed: %s", exc)
+
+
+async def start_scan_index() -> None:
+    """Invalidate scan maps on product commits and warm them (application startup)."""
+    global _loop, _warm_task
+    _loop = asyncio.get_running_loop()
+    commit_tracker.subscribe(_SUBSCRIBER)
+    if not event.contains(Session, "do_orm_execute", _collect_bulk):
+        event.listen(Session, "do_orm_execute", _collect_bulk)
+    if _warm_task is None or _warm_task.done():
+        _warm_task = asyncio.create_task(_warm())
+
+
+async def stop_scan_index() -> None:
+    """Stop invalidating and drop the maps (shutdown)."""
+    global _loop, _warm_task
+    commit_tracker.unsubscribe(_SUBSCRIBER_NAME)
+    if event.contains(Session, "do_orm_execute", _collect_bulk):
+        event.remove(Session, "do_orm_execute", _collect_bulk)
+    if _warm_task is not None:
+        _warm_task.cancel()
+        try:
+            await _warm_task
+        except asyncio.CancelledError:
+            pass
+        _warm_task = None
+    with _lock:
+        _indexes.clear()
+    _loop = None
+
+
+def scan_index_stats() -> Dict[str, Any]:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "businesses": len(_indexes),
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
@@ -0,0 +1,320 @@
+"""Streaming spreadsheet and CSV export helpers.
+
+Exports used to build a fully styled ``Workbook`` in memory from an
+``.all()`` result before sending a single byte.  The helpers here keep peak
+memory bounded instead:
+
+- XLSX files are written with openpyxl ``write_only`` workbooks, which flush
+  rows to disk as they are appended.  Only header cells are styled; per-cell
+  styles on data rows are what made the old exports slow and large.
+- CSV is produced incrementally from an iterator of rows and sent with
+  ``StreamingResponse`` so the first bytes go out while the query is still
+  being read.
+- Database rows are read through server-side cursors (``yield_per``).
+- Very large exports run as tracked bulk operations that write the file to
+  ``EXPORT_DIR``; the client polls the operation and then downloads it.
+"""
+
+import csv
+import io
+import logging
+import os
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, StreamingResponse
+
+from app.core.config import settings
+from app.models.base import utc_now
+from app.models.bulk_operation import BulkOperation, BulkOperationType, OperationStatus
+
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+
+logger = logging.getLogger(__name__)
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MEDIA_TYPE = "text/csv"
+
+# Rows fetched per server-side cursor round trip
+EXPORT_YIELD_PER = 1000
+# CSV rows buffered before a chunk is handed to the response
+CSV_FLUSH_ROWS = 500
+
+DEFAULT_HEADER_COLOR = "4F46E5"
+
+ExportTarget = Union[str, os.PathLike, io.IOBase]
+
+
+def get_export_dir() -> str:
+    """Directory for export job output (created on first use)."""
+    path = settings.EXPORT_DIR or os.path.join(tempfile.gettempdir(), "bizpilot-exports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# ── XLSX ─────────────────────────────────────────────────────────────────────
+# openpyxl (and the numpy it pulls in) is imported on first export, not at startup
+
+def new_export_workbook() -> "Workbook":
+    """Create an empty write-only workbook."""
+    from openpyxl import Workbook
+
+    return Workbook(write_only=True)
+
+
+def _header_cells(ws, headers: Sequence[str], color: str) -> list:
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+    thin = Side(style="thin")
+    font = Font(bold=True, color="FFFFFF")
+    fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    alignment = Alignment(horizontal="center", vertical="center")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = font
+        cell.fill = fill
+        cell.alignment = alignment
+        cell.border = border
+        cells.append(cell)
+    return cells
+
+
+def add_table_sheet(
+    wb: "Workbook",
+    title: str,
+    headers: Sequence[str],
+    widths: Optional[Sequence[Optional[float]]] = None,
+    header_color: str = DEFAULT_HEADER_COLOR,
+):
+    """Add a sheet with a styled, frozen header row and return it.
+
+    Column widths and freeze panes must be set before the first row is
+    appended in write-only mode, so callers pass widths up front.  Data rows
+    are then added with ``ws.append(values)``.
+    """
+    from openpyxl.utils import get_column_letter
+
+    ws = wb.create_sheet(title)
+    for idx, width in enumerate(widths or [], 1):
+        if width:
+            ws.column_dimensions[get_column_letter(idx)].width = width
+    ws.freeze_panes = "A2"
+    ws.append(_header_cells(ws, headers, header_color))
+    return ws
+
+
+def add_info_sheet(wb: "Workbook", title: str, pairs: Iterable[Sequence[Any]]) -> None:
+    """Add a two-column key/value sheet (e.g. "Export Info")."""
+    ws = wb.create_sheet(title)
+    for pair in pairs:
+        ws.append(list(pair))
+
+
+def column_widths(
+    headers: Sequence[str], rows: Sequence[Sequence[Any]], padding: int = 4, maximum: int = 40
+) -> list:
+    """Fit column widths to already-materialised (small) report rows."""
+    widths = []
+    for idx, header in enumerate(headers):
+        longest = max((len(str(row[idx] if row[idx] is not None else "")) for row in rows), default=0)
+        widths.append(min(max(longest, len(str(header))) + padding, maximum))
+    return widths
+
+
+def workbook_to_bytes(wb: "Workbook") -> bytes:
+    """Serialise a small workbook (aggregated reports) to bytes."""
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def save_to_tempfile(write: Callable[[str], Any], suffix: str = ".xlsx") -> str:
+    """Run ``write(path)`` against a fresh temp file and return the path.
+
+    The file is removed again if ``write`` raises.
+    """
+    fd, path = tempfile.mkstemp(prefix="bizpilot-export-", suffix=suffix)
+    os.close(fd)
+    try:
+        write(path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def file_download_response(
+    path: str, filename: str, media_type: str = XLSX_MEDIA_TYPE, delete_after: bool = True
+) -> FileResponse:
+    """Stream a file from disk in chunks, deleting it once sent."""
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        headers={"Access-Control-Expose-Headers": "Content-Disposition"},
+        background=BackgroundTask(_remove_quietly, path) if delete_after else None,
+    )
+
+
+# ── CSV ──────────────────────────────────────────────────────────────────────
+
+def iter_csv(
+    headers: Sequence[str], rows: Iterable[Sequence[Any]], flush_rows: int = CSV_FLUSH_ROWS
+) -> Iterator[str]:
+    """Yield CSV text in chunks of ``flush_rows`` rows, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= flush_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    tail = buffer.getvalue()
+    if tail:
+        yield tail
+
+
+def csv_streaming_response(chunks: Iterable[str], filename: str) -> StreamingResponse:
+    """Wrap a CSV chunk iterator in an attachment ``StreamingResponse``."""
+    return StreamingResponse(
+        chunks,
+        media_type=CSV_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Access-Control-Expose-Headers": "Content-Disposition",
+        },
+    )
+
+
+# ── Background jobs ──────────────────────────────────────────────────────────
+
+EXPORT_ENTITIES = ("products", "inventory")
+
+
+def purge_expired_exports(max_age_hours: Optional[int] = None) -> int:
+    """Delete finished export files older than ``max_age_hours``."""
+    max_age = (max_age_hours or settings.EXPORT_FILE_TTL_HOURS) * 3600
+    cutoff = time.time() - max_age
+    directory = get_export_dir()
+    removed = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def run_export_job(operation_id: str, entity: str, business_id: str) -> None:
+    """Write a products/inventory export as a tracked bulk operation.
+
+    Intended to run from a FastAPI background task.  Uses its own session,
+    updates ``processed_records`` every ``EXPORT_YIELD_PER`` rows, honours
+    cancellation, and records the output path on the operation's parameters
+    for ``GET /bulk/operations/{id}/download``.
+    """
+    from app.core.database import SessionLocal
+    from app.services.inventory_excel_service import InventoryExcelService
+    from app.services.product_excel_service import ProductExcelService
+
+    db = SessionLocal()
+    path = None
+    try:
+        operation = db.query(BulkOperation).filter(BulkOperation.id == operation_id).first()
+        if operation is None or operation.is_terminal:
+            return
+
+        purge_expired_exports()
+        operation.status = OperationStatus.PROCESSING.value
+        operation.started_at = utc_now()
+        db.commit()
+
+        if entity == "inventory":
+            service = InventoryExcelService(db)
+            write, count = service.write_inventory_export, service.count_inventory_export
+        else:
+            service = ProductExcelService(db)
+            write, count = service.write_products_export, service.count_products_export
+        operation.total_records = count(business_id)
+        db.commit()
+
+        def on_progress(rows_written: int) -> bool:
+            db.refresh(operation)
+            if operation.status == OperationStatus.CANCELLED.value:
+                return False
+            operation.processed_records = rows_written
+            operation.successful_records = rows_written
+            db.commit()
+            return True
+
+        filename = f"{entity}_export_{utc_now():%Y%m%d_%H%M%S}.xlsx"
+        path = os.path.join(get_export_dir(), f"{operation_id}.xlsx")
+        rows = write(business_id, path, progress=on_progress)
+
+        db.refresh(operation)
+        if operation.status == OperationStatus.CANCELLED.value:
+            _remove_quietly(path)
+        else:
+            operation.status = OperationStatus.COMPLETED.value
+            operation.parameters = {
+                **(operation.parameters or {}),
+                "file_path": path,
+                "filename": filename,
+                "media_type": XLSX_MEDIA_TYPE,
+            }
+        operation.processed_records = rows
+        operation.successful_records = rows
+        operation.completed_at = utc_now()
+        db.commit()
+    except Exception as e:
+        logger.error("Export job %s failed: %s", operation_id, e, exc_info=True)
+        db.rollback()
+        if path:
+            _remove_quietly(path)
+        operation = db.query(BulkOperation).filter(BulkOperation.id == operation_id).first()
+        if operation is not None:
+            operation.status = OperationStatus.FAILED.value
+            operation.error_summary = str(e)[:1000]
+            operation.completed_at = utc_now()
+            db.commit()
+    finally:
+        db.close()
+
+
+def export_job_file(operation: BulkOperation) -> Optional[Dict[str, str]]:
+    """Return ``{path, filename, media_type}`` for a finished export job, if still on disk."""
+    params = operation.parameters or {}
+    path = params.get("file_path")
+    if (
+        operation.operation_type != BulkOperationType.EXPORT.value
+        or operation.status != OperationStatus.COMPLETED.value
+        or not path
+        or not os.path.isfile(path)
+    ):
+        return None
+    return {
+        "path": path,
+        "filename": params.get("filename") or os.path.basename(path),
+        "media_type": params.get("media_type") or XLSX_MEDIA_TYPE,
+    }
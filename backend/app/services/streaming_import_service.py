@@ -0,0 +1,811 @@
+"""Streaming bulk import pipeline for products and inventory.
+
+The interactive Excel importers in ``product_excel_service`` and
+``inventory_excel_service`` build one ORM object per row, which is fine for
+a few hundred rows but not for supplier catalogs with tens of thousands of
+lines.  This module:
+
+- reads spreadsheets in openpyxl read-only mode (or CSV) so the workbook is
+  never fully materialised,
+- validates rows in fixed-size chunks,
+- writes each chunk with set-based statements (``INSERT ... ON CONFLICT
+  (business_id, sku)`` for products, bulk UPDATE/INSERT for inventory),
+- and runs large files as tracked bulk operations that clients can poll.
+"""
+
+import csv
+import io
+import logging
+import os
+import tempfile
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import and_, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.base import utc_now
+from app.models.bulk_operation import BulkOperation, OperationStatus
+from app.models.inventory import InventoryItem
+from app.models.product import Product, ProductStatus
+
+logger = logging.getLogger(__name__)
+
+# Rows validated and written per database round trip.
+IMPORT_CHUNK_SIZE = 1000
+
+# Upload ceiling for background import jobs (the synchronous endpoints keep
+# their 10MB limit).
+MAX_IMPORT_JOB_SIZE_MB = 100
+
+# Errors stored on the operation record; the rest are only counted.
+MAX_STORED_ERRORS = 100
+
+IMPORT_FILE_EXTENSIONS = (".xlsx", ".csv")
+
+# Predicate of the partial unique index ``uq_products_business_sku``.  The
+# ON CONFLICT target must repeat it for PostgreSQL/SQLite to infer the index.
+PRODUCT_SKU_CONFLICT_WHERE = and_(Product.sku.isnot(None), Product.deleted_at.is_(None))
+
+ProgressCallback = Callable[[Dict[str, Any]], bool]
+
+
+class ImportFileError(ValueError):
+    """Raised when an uploaded file cannot be read as an import spreadsheet."""
+
+
+class ImportFileTooLargeError(ImportFileError):
+    """Raised when an uploaded file exceeds the import size limit."""
+
+
+def normalize_header(value: Any) -> str:
+    """Normalise a spreadsheet header cell to a lookup key."""
+    return str(value).lower().strip().replace(" ", "_")
+
+
+@dataclass
+class SheetRows:
+    """Header map and lazy row iterator for an import file.
+
+    ``headers`` maps normalised header names to 0-based column indexes.
+    ``rows`` yields ``(row_number, values)`` tuples, where ``row_number`` is
+    the 1-based spreadsheet row so error messages match what the user sees.
+    """
+
+    headers: Dict[str, int]
+    rows: Iterator[Tuple[int, Sequence[Any]]]
+    estimated_total: Optional[int] = None
+    _closers: List[Callable[[], None]] = field(default_factory=list)
+
+    def close(self) -> None:
+        """Release the underlying workbook or file handle."""
+        for closer in self._closers:
+            try:
+                closer()
+            except Exception:  # pragma: no cover - best effort cleanup
+                pass
+        self._closers.clear()
+
+
+def is_csv_filename(filename: Optional[str]) -> bool:
+    """Return True if the filename points at a CSV file."""
+    return bool(filename) and filename.lower().endswith(".csv")
+
+
+def _count_newlines(source: Union[bytes, str]) -> int:
+    """Count line breaks without decoding the file (used for progress totals)."""
+    if isinstance(source, bytes):
+        return source.count(b"\n")
+    count = 0
+    with open(source, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            count += block.count(b"\n")
+    return count
+
+
+def _header_map(header_row: Optional[Sequence[Any]]) -> Dict[str, int]:
+    headers: Dict[str, int] = {}
+    for idx, value in enumerate(header_row or ()):
+        if value not in (None, ""):
+            headers[normalize_header(value)] = idx
+    return headers
+
+
+def open_sheet_rows(
+    source: Union[bytes, str],
+    preferred_sheets: Sequence[str],
+    filename: Optional[str] = None,
+) -> SheetRows:
+    """Open an import file for streaming.
+
+    Args:
+        source: File content as bytes, or a path to the file on disk.
+        preferred_sheets: Worksheet names to look for, in order.  Falls back
+            to the first sheet.  Ignored for CSV files.
+        filename: Original upload name; a ``.csv`` suffix selects the CSV reader.
+
+    Raises:
+        ImportFileError: If the file cannot be opened or has no sheets.
+    """
+    if is_csv_filename(filename):
+        return _open_csv_rows(source)
+    return _open_xlsx_rows(source, preferred_sheets)
+
+
+def _open_csv_rows(source: Union[bytes, str]) -> SheetRows:
+    try:
+        if isinstance(source, bytes):
+            handle = io.TextIOWrapper(io.BytesIO(source), encoding="utf-8-sig", newline="")
+        else:
+            handle = open(source, encoding="utf-8-sig", newline="")
+    except Exception as e:
+        raise ImportFileError(f"Failed to read CSV file: {str(e)}") from e
+
+    reader = csv.reader(handle)
+    try:
+        header_row = next(reader, None)
+    except (csv.Error, UnicodeDecodeError) as e:
+        handle.close()
+        raise ImportFileError(f"Failed to read CSV file: {str(e)}") from e
+
+    def _rows() -> Iterator[Tuple[int, Sequence[Any]]]:
+        try:
+            for row_idx, values in enumerate(reader, 2):
+                # csv yields "" for blank cells; treat them like empty Excel cells
+                yield row_idx, [v if v != "" else None for v in values]
+        finally:
+            handle.close()
+
+    return SheetRows(
+        headers=_header_map(header_row),
+        rows=_rows(),
+        estimated_total=max(_count_newlines(source) - 1, 0),
+        _closers=[handle.close],
+    )
+
+
+def _open_xlsx_rows(source: Union[bytes, str], preferred_sheets: Sequence[str]) -> SheetRows:
+    from openpyxl import load_workbook
+
+    try:
+        wb = load_workbook(
+            filename=io.BytesIO(source) if isinstance(source, bytes) else source,
+            read_only=True,
+            data_only=True,
+        )
+    except Exception as e:
+        raise ImportFileError(f"Failed to read Excel file: {str(e)}") from e
+
+    if not wb.sheetnames:
+        wb.close()
+        raise ImportFileError("Excel file contains no sheets")
+
+    ws = None
+    for sheet_name in preferred_sheets:
+        if sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+            break
+    if ws is None:
+        ws = wb[wb.sheetnames[0]]
+
+    row_iter = ws.iter_rows(values_only=True)
+    header_row = next(row_iter, None)
+    max_row = ws.max_row
+
+    def _rows() -> Iterator[Tuple[int, Sequence[Any]]]:
+        try:
+            for row_idx, values in enumerate(row_iter, 2):
+                yield row_idx, values
+        finally:
+            wb.close()
+
+    return SheetRows(
+        headers=_header_map(header_row),
+        rows=_rows(),
+        estimated_total=max(max_row - 1, 0) if max_row else None,
+        _closers=[wb.close],
+    )
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _cell_getter(headers: Dict[str, int], values: Sequence[Any]) -> Callable[..., Any]:
+    def get(*header_keys: str) -> Any:
+        for key in header_keys:
+            col = headers.get(key)
+            if col is not None and col < len(values) and values[col] is not None:
+                return values[col]
+        return None
+
+    return get
+
+
+def _new_result() -> Dict[str, Any]:
+    return {
+        "success": True,
+        "updated": 0,
+        "created": 0,
+        "errors": [],
+        "skipped": 0,
+        "processed": 0,
+        "total": None,
+    }
+
+
+# ── Row validation ───────────────────────────────────────────────────────────
+
+_PRODUCT_STATUSES = {
+    "active": ProductStatus.ACTIVE,
+    "draft": ProductStatus.DRAFT,
+    "archived": ProductStatus.ARCHIVED,
+}
+
+
+def parse_product_row(get: Callable[..., Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate one product row.
+
+    Returns ``(values, None)`` for a valid row, ``(None, error)`` for an
+    invalid one and ``(None, None)`` for a blank row that should be skipped.
+    Only columns present in the row appear in ``values`` so updates never
+    blank out existing data.
+    """
+    name = get("product_name", "name")
+    if not name or not str(name).strip():
+        return None, None
+
+    selling_price = get("selling_price")
+    if selling_price is None:
+        return None, "Missing selling price"
+    try:
+        selling_price = Decimal(str(selling_price))
+    except Exception:
+        return None, "Invalid selling price value"
+
+    values: Dict[str, Any] = {"name": str(name).strip(), "selling_price": selling_price}
+
+    sku = get("sku")
+    if sku is not None and str(sku).strip():
+        values["sku"] = str(sku).strip()
+
+    description = get("description")
+    if description is not None:
+        values["description"] = str(description).strip() or None
+
+    barcode = get("barcode")
+    if barcode is not None:
+        values["barcode"] = str(barcode).strip() or None
+
+    cost_price = get("cost_price")
+    if cost_price is not None:
+        try:
+            values["cost_price"] = Decimal(str(cost_price))
+        except Exception:
+            pass  # Keep existing or default
+
+    quantity = get("initial_quantity", "quantity")
+    if quantity is not None:
+        try:
+            values["quantity"] = int(quantity)
+        except (TypeError, ValueError):
+            pass
+
+    low_stock_threshold = get("low_stock_threshold")
+    if low_stock_threshold is not None:
+        try:
+            values["low_stock_threshold"] = int(low_stock_threshold)
+        except (TypeError, ValueError):
+            pass
+
+    is_taxable = get("is_taxable_(y/n)", "is_taxable")
+    if is_taxable is not None:
+        values["is_taxable"] = str(is_taxable).upper().strip() in ["Y", "YES", "TRUE", "1"]
+
+    status = get("status")
+    if status is None:
+        values["status"] = ProductStatus.ACTIVE
+    elif str(status).lower().strip() in _PRODUCT_STATUSES:
+        values["status"] = _PRODUCT_STATUSES[str(status).lower().strip()]
+
+    return values, None
+
+
+def parse_inventory_row(get: Callable[..., Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate one inventory row (same contract as :func:`parse_product_row`)."""
+    sku = get("sku")
+    if sku is None or not str(sku).strip():
+        return None, None
+
+    qty_on_hand = get("quantity_on_hand")
+    if qty_on_hand is None:
+        return None, "Missing quantity_on_hand"
+
+    values: Dict[str, Any] = {"sku": str(sku).strip()}
+    try:
+        values["quantity_on_hand"] = int(qty_on_hand)
+        for key in ("quantity_reserved", "quantity_incoming", "reorder_point", "reorder_quantity"):
+            raw = get(key)
+            if raw is not None:
+                values[key] = int(raw)
+        for key in ("average_cost", "last_cost"):
+            raw = get(key)
+            if raw is not None:
+                values[key] = Decimal(str(float(raw)))
+    except (TypeError, ValueError) as e:
+        return None, f"Invalid value - {str(e)}"
+
+    for key in ("location", "bin_location"):
+        raw = get(key)
+        if raw is not None:
+            # Convert empty strings to None
+            values[key] = str(raw).strip() or None
+
+    return values, None
+
+
+# ── Service ──────────────────────────────────────────────────────────────────
+
+class StreamingImportService:
+    """Chunked, set-based product and inventory importer."""
+
+    def __init__(self, db: Session, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def _insert(self, model):
+        """Return a dialect-specific INSERT that supports ON CONFLICT."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            return sqlite_insert(model)
+        return pg_insert(model)
+
+    # ── Products ─────────────────────────────────────────────────────────
+
+    def import_products(
+        self,
+        business_id: str,
+        source: Union[bytes, str],
+        filename: Optional[str] = None,
+        auto_create_inventory: bool = True,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Stream-import products, upserting by ``(business_id, sku)``.
+
+        Returns the same summary dict as ``ProductExcelService.import_products``
+        plus ``processed`` and ``total`` counters.
+        """
+        return self._run(
+            source,
+            filename,
+            preferred_sheets=["Products", "Sheet1"],
+            required={"product_name", "selling_price"},
+            aliases={"name": "product_name"},
+            parse_row=parse_product_row,
+            write_chunk=lambda biz, rows, res: self._write_product_chunk(
+                biz, rows, res, auto_create_inventory
+            ),
+            business_id=business_id,
+            empty_message="No valid product data found in spreadsheet",
+            progress=progress,
+        )
+
+    def _product_insert_row(self, business_id: UUID, values: Dict[str, Any], now) -> Dict[str, Any]:
+        row = {
+            "id": uuid.uuid4(),
+            "business_id": business_id,
+            "created_at": now,
+            "updated_at": now,
+            "sku": None,
+            "description": None,
+            "barcode": None,
+            "cost_price": None,
+            "quantity": 0,
+            "low_stock_threshold": 10,
+            "is_taxable": True,
+            "track_inventory": True,
+            "labor_minutes": 0,
+            "status": ProductStatus.ACTIVE,
+        }
+        row.update(values)
+        return row
+
+    def _write_product_chunk(
+        self,
+        business_id: UUID,
+        rows: List[Tuple[int, Dict[str, Any]]],
+        result: Dict[str, Any],
+        auto_create_inventory: bool,
+    ) -> None:
+        now = utc_now()
+        by_sku: Dict[str, Dict[str, Any]] = {}
+        unkeyed: List[Dict[str, Any]] = []
+        for _, values in rows:
+            sku = values.get("sku")
+            if sku is None:
+                unkeyed.append(values)
+            elif sku in by_sku:
+                # Repeated SKU within the chunk: later row wins, counted as an update
+                by_sku[sku] = {**by_sku[sku], **values}
+                result["updated"] += 1
+            else:
+                by_sku[sku] = values
+
+        existing_skus = set()
+        if by_sku:
+            existing_skus = set(
+                self.db.execute(
+                    select(Product.sku).where(
+                        Product.business_id == business_id,
+                        Product.sku.in_(list(by_sku)),
+                        Product.deleted_at.is_(None),
+                    )
+                ).scalars()
+            )
+
+        new_products: List[Tuple[UUID, int, Optional[int]]] = []
+
+        # One statement per distinct set of provided columns (usually one per
+        # chunk) so the UPDATE branch only touches columns present in the file.
+        groups: Dict[frozenset, List[Dict[str, Any]]] = defaultdict(list)
+        for values in by_sku.values():
+            groups[frozenset(values)].append(values)
+
+        for keys, group in groups.items():
+            stmt = self._insert(Product)
+            set_ = {key: stmt.excluded[key] for key in keys if key != "sku"}
+            set_["updated_at"] = stmt.excluded.updated_at
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Product.business_id, Product.sku],
+                index_where=PRODUCT_SKU_CONFLICT_WHERE,
+                set_=set_,
+            ).returning(Product.id, Product.sku, Product.quantity, Product.low_stock_threshold)
+            # executemany form: the statement compiles once and the driver
+            # batches rows via SQLAlchemy's "insertmanyvalues" with RETURNING
+            result_rows = self.db.execute(
+                stmt, [self._product_insert_row(business_id, v, now) for v in group]
+            )
+            for product_id, sku, quantity, threshold in result_rows:
+                if sku in existing_skus:
+                    result["updated"] += 1
+                else:
+                    result["created"] += 1
+                    new_products.append((product_id, quantity or 0, threshold))
+
+        if unkeyed:
+            insert_rows = [self._product_insert_row(business_id, v, now) for v in unkeyed]
+            self.db.execute(insert(Product), insert_rows)
+            result["created"] += len(insert_rows)
+            new_products.extend(
+                (r["id"], r["quantity"] or 0, r["low_stock_threshold"]) for r in insert_rows
+            )
+
+        if auto_create_inventory and new_products:
+            self.db.execute(
+                insert(InventoryItem),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "business_id": business_id,
+                        "product_id": product_id,
+                        "quantity_on_hand": quantity,
+                        "quantity_reserved": 0,
+                        "quantity_incoming": 0,
+                        "reorder_point": threshold or 10,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for product_id, quantity, threshold in new_products
+                ],
+            )
+
+    # ── Inventory ────────────────────────────────────────────────────────
+
+    def import_inventory(
+        self,
+        business_id: str,
+        source: Union[bytes, str],
+        filename: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Stream-import inventory levels, matching rows to products by SKU."""
+        return self._run(
+            source,
+            filename,
+            preferred_sheets=["Inventory", "Sheet1"],
+            required={"sku", "quantity_on_hand"},
+            aliases={},
+            parse_row=parse_inventory_row,
+            write_chunk=self._write_inventory_chunk,
+            business_id=business_id,
+            empty_message="No valid inventory data found in spreadsheet",
+            progress=progress,
+        )
+
+    def _write_inventory_chunk(
+        self,
+        business_id: UUID,
+        rows: List[Tuple[int, Dict[str, Any]]],
+        result: Dict[str, Any],
+    ) -> None:
+        now = utc_now()
+        skus = {values["sku"] for _, values in rows}
+        product_by_sku = dict(
+            self.db.execute(
+                select(Product.sku, Product.id).where(
+                    Product.business_id == business_id,
+                    Product.sku.in_(skus),
+                    Product.deleted_at.is_(None),
+                )
+            ).all()
+        )
+        item_by_product = dict(
+            self.db.execute(
+                select(InventoryItem.product_id, InventoryItem.id).where(
+                    InventoryItem.business_id == business_id,
+                    InventoryItem.product_id.in_(list(product_by_sku.values())),
+                    InventoryItem.deleted_at.is_(None),
+                )
+            ).all()
+        ) if product_by_sku else {}
+
+        updates: Dict[UUID, Dict[str, Any]] = {}
+        inserts: Dict[UUID, Dict[str, Any]] = {}
+        for row_idx, values in rows:
+            sku = values.pop("sku")
+            product_id = product_by_sku.get(sku)
+            if product_id is None:
+                result["errors"].append(f"Row {row_idx}: Product with SKU '{sku}' not found")
+                result["skipped"] += 1
+                continue
+
+            item_id = item_by_product.get(product_id)
+            if item_id is not None:
+                if item_id in updates:
+                    updates[item_id].update(values)
+                else:
+                    updates[item_id] = {"id": item_id, "updated_at": now, **values}
+                result["updated"] += 1
+            elif product_id in inserts:
+                inserts[product_id].update(values)
+                result["updated"] += 1
+            else:
+                inserts[product_id] = {
+                    "id": uuid.uuid4(),
+                    "business_id": business_id,
+                    "product_id": product_id,
+                    "quantity_reserved": 0,
+                    "quantity_incoming": 0,
+                    "reorder_point": 10,
+                    "reorder_quantity": 50,
+                    "location": None,
+                    "bin_location": None,
+                    "average_cost": Decimal("0"),
+                    "last_cost": Decimal("0"),
+                    "created_at": now,
+                    "updated_at": now,
+                    **values,
+                }
+                result["created"] += 1
+
+        if updates:
+            # ORM bulk UPDATE by primary key; rows are grouped by key set internally
+            self.db.execute(update(InventoryItem), list(updates.values()))
+        if inserts:
+            self.db.execute(insert(InventoryItem), list(inserts.values()))
+
+    # ── Shared driver ────────────────────────────────────────────────────
+
+    def _run(
+        self,
+        source: Union[bytes, str],
+        filename: Optional[str],
+        *,
+        preferred_sheets: Sequence[str],
+        required: set,
+        aliases: Dict[str, str],
+        parse_row: Callable[[Callable[..., Any]], Tuple[Optional[Dict[str, Any]], Optional[str]]],
+        write_chunk: Callable[[UUID, List[Tuple[int, Dict[str, Any]]], Dict[str, Any]], None],
+        business_id: str,
+        empty_message: str,
+        progress: Optional[ProgressCallback],
+    ) -> Dict[str, Any]:
+        result = _new_result()
+        try:
+            sheet = open_sheet_rows(source, preferred_sheets, filename)
+        except ImportFileError as e:
+            result["success"] = False
+            result["errors"].append(str(e))
+            return result
+
+        try:
+            headers = dict(sheet.headers)
+            for alias, canonical in aliases.items():
+                if alias in headers and canonical not in headers:
+                    headers[canonical] = headers[alias]
+
+            missing = required - set(headers)
+            if missing:
+                result["success"] = False
+                result["errors"].append(f"Missing required columns: {', '.join(sorted(missing))}")
+                return result
+
+            result["total"] = sheet.estimated_total
+            biz_uuid = UUID(str(business_id))
+
+            for chunk in chunked(sheet.rows, self.chunk_size):
+                valid: List[Tuple[int, Dict[str, Any]]] = []
+                for row_idx, values in chunk:
+                    parsed, error = parse_row(_cell_getter(headers, values))
+                    if error:
+                        result["errors"].append(f"Row {row_idx}: {error}")
+                        result["skipped"] += 1
+                    elif parsed is None:
+                        result["skipped"] += 1
+                    else:
+                        valid.append((row_idx, parsed))
+
+                if valid:
+                    counts_before = (result["created"], result["updated"], result["skipped"], len(result["errors"]))
+                    try:
+                        write_chunk(biz_uuid, valid, result)
+                        self.db.commit()
+                    except Exception as e:
+                        self.db.rollback()
+                        logger.warning("Import chunk starting at row %s failed: %s", valid[0][0], e)
+                        # Undo the chunk's optimistic counters; every row in it was rolled back
+                        result["created"], result["updated"], result["skipped"] = counts_before[:3]
+                        del result["errors"][counts_before[3]:]
+                        result["skipped"] += len(valid)
+                        result["errors"].append(
+                            f"Batch starting at row {valid[0][0]} failed: {str(e)}"
+                        )
+
+                result["processed"] += len(chunk)
+                if progress is not None and progress(result) is False:
+                    result["errors"].append("Import cancelled")
+                    break
+        finally:
+            sheet.close()
+
+        if result["updated"] == 0 and result["created"] == 0:
+            if not result["errors"]:
+                result["errors"].append(empty_message)
+            result["success"] = False
+
+        return result
+
+
+# ── Background jobs ──────────────────────────────────────────────────────────
+
+async def spool_upload_to_tempfile(upload, max_size_mb: int = MAX_IMPORT_JOB_SIZE_MB) -> str:
+    """Copy an ``UploadFile`` to a temporary file in 1MB blocks.
+
+    Returns the temp file path; the caller (or :func:`run_import_job`) is
+    responsible for deleting it.
+
+    Raises:
+        ImportFileError: For missing, empty or unsupported files.
+        ImportFileTooLargeError: If the upload exceeds ``max_size_mb``.
+    """
+    if not upload.filename:
+        raise ImportFileError("No file provided")
+    if not upload.filename.lower().endswith(IMPORT_FILE_EXTENSIONS):
+        raise ImportFileError("File must be an Excel spreadsheet (.xlsx) or CSV file (.csv)")
+
+    max_bytes = max_size_mb * 1024 * 1024
+    suffix = os.path.splitext(upload.filename)[1].lower()
+    fd, path = tempfile.mkstemp(prefix="bizpilot-import-", suffix=suffix)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                block = await upload.read(1024 * 1024)
+                if not block:
+                    break
+                size += len(block)
+                if size > max_bytes:
+                    raise ImportFileTooLargeError(
+                        f"File too large. Maximum size is {max_size_mb}MB"
+                    )
+                out.write(block)
+        if size == 0:
+            raise ImportFileError("File is empty")
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def run_import_job(
+    operation_id: str,
+    entity: str,
+    business_id: str,
+    file_path: str,
+    filename: str,
+) -> None:
+    """Execute a streaming import as a tracked bulk operation.
+
+    Intended to run from a FastAPI background task.  Uses its own session,
+    updates the operation's progress counters after every chunk, honours
+    cancellation between chunks, and always deletes the spooled upload.
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        operation = db.query(BulkOperation).filter(BulkOperation.id == operation_id).first()
+        if operation is None or operation.is_terminal:
+            return
+
+        operation.status = OperationStatus.PROCESSING.value
+        operation.started_at = utc_now()
+        db.commit()
+
+        def on_progress(result: Dict[str, Any]) -> bool:
+            db.refresh(operation)
+            if operation.status == OperationStatus.CANCELLED.value:
+                return False
+            operation.total_records = max(result["total"] or 0, result["processed"])
+            operation.processed_records = result["processed"]
+            operation.successful_records = result["created"] + result["updated"]
+            operation.failed_records = result["skipped"]
+            db.commit()
+            return True
+
+        service = StreamingImportService(db)
+        if entity == "inventory":
+            result = service.import_inventory(business_id, file_path, filename, progress=on_progress)
+        else:
+            result = service.import_products(business_id, file_path, filename, progress=on_progress)
+
+        db.refresh(operation)
+        if operation.status != OperationStatus.CANCELLED.value:
+            operation.status = (
+                OperationStatus.COMPLETED.value if result["success"] else OperationStatus.FAILED.value
+            )
+        operation.total_records = max(result["total"] or 0, result["processed"])
+        operation.processed_records = result["processed"]
+        operation.successful_records = result["created"] + result["updated"]
+        operation.failed_records = result["skipped"]
+        if result["errors"]:
+            operation.error_summary = "; ".join(result["errors"][:5])
+        operation.parameters = {
+            **(operation.parameters or {}),
+            "result": {
+                "created": result["created"],
+                "updated": result["updated"],
+                "skipped": result["skipped"],
+                "errors": result["errors"][:MAX_STORED_ERRORS],
+            },
+        }
+        operation.completed_at = utc_now()
+        db.commit()
+    except Exception as e:
+        logger.error("Import job %s failed: %s", operation_id, e, exc_info=True)
+        db.rollback()
+        operation = db.query(BulkOperation).filter(BulkOperation.id == operation_id).first()
+        if operation is not None:
+            operation.status = OperationStatus.FAILED.value
+            operation.error_summary = str(e)[:1000]
+            operation.completed_at = utc_now()
+            db.commit()
+    finally:
+        db.close()
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
@@ -1,14 +1,20 @@
 """Supplier service for business logic."""
 
-from typing import List, Optional, Tuple
+from typing import Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
+from app.core.pagination import Page, TotalMode, paginate
+from app.core.search import SearchSpec, apply_search
 from app.models.supplier import Supplier
 from app.schemas.supplier import SupplierCreate, SupplierUpdate
 
 
+SUPPLIER_SEARCH = SearchSpec(
+    columns=[Supplier.name, Supplier.contact_name, Supplier.email, Supplier.phone],
+)
+
+
 class SupplierService:
     """Service for supplier operations."""
 
@@ -24,38 +30,30 @@ class SupplierService:
         tag: Optional[str] = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
-    ) -> Tuple[List[Supplier], int]:
+        total_mode: TotalMode = TotalMode.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[Supplier]:
         query = self.db.query(Supplier).filter(
             Supplier.business_id == business_id,
             Supplier.deleted_at.is_(None),
         )
 
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Supplier.name.ilike(search_term),
-                    Supplier.contact_name.ilike(search_term),
-                    Supplier.email.ilike(search_term),
-                    Supplier.phone.ilike(search_term),
-                )
-            )
+        query, rank = apply_search(query, SUPPLIER_SEARCH, search)
 
         if tag:
             query = query.filter(Supplier.tags.any(tag))
 
-        total = query.count()
-
+        # Sorting and pagination
+        if sort_by == "relevance" and rank is not None:
+            return paginate(
+                query.order_by(rank.desc(), Supplier.created_at.desc()),
+                page, per_page, total_mode, cursor,
+            )
         sort_column = getattr(Supplier, sort_by, Supplier.created_at)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        offset = (page - 1) * per_page
-        suppliers = query.offset(offset).limit(per_page).all()
-
-        return suppliers, total
+        return paginate(
+            query, page, per_page, total_mode, cursor,
+            keyset=(sort_column, Supplier.id), descending=sort_order == "desc",
+        )
 
     def get_supplier(self, supplier_id: str, business_id: str) -> Optional[Supplier]:
         return self.db.query(Supplier).filter(
@@ -10,10 +10,11 @@ split-brain issues when multiple devices edit the same entity offline.
 """
 
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, TotalMode, paginate
 from app.models.sync_queue import SyncQueueItem, SyncMetadata
 
 
@@ -63,7 +64,9 @@ class SyncQueueService:
         entity_type: Optional[str] = None,
         page: int = 1,
         per_page: int = 50,
-    ) -> Tuple[List[SyncQueueItem], int]:
+        total_mode: TotalMode = TotalMode.EXACT,
+        cursor: Optional[str] = None,
+    ) -> Page[SyncQueueItem]:
         """List pending sync queue items, ordered by creation time."""
         query = self.db.query(SyncQueueItem).filter(
             SyncQueueItem.business_id == business_id,
@@ -72,14 +75,10 @@ class SyncQueueService:
         if entity_type:
             query = query.filter(SyncQueueItem.entity_type == entity_type)
 
-        total = query.count()
-        items = (
-            query.order_by(SyncQueueItem.created_at.asc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
+        return paginate(
+            query, page, per_page, total_mode, cursor,
+            keyset=(SyncQueueItem.created_at, SyncQueueItem.id),
         )
-        return items, total
 
     def mark_completed(self, item_id: str) -> Optional[SyncQueueItem]:
         """Mark a sync queue item as completed."""
@@ -2,11 +2,12 @@
 
 from typing import Optional, Tuple, List
 from uuid import UUID
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from app.models.restaurant_table import RestaurantTable, TableStatus
-from app.models.order import Order, OrderStatus
+from app.models.order import Order, OrderItem, OrderStatus
 
 
 class TableService:
@@ -115,3 +116,86 @@ class TableService:
                 "has_active_order": order is not None,
             })
         return result
+
+    def get_floor_state(self, business_id: UUID) -> List[dict]:
+        """
+        Every active table with its latest open order, in one query.
+
+        Open orders are ranked per table inside the business (ROW_NUMBER, so
+        the same statement runs on SQLite) and the newest one is joined;
+        item counts come from a correlated subquery.  Rows are plain
+        JSON-ready dicts so the floor state can be cached as is.
+        """
+        open_orders = (
+            select(
+                Order.id,
+                Order.table_id,
+                Order.order_number,
+                Order.status,
+                Order.total,
+                Order.created_at,
+                func.row_number().over(
+                    partition_by=Order.table_id, order_by=Order.created_at.desc()
+                ).label("rank"),
+            )
+            .where(
+                Order.business_id == business_id,
+                Order.table_id.isnot(None),
+                Order.deleted_at.is_(None),
+                Order.status.notin_([OrderStatus.CANCELLED.value, OrderStatus.REFUNDED.value]),
+                Order.payment_status != 'paid',
+            )
+            .subquery()
+        )
+        item_count = (
+            select(func.coalesce(func.sum(OrderItem.quantity), 0))
+            .where(OrderItem.order_id == open_orders.c.id, OrderItem.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+        rows = self.db.execute(
+            select(
+                RestaurantTable.id,
+                RestaurantTable.table_number,
+                RestaurantTable.capacity,
+                RestaurantTable.status,
+                RestaurantTable.section,
+                RestaurantTable.position_x,
+                RestaurantTable.position_y,
+                open_orders.c.id.label("order_id"),
+                open_orders.c.order_number,
+                open_orders.c.status.label("order_status"),
+                open_orders.c.total.label("order_total"),
+                open_orders.c.created_at.label("order_opened_at"),
+                item_count.label("order_item_count"),
+            )
+            .outerjoin(
+                open_orders,
+                and_(open_orders.c.table_id == RestaurantTable.id, open_orders.c.rank == 1),
+            )
+            .where(
+                RestaurantTable.business_id == business_id,
+                RestaurantTable.deleted_at.is_(None),
+                RestaurantTable.is_active == True,  # noqa: E712
+            )
+            .order_by(RestaurantTable.table_number)
+        ).all()
+
+        return [
+            {
+                "id": str(row.id),
+                "table_number": row.table_number,
+                "capacity": row.capacity,
+                "status": getattr(row.status, "value", row.status),
+                "section": row.section,
+                "position_x": float(row.position_x or 0),
+                "position_y": float(row.position_y or 0),
+                "has_active_order": row.order_id is not None,
+                "order_id": str(row.order_id) if row.order_id else None,
+                "order_number": row.order_number,
+                "order_status": getattr(row.order_status, "value", row.order_status),
+                "order_total": float(row.order_total or 0) if row.order_id else None,
+                "order_item_count": int(row.order_item_count or 0) if row.order_id else 0,
+                "order_opened_at": row.order_opened_at.isoformat() if row.order_opened_at else None,
+            }
+            for row in rows
+        ]
@@ -14,6 +14,7 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.search import contains
 from app.models.tag import TagCategory, Tag, ProductTag
 
 
@@ -178,7 +179,7 @@ class TagService:
         if category_id:
             query = query.filter(Tag.category_id == category_id)
         if search:
-            query = query.filter(Tag.name.ilike(f"%{search}%"))
+            query = query.filter(contains([Tag.name], search))
 
         total = query.count()
         items = (
@@ -1,6 +1,4 @@
 import pyotp
-import qrcode
-import qrcode.image.svg
 import io
 import base64
 import logging
@@ -53,7 +51,9 @@ async def generate_totp_setup(user_id: UUID, business_id: UUID, db: AsyncSession
         issuer_name="BizPilot Pro"
     )
     
-    # Generate QR code data URL
+    # Generate QR code data URL (qrcode and PIL load on first enrolment)
+    import qrcode
+
     qr = qrcode.QRCode(version=1, box_size=10, border=5)
     qr.add_data(provision_uri)
     qr.make(fit=True)
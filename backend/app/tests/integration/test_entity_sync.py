@@ -211,6 +211,11 @@ class TestEntitySyncHelpers:
         assert "orders" in registry
         assert "customers" in registry
 
+    def test_association_rules_are_pull_only(self):
+        from app.api.entity_sync import PULL_ONLY_ENTITIES, _build_entity_registry
+        assert "association_rules" in _build_entity_registry()
+        assert "association_rules" in PULL_ONLY_ENTITIES
+
     def test_entity_registry_does_not_contain_internal_tables(self):
         from app.api.entity_sync import _build_entity_registry
         registry = _build_entity_registry()
@@ -0,0 +1,138 @@
+"""API tests for the realtime push gateway.
+
+Tests:
+- A customer display connected to /realtime/ws receives the cart the POS
+  pushes with POST /displays/{id}/cart, and nothing else
+- Staff connections receive business events, filtered by ``types``
+- Connections that fail authentication are closed with 1008
+- The SSE stream frames events and keeps idle streams alive
+
+The app under test mounts only the realtime and customer display routers
+and runs the hub without Redis (local delivery).
+"""
+
+import os
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+from app.api import realtime as realtime_api
+from app.api.customer_displays import router as customer_displays_router
+from app.api.deps import get_current_active_user, get_current_business_id
+from app.core import realtime
+from app.core.database import get_sync_db
+from app.core.realtime import RealtimeEventType, emit_event, realtime_hub
+
+BUSINESS_ID = str(uuid.uuid4())
+USER_ID = str(uuid.uuid4())
+DISPLAY_ID = str(uuid.uuid4())
+
+
+def _app() -> FastAPI:
+    app = FastAPI(
+        on_startup=[realtime.start_realtime_hub],
+        on_shutdown=[realtime.stop_realtime_hub],
+    )
+    app.include_router(realtime_api.router)
+    app.include_router(customer_displays_router)
+
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(
+        id=uuid.UUID(DISPLAY_ID), business_id=uuid.UUID(BUSINESS_ID),
+    )
+    app.dependency_overrides[get_sync_db] = lambda: db
+    app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(id=uuid.UUID(USER_ID))
+    app.dependency_overrides[get_current_business_id] = lambda: BUSINESS_ID
+    return app
+
+
+@pytest.fixture
+def client():
+    with patch.object(realtime.redis_manager, "get_client", return_value=None):
+        with TestClient(_app()) as test_client:
+            yield test_client
+
+
+def _connected_as(business_id, user_id):
+    return patch.object(realtime_api, "_resolve_connection", return_value=(business_id, user_id))
+
+
+def test_display_receives_its_cart(client):
+    with _connected_as(BUSINESS_ID, None):
+        with client.websocket_connect(f"/realtime/ws?display_id={DISPLAY_ID}") as display:
+            emit_event(BUSINESS_ID, RealtimeEventType.ORDER_STATUS_CHANGED, {"order_id": "o1"})
+            response = client.post(f"/displays/{DISPLAY_ID}/cart", json={
+                "items": [{"name": "Flat white", "quantity": 2, "unit_price": 32, "total": 64}],
+                "total": 64,
+            })
+            assert response.status_code == 202
+
+            event = display.receive_json()
+
+    assert event["type"] == "display.cart_updated"
+    assert event["data"]["display_id"] == DISPLAY_ID
+    assert event["data"]["cart"]["items"][0]["name"] == "Flat white"
+    # The server side unsubscribes once it notices the disconnect
+    for _ in range(100):
+        if realtime_hub.connections == 0:
+            break
+        time.sleep(0.01)
+    assert realtime_hub.connections == 0
+
+
+def test_staff_connection_filters_by_type(client):
+    with _connected_as(BUSINESS_ID, USER_ID):
+        with client.websocket_connect("/realtime/ws?token=t&types=order.status_changed") as ws:
+            emit_event(BUSINESS_ID, RealtimeEventType.MENU_AVAILABILITY_CHANGED, {"modifier_id": "m1"})
+            emit_event(str(uuid.uuid4()), RealtimeEventType.ORDER_STATUS_CHANGED, {"order_id": "elsewhere"})
+            emit_event(BUSINESS_ID, RealtimeEventType.ORDER_STATUS_CHANGED, {"order_id": "o1", "status": "ready"})
+
+            event = ws.receive_json()
+
+    assert event["type"] == "order.status_changed"
+    assert event["data"] == {"order_id": "o1", "status": "ready"}
+
+
+def test_unauthenticated_connection_is_closed(client):
+    with patch.object(realtime_api, "_resolve_connection", return_value=None):
+        with pytest.raises(WebSocketDisconnect) as closed:
+            with client.websocket_connect("/realtime/ws?token=bad") as ws:
+                ws.receive_json()
+
+    assert closed.value.code == 1008
+
+
+def test_cart_for_another_business_display_is_rejected(client):
+    client.app.dependency_overrides[get_current_business_id] = lambda: str(uuid.uuid4())
+
+    response = client.post(f"/displays/{DISPLAY_ID}/cart", json={"items": []})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sse_frames_events_and_keepalives():
+    hub = realtime.RealtimeHub()
+    subscription = hub.subscribe(BUSINESS_ID)
+    hub.deliver(BUSINESS_ID, realtime.encode_event(
+        RealtimeEventType.NOTIFICATION_CREATED, BUSINESS_ID, {"title": "Low stock"},
+    ))
+
+    with patch.object(realtime_api, "realtime_hub", hub), \
+            patch.object(realtime_api.settings, "REALTIME_KEEPALIVE_SECONDS", 0.01):
+        stream = realtime_api._sse_events(subscription)
+        frames = [await stream.__anext__() for _ in range(3)]
+        await stream.aclose()
+
+    assert frames[0] == "retry: 3000\n\n"
+    assert frames[1].startswith("event: notification.created\ndata: {")
+    assert frames[2] == ": keepalive\n\n"
+    assert hub.connections == 0
@@ -0,0 +1,303 @@
+"""Tests for the set-based account aging engine and open-item maintenance."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.customer_account import (
+    AccountOpenItem,
+    AccountPayment,
+    AccountStatus,
+    AccountTransaction,
+    CustomerAccount,
+    PaymentAllocation,
+    TransactionType,
+)
+from app.schemas.customer_account import AccountUpdate
+from app.services.account_aging_service import (
+    AccountAgingService,
+    aging_as_of,
+    open_item_due_at,
+    sum_aging,
+)
+from app.services.customer_account_service import CustomerAccountService
+
+AS_OF = date(2026, 6, 30)
+# Midnight UTC on AS_OF, the due time of charges due that day
+AS_OF_AT = datetime(2026, 6, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        CustomerAccount.__table__,
+        AccountTransaction.__table__,
+        AccountPayment.__table__,
+        PaymentAllocation.__table__,
+        AccountOpenItem.__table__,
+    ])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    # The account's joined customer/business tables are not created here
+    with patch.object(session, "refresh"):
+        yield session
+    session.close()
+
+
+@pytest.fixture
+def business_id():
+    return uuid.uuid4()
+
+
+def _account(db, business_id, status=AccountStatus.ACTIVE, payment_terms=30, balance="0"):
+    account = CustomerAccount(
+        id=uuid.uuid4(),
+        customer_id=uuid.uuid4(),
+        business_id=business_id,
+        account_number=f"ACC-{uuid.uuid4().hex[:10]}",
+        status=status,
+        credit_limit=Decimal("100000"),
+        current_balance=Decimal(balance),
+        payment_terms=payment_terms,
+    )
+    db.add(account)
+    db.commit()
+    return account
+
+
+def _charge(db, account, amount, due_date=None, created_at=None):
+    charge = AccountTransaction(
+        id=uuid.uuid4(),
+        account_id=account.id,
+        transaction_type=TransactionType.CHARGE,
+        amount=Decimal(amount),
+        balance_after=Decimal(amount),
+        due_date=due_date,
+        created_at=created_at or datetime(2026, 6, 1, tzinfo=timezone.utc),
+    )
+    db.add(charge)
+    db.commit()
+    return charge
+
+
+def _count_selects(engine):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before)
+    return statements
+
+
+class TestHelpers:
+    def test_aging_as_of_normalises_to_utc(self):
+        sast = timezone(timedelta(hours=2))
+        assert aging_as_of(datetime(2026, 7, 1, 1, 0, tzinfo=sast)) == \
+            datetime(2026, 6, 30, 23, 0, tzinfo=timezone.utc)
+        assert aging_as_of(datetime(2026, 7, 1, 23, 0)) == datetime(2026, 7, 1, 23, 0, tzinfo=timezone.utc)
+        assert aging_as_of(AS_OF) == AS_OF_AT
+
+    def test_open_item_due_at_prefers_explicit_due_date(self):
+        created = datetime(2026, 1, 31, 23, 30, tzinfo=timezone.utc)
+        assert open_item_due_at(30, date(2026, 2, 5), created) == datetime(2026, 2, 5, tzinfo=timezone.utc)
+        assert open_item_due_at(30, None, created) == datetime(2026, 3, 2, 23, 30, tzinfo=timezone.utc)
+
+    def test_sum_aging(self):
+        totals = sum_aging([
+            {"current": Decimal("1"), "total": Decimal("1")},
+            {"days_60": Decimal("2"), "total": Decimal("2")},
+        ])
+        assert totals["current"] == Decimal("1")
+        assert totals["days_60"] == Decimal("2")
+        assert totals["total"] == Decimal("3")
+
+
+class TestAgingForAccounts:
+    def test_business_wide_aging_is_one_query(self, db, engine, business_id):
+        for i in range(5):
+            account = _account(db, business_id)
+            _charge(db, account, "100", due_date=AS_OF + timedelta(days=1))
+            _charge(db, account, "50", due_date=AS_OF - timedelta(days=45))
+        other = _account(db, uuid.uuid4())
+        _charge(db, other, "999", due_date=AS_OF)
+
+        statements = _count_selects(engine)
+        aging = AccountAgingService(db).aging_for_accounts(business_id=business_id, as_of_date=AS_OF)
+
+        assert len(statements) == 1
+        assert len(aging) == 5
+        totals = sum_aging(aging.values())
+        assert totals["current"] == Decimal("500")
+        assert totals["days_60"] == Decimal("250")
+        assert totals["total"] == Decimal("750")
+
+    def test_default_due_date_uses_payment_terms(self, db, business_id):
+        account = _account(db, business_id, payment_terms=14)
+        # Due 2026-06-15, 15 days overdue on AS_OF
+        _charge(db, account, "80", created_at=datetime(2026, 6, 1, 9, tzinfo=timezone.utc))
+
+        aging = AccountAgingService(db).aging_for_account(account.id, AS_OF)
+
+        assert aging["days_30"] == Decimal("80")
+        assert aging["total"] == Decimal("80")
+
+    def test_days_past_due_count_from_the_due_time(self, db, business_id):
+        account = _account(db, business_id, payment_terms=0)
+        # Due at 15:00; 30 whole days have passed until 15:00 on day 31
+        _charge(db, account, "10", created_at=datetime(2026, 5, 1, 15, tzinfo=timezone.utc))
+        aging_service = AccountAgingService(db)
+
+        before = aging_service.aging_for_account(account.id, datetime(2026, 6, 1, 14, 59, tzinfo=timezone.utc))
+        after = aging_service.aging_for_account(account.id, datetime(2026, 6, 1, 15, 0, tzinfo=timezone.utc))
+
+        assert before["days_30"] == Decimal("10")
+        assert after["days_60"] == Decimal("10")
+
+        aging_service.rebuild_open_items(account_ids=[account.id])
+        db.commit()
+        assert aging_service.open_items_aging(
+            business_id, datetime(2026, 6, 1, 14, 59, tzinfo=timezone.utc)
+        )[account.id] == before
+        assert aging_service.open_items_aging(
+            business_id, datetime(2026, 6, 1, 15, 0, tzinfo=timezone.utc)
+        )[account.id] == after
+
+    def test_excludes_paid_and_deleted_charges(self, db, business_id):
+        account = _account(db, business_id)
+        paid = _charge(db, account, "100", due_date=AS_OF)
+        deleted = _charge(db, account, "40", due_date=AS_OF)
+        deleted.deleted_at = datetime(2026, 6, 2, tzinfo=timezone.utc)
+        _charge(db, account, "25", due_date=AS_OF)
+        db.add(PaymentAllocation(payment_id=uuid.uuid4(), transaction_id=paid.id, amount=Decimal("60")))
+        db.add(PaymentAllocation(payment_id=uuid.uuid4(), transaction_id=paid.id, amount=Decimal("40")))
+        db.commit()
+
+        aging = AccountAgingService(db).aging_for_account(account.id, AS_OF)
+
+        assert aging["total"] == Decimal("25")
+
+    def test_account_with_nothing_outstanding_returns_zeros(self, db, business_id):
+        account = _account(db, business_id)
+        aging = AccountAgingService(db).aging_for_account(account.id, AS_OF)
+        assert aging == {k: Decimal("0") for k in ("current", "days_30", "days_60", "days_90_plus", "total")}
+
+
+class TestOpenItems:
+    def test_charges_and_payments_maintain_open_items(self, db, business_id):
+        account = _account(db, business_id)
+        service = CustomerAccountService(db)
+        user_id = uuid.uuid4()
+        service.charge_to_account(account, Decimal("100"), user_id, due_date=AS_OF - timedelta(days=40))
+        service.charge_to_account(account, Decimal("70"), user_id, due_date=AS_OF - timedelta(days=40))
+        service.charge_to_account(account, Decimal("30"), user_id, due_date=AS_OF + timedelta(days=5))
+
+        payment = AccountPayment(
+            id=uuid.uuid4(),
+            account_id=account.id,
+            amount=Decimal("120"),
+            payment_method="cash",
+        )
+        db.add(payment)
+        db.commit()
+        service.allocate_payment(payment)
+
+        items = {i.due_at.date(): i.amount for i in db.query(AccountOpenItem).all()}
+        assert items == {
+            AS_OF - timedelta(days=40): Decimal("50"),
+            AS_OF + timedelta(days=5): Decimal("30"),
+        }
+
+        aging_service = AccountAgingService(db)
+        from_items = aging_service.open_items_aging(business_id, AS_OF)[account.id]
+        from_history = aging_service.aging_for_account(account.id, AS_OF)
+        assert from_items == from_history
+        assert from_items["days_60"] == Decimal("50")
+        assert from_items["current"] == Decimal("30")
+
+    def test_adjustments_maintain_open_items(self, db, business_id):
+        account = _account(db, business_id)
+        service = CustomerAccountService(db)
+        user_id = uuid.uuid4()
+        service.charge_to_account(account, Decimal("100"), user_id, due_date=AS_OF - timedelta(days=40))
+        service.charge_to_account(account, Decimal("50"), user_id, due_date=AS_OF + timedelta(days=5))
+        fee = service.adjust_balance(account, Decimal("20"), "Late fee", user_id)
+        # A credit settles the oldest debit first
+        credit = service.adjust_balance(account, Decimal("-60"), "Discount", user_id)
+
+        items = {i.due_at.date(): i.amount for i in db.query(AccountOpenItem).all()}
+        assert items == {
+            AS_OF - timedelta(days=40): Decimal("40"),
+            AS_OF + timedelta(days=5): Decimal("50"),
+            (fee.created_at + timedelta(days=30)).date(): Decimal("20"),
+        }
+        assert db.query(PaymentAllocation).filter(
+            PaymentAllocation.adjustment_id == credit.id
+        ).one().amount == Decimal("60")
+
+        aging_service = AccountAgingService(db)
+        from_items = aging_service.open_items_aging(business_id, AS_OF)[account.id]
+        assert from_items == aging_service.aging_for_account(account.id, AS_OF)
+        assert from_items["total"] == account.current_balance == Decimal("110")
+
+        aging_service.rebuild_open_items(account_ids=[account.id])
+        db.commit()
+        assert aging_service.open_items_aging(business_id, AS_OF)[account.id] == from_items
+
+    def test_open_items_aging_filters_by_status(self, db, business_id):
+        active = _account(db, business_id)
+        suspended = _account(db, business_id, status=AccountStatus.SUSPENDED)
+        aging_service = AccountAgingService(db)
+        aging_service.post_open_item(active, AS_OF_AT, Decimal("10"))
+        aging_service.post_open_item(suspended, AS_OF_AT, Decimal("20"))
+        db.commit()
+
+        aging = aging_service.open_items_aging(business_id, AS_OF, status=AccountStatus.ACTIVE)
+
+        assert list(aging) == [active.id]
+        assert aging[active.id]["days_30"] == Decimal("10")
+
+    def test_rebuild_matches_history(self, db, business_id):
+        account = _account(db, business_id)
+        charge = _charge(db, account, "100", due_date=AS_OF - timedelta(days=70))
+        _charge(db, account, "60", due_date=AS_OF - timedelta(days=70))
+        _charge(db, account, "15")
+        db.add(PaymentAllocation(payment_id=uuid.uuid4(), transaction_id=charge.id, amount=Decimal("100")))
+        AccountAgingService(db).post_open_item(account, AS_OF_AT, Decimal("999"))  # stale row
+        db.commit()
+
+        aging_service = AccountAgingService(db)
+        written = aging_service.rebuild_open_items(business_id=business_id)
+        db.commit()
+
+        assert written == 2
+        assert aging_service.open_items_aging(business_id, AS_OF)[account.id] == \
+            aging_service.aging_for_account(account.id, AS_OF)
+
+    def test_changing_payment_terms_moves_open_items(self, db, business_id):
+        account = _account(db, business_id, payment_terms=30)
+        _charge(db, account, "45", created_at=datetime(2026, 6, 1, tzinfo=timezone.utc))
+        AccountAgingService(db).rebuild_open_items(account_ids=[account.id])
+        db.commit()
+
+        CustomerAccountService(db).update_account(account, AccountUpdate(payment_terms=7))
+
+        items = db.query(AccountOpenItem).filter(AccountOpenItem.account_id == account.id).all()
+        assert [(i.due_at, i.amount) for i in items] == [(datetime(2026, 6, 8), Decimal("45"))]
@@ -0,0 +1,250 @@
+"""Tests for streamed LLM responses and the orchestrator's event stream.
+
+The provider is an ``httpx.MockTransport`` that answers with an SSE body in
+OpenAI's ``chat.completion.chunk`` format, optionally pausing between
+chunks so time to first token can be told apart from total latency.
+"""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.core import ai_models
+from app.core.ai_models import (
+    MODEL_REGISTRY,
+    LLMResponse,
+    LLMStreamChunk,
+    ModelExecutionError,
+    TaskType,
+    execute_task_stream,
+    run_groq_stream,
+)
+from app.core.config import settings
+from app.core.llm_transport import LLMTransport
+from app.models.user_settings import AIDataSharingLevel
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _sse_body(chunks, delay=0.0):
+    async def body():
+        for chunk in chunks:
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+            if delay:
+                await asyncio.sleep(delay)
+        yield b"data: [DONE]\n\n"
+    return body()
+
+
+def _content_chunks(*parts, usage=None):
+    chunks = [{"choices": [{"index": 0, "delta": {"content": p}, "finish_reason": None}]} for p in parts]
+    chunks.append({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+    if usage:
+        chunks.append({"choices": [], "usage": usage})
+    return chunks
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Route each model name to a handler; returns the dict to fill in."""
+    routes = {}
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        return routes[body["model"]](body)
+
+    transport = LLMTransport(
+        base_url="http://llm.test/v1",
+        http2=False,
+        breaker_failures=5,
+        http_transport=httpx.MockTransport(handler),
+    )
+    monkeypatch.setattr(ai_models, "get_llm_transport", lambda: transport)
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    routes["_requests"] = requests
+    routes["_transport"] = transport
+    return routes
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+class TestRunGroqStream:
+    @pytest.mark.asyncio
+    async def test_yields_deltas_then_assembled_response(self, provider):
+        usage = {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13}
+        provider["m"] = lambda body: httpx.Response(
+            200, content=_sse_body(_content_chunks("Hel", "lo", "!", usage=usage))
+        )
+
+        chunks = await _collect(run_groq_stream("m", MESSAGES))
+
+        assert [c.delta for c in chunks[:-1]] == ["Hel", "lo", "!"]
+        final = chunks[-1].response
+        assert final.content == "Hello!"
+        assert final.finish_reason == "stop"
+        assert final.usage["total_tokens"] == 13
+        sent = provider["_requests"][0]
+        assert sent["stream"] is True
+        assert sent["stream_options"] == {"include_usage": True}
+
+    @pytest.mark.asyncio
+    async def test_tool_call_fragments_are_assembled(self, provider):
+        chunks = [
+            {"choices": [{"index": 0, "delta": {"tool_calls": [
+                {"index": 0, "id": "call_1", "function": {"name": "get_sales", "arguments": '{"per'}},
+            ]}}]},
+            {"choices": [{"index": 0, "delta": {"tool_calls": [
+                {"index": 0, "function": {"arguments": 'iod": "week"}'}},
+            ]}, "finish_reason": "tool_calls"}]},
+        ]
+        provider["m"] = lambda body: httpx.Response(200, content=_sse_body(chunks))
+
+        result = await _collect(run_groq_stream("m", MESSAGES, tools=[{"type": "function"}]))
+
+        assert len(result) == 1
+        assert result[0].response.tool_calls == [
+            {"id": "call_1", "name": "get_sales", "arguments": {"period": "week"}}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_http_error_becomes_model_error(self, provider):
+        provider["m"] = lambda body: httpx.Response(503, text="overloaded")
+
+        with pytest.raises(ModelExecutionError) as exc_info:
+            await _collect(run_groq_stream("m", MESSAGES))
+
+        assert exc_info.value.status_code == 503
+        assert provider["_transport"].stats()["models"]["m"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_first_token_arrives_before_stream_completes(self, provider):
+        provider["m"] = lambda body: httpx.Response(
+            200, content=_sse_body(_content_chunks("a", "b", "c", "d"), delay=0.05)
+        )
+
+        started = time.perf_counter()
+        first = None
+        async for chunk in run_groq_stream("m", MESSAGES):
+            if first is None and chunk.delta:
+                first = time.perf_counter() - started
+        total = time.perf_counter() - started
+
+        assert first < total / 2
+        ttft = provider["_transport"].stats()["models"]["m"]["ttft_ms"]
+        assert ttft["count"] == 1
+        assert ttft["sum"] < provider["_transport"].stats()["models"]["m"]["latency_ms"]["sum"]
+
+
+class TestExecuteTaskStream:
+    @pytest.mark.asyncio
+    async def test_falls_back_before_first_token(self, provider, monkeypatch):
+        monkeypatch.setitem(MODEL_REGISTRY, "fast", ["bad"])
+        monkeypatch.setitem(MODEL_REGISTRY, "fallback", ["good"])
+        provider["bad"] = lambda body: httpx.Response(500, text="boom")
+        provider["good"] = lambda body: httpx.Response(200, content=_sse_body(_content_chunks("ok")))
+
+        chunks = await _collect(execute_task_stream(TaskType.FAST, MESSAGES))
+
+        assert chunks[0].delta == "ok"
+        assert chunks[-1].response.model_used == "good"
+
+    @pytest.mark.asyncio
+    async def test_failure_after_tokens_is_not_retried(self, monkeypatch):
+        monkeypatch.setitem(MODEL_REGISTRY, "fast", ["flaky"])
+        monkeypatch.setitem(MODEL_REGISTRY, "fallback", ["good"])
+        calls = []
+
+        async def fake_stream(model, messages, **kwargs):
+            calls.append(model)
+            yield LLMStreamChunk(delta="partial")
+            raise ModelExecutionError(model, "connection dropped")
+
+        monkeypatch.setattr(ai_models, "run_groq_stream", fake_stream)
+
+        with pytest.raises(RuntimeError, match="mid-stream"):
+            await _collect(execute_task_stream(TaskType.FAST, MESSAGES))
+        assert calls == ["flaky"]
+
+
+def _stream_of(*items):
+    """Fake execute_task_stream returning one scripted LLM turn per call."""
+    turns = list(items)
+
+    async def fake(**kwargs):
+        deltas, response = turns.pop(0)
+        for delta in deltas:
+            yield LLMStreamChunk(delta=delta)
+        yield LLMStreamChunk(response=response)
+    return fake
+
+
+class TestOrchestratorStream:
+    @pytest.mark.asyncio
+    async def test_emits_tool_and_token_events_in_order(self):
+        from app.agents.orchestrator import Orchestrator
+
+        tool_def = MagicMock()
+        tool_def.action_type = "HOTL"
+        tool_def.handler = AsyncMock(return_value={"total": 42})
+        tool_turn = LLMResponse(
+            content="", model_used="m", finish_reason="tool_calls", usage={"total_tokens": 5},
+            tool_calls=[{"id": "c1", "name": "get_sales", "arguments": {"period": "week"}}],
+        )
+        final_turn = LLMResponse(
+            content="Sales were 42.", model_used="m", finish_reason="stop", usage={"total_tokens": 7},
+        )
+
+        with patch("app.agents.orchestrator.execute_task_stream",
+                   new=_stream_of(([], tool_turn), (["Sales were ", "42."], final_turn))), \
+                patch("app.agents.orchestrator.tool_registry.get", return_value=tool_def), \
+                patch("app.agents.orchestrator.get_cached_prompt", new=AsyncMock(return_value="system prompt")), \
+                patch("app.agents.orchestrator.cache_prompt", new=AsyncMock()), \
+                patch("app.agents.orchestrator.log_agent_step"):
+            events = [e async for e in Orchestrator(MagicMock()).run_task_stream(
+                agent_name="chat_agent",
+                user=MagicMock(id=uuid4()),
+                user_message="How were sales?",
+                session_id=str(uuid4()),
+                chat_history=[],
+                sharing_level=AIDataSharingLevel.FULL_BUSINESS,
+                business_id=str(uuid4()),
+            )]
+
+        assert [e["type"] for e in events] == ["tool_start", "tool_result", "token", "token", "response"]
+        assert events[0]["arguments"] == {"period": "week"}
+        assert events[1]["result"] == {"total": 42}
+        assert events[-1]["message"] == "Sales were 42."
+
+    @pytest.mark.asyncio
+    async def test_llm_failure_yields_error_event(self):
+        from app.agents.orchestrator import Orchestrator
+
+        async def failing(**kwargs):
+            raise RuntimeError("All Groq models failed")
+            yield  # pragma: no cover
+
+        with patch("app.agents.orchestrator.execute_task_stream", new=failing), \
+                patch("app.agents.orchestrator.get_cached_prompt", new=AsyncMock(return_value="system prompt")):
+            events = [e async for e in Orchestrator(MagicMock()).run_task_stream(
+                agent_name="chat_agent",
+                user=MagicMock(id=uuid4()),
+                user_message="hi",
+                session_id="s",
+                chat_history=[],
+                sharing_level=AIDataSharingLevel.FULL_BUSINESS,
+                business_id=str(uuid4()),
+            )]
+
+        assert [e["type"] for e in events] == ["error"]
@@ -0,0 +1,198 @@
+"""Tests for the per-business AI context snapshot and its refresher."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core import commit_tracker
+from app.models.customer import Customer
+from app.models.product import Product
+from app.models.user_settings import AIDataSharingLevel
+from app.services import ai_context_snapshot
+from app.services.ai_context_service import AIContextService
+from app.services.ai_context_snapshot import (
+    ContextSnapshotRefresher,
+    get_context_snapshot,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ttl_seconds=None):
+        self.store[key] = value
+        self.ttls[key] = ttl_seconds
+        return True
+
+    async def delete(self, key):
+        return self.store.pop(key, None) is not None
+
+
+SNAPSHOT = {
+    "metrics": {"totalProducts": 3, "totalOrders": 7, "avgMargin": 25.0},
+    "topProductsByMargin": [{"name": "Latte", "profit_margin": 60.0}],
+    "lowStockInventory": [{"product_id": "p1", "quantity_on_hand": 1}],
+}
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(ai_context_snapshot, "redis_manager", fake):
+        yield fake
+
+
+@pytest.fixture
+def business():
+    return SimpleNamespace(id=uuid.uuid4(), name="Corner Cafe", currency="ZAR")
+
+
+class TestReadThrough:
+    def test_computed_once_then_served_from_redis(self, redis, business):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return SNAPSHOT
+
+        first = asyncio.run(get_context_snapshot(business.id, compute))
+        second = asyncio.run(get_context_snapshot(business.id, compute))
+
+        assert first == second == SNAPSHOT
+        assert len(calls) == 1
+        key = f"bizpilot:ai_context:{business.id}"
+        assert redis.ttls[key] == ai_context_snapshot.settings.AI_CONTEXT_SNAPSHOT_TTL_SECONDS
+
+    def test_redis_unavailable_computes_every_time(self, business):
+        class Down(FakeRedis):
+            async def get(self, key):
+                return None
+
+            async def set(self, key, value, ttl_seconds=None):
+                return False
+
+        calls = []
+        with patch.object(ai_context_snapshot, "redis_manager", Down()):
+            for _ in range(2):
+                asyncio.run(get_context_snapshot(business.id, lambda: calls.append(1) or SNAPSHOT))
+        assert len(calls) == 2
+
+
+class TestSharingLevels:
+    def _context(self, business, level):
+        service = AIContextService(MagicMock())
+        with patch.object(service, "_get_business_for_user", return_value=business), \
+                patch.object(service, "compute_business_snapshot", return_value=SNAPSHOT) as compute:
+            context = asyncio.run(service.get_business_context(SimpleNamespace(id=uuid.uuid4()), level))
+        return context, compute
+
+    def test_app_only_skips_the_snapshot(self, redis, business):
+        context, compute = self._context(business, AIDataSharingLevel.APP_ONLY)
+        compute.assert_not_called()
+        assert context["businessName"] == "Corner Cafe"
+        assert context["totalOrders"] == 0
+
+    def test_metrics_only_has_no_product_detail(self, redis, business):
+        context, _ = self._context(business, AIDataSharingLevel.METRICS_ONLY)
+        assert context["totalOrders"] == 7
+        assert context["totalSuppliers"] == 0  # default for keys missing from the snapshot
+        assert "topProductsByMargin" not in context
+
+    def test_full_business_adds_highlights(self, redis, business):
+        context, _ = self._context(business, AIDataSharingLevel.FULL_BUSINESS)
+        assert context["topProductsByMargin"] == SNAPSHOT["topProductsByMargin"]
+        assert context["lowStockInventory"] == SNAPSHOT["lowStockInventory"]
+        assert "topCustomers" not in context
+
+    def test_customer_detail_is_never_cached(self, redis, business):
+        service = AIContextService(MagicMock())
+        service.db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
+        with patch.object(service, "_get_business_for_user", return_value=business), \
+                patch.object(service, "compute_business_snapshot", return_value=SNAPSHOT):
+            context = asyncio.run(service.get_business_context(
+                SimpleNamespace(id=uuid.uuid4()), AIDataSharingLevel.FULL_BUSINESS_WITH_CUSTOMERS
+            ))
+        assert context["topCustomers"] == []
+        assert all("topCustomers" not in value for value in redis.store.values())
+
+    def test_no_business(self, redis):
+        service = AIContextService(MagicMock())
+        with patch.object(service, "_get_business_for_user", return_value=None):
+            context = asyncio.run(service.get_business_context(
+                SimpleNamespace(id=uuid.uuid4()), AIDataSharingLevel.FULL_BUSINESS
+            ))
+        assert context["businessName"] == "" and context["totalProducts"] == 0
+
+
+class TestWriteEvents:
+    def _session(self, new=(), dirty=(), deleted=()):
+        return SimpleNamespace(info={}, new=list(new), dirty=list(dirty), deleted=list(deleted))
+
+    def test_commit_marks_touched_businesses(self):
+        shop, cafe = uuid.uuid4(), uuid.uuid4()
+        session = self._session(
+            new=[Product(business_id=shop), object()],
+            dirty=[Customer(business_id=cafe)],
+        )
+        refresher = ContextSnapshotRefresher()
+        with patch.object(ai_context_snapshot, "snapshot_refresher", refresher), \
+                patch.dict(commit_tracker._subscribers, {"ai_context_snapshot": ai_context_snapshot._SUBSCRIBER}):
+            commit_tracker._after_flush(session, None)
+            commit_tracker._after_commit(session)
+        assert refresher._take() == {shop, cafe}
+        assert session.info == {}
+
+    def test_rollback_forgets_touched_businesses(self):
+        session = self._session(new=[Product(business_id=uuid.uuid4())])
+        refresher = ContextSnapshotRefresher()
+        with patch.object(ai_context_snapshot, "snapshot_refresher", refresher), \
+                patch.dict(commit_tracker._subscribers, {"ai_context_snapshot": ai_context_snapshot._SUBSCRIBER}):
+            commit_tracker._after_flush(session, None)
+            commit_tracker._after_rollback(session)
+            commit_tracker._after_commit(session)
+        assert refresher._take() == set()
+
+    def test_refresher_recomputes_dirty_businesses_once(self, redis, business):
+        refresher = ContextSnapshotRefresher(debounce_seconds=0.01)
+        computed = []
+
+        def compute(business_id):
+            computed.append(business_id)
+            return {**SNAPSHOT, "metrics": {"totalOrders": 8}}
+
+        async def scenario():
+            refresher.start()
+            try:
+                for _ in range(5):  # a burst of commits for one business
+                    refresher.mark_dirty([business.id])
+                await asyncio.sleep(0.1)
+            finally:
+                await refresher.stop()
+
+        with patch.object(refresher, "_compute", side_effect=compute):
+            asyncio.run(scenario())
+
+        assert computed == [business.id]
+        assert refresher.refreshed == 1
+        cached = asyncio.run(get_context_snapshot(business.id, lambda: pytest.fail("should be cached")))
+        assert cached["metrics"]["totalOrders"] == 8
+
+    def test_failed_refresh_drops_the_stale_snapshot(self, redis, business):
+        asyncio.run(get_context_snapshot(business.id, lambda: SNAPSHOT))
+        refresher = ContextSnapshotRefresher()
+        refresher.mark_dirty([business.id])
+        with patch.object(refresher, "_compute", side_effect=RuntimeError("db down")):
+            assert asyncio.run(refresher.refresh_pending()) == 0
+        assert refresher.failed == 1
+        assert redis.store == {}
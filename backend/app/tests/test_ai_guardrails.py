@@ -1,6 +1,7 @@
 """Tests for AI guardrails: PII redaction, subscription tier check, and metrics aggregation."""
 
 import uuid
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 
@@ -133,28 +134,26 @@ class TestAIRuleGenerationJob:
         biz.deleted_at = None
         mock_db.query.return_value.filter.return_value.all.return_value = [biz]
 
-        with patch("app.scheduler.jobs.ai_rule_generation_job._generate_rules_for_business", return_value=[]) as mock_gen:
+        with patch("app.scheduler.jobs.ai_rule_generation_job._refresh_business", return_value=0) as mock_refresh:
             ai_rule_generation_job()
-            mock_gen.assert_called_once()
+            mock_refresh.assert_called_once()
+            assert mock_refresh.call_args.args[1] == biz.id
 
     @patch("app.scheduler.jobs.ai_rule_generation_job.SessionLocal")
-    def test_job_stores_rules_when_generated(self, MockSession):
-        from app.scheduler.jobs.ai_rule_generation_job import ai_rule_generation_job
+    def test_job_uses_one_session_per_chunk(self, MockSession):
+        from app.scheduler.jobs import ai_rule_generation_job as job
 
         mock_db = MagicMock()
         MockSession.return_value = mock_db
 
-        biz = MagicMock()
-        biz.id = uuid.uuid4()
-        biz.deleted_at = None
-        mock_db.query.return_value.filter.return_value.all.return_value = [biz]
+        businesses = [MagicMock(id=uuid.uuid4(), deleted_at=None) for _ in range(job._CHUNK_SIZE + 1)]
+        mock_db.query.return_value.filter.return_value.all.return_value = businesses
 
-        fake_rules = [{"product_id": str(uuid.uuid4()), "name": "Widget", "frequency": 10, "rule_type": "top_seller"}]
-
-        with patch("app.scheduler.jobs.ai_rule_generation_job._generate_rules_for_business", return_value=fake_rules), \
-             patch("app.scheduler.jobs.ai_rule_generation_job._store_rules") as mock_store:
-            ai_rule_generation_job()
-            mock_store.assert_called_once()
+        with patch.object(job, "_refresh_business", return_value=2) as mock_refresh:
+            job.ai_rule_generation_job()
+            assert mock_refresh.call_count == len(businesses)
+        # one session to list businesses, one per chunk of _CHUNK_SIZE
+        assert MockSession.call_count == 3
 
     @patch("app.scheduler.jobs.ai_rule_generation_job.SessionLocal")
     def test_job_continues_on_error(self, MockSession):
@@ -172,11 +171,12 @@ class TestAIRuleGenerationJob:
         mock_db.query.return_value.filter.return_value.all.return_value = [biz1, biz2]
 
         with patch(
-            "app.scheduler.jobs.ai_rule_generation_job._generate_rules_for_business",
-            side_effect=[Exception("DB error"), []],
-        ) as mock_gen:
+            "app.scheduler.jobs.ai_rule_generation_job._refresh_business",
+            side_effect=[Exception("DB error"), 0],
+        ) as mock_refresh:
             ai_rule_generation_job()
-            assert mock_gen.call_count == 2
+            assert mock_refresh.call_count == 2
+        mock_db.rollback.assert_called_once()
 
 
 # ---------------------------------------------------------------------------
@@ -197,28 +197,35 @@ class TestAIMetricsEndpoint:
         assert response.status_code in (200, 401, 403, 422)
 
     def test_metrics_aggregation_logic(self):
-        """Metrics aggregation returns correct totals from mocked DB."""
+        """Step totals come from the in-memory counters, not agent_logs."""
+        from app.agents.lib.observability_logger import step_counters
+
         mock_user = MagicMock()
         mock_user.business_id = uuid.uuid4()
 
+        step_counters.reset()
+        for i in range(15):
+            step_counters.record(str(mock_user.business_id), 200 if i < 10 else 240, i >= 3, 5.0)
+        step_counters.record(str(uuid.uuid4()), 999, False, 5.0)
+
         mock_db = MagicMock()
-        # Simulate query().filter().scalar() returning counts
-        mock_db.query.return_value.filter.return_value.scalar.side_effect = [
-            15,    # total_steps
-            3200,  # total_tokens
-            12,    # success_count
-        ]
-        mock_db.query.return_value.filter.return_value.order_by.return_value.first.return_value = None
+        generated_at = datetime(2026, 10, 1, 2, 0, tzinfo=timezone.utc)
+        mock_db.query.return_value.filter.return_value.scalar.side_effect = [generated_at, 7]
 
         import asyncio
         from app.api.ai import get_ai_metrics
 
-        result = asyncio.run(
-            get_ai_metrics(current_user=mock_user, db=mock_db)
-        )
+        try:
+            result = asyncio.run(
+                get_ai_metrics(current_user=mock_user, db=mock_db)
+            )
+        finally:
+            step_counters.reset()
 
         assert result["total_agent_steps"] == 15
         assert result["total_tokens_used"] == 3200
         assert result["success_count"] == 12
         assert result["failure_count"] == 3
+        assert result["latest_rules_generated_at"] == generated_at.isoformat()
+        assert result["association_rules"] == 7
         assert result["business_id"] == str(mock_user.business_id)
@@ -10,8 +10,10 @@ This test suite verifies:
 7. Integration with actual endpoints
 """
 
+import httpx
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, patch
+from app.core.llm_transport import LLMTransport
 from app.core.ai_models import (
     TaskType,
     get_models_for_task,
@@ -25,6 +27,16 @@ from app.core.ai_models import (
 )
 
 
+def _mock_transport(handler):
+    """Route run_groq through an httpx.MockTransport calling ``handler``."""
+    transport = LLMTransport(
+        base_url="http://llm.test/v1",
+        http2=False,
+        http_transport=httpx.MockTransport(handler),
+    )
+    return patch("app.core.ai_models.get_llm_transport", return_value=transport)
+
+
 class TestModelRegistry:
     """Test model registry configuration."""
     
@@ -236,16 +248,7 @@ class TestGroqExecutionWrapper:
             "usage": {"total_tokens": 100, "prompt_tokens": 50, "completion_tokens": 50}
         }
         
-        # httpx Response .json() and .text are synchronous, so use MagicMock for response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_response_data
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
-            
+        with _mock_transport(lambda request: httpx.Response(200, json=mock_response_data)):
             # Mock settings
             with patch("app.core.ai_models.settings") as mock_settings:
                 mock_settings.GROQ_API_KEY = "test-key"
@@ -263,15 +266,7 @@ class TestGroqExecutionWrapper:
     @pytest.mark.asyncio
     async def test_run_groq_http_error(self):
         """Test Groq API HTTP error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.text = "Model not found"
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
-            
+        with _mock_transport(lambda request: httpx.Response(404, text="Model not found")):
             with patch("app.core.ai_models.settings") as mock_settings:
                 mock_settings.GROQ_API_KEY = "test-key"
                 
@@ -300,11 +295,10 @@ class TestGroqExecutionWrapper:
     @pytest.mark.asyncio
     async def test_run_groq_timeout(self):
         """Test timeout handling."""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_post = AsyncMock()
-            mock_post.side_effect = Exception("Request timeout")
-            mock_client.return_value.__aenter__.return_value.post = mock_post
-            
+        def timeout(request):
+            raise httpx.ReadTimeout("Request timeout", request=request)
+
+        with _mock_transport(timeout):
             with patch("app.core.ai_models.settings") as mock_settings:
                 mock_settings.GROQ_API_KEY = "test-key"
                 
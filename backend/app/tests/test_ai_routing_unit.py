@@ -5,13 +5,16 @@ These tests verify the core routing logic without importing the full app.
 
 import pytest
 import os
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 
 # Import only the routing module
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+import httpx
+
+from app.core.llm_transport import LLMTransport
 from app.core.ai_models import (
     TaskType,
     get_models_for_task,
@@ -25,6 +28,16 @@ from app.core.ai_models import (
 )
 
 
+def _mock_transport(response: httpx.Response):
+    """Route run_groq through a transport that answers every request with ``response``."""
+    transport = LLMTransport(
+        base_url="http://llm.test/v1",
+        http2=False,
+        http_transport=httpx.MockTransport(lambda request: response),
+    )
+    return patch("app.core.ai_models.get_llm_transport", return_value=transport)
+
+
 class TestModelRegistry:
     """Test model registry configuration."""
     
@@ -230,16 +243,7 @@ class TestGroqExecutionWrapper:
             "usage": {"total_tokens": 100, "prompt_tokens": 50, "completion_tokens": 50}
         }
         
-        # httpx Response .json() and .text are synchronous, so use MagicMock for response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_response_data
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
-            
+        with _mock_transport(httpx.Response(200, json=mock_response_data)):
             # Mock settings
             with patch("app.core.ai_models.settings") as mock_settings:
                 mock_settings.GROQ_API_KEY = "test-key"
@@ -257,15 +261,7 @@ class TestGroqExecutionWrapper:
     @pytest.mark.asyncio
     async def test_run_groq_http_error(self):
         """Test Groq API HTTP error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.text = "Model not found"
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
-            
+        with _mock_transport(httpx.Response(404, text="Model not found")):
             with patch("app.core.ai_models.settings") as mock_settings:
                 mock_settings.GROQ_API_KEY = "test-key"
                 
@@ -302,15 +298,7 @@ class TestGroqExecutionWrapper:
             "usage": {"total_tokens": 10}
         }
         
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_response_data
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_instance = AsyncMock()
-            mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
-            
+        with _mock_transport(httpx.Response(200, json=mock_response_data)):
             with patch("app.core.ai_models.settings") as mock_settings:
                 mock_settings.GROQ_API_KEY = "test-key"
                 
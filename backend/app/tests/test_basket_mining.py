@@ -0,0 +1,223 @@
+"""Tests for the market-basket mining engine and the rule generation job."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import itertools
+import random
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import JSON, create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.association_rule import AssociationRule, BasketMiningState
+from app.models.order import Order, OrderDirection, OrderItem, OrderStatus
+from app.scheduler.jobs import ai_rule_generation_job as job
+from app.services.basket_mining import MAX_BASKET_ITEMS, BasketCounts, count_baskets, mine_rules
+
+NOW = datetime(2026, 6, 1, 4, 0, tzinfo=timezone.utc)
+
+
+def _rows(baskets):
+    keys, products = [], []
+    for key, items in baskets:
+        keys.extend([key] * len(items))
+        products.extend(items)
+    return keys, products
+
+
+def _as_dicts(counts):
+    pairs = {
+        (counts.products[a], counts.products[b]): int(n)
+        for a, b, n in zip(counts.pair_a, counts.pair_b, counts.pair_counts)
+    }
+    return pairs, dict(zip(counts.products, counts.item_counts.tolist())), counts.transactions
+
+
+@pytest.fixture
+def baskets():
+    rng = random.Random(3)
+    return [
+        (f"o{i}", [f"p{rng.randint(0, 25)}" for _ in range(rng.randint(1, 6))])
+        for i in range(400)
+    ]
+
+
+class TestCounting:
+    def test_counts_match_brute_force(self, baskets):
+        items, pairs = Counter(), Counter()
+        for _, basket in baskets:
+            distinct = sorted(set(basket))
+            items.update(distinct)
+            pairs.update(itertools.combinations(distinct, 2))
+
+        assert _as_dicts(count_baskets(*_rows(baskets))) == (dict(pairs), dict(items), len(baskets))
+
+    def test_incremental_update_equals_recount(self, baskets):
+        counted = count_baskets(*_rows(baskets[:300]))
+        added = count_baskets(*_rows(baskets[300:]))
+        expired = count_baskets(*_rows(baskets[:120]))
+
+        updated = counted.combine(added).combine(expired, sign=-1)
+
+        assert _as_dicts(updated) == _as_dicts(count_baskets(*_rows(baskets[120:])))
+
+    def test_round_trips_through_bytes(self, baskets):
+        counts = count_baskets(*_rows(baskets))
+        assert _as_dicts(BasketCounts.from_bytes(counts.to_bytes())) == _as_dicts(counts)
+
+    def test_bulk_baskets_are_not_paired(self):
+        bulk = [f"p{i}" for i in range(MAX_BASKET_ITEMS + 1)]
+        counts = count_baskets(*_rows([("bulk", bulk), ("o1", ["p0", "p1"])]))
+        assert counts.pairs == 1
+        assert counts.transactions == 2
+
+
+class TestRules:
+    def test_support_confidence_lift(self):
+        # coffee in 8 of 10 baskets, muffin in 5, both in 4 ... plus noise
+        baskets = (
+            [(f"a{i}", ["coffee", "muffin"]) for i in range(4)]
+            + [(f"b{i}", ["coffee"]) for i in range(4)]
+            + [("c0", ["muffin", "tea"]), ("c1", ["tea"])]
+        )
+        rules = mine_rules(count_baskets(*_rows(baskets)), min_support=0.1, min_confidence=0.1, min_lift=0.0)
+        by_pair = {(r["antecedent_product_id"], r["consequent_product_id"]): r for r in rules}
+
+        muffin_coffee = by_pair[("muffin", "coffee")]
+        assert muffin_coffee["support"] == pytest.approx(0.4)
+        assert muffin_coffee["confidence"] == pytest.approx(0.8)
+        assert muffin_coffee["lift"] == pytest.approx(0.8 / 0.8)
+        assert by_pair[("coffee", "muffin")]["confidence"] == pytest.approx(0.5)
+        # seen together once: below min_pair_count
+        assert ("tea", "muffin") not in by_pair
+
+    def test_thresholds_and_per_product_cap(self, baskets):
+        counts = count_baskets(*_rows(baskets))
+        rules = mine_rules(counts, min_support=0.0, min_confidence=0.2, min_lift=1.3, max_per_antecedent=2)
+        assert rules
+        assert all(r["confidence"] >= 0.2 and r["lift"] >= 1.3 for r in rules)
+        assert max(Counter(r["antecedent_product_id"] for r in rules).values()) <= 2
+        assert [r["lift"] for r in rules] == sorted((r["lift"] for r in rules), reverse=True)
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    # orders.tags is a Postgres ARRAY; store it as JSON on SQLite
+    monkeypatch.setattr(Order.__table__.c.tags, "type", JSON())
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=[
+        Order.__table__, OrderItem.__table__, AssociationRule.__table__, BasketMiningState.__table__,
+    ])
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+class Shop:
+    def __init__(self, db):
+        self.db = db
+        self.id = uuid.uuid4()
+        self.coffee, self.muffin, self.tea, self.scone = (uuid.uuid4() for _ in range(4))
+
+    def sell(self, products, at, direction=OrderDirection.INBOUND, status=OrderStatus.DELIVERED):
+        order = Order(
+            business_id=self.id, order_number=f"ORD-{uuid.uuid4().hex[:10]}",
+            direction=direction, status=status, created_at=at,
+        )
+        self.db.add(order)
+        self.db.flush()
+        for product in products:
+            self.db.add(OrderItem(order_id=order.id, product_id=product, name="item", unit_price=1, quantity=1, total=1))
+
+    def rules(self, include_deleted=False):
+        query = select(AssociationRule).where(AssociationRule.business_id == self.id)
+        if not include_deleted:
+            query = query.where(AssociationRule.deleted_at.is_(None))
+        return {(r.antecedent_product_id, r.consequent_product_id): r for r in self.db.execute(query).scalars()}
+
+
+@pytest.fixture
+def shop(db):
+    shop = Shop(db)
+    for day in range(20):
+        at = NOW - timedelta(days=25 - day)
+        shop.sell([shop.coffee, shop.muffin], at)
+        shop.sell([shop.coffee], at)
+        shop.sell([shop.tea], at)
+    db.commit()
+    return shop
+
+
+class TestRuleGenerationJob:
+    def test_stores_rules_and_counts(self, db, shop):
+        assert job._refresh_business(db, shop.id, NOW) > 0
+
+        rule = shop.rules()[(shop.muffin, shop.coffee)]
+        assert rule.confidence == pytest.approx(1.0)
+        assert rule.lift == pytest.approx(60 / 40)
+        assert rule.pair_count == 20
+        state = db.execute(select(BasketMiningState)).scalar_one()
+        assert state.transactions == 60
+
+    def test_ignores_purchases_and_cancelled_sales(self, db, shop):
+        for _ in range(30):
+            shop.sell([shop.tea, shop.scone], NOW - timedelta(days=1), direction=OrderDirection.OUTBOUND)
+            shop.sell([shop.tea, shop.scone], NOW - timedelta(days=1), status=OrderStatus.CANCELLED)
+        db.commit()
+
+        job._refresh_business(db, shop.id, NOW)
+
+        assert (shop.tea, shop.scone) not in shop.rules()
+        assert db.execute(select(BasketMiningState)).scalar_one().transactions == 60
+
+    def test_next_run_counts_only_the_delta(self, db, shop):
+        job._refresh_business(db, shop.id, NOW)
+        later = NOW + timedelta(days=5)
+        for day in range(5):
+            for _ in range(3):
+                shop.sell([shop.tea, shop.scone], NOW + timedelta(days=day, hours=1))
+        db.commit()
+
+        windows = []
+        count = job._count_orders
+
+        def spy(db_, business_id, start, end):
+            windows.append((start, end))
+            return count(db_, business_id, start, end)
+
+        with patch.object(job, "_count_orders", side_effect=spy):
+            job._refresh_business(db, shop.id, later)
+
+        cutoff = later - timedelta(days=job._LOOKBACK_DAYS)
+        assert windows == [(NOW, later), (NOW - timedelta(days=job._LOOKBACK_DAYS), cutoff)]
+        state = db.execute(select(BasketMiningState)).scalar_one()
+        assert _as_dicts(BasketCounts.from_bytes(state.counts)) == _as_dicts(job._count_orders(db, shop.id, cutoff, later))
+        assert (shop.tea, shop.scone) in shop.rules()
+
+    def test_rules_that_stop_holding_are_soft_deleted(self, db, shop):
+        job._refresh_business(db, shop.id, NOW)
+        for _ in range(40):
+            shop.sell([shop.tea], NOW + timedelta(days=40))
+        db.commit()
+
+        job._refresh_business(db, shop.id, NOW + timedelta(days=45))
+
+        assert shop.rules() == {}
+        gone = shop.rules(include_deleted=True)[(shop.muffin, shop.coffee)]
+        assert gone.deleted_at is not None
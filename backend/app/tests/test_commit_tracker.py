@@ -0,0 +1,110 @@
+"""Tests for the shared tracker of businesses touched by each commit."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.models  # noqa: F401  - register all mappers
+from app.core import commit_tracker
+from app.core.commit_tracker import CommitSubscriber
+from app.core.database import Base
+from app.models.customer import Customer
+from app.models.product import Product
+
+
+class Recorder:
+    def __init__(self, name, models, fail=False):
+        self.calls = []
+        self.committed = []
+        self.fail = fail
+        self.subscriber = CommitSubscriber(name, models, self.touched, self.on_commit)
+
+    def touched(self, obj, new_or_deleted):
+        self.calls.append((obj, new_or_deleted))
+        return obj.business_id
+
+    def on_commit(self, business_ids):
+        if self.fail:
+            raise RuntimeError("cache down")
+        self.committed.append(business_ids)
+
+
+@pytest.fixture
+def recorders():
+    products = Recorder("products", (Product,), fail=True)
+    everything = Recorder("everything", (Product, Customer))
+    commit_tracker.subscribe(products.subscriber)
+    commit_tracker.subscribe(everything.subscriber)
+    yield products, everything
+    commit_tracker.unsubscribe("products")
+    commit_tracker.unsubscribe("everything")
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Product.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _session(new=(), dirty=(), deleted=()):
+    return SimpleNamespace(info={}, new=list(new), dirty=list(dirty), deleted=list(deleted))
+
+
+def test_each_subscriber_sees_only_its_models(recorders):
+    products, everything = recorders
+    shop, cafe = uuid.uuid4(), uuid.uuid4()
+    product, customer = Product(business_id=shop), Customer(business_id=cafe)
+    session = _session(new=[product, object()], dirty=[customer])
+
+    commit_tracker._after_flush(session, None)
+
+    assert products.calls == [(product, True)]
+    assert everything.calls == [(product, True), (customer, False)]
+    assert session.info[commit_tracker._SESSION_INFO_KEY] == {
+        "products": {shop}, "everything": {shop, cafe},
+    }
+
+
+def test_failing_subscriber_does_not_block_the_others(recorders):
+    products, everything = recorders
+    shop = uuid.uuid4()
+    session = _session(new=[Product(business_id=shop)])
+
+    commit_tracker._after_flush(session, None)
+    commit_tracker._after_commit(session)
+
+    assert everything.committed == [{shop}]
+    assert session.info == {}
+
+
+def test_commits_dispatch_and_rollbacks_forget(recorders, db):
+    _, everything = recorders
+    shop, cafe = uuid.uuid4(), uuid.uuid4()
+
+    db.add(Product(business_id=shop, name="Tea", selling_price=1))
+    db.commit()
+    db.add(Product(business_id=cafe, name="Cake", selling_price=2))
+    db.flush()
+    db.rollback()
+    commit_tracker.mark_touched(db, "everything", [cafe])
+    db.commit()
+
+    assert everything.committed == [{shop}, {cafe}]
+
+
+def test_hooks_are_removed_with_the_last_subscriber(recorders):
+    assert commit_tracker.event.contains(Session, "after_flush", commit_tracker._after_flush)
+    commit_tracker.unsubscribe("products")
+    assert commit_tracker.event.contains(Session, "after_flush", commit_tracker._after_flush)
+    commit_tracker.unsubscribe("everything")
+    assert not commit_tracker.event.contains(Session, "after_flush", commit_tracker._after_flush)
@@ -3,6 +3,7 @@
 import uuid
 from decimal import Decimal
 from datetime import datetime
+from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
 
 import pytest
@@ -41,6 +42,14 @@ class FakeQuery:
         """Apply ordering."""
         return self
 
+    def outerjoin(self, *args, **kwargs):
+        """Apply join."""
+        return self
+
+    def group_by(self, *args, **kwargs):
+        """Apply grouping."""
+        return self
+
     def offset(self, n: int):
         """Apply offset."""
         self._offset = n
@@ -78,9 +87,10 @@ class FakeSession:
         self.deleted: List[Any] = []
         self.commits = 0
         self.refreshed: List[Any] = []
+        self.executed: List[Any] = []
 
-    def query(self, model_or_expr):
-        """Create a query for the given model."""
+    def query(self, model_or_expr, *others):
+        """Create a query for the given model (keyed by the first entity)."""
         return FakeQuery(self.data_by_model.get(model_or_expr, []))
 
     def add(self, obj: Any):
@@ -104,6 +114,14 @@ class FakeSession:
         """Refresh object from database."""
         self.refreshed.append(obj)
 
+    def execute(self, statement: Any, *args, **kwargs):
+        """Record a Core statement (such as the open-item upsert)."""
+        self.executed.append(statement)
+
+    def get_bind(self):
+        """Bind of a PostgreSQL session."""
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
 
 @pytest.fixture
 def business_id():
@@ -147,7 +147,7 @@ class TestGetCustomers:
         assert customers == rows
         assert total == 2
         chain.offset.assert_called_once_with(0)
-        chain.limit.assert_called_once_with(20)
+        chain.limit.assert_called_once_with(21)  # one extra row tells whether there is a next page
 
     def test_pagination_page_two(self):
         svc, db = _svc()
@@ -158,7 +158,7 @@ class TestGetCustomers:
 
         assert total == 35
         chain.offset.assert_called_once_with(10)
-        chain.limit.assert_called_once_with(10)
+        chain.limit.assert_called_once_with(11)
 
     def test_pagination_page_three(self):
         svc, db = _svc()
@@ -168,7 +168,7 @@ class TestGetCustomers:
         svc.get_customers(BIZ, page=3, per_page=15)
 
         chain.offset.assert_called_once_with(30)  # (3-1)*15
-        chain.limit.assert_called_once_with(15)
+        chain.limit.assert_called_once_with(16)
 
     def test_search_adds_filter(self):
         svc, db = _svc()
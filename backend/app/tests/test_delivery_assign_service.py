@@ -5,14 +5,16 @@ import os
 os.environ.setdefault("SECRET_KEY", "test-secret-key")
 
 import uuid
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
 from app.models.delivery import Delivery, DeliveryStatus, Driver
 from app.services.delivery_assign_service import (
     _active_delivery_count,
+    _min_cost_assignment,
     auto_assign,
+    auto_assign_batch,
     get_available_drivers,
     get_driver_workload,
     reassign_driver,
@@ -59,6 +61,31 @@ def _mock_chain(terminal_value, terminal_method="scalar"):
     return chain
 
 
+def _drivers_db(drivers, counts, stops=()):
+    """db whose first query returns *drivers*, the second the grouped
+    active-delivery counts (one per driver, in order), the third the
+    drivers' current drops as (driver_id, id, lat, lng, zone_id) rows, and
+    later ones (tracking history) nothing."""
+    db = MagicMock()
+    driver_chain = _mock_chain(drivers, "all")
+    count_chain = _mock_chain([(d.id, c) for d, c in zip(drivers, counts)], "all")
+    count_chain.group_by.return_value = count_chain
+    stops_chain = _mock_chain(list(stops), "all")
+    stops_chain.order_by.return_value = stops_chain
+    chains = iter([driver_chain, count_chain, stops_chain])
+
+    def query(*args):
+        chain = next(chains, None)
+        if chain is None:
+            chain = _mock_chain([], "all")
+            chain.join.return_value = chain
+            chain.order_by.return_value = chain
+        return chain
+
+    db.query.side_effect = query
+    return db
+
+
 # ---------------------------------------------------------------------------
 # _active_delivery_count
 # ---------------------------------------------------------------------------
@@ -103,15 +130,8 @@ class TestActiveDeliveryCount:
 
 class TestGetAvailableDrivers:
     def _setup_db(self, drivers, counts):
-        """Set up db.query so the first call returns drivers, subsequent calls
-        return active-delivery counts via the scalar chain."""
-        db = MagicMock()
-
-        driver_chain = _mock_chain(drivers, "all")
-        count_chains = [_mock_chain(c, "scalar") for c in counts]
-
-        db.query.side_effect = [driver_chain] + count_chains
-        return db
+        """First query returns drivers, the second their active counts."""
+        return _drivers_db(drivers, counts)
 
     def test_returns_sorted_by_active_count(self):
         d1 = _make_driver(name="Alice", current_lat=None, current_lng=None)
@@ -191,26 +211,20 @@ class TestGetAvailableDrivers:
 # auto_assign
 # ---------------------------------------------------------------------------
 
-@patch("app.services.delivery_assign_service._haversine_km")
 class TestAutoAssign:
     def _setup_db_for_auto_assign(self, drivers, counts):
         """Mirrors get_available_drivers DB setup."""
-        db = MagicMock()
-        driver_chain = _mock_chain(drivers, "all")
-        count_chains = [_mock_chain(c, "scalar") for c in counts]
-        db.query.side_effect = [driver_chain] + count_chains
-        return db
+        return _drivers_db(drivers, counts)
 
-    def test_returns_none_when_no_candidates(self, mock_haversine):
+    def test_returns_none_when_no_candidates(self):
         db = self._setup_db_for_auto_assign([], [])
         delivery = _make_delivery()
 
         result = auto_assign(db, delivery, "biz-1")
 
         assert result is None
-        mock_haversine.assert_not_called()
 
-    def test_assigns_best_driver_by_workload(self, mock_haversine):
+    def test_assigns_best_driver_by_workload(self):
         d1 = _make_driver(name="Busy", current_lat=None, current_lng=None)
         d2 = _make_driver(name="Free", current_lat=None, current_lng=None)
         db = self._setup_db_for_auto_assign([d1, d2], [4, 1])
@@ -224,37 +238,45 @@ class TestAutoAssign:
         db.commit.assert_called_once()
         db.refresh.assert_called_once_with(delivery)
 
-    def test_assigns_closest_driver_with_location(self, mock_haversine):
+    def test_assigns_closest_driver_with_location(self):
         d_far = _make_driver(name="Far", current_lat=-26.0, current_lng=28.0)
         d_near = _make_driver(name="Near", current_lat=-26.1, current_lng=28.1)
         db = self._setup_db_for_auto_assign([d_far, d_near], [1, 1])
 
-        # Far driver is 50km away, near driver is 5km
-        mock_haversine.side_effect = lambda lat1, lng1, lat2, lng2: (
-            5.0 if lat1 == pytest.approx(-26.1) else 50.0
-        )
         delivery = _make_delivery(status=DeliveryStatus.PENDING)
 
         result = auto_assign(db, delivery, "biz-1", delivery_lat=-26.2, delivery_lng=28.2)
 
         assert result is d_near
 
-    def test_prefers_closer_driver_over_less_busy(self, mock_haversine):
+    def test_prefers_closer_driver_over_less_busy(self):
         d_close_busy = _make_driver(name="CloseBusy", current_lat=-26.1, current_lng=28.1)
         d_far_free = _make_driver(name="FarFree", current_lat=-30.0, current_lng=25.0)
         db = self._setup_db_for_auto_assign([d_close_busy, d_far_free], [3, 0])
 
-        mock_haversine.side_effect = lambda lat1, lng1, lat2, lng2: (
-            2.0 if lat1 == pytest.approx(-26.1) else 100.0
-        )
         delivery = _make_delivery(status=DeliveryStatus.PENDING)
 
         result = auto_assign(db, delivery, "biz-1", delivery_lat=-26.2, delivery_lng=28.2)
 
-        # Distance takes priority in tuple sort (2.0, 3) < (100.0, 0)
+        # Distance takes priority over workload
         assert result is d_close_busy
 
-    def test_does_not_change_status_if_not_pending(self, mock_haversine):
+    def test_closer_driver_with_queued_drops_loses_to_free_driver(self):
+        busy = _make_driver(name="Busy", current_lat=-26.0, current_lng=28.00)
+        free = _make_driver(name="Free", current_lat=-26.0, current_lng=27.97)
+        stops = [
+            (busy.id, uuid.uuid4(), -26.0, 28.01, None),
+            (busy.id, uuid.uuid4(), -26.0, 28.02, None),
+        ]
+        db = _drivers_db([busy, free], [2, 0], stops)
+        delivery = _make_delivery(status=DeliveryStatus.PENDING)
+
+        # Busy is 1 km away but has two drops the other way to make first
+        result = auto_assign(db, delivery, "biz-1", delivery_lat=-26.0, delivery_lng=27.99)
+
+        assert result is free
+
+    def test_does_not_change_status_if_not_pending(self):
         d1 = _make_driver(current_lat=None, current_lng=None)
         db = self._setup_db_for_auto_assign([d1], [0])
         delivery = _make_delivery(status=DeliveryStatus.ASSIGNED)
@@ -266,8 +288,8 @@ class TestAutoAssign:
         # Status should remain ASSIGNED, not changed
         assert delivery.status == DeliveryStatus.ASSIGNED
 
-    def test_no_location_uses_inf_distance(self, mock_haversine):
-        """When delivery has no lat/lng, haversine is not called and distance is inf."""
+    def test_no_location_uses_inf_distance(self):
+        """When delivery has no lat/lng, every distance is inf."""
         d1 = _make_driver(name="A", current_lat=-26.0, current_lng=28.0)
         d2 = _make_driver(name="B", current_lat=-26.1, current_lng=28.1)
         db = self._setup_db_for_auto_assign([d1, d2], [2, 1])
@@ -276,24 +298,22 @@ class TestAutoAssign:
         result = auto_assign(db, delivery, "biz-1")  # no lat/lng
 
         # Without location, all distances are inf, so sort by active_count
-        mock_haversine.assert_not_called()
         assert result is d2  # fewer active deliveries
 
-    def test_driver_without_location_gets_inf_distance(self, mock_haversine):
+    def test_driver_without_location_gets_inf_distance(self):
         """Driver with no lat/lng should get inf distance even when delivery has location."""
         d_no_loc = _make_driver(name="NoLoc", current_lat=None, current_lng=None)
         d_with_loc = _make_driver(name="WithLoc", current_lat=-26.1, current_lng=28.1)
         db = self._setup_db_for_auto_assign([d_no_loc, d_with_loc], [0, 0])
 
-        mock_haversine.return_value = 5.0
         delivery = _make_delivery(status=DeliveryStatus.PENDING)
 
         result = auto_assign(db, delivery, "biz-1", delivery_lat=-26.2, delivery_lng=28.2)
 
-        # d_with_loc has finite distance (5.0), d_no_loc has inf
+        # d_with_loc has a finite distance, d_no_loc has inf
         assert result is d_with_loc
 
-    def test_single_candidate_selected(self, mock_haversine):
+    def test_single_candidate_selected(self):
         d1 = _make_driver(current_lat=None, current_lng=None)
         db = self._setup_db_for_auto_assign([d1], [0])
         delivery = _make_delivery(status=DeliveryStatus.PENDING)
@@ -304,6 +324,66 @@ class TestAutoAssign:
         assert delivery.driver_id == d1.id
 
 
+# ---------------------------------------------------------------------------
+# auto_assign_batch
+# ---------------------------------------------------------------------------
+
+class TestAutoAssignBatch:
+    def test_minimises_total_distance_instead_of_greedy(self):
+        # A sits between both deliveries, B is only near the second: greedy
+        # gives A the first delivery and sends B 30 km; the batch does not
+        d_a = _make_driver(name="A", current_lat=-26.00, current_lng=28.00, max_concurrent=1)
+        d_b = _make_driver(name="B", current_lat=-26.00, current_lng=28.30, max_concurrent=1)
+        db = _drivers_db([d_a, d_b], [0, 0])
+        first = _make_delivery()
+        second = _make_delivery()
+
+        result = auto_assign_batch(db, "biz-1", [
+            (first, -26.00, 28.02),
+            (second, -26.00, 28.27),
+        ])
+
+        assert result == {first.id: d_a, second.id: d_b}
+        assert first.status == DeliveryStatus.ASSIGNED
+        assert second.driver_id == d_b.id
+        db.commit.assert_called_once()
+
+    def test_respects_free_capacity(self):
+        d1 = _make_driver(current_lat=-26.0, current_lng=28.0, max_concurrent=3)
+        db = _drivers_db([d1], [1])
+        deliveries = [_make_delivery() for _ in range(3)]
+
+        result = auto_assign_batch(db, "biz-1", [(d, -26.0, 28.01) for d in deliveries])
+
+        assert sum(1 for driver in result.values() if driver is d1) == 2
+        assert list(result.values()).count(None) == 1
+
+    def test_without_locations_spreads_by_workload(self):
+        busy = _make_driver(name="Busy")
+        idle = _make_driver(name="Idle")
+        db = _drivers_db([busy, idle], [3, 0])
+        deliveries = [_make_delivery() for _ in range(2)]
+
+        result = auto_assign_batch(db, "biz-1", [(d, None, None) for d in deliveries])
+
+        assert list(result.values()) == [idle, idle]
+
+    def test_no_drivers_assigns_nothing(self):
+        db = _drivers_db([], [])
+        delivery = _make_delivery()
+
+        assert auto_assign_batch(db, "biz-1", [(delivery, None, None)]) == {delivery.id: None}
+        db.commit.assert_not_called()
+
+    def test_min_cost_assignment_handles_more_columns(self):
+        import numpy as np
+
+        # Row 1 would pick column 1 alone; the optimum moves it to column 0
+        cost = np.array([[4.0, 1.0, 3.0], [1.0, 0.0, 5.0]])
+
+        assert sorted(_min_cost_assignment(cost)) == [(0, 1), (1, 0)]
+
+
 # ---------------------------------------------------------------------------
 # reassign_driver
 # ---------------------------------------------------------------------------
@@ -399,11 +479,7 @@ class TestReassignDriver:
 
 class TestGetDriverWorkload:
     def _setup_db(self, drivers, counts):
-        db = MagicMock()
-        driver_chain = _mock_chain(drivers, "all")
-        count_chains = [_mock_chain(c, "scalar") for c in counts]
-        db.query.side_effect = [driver_chain] + count_chains
-        return db
+        return _drivers_db(drivers, counts)
 
     def test_returns_workload_for_all_active_drivers(self):
         d1 = _make_driver(name="Alice", phone="111", is_available=True, max_concurrent=5)
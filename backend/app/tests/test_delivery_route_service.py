@@ -0,0 +1,179 @@
+"""Tests for multi-drop route planning and learned zone speeds."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.delivery import Delivery
+from app.models.delivery_tracking import DeliveryTracking
+from app.services import delivery_route_service
+from app.services.delivery_route_service import (
+    DEFAULT_SPEED_KMH,
+    STOP_MINUTES,
+    ZoneSpeeds,
+    _nearest_neighbour,
+    _order_located,
+    insertion_eta_minutes,
+    learn_zone_speeds,
+    plan_route,
+)
+
+BUSINESS = uuid.uuid4()
+NOW = datetime(2026, 6, 1, 18, 0, tzinfo=timezone.utc)
+ORIGIN = (-26.0, 28.0)
+
+
+def _stop(lng, lat=-26.0, zone_id=None):
+    return {"delivery_id": str(uuid.uuid4()), "lat": lat, "lng": lng, "zone_id": zone_id}
+
+
+def _length(origin, order):
+    points = [origin] + [(s["lat"], s["lng"]) for s in order]
+    return sum(
+        delivery_route_service.haversine_km_many(a[0], a[1], b[0], b[1])
+        for a, b in zip(points, points[1:])
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_speeds():
+    delivery_route_service.clear_zone_speeds()
+    yield
+    delivery_route_service.clear_zone_speeds()
+
+
+class TestPlanRoute:
+    def test_orders_drops_and_accumulates_etas(self):
+        stops = [_stop(28.03), _stop(28.01), _stop(28.02)]
+
+        plan = plan_route(ORIGIN, stops, start=NOW)
+
+        assert [s["delivery_id"] for s in plan["stops"]] == [
+            stops[1]["delivery_id"], stops[2]["delivery_id"], stops[0]["delivery_id"],
+        ]
+        assert [s["sequence"] for s in plan["stops"]] == [1, 2, 3]
+        first, second, third = plan["stops"]
+        leg_minutes = first["leg_km"] / DEFAULT_SPEED_KMH * 60
+        assert first["eta_minutes"] == round(leg_minutes)
+        assert third["cumulative_km"] == pytest.approx(plan["total_km"])
+        minutes = 2 * STOP_MINUTES + _length(ORIGIN, [stops[1], stops[2], stops[0]]) / DEFAULT_SPEED_KMH * 60
+        assert (third["eta"] - NOW).total_seconds() == pytest.approx(minutes * 60)
+
+    def test_zone_speeds_apply_to_the_leg_into_the_zone(self):
+        slow = _stop(28.05, zone_id="cbd")
+        speeds = ZoneSpeeds({"cbd": 10.0})
+
+        plan = plan_route(ORIGIN, [slow], speeds, start=NOW)
+
+        assert plan["stops"][0]["eta_minutes"] == round(plan["total_km"] / 10.0 * 60)
+
+    def test_unlocated_drops_go_last_and_unknown_origin_has_no_etas(self):
+        located, unlocated = _stop(28.01), _stop(None, lat=None)
+
+        plan = plan_route(None, [unlocated, located])
+
+        assert [s["delivery_id"] for s in plan["stops"]] == [located["delivery_id"], unlocated["delivery_id"]]
+        assert {s["eta_minutes"] for s in plan["stops"]} == {None}
+        assert plan["stops"][1]["leg_km"] is None
+        assert plan["total_minutes"] is None
+
+    def test_two_opt_never_loses_to_nearest_neighbour(self):
+        rng = np.random.default_rng(3)
+        for _ in range(20):
+            stops = [_stop(lng, lat) for lat, lng in zip(rng.uniform(-26.1, -25.9, 12), rng.uniform(27.9, 28.1, 12))]
+            order, _ = _order_located(ORIGIN, stops)
+
+            lats = np.array([ORIGIN[0]] + [s["lat"] for s in stops])
+            lngs = np.array([ORIGIN[1]] + [s["lng"] for s in stops])
+            dist = np.zeros((len(stops) + 2, len(stops) + 2))
+            dist[:-1, :-1] = delivery_route_service.haversine_km_many(
+                lats[:, None], lngs[:, None], lats[None, :], lngs[None, :]
+            )
+            greedy = [stops[node - 1] for node in _nearest_neighbour(dist)[1:-1]]
+
+            assert sorted(s["delivery_id"] for s in order) == sorted(s["delivery_id"] for s in stops)
+            assert _length(ORIGIN, order) <= _length(ORIGIN, greedy) + 1e-9
+
+
+class TestInsertion:
+    def test_free_driver_is_sooner_than_one_with_a_queue(self):
+        # The busy driver is closer but finishes its own drops first
+        new_drop = _stop(27.99)
+        busy_route = [_stop(28.01), _stop(28.02)]
+
+        busy = insertion_eta_minutes(ORIGIN, busy_route, new_drop)
+        free = insertion_eta_minutes((-26.0, 27.97), [], new_drop)
+
+        assert free < busy
+        direct = delivery_route_service.haversine_km_many(-26.0, 27.97, -26.0, 27.99) / DEFAULT_SPEED_KMH * 60
+        assert free == pytest.approx(direct)
+
+    def test_drop_on_the_way_is_inserted_before_later_drops(self):
+        on_the_way = _stop(28.01)
+
+        eta = insertion_eta_minutes(ORIGIN, [_stop(28.05)], on_the_way)
+
+        assert eta == pytest.approx(_length(ORIGIN, [on_the_way]) / DEFAULT_SPEED_KMH * 60)
+
+
+class TestLearnZoneSpeeds:
+    @pytest.fixture
+    def db(self, monkeypatch):
+        # delivery_tracking.location is Postgres JSONB; store it as JSON on SQLite
+        monkeypatch.setattr(DeliveryTracking.__table__.c.location, "type", JSON())
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine, tables=[Delivery.__table__, DeliveryTracking.__table__])
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+        engine.dispose()
+
+    def _drive(self, db, zone_id, km_per_minute, pings):
+        delivery = Delivery(
+            business_id=BUSINESS, order_id=uuid.uuid4(), zone_id=zone_id,
+            delivery_address="1 Main Rd", customer_phone="0820000000",
+        )
+        db.add(delivery)
+        db.flush()
+        lng_per_km = 1 / 100.0  # about 100 km per degree of longitude here
+        for i in range(pings):
+            db.add(DeliveryTracking(
+                delivery_id=delivery.id, status="in_transit",
+                location={"lat": -26.0, "lng": 28.0 + i * km_per_minute * lng_per_km},
+                recorded_at=NOW - timedelta(hours=1) + timedelta(minutes=i),
+            ))
+        db.commit()
+
+    def test_median_speed_per_zone_with_business_fallback(self, db):
+        cbd, suburb, quiet = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        self._drive(db, cbd, km_per_minute=0.25, pings=7)      # ~15 km/h
+        self._drive(db, suburb, km_per_minute=0.75, pings=7)   # ~45 km/h
+        self._drive(db, quiet, km_per_minute=0.5, pings=3)     # too few samples
+
+        speeds = learn_zone_speeds(db, BUSINESS, now=NOW)
+
+        assert speeds.for_zone(cbd) == pytest.approx(15, rel=0.05)
+        assert speeds.for_zone(suburb) == pytest.approx(45, rel=0.05)
+        assert speeds.for_zone(quiet) == speeds.default
+        assert 15 < speeds.default < 45
+
+    def test_no_history_uses_the_default_speed(self, db):
+        assert learn_zone_speeds(db, BUSINESS, now=NOW).default == DEFAULT_SPEED_KMH
+
+    def test_learned_speeds_are_cached(self, db):
+        first = delivery_route_service.get_zone_speeds(db, BUSINESS)
+        self._drive(db, uuid.uuid4(), km_per_minute=0.25, pings=7)
+
+        assert delivery_route_service.get_zone_speeds(db, BUSINESS) is first
@@ -326,8 +326,10 @@ class TestAutoAssignment:
         db = MagicMock()
         # list available drivers
         db.query.return_value.filter.return_value.all.return_value = [d1, d2]
-        # count queries: d1 has 3, d2 has 1
-        db.query.return_value.filter.return_value.scalar.side_effect = [3, 1]
+        # grouped count query: d1 has 3, d2 has 1
+        db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            (d1.id, 3), (d2.id, 1),
+        ]
 
         delivery = _make_delivery(business_id=biz_id)
 
@@ -351,7 +353,9 @@ class TestAutoAssignment:
 
         db = MagicMock()
         db.query.return_value.filter.return_value.all.return_value = [d1]
-        db.query.return_value.filter.return_value.scalar.return_value = 2  # at max
+        db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            (d1.id, 2),  # at max
+        ]
 
         candidates = get_available_drivers(db, "biz-1")
         assert len(candidates) == 0
@@ -363,7 +367,9 @@ class TestAutoAssignment:
 
         db = MagicMock()
         db.query.return_value.filter.return_value.all.return_value = [d1, d2]
-        db.query.return_value.filter.return_value.scalar.side_effect = [2, 1]
+        db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            (d1.id, 2), (d2.id, 1),
+        ]
 
         result = get_driver_workload(db, "biz-1")
         assert len(result) == 2
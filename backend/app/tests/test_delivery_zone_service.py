@@ -8,6 +8,8 @@ from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
 
+import pytest
+
 from app.models.delivery import DeliveryZone
 from app.services.delivery_zone_service import (
     _point_in_polygon,
@@ -15,6 +17,7 @@ from app.services.delivery_zone_service import (
     match_zone_by_coords,
     match_zone_by_postcode,
 )
+from app.services.geo_index import clear_zone_indexes
 
 BIZ = str(uuid4())
 
@@ -130,19 +133,23 @@ class TestPointInPolygon:
 # ===================================================================
 # match_zone_by_coords
 # ===================================================================
-@patch("app.services.delivery_zone_service._haversine_km")
 class TestMatchZoneByCoords:
-    """Tests for coordinate-based zone matching."""
+    """Tests for coordinate-based zone matching (through the zone index)."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_indexes(self):
+        clear_zone_indexes()
+        yield
+        clear_zone_indexes()
 
-    def test_returns_none_when_no_zones(self, mock_hav):
+    def test_returns_none_when_no_zones(self):
         db = MagicMock()
         db.query.return_value = _chain(rows=[])
         assert match_zone_by_coords(db, BIZ, -26.0, 28.0) is None
 
     # -- Radius matching --------------------------------------------------
 
-    def test_radius_match_within_range(self, mock_hav):
-        mock_hav.return_value = 3.0
+    def test_radius_match_within_range(self):
         zone = _mock_zone(
             zone_type="radius",
             center_lat=Decimal("-26.0"),
@@ -153,8 +160,7 @@ class TestMatchZoneByCoords:
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, -26.01, 28.01) is zone
 
-    def test_radius_no_match_outside_range(self, mock_hav):
-        mock_hav.return_value = 10.0
+    def test_radius_no_match_outside_range(self):
         zone = _mock_zone(
             zone_type="radius",
             center_lat=Decimal("-26.0"),
@@ -165,9 +171,8 @@ class TestMatchZoneByCoords:
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, -26.5, 28.5) is None
 
-    def test_radius_closest_wins(self, mock_hav):
+    def test_radius_closest_wins(self):
         """When multiple radius zones match, the closest is returned."""
-        mock_hav.side_effect = [8.0, 2.0]  # zone_far first, zone_near second
         zone_far = _mock_zone(
             name="far",
             zone_type="radius",
@@ -178,8 +183,8 @@ class TestMatchZoneByCoords:
         zone_near = _mock_zone(
             name="near",
             zone_type="radius",
-            center_lat=Decimal("-26.0"),
-            center_lng=Decimal("28.0"),
+            center_lat=Decimal("-26.01"),
+            center_lng=Decimal("28.01"),
             radius_km=Decimal("5.0"),
         )
         db = MagicMock()
@@ -187,9 +192,8 @@ class TestMatchZoneByCoords:
         result = match_zone_by_coords(db, BIZ, -26.01, 28.01)
         assert result.name == "near"
 
-    def test_radius_exact_boundary(self, mock_hav):
+    def test_radius_exact_boundary(self):
         """Distance == radius_km should still match (<=)."""
-        mock_hav.return_value = 5.0
         zone = _mock_zone(
             zone_type="radius",
             center_lat=Decimal("-26.0"),
@@ -200,7 +204,7 @@ class TestMatchZoneByCoords:
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, -26.0, 28.0) is zone
 
-    def test_radius_skipped_when_center_zero(self, mock_hav):
+    def test_radius_skipped_when_center_zero(self):
         """Radius zone with 0 center_lat/lng is skipped."""
         zone = _mock_zone(
             zone_type="radius",
@@ -212,9 +216,8 @@ class TestMatchZoneByCoords:
         db.query.return_value = _chain(rows=[zone])
         result = match_zone_by_coords(db, BIZ, -26.0, 28.0)
         assert result is None
-        mock_hav.assert_not_called()
 
-    def test_radius_skipped_when_radius_zero(self, mock_hav):
+    def test_radius_skipped_when_radius_zero(self):
         """Radius zone with radius_km=0 is skipped."""
         zone = _mock_zone(
             zone_type="radius",
@@ -226,9 +229,8 @@ class TestMatchZoneByCoords:
         db.query.return_value = _chain(rows=[zone])
         result = match_zone_by_coords(db, BIZ, -26.0, 28.0)
         assert result is None
-        mock_hav.assert_not_called()
 
-    def test_radius_skipped_when_none_values(self, mock_hav):
+    def test_radius_skipped_when_none_values(self):
         """Radius zone with None center/radius is skipped."""
         zone = _mock_zone(
             zone_type="radius",
@@ -239,36 +241,35 @@ class TestMatchZoneByCoords:
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, -26.0, 28.0) is None
-        mock_hav.assert_not_called()
 
     # -- Polygon matching -------------------------------------------------
 
-    def test_polygon_match(self, mock_hav):
+    def test_polygon_match(self):
         zone = _mock_zone(zone_type="polygon", boundary=SQUARE)
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, 5.0, 5.0) is zone
 
-    def test_polygon_no_match(self, mock_hav):
+    def test_polygon_no_match(self):
         zone = _mock_zone(zone_type="polygon", boundary=SQUARE)
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, 15.0, 15.0) is None
 
-    def test_polygon_boundary_too_few_points_skipped(self, mock_hav):
+    def test_polygon_boundary_too_few_points_skipped(self):
         """Polygon with < 3 vertices is skipped."""
         zone = _mock_zone(zone_type="polygon", boundary=[[0, 0], [1, 1]])
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, 0.5, 0.5) is None
 
-    def test_polygon_boundary_none_skipped(self, mock_hav):
+    def test_polygon_boundary_none_skipped(self):
         zone = _mock_zone(zone_type="polygon", boundary=None)
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, 5.0, 5.0) is None
 
-    def test_polygon_boundary_not_list_skipped(self, mock_hav):
+    def test_polygon_boundary_not_list_skipped(self):
         zone = _mock_zone(zone_type="polygon", boundary="invalid")
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
@@ -276,13 +277,13 @@ class TestMatchZoneByCoords:
 
     # -- Flat fallback ----------------------------------------------------
 
-    def test_flat_fallback(self, mock_hav):
+    def test_flat_fallback(self):
         zone = _mock_zone(zone_type="flat")
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, 5.0, 5.0) is zone
 
-    def test_flat_first_only(self, mock_hav):
+    def test_flat_first_only(self):
         """Only the first flat zone is used as fallback."""
         zone1 = _mock_zone(name="flat1", zone_type="flat")
         zone2 = _mock_zone(name="flat2", zone_type="flat")
@@ -292,8 +293,7 @@ class TestMatchZoneByCoords:
 
     # -- Priority: radius > polygon > flat --------------------------------
 
-    def test_radius_beats_polygon(self, mock_hav):
-        mock_hav.return_value = 1.0
+    def test_radius_beats_polygon(self):
         r_zone = _mock_zone(
             name="radius",
             zone_type="radius",
@@ -307,8 +307,7 @@ class TestMatchZoneByCoords:
         result = match_zone_by_coords(db, BIZ, 5.0, 5.0)
         assert result.name == "radius"
 
-    def test_radius_beats_flat(self, mock_hav):
-        mock_hav.return_value = 1.0
+    def test_radius_beats_flat(self):
         r_zone = _mock_zone(
             name="radius",
             zone_type="radius",
@@ -322,7 +321,7 @@ class TestMatchZoneByCoords:
         result = match_zone_by_coords(db, BIZ, 5.0, 5.0)
         assert result.name == "radius"
 
-    def test_polygon_beats_flat(self, mock_hav):
+    def test_polygon_beats_flat(self):
         p_zone = _mock_zone(name="polygon", zone_type="polygon", boundary=SQUARE)
         f_zone = _mock_zone(name="flat", zone_type="flat")
         db = MagicMock()
@@ -330,8 +329,7 @@ class TestMatchZoneByCoords:
         result = match_zone_by_coords(db, BIZ, 5.0, 5.0)
         assert result.name == "polygon"
 
-    def test_falls_through_to_flat_when_radius_and_polygon_miss(self, mock_hav):
-        mock_hav.return_value = 100.0  # outside radius
+    def test_falls_through_to_flat_when_radius_and_polygon_miss(self):
         r_zone = _mock_zone(
             name="radius",
             zone_type="radius",
@@ -349,15 +347,14 @@ class TestMatchZoneByCoords:
 
     # -- zone_type normalization ------------------------------------------
 
-    def test_zone_type_none_treated_as_flat(self, mock_hav):
+    def test_zone_type_none_treated_as_flat(self):
         zone = _mock_zone(zone_type=None)
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
         assert match_zone_by_coords(db, BIZ, 5.0, 5.0) is zone
 
-    def test_zone_type_uppercase_radius(self, mock_hav):
+    def test_zone_type_uppercase_radius(self):
         """Zone type is lowered before comparison."""
-        mock_hav.return_value = 1.0
         zone = _mock_zone(
             zone_type="RADIUS",
             center_lat=Decimal("-26.0"),
@@ -370,7 +367,7 @@ class TestMatchZoneByCoords:
 
     # -- Postcode zones are ignored in coord matching ---------------------
 
-    def test_postcode_zone_ignored(self, mock_hav):
+    def test_postcode_zone_ignored(self):
         zone = _mock_zone(zone_type="postcode", postcodes=["2000"])
         db = MagicMock()
         db.query.return_value = _chain(rows=[zone])
@@ -0,0 +1,167 @@
+"""Tests for the single-query floor state and its per-business cache."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import JSON, create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.order import Order, OrderItem, OrderStatus, PaymentStatus
+from app.models.restaurant_table import RestaurantTable, TableStatus
+from app.services import floor_state
+from app.services.floor_state import with_elapsed
+from app.services.table_service import TableService
+
+BUSINESS = uuid.uuid4()
+OPENED = datetime(2026, 6, 1, 18, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    # orders.tags is a Postgres ARRAY; store it as JSON on SQLite
+    monkeypatch.setattr(Order.__table__.c.tags, "type", JSON())
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=[
+        RestaurantTable.__table__, Order.__table__, OrderItem.__table__,
+    ])
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def _table(db, number, **kwargs):
+    table = RestaurantTable(business_id=kwargs.pop("business_id", BUSINESS), table_number=number, **kwargs)
+    db.add(table)
+    db.flush()
+    return table
+
+
+def _order(db, table, opened_at, quantities=(1,), **kwargs):
+    order = Order(
+        business_id=table.business_id, table_id=table.id,
+        order_number=f"ORD-{uuid.uuid4().hex[:8]}", total=kwargs.pop("total", 100),
+        created_at=opened_at, **kwargs,
+    )
+    db.add(order)
+    db.flush()
+    for quantity in quantities:
+        db.add(OrderItem(order_id=order.id, name="Burger", unit_price=50, quantity=quantity))
+    db.flush()
+    return order
+
+
+class TestFloorStateQuery:
+    def test_one_row_per_table_with_its_latest_open_order(self, db):
+        t1 = _table(db, "T1", capacity=4, section="Patio", status=TableStatus.OCCUPIED, position_x=10)
+        t2 = _table(db, "T2", capacity=2)
+        _table(db, "T3", is_active=False)
+        _table(db, "T4", business_id=uuid.uuid4())
+        _order(db, t1, OPENED - timedelta(hours=3), total=10)
+        latest = _order(db, t1, OPENED, quantities=(2, 3), total=250)
+        _order(db, t1, OPENED + timedelta(minutes=5), status=OrderStatus.CANCELLED)
+        _order(db, t2, OPENED, payment_status=PaymentStatus.PAID)
+        db.commit()
+
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+        rows = TableService(db).get_floor_state(BUSINESS)
+
+        assert len(statements) == 1
+        assert [r["table_number"] for r in rows] == ["T1", "T2"]
+        t1_row, t2_row = rows
+        assert t1_row["order_id"] == str(latest.id)
+        assert t1_row["order_total"] == 250.0
+        assert t1_row["order_item_count"] == 5
+        assert t1_row["capacity"] == 4
+        assert t1_row["section"] == "Patio"
+        assert t1_row["status"] == "occupied"
+        assert t1_row["position_x"] == 10.0
+        assert datetime.fromisoformat(t1_row["order_opened_at"]).replace(tzinfo=timezone.utc) == OPENED
+        assert t2_row["has_active_order"] is False
+        assert t2_row["order_total"] is None
+        assert t2_row["order_item_count"] == 0
+        # Cached as JSON as is
+        assert json.loads(json.dumps(rows)) == rows
+
+    def test_elapsed_minutes_is_computed_when_served(self):
+        rows = [
+            {"id": "a", "order_opened_at": OPENED.isoformat()},
+            {"id": "b", "order_opened_at": None},
+        ]
+
+        served = with_elapsed(rows, now=OPENED + timedelta(minutes=42, seconds=30))
+
+        assert [r["elapsed_minutes"] for r in served] == [42, None]
+        assert "elapsed_minutes" not in rows[0]
+
+
+class TestFloorStateCache:
+    @pytest.mark.asyncio
+    async def test_hit_skips_the_query(self):
+        rows = [{"id": "t1", "table_number": "T1"}]
+        compute = MagicMock()
+
+        with patch.object(floor_state.redis_manager, "get", AsyncMock(return_value=json.dumps(rows))):
+            assert await floor_state.get_floor_state(BUSINESS, compute) == rows
+
+        compute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_miss_computes_and_stores(self):
+        rows = [{"id": "t1", "table_number": "T1"}]
+        redis_set = AsyncMock(return_value=True)
+
+        with patch.object(floor_state.redis_manager, "get", AsyncMock(return_value=None)), \
+                patch.object(floor_state.redis_manager, "set", redis_set):
+            assert await floor_state.get_floor_state(BUSINESS, lambda: rows) == rows
+
+        key, raw = redis_set.await_args.args
+        assert key == f"bizpilot:floor_state:{BUSINESS}"
+        assert json.loads(raw) == rows
+        assert redis_set.await_args.kwargs["ttl_seconds"] == floor_state.settings.FLOOR_STATE_TTL_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_commits_to_tables_and_table_orders_invalidate(self, session_factory):
+        other_business = uuid.uuid4()
+        redis_delete = AsyncMock(return_value=True)
+
+        with patch.object(floor_state.redis_manager, "delete", redis_delete):
+            await floor_state.start_floor_state_invalidation()
+            try:
+                db = session_factory()
+                table = _table(db, "T1")
+                db.commit()
+                db.add(Order(business_id=other_business, order_number="TAKEAWAY-1", total=5))
+                db.commit()
+                table.status = TableStatus.DIRTY
+                db.rollback()
+                db.close()
+                await _drain()
+            finally:
+                await floor_state.stop_floor_state_invalidation()
+
+        assert [call.args[0] for call in redis_delete.await_args_list] == [f"bizpilot:floor_state:{BUSINESS}"]
+
+
+async def _drain():
+    for _ in range(3):
+        await asyncio.sleep(0)
@@ -13,13 +13,14 @@ import os
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 os.environ.setdefault("SECRET_KEY", "test-secret-key")
 
 import pytest
 
 from app.services.general_ledger_service import GeneralLedgerService
+from app.services.gl_balance_snapshot_service import GLBalanceSnapshotService
 from app.models.general_ledger import (
     AccountType,
     JournalEntryStatus,
@@ -34,6 +35,13 @@ BIZ = str(uuid.uuid4())
 USER = str(uuid.uuid4())
 
 
+def _report_rows(rows):
+    """Patch the per-account totals query the reports read from."""
+    totals = MagicMock()
+    totals.return_value.order_by.return_value.all.return_value = rows
+    return patch.object(GLBalanceSnapshotService, "account_totals", totals)
+
+
 def _make_service():
     db = MagicMock()
     return GeneralLedgerService(db), db
@@ -228,10 +236,8 @@ class TestFinancialReports:
     def test_trial_balance_empty(self):
         """Trial balance with no posted entries returns empty."""
         svc, db = _make_service()
-        chain = db.query.return_value.join.return_value.join.return_value.filter.return_value
-        chain.group_by.return_value.order_by.return_value.all.return_value = []
-
-        result = svc.get_trial_balance(BIZ)
+        with _report_rows([]):
+            result = svc.get_trial_balance(BIZ)
         assert result["rows"] == []
         assert result["total_debit"] == Decimal("0")
         assert result["total_credit"] == Decimal("0")
@@ -258,10 +264,8 @@ class TestFinancialReports:
         row_revenue.total_debit = Decimal("0")
         row_revenue.total_credit = Decimal("1000")
 
-        chain = db.query.return_value.join.return_value.join.return_value.filter.return_value
-        chain.group_by.return_value.order_by.return_value.all.return_value = [row_asset, row_revenue]
-
-        result = svc.get_trial_balance(BIZ)
+        with _report_rows([row_asset, row_revenue]):
+            result = svc.get_trial_balance(BIZ)
         assert result["total_debit"] == result["total_credit"]
         assert len(result["rows"]) == 2
 
@@ -287,11 +291,9 @@ class TestFinancialReports:
         row_exp.total_debit = Decimal("2000")
         row_exp.total_credit = Decimal("0")
 
-        chain = db.query.return_value.join.return_value.join.return_value.filter.return_value
-        chain.group_by.return_value.order_by.return_value.all.return_value = [row_rev, row_exp]
-
         now = datetime.now(timezone.utc)
-        result = svc.get_income_statement(BIZ, now, now)
+        with _report_rows([row_rev, row_exp]):
+            result = svc.get_income_statement(BIZ, now, now)
         assert result["total_revenue"] == Decimal("5000")
         assert result["total_expenses"] == Decimal("2000")
         assert result["net_income"] == Decimal("3000")
@@ -299,10 +301,8 @@ class TestFinancialReports:
     def test_balance_sheet_empty(self):
         """Balance sheet with no data returns empty categories."""
         svc, db = _make_service()
-        chain = db.query.return_value.join.return_value.join.return_value.filter.return_value
-        chain.group_by.return_value.order_by.return_value.all.return_value = []
-
-        result = svc.get_balance_sheet(BIZ)
+        with _report_rows([]):
+            result = svc.get_balance_sheet(BIZ)
         assert result["assets"] == []
         assert result["liabilities"] == []
         assert result["equity"] == []
@@ -339,12 +339,10 @@ class TestFinancialReports:
         row_equity.total_debit = Decimal("0")
         row_equity.total_credit = Decimal("7000")
 
-        chain = db.query.return_value.join.return_value.join.return_value.filter.return_value
-        chain.group_by.return_value.order_by.return_value.all.return_value = [
+        with _report_rows([
             row_asset, row_liability, row_equity,
-        ]
-
-        result = svc.get_balance_sheet(BIZ)
+        ]):
+            result = svc.get_balance_sheet(BIZ)
         assert result["total_assets"] == Decimal("10000")
         assert result["total_liabilities"] == Decimal("3000")
         assert result["total_equity"] == Decimal("7000")
@@ -0,0 +1,109 @@
+"""Tests for the delivery zone index (app.services.geo_index)."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.services import geo_index
+from app.services.delivery_fee_service import _haversine_km
+from app.services.delivery_zone_service import _point_in_polygon
+from app.services.geo_index import ZoneIndex, get_zone_index, haversine_km_many
+
+SQUARE = [[-26.0, 28.0], [-26.0, 28.1], [-26.1, 28.1], [-26.1, 28.0]]
+
+
+def _zone(zone_type, **kwargs):
+    defaults = {"center_lat": None, "center_lng": None, "radius_km": None, "boundary": None}
+    return SimpleNamespace(id=uuid.uuid4(), zone_type=zone_type, **{**defaults, **kwargs})
+
+
+@pytest.fixture(autouse=True)
+def _clear_indexes():
+    geo_index.clear_zone_indexes()
+    yield
+    geo_index.clear_zone_indexes()
+
+
+class TestGeometry:
+    def test_vectorised_haversine_matches_scalar(self):
+        lats = np.array([-26.2, -33.9, np.nan])
+        lngs = np.array([28.0, 18.4, 28.0])
+
+        distances = haversine_km_many(-26.1, 28.1, lats, lngs)
+
+        assert distances[0] == pytest.approx(_haversine_km(-26.1, 28.1, -26.2, 28.0))
+        assert distances[1] == pytest.approx(_haversine_km(-26.1, 28.1, -33.9, 18.4))
+        assert np.isnan(distances[2])
+
+    def test_polygon_matches_the_reference_ray_cast(self):
+        polygon = [[-26.0, 28.0], [-26.0, 28.2], [-26.1, 28.05], [-26.2, 28.2], [-26.2, 28.0]]
+        index = ZoneIndex([_zone("polygon", boundary=polygon)])
+        rng = np.random.default_rng(7)
+
+        for lat, lng in zip(rng.uniform(-26.25, -25.95, 300), rng.uniform(27.95, 28.25, 300)):
+            expected = _point_in_polygon(lat, lng, polygon)
+            assert (index.match(lat, lng) is not None) == expected
+
+
+class TestZoneIndex:
+    def test_match_order_radius_then_polygon_then_flat(self):
+        flat = _zone("flat")
+        polygon = _zone("polygon", boundary=SQUARE)
+        far = _zone("radius", center_lat=-26.05, center_lng=28.10, radius_km=20)
+        near = _zone("radius", center_lat=-26.05, center_lng=28.05, radius_km=20)
+        index = ZoneIndex([flat, polygon, far, near])
+
+        assert index.match(-26.05, 28.05) == near.id
+        assert index.match(-26.05, 28.05 + 0.5) == flat.id
+        assert ZoneIndex([flat, polygon]).match(-26.05, 28.05) == polygon.id
+
+    def test_lookups_only_test_nearby_zones(self):
+        zones = [
+            _zone("radius", center_lat=-26.0 - i * 0.5, center_lng=28.0, radius_km=3)
+            for i in range(50)
+        ]
+        index = ZoneIndex(zones)
+
+        assert index.match(-26.0 - 10 * 0.5, 28.01) == zones[10].id
+        assert len(index._grid[geo_index._cell(-31.0, 28.01)]) == 1
+        assert index._wide == []
+
+    def test_huge_zones_are_checked_everywhere(self):
+        country = _zone("radius", center_lat=-29.0, center_lng=25.0, radius_km=900)
+        index = ZoneIndex([country])
+
+        assert index._wide == [("r", 0)]
+        assert index.match(-26.2, 28.0) == country.id
+
+
+class TestGetZoneIndex:
+    def _db(self, zones, updated_at):
+        db = MagicMock()
+        query = db.query.return_value.filter.return_value
+        query.with_entities.return_value.one.side_effect = lambda: (len(zones), updated_at[0])
+        query.all.side_effect = lambda: list(zones)
+        return db, query
+
+    def test_reuses_the_index_until_zones_change(self):
+        zones = [_zone("flat")]
+        updated_at = [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+        db, query = self._db(zones, updated_at)
+
+        first, loaded = get_zone_index(db, "biz-1")
+        again, loaded_again = get_zone_index(db, "biz-1")
+        assert again is first
+        assert loaded == {zones[0].id: zones[0]}
+        assert loaded_again == {}
+        assert query.all.call_count == 1
+
+        updated_at[0] += timedelta(minutes=1)
+        rebuilt, _ = get_zone_index(db, "biz-1")
+        assert rebuilt is not first
+        assert query.all.call_count == 2
@@ -0,0 +1,270 @@
+"""Tests for monthly GL balance snapshots and snapshot-backed reports."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.general_ledger import (
+    ChartOfAccount,
+    GLAccountBalance,
+    JournalEntry,
+    JournalLine,
+)
+from app.models.user import User
+from app.services.general_ledger_service import GeneralLedgerService
+from app.services.gl_balance_snapshot_service import (
+    GLBalanceSnapshotService,
+    period_index,
+    period_of,
+    period_start,
+)
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__,
+        ChartOfAccount.__table__,
+        JournalEntry.__table__,
+        JournalLine.__table__,
+        GLAccountBalance.__table__,
+    ])
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def business_id():
+    return uuid.uuid4()
+
+
+@pytest.fixture
+def ledger(db, business_id):
+    service = GeneralLedgerService(db)
+    accounts = {
+        "cash": service.create_account(business_id, "1000", "Cash", "asset"),
+        "payable": service.create_account(business_id, "2000", "Payable", "liability", normal_balance="credit"),
+        "sales": service.create_account(business_id, "4000", "Sales", "revenue", normal_balance="credit"),
+        "rent": service.create_account(business_id, "5000", "Rent", "expense"),
+    }
+    return service, accounts
+
+
+def _post(service, business_id, when, debit_account, credit_account, amount, user_id=None):
+    entry = service.create_journal_entry(
+        business_id,
+        f"Entry {when:%Y-%m-%d}",
+        [
+            {"account_id": debit_account.id, "debit": amount, "credit": 0},
+            {"account_id": credit_account.id, "debit": 0, "credit": amount},
+        ],
+    )
+    entry.entry_date = when
+    service.db.commit()
+    return service.post_journal_entry(entry.id, business_id, user_id)
+
+
+def _raw_totals(db, business_id, start=None, end=None):
+    """Reference per-account totals straight from the journal lines."""
+    totals = {}
+    for line, entry in db.query(JournalLine, JournalEntry).join(JournalEntry, JournalLine.entry_id == JournalEntry.id):
+        when = (entry.entry_date or entry.created_at).replace(tzinfo=timezone.utc)
+        if entry.status.value != "posted" or entry.business_id != business_id:
+            continue
+        if (start and when < start) or (end and when > end):
+            continue
+        debit, credit = totals.get(line.account_id, (Decimal("0"), Decimal("0")))
+        totals[line.account_id] = (debit + line.debit, credit + line.credit)
+    return totals
+
+
+def _report_totals(snapshots, business_id, start=None, end=None):
+    return {
+        row.account_id: (Decimal(str(row.total_debit)), Decimal(str(row.total_credit)))
+        for row in snapshots.account_totals(business_id, start=start, end=end).all()
+    }
+
+
+class TestPeriods:
+    def test_period_helpers(self):
+        sast = timezone(timedelta(hours=2))
+        assert period_of(datetime(2026, 1, 31, 23, 30)) == (2026, 1)
+        assert period_of(datetime(2026, 2, 1, 1, 0, tzinfo=sast)) == (2026, 1)
+        assert period_start(period_index((2026, 12)) + 1) == _utc(2027, 1, 1)
+
+
+class TestSnapshotMaintenance:
+    def test_posting_writes_running_monthly_balances(self, db, business_id, ledger):
+        service, acct = ledger
+        _post(service, business_id, _utc(2026, 1, 10), acct["cash"], acct["sales"], "100")
+        _post(service, business_id, _utc(2026, 1, 20), acct["cash"], acct["sales"], "50")
+        _post(service, business_id, _utc(2026, 3, 5), acct["rent"], acct["cash"], "30")
+
+        cash = {
+            (r.period_year, r.period_month): r
+            for r in db.query(GLAccountBalance).filter(GLAccountBalance.account_id == acct["cash"].id)
+        }
+        assert cash[(2026, 1)].debit_total == Decimal("150")
+        assert cash[(2026, 1)].closing_balance == Decimal("150")
+        assert cash[(2026, 3)].opening_balance == Decimal("150")
+        assert cash[(2026, 3)].credit_total == Decimal("30")
+        assert cash[(2026, 3)].closing_balance == Decimal("120")
+
+        sales = db.query(GLAccountBalance).filter(GLAccountBalance.account_id == acct["sales"].id).one()
+        assert sales.closing_balance == Decimal("150")  # credit-normal
+
+        assert GLBalanceSnapshotService(db).verify(business_id)["mismatches"] == []
+
+    def test_backdated_entry_shifts_later_months(self, db, business_id, ledger):
+        service, acct = ledger
+        _post(service, business_id, _utc(2026, 3, 5), acct["cash"], acct["sales"], "40")
+        _post(service, business_id, _utc(2026, 1, 5), acct["cash"], acct["sales"], "10")
+
+        march = db.query(GLAccountBalance).filter(
+            GLAccountBalance.account_id == acct["cash"].id,
+            GLAccountBalance.period_month == 3,
+        ).one()
+        db.refresh(march)
+        assert march.opening_balance == Decimal("10")
+        assert march.closing_balance == Decimal("50")
+        assert GLBalanceSnapshotService(db).verify(business_id)["mismatches"] == []
+
+    def test_voiding_posted_entry_reverses_snapshot(self, db, business_id, ledger):
+        service, acct = ledger
+        keep = _post(service, business_id, _utc(2026, 2, 1), acct["cash"], acct["sales"], "70")
+        voided = _post(service, business_id, _utc(2026, 2, 2), acct["rent"], acct["payable"], "25")
+
+        service.void_journal_entry(voided.id, business_id)
+
+        assert GLBalanceSnapshotService(db).verify(business_id)["mismatches"] == []
+        trial = service.get_trial_balance(business_id)
+        assert {r["account_code"] for r in trial["rows"]} == {"1000", "4000"}
+        assert keep.status.value == "posted"
+
+    def test_voiding_draft_leaves_snapshots_alone(self, db, business_id, ledger):
+        service, acct = ledger
+        draft = service.create_journal_entry(
+            business_id, "Draft",
+            [
+                {"account_id": acct["cash"].id, "debit": 5, "credit": 0},
+                {"account_id": acct["sales"].id, "debit": 0, "credit": 5},
+            ],
+        )
+        service.void_journal_entry(draft.id, business_id)
+        assert db.query(GLAccountBalance).count() == 0
+
+
+class TestSnapshotReads:
+    @pytest.fixture
+    def history(self, db, business_id, ledger):
+        service, acct = ledger
+        postings = [
+            (_utc(2025, 11, 15), "cash", "sales", "500"),
+            (_utc(2025, 12, 31, 23, 59), "rent", "cash", "120"),
+            (_utc(2026, 1, 1), "cash", "sales", "80"),
+            (_utc(2026, 1, 14, 12), "rent", "payable", "60"),
+            (_utc(2026, 2, 3), "payable", "cash", "60"),
+            (_utc(2026, 2, 17), "cash", "sales", "25"),
+        ]
+        for when, debit, credit, amount in postings:
+            _post(service, business_id, when, acct[debit], acct[credit], amount)
+        return service, acct
+
+    @pytest.mark.parametrize("start,end", [
+        (None, None),
+        (None, _utc(2026, 1, 14, 12)),
+        (None, _utc(2026, 1, 1)),
+        (_utc(2025, 12, 1), _utc(2026, 2, 10)),
+        (_utc(2025, 11, 20), _utc(2026, 1, 31, 23, 59, 59)),
+        (_utc(2026, 1, 2), _utc(2026, 1, 20)),
+        (_utc(2026, 1, 1), None),
+    ])
+    def test_totals_match_raw_lines(self, db, business_id, history, start, end):
+        snapshots = GLBalanceSnapshotService(db)
+        assert _report_totals(snapshots, business_id, start, end) == _raw_totals(db, business_id, start, end)
+
+    def test_undated_entry_counts_from_created_at(self, db, business_id, history):
+        service, acct = history
+        entry = service.create_journal_entry(
+            business_id,
+            "Undated",
+            [
+                {"account_id": acct["cash"].id, "debit": 7, "credit": 0},
+                {"account_id": acct["sales"].id, "debit": 0, "credit": 7},
+            ],
+        )
+        entry.entry_date = None
+        entry.created_at = _utc(2026, 1, 10)
+        db.commit()
+        service.post_journal_entry(entry.id, business_id, None)
+
+        snapshots = GLBalanceSnapshotService(db)
+        for start, end in [(_utc(2026, 1, 2), _utc(2026, 1, 20)), (_utc(2025, 12, 15), _utc(2026, 2, 10))]:
+            cash = _report_totals(snapshots, business_id, start, end)[acct["cash"].id]
+            assert cash == _raw_totals(db, business_id, start, end)[acct["cash"].id]
+        assert snapshots.verify(business_id)["mismatches"] == []
+
+    def test_reports_read_snapshots_for_closed_months(self, db, business_id, history):
+        service, acct = history
+        # Corrupt a closed month: the report follows the snapshot, verify catches it
+        snapshot = db.query(GLAccountBalance).filter(
+            GLAccountBalance.account_id == acct["cash"].id,
+            GLAccountBalance.period_year == 2025,
+            GLAccountBalance.period_month == 11,
+        ).one()
+        snapshot.debit_total = Decimal("499")
+        db.commit()
+
+        balance = service.get_account_balance(acct["cash"].id, business_id, as_of=_utc(2026, 1, 10))
+        assert balance["debit_total"] == Decimal("579")
+
+        result = service.verify_account_balances(business_id, repair=True)
+        assert result["repaired"] is True
+        assert {m["field"] for m in result["mismatches"]} == {"debit_total"}
+
+        balance = service.get_account_balance(acct["cash"].id, business_id, as_of=_utc(2026, 1, 10))
+        assert balance["debit_total"] == Decimal("580")
+        assert service.verify_account_balances(business_id) == {"checked": 11, "mismatches": [], "repaired": False}
+
+    def test_financial_statements(self, db, business_id, history):
+        service, _ = history
+        income = service.get_income_statement(business_id, _utc(2026, 1, 1), _utc(2026, 2, 28, 23, 59))
+        assert income["total_revenue"] == Decimal("105")
+        assert income["total_expenses"] == Decimal("60")
+
+        sheet = service.get_balance_sheet(business_id, as_of=_utc(2026, 1, 31))
+        assert sheet["total_assets"] == Decimal("460")
+        assert sheet["total_liabilities"] == Decimal("60")
+
+        trial = service.get_trial_balance(business_id)
+        assert trial["total_debit"] == trial["total_credit"]
+
+    def test_rebuild_matches_incremental_snapshots(self, db, business_id, history):
+        snapshots = GLBalanceSnapshotService(db)
+        before = sorted(
+            (str(r.account_id), r.period_year, r.period_month, r.closing_balance)
+            for r in db.query(GLAccountBalance)
+        )
+        assert snapshots.rebuild(business_id) == len(before)
+        db.commit()
+        after = sorted(
+            (str(r.account_id), r.period_year, r.period_month, r.closing_balance)
+            for r in db.query(GLAccountBalance)
+        )
+        assert after == before
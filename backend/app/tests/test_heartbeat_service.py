@@ -0,0 +1,244 @@
+"""Tests for coalesced heartbeat ingestion (app.services.heartbeat_service)."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.customer_display import CustomerDisplay
+from app.models.signage import SignageDisplay
+from app.models.subscription import DeviceRegistry
+from app.services import heartbeat_service
+from app.services.heartbeat_service import (
+    CUSTOMER_DISPLAY,
+    DEVICE,
+    SIGNAGE_DISPLAY,
+    HeartbeatBuffer,
+    entity_key,
+    presence,
+)
+
+BUSINESS = uuid.uuid4()
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine, tables=[
+        CustomerDisplay.__table__, SignageDisplay.__table__, DeviceRegistry.__table__,
+    ])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _count_statements(engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement.split()[0], executemany))
+
+    return statements
+
+
+def _displays(session_factory, n):
+    db = session_factory()
+    displays = [
+        CustomerDisplay(business_id=BUSINESS, name=f"Till {i}", display_type="tablet", status="offline")
+        for i in range(n)
+    ]
+    db.add_all(displays)
+    db.commit()
+    ids = [str(d.id) for d in displays]
+    db.close()
+    return ids
+
+
+class TestBuffer:
+    def test_flush_coalesces_heartbeats_into_one_update(self, session_factory):
+        ids = _displays(session_factory, 3)
+        buffer = HeartbeatBuffer(session_factory=session_factory)
+        for second in range(50):
+            for display_id in ids:
+                buffer.record(CUSTOMER_DISPLAY, display_id, NOW + timedelta(seconds=second))
+        statements = _count_statements(session_factory.kw["bind"])
+
+        assert buffer.flush() == 3
+
+        assert [s for s in statements if s[0] == "UPDATE"] == [("UPDATE", True)]
+        db = session_factory()
+        rows = db.query(CustomerDisplay).all()
+        assert {r.status for r in rows} == {"online"}
+        assert {r.last_seen_at.replace(tzinfo=timezone.utc) for r in rows} == {NOW + timedelta(seconds=49)}
+        assert buffer.stats()["received"] == 150
+        assert buffer.flush() == 0
+
+    def test_signage_and_device_rows_are_scoped_to_the_business(self, session_factory):
+        db = session_factory()
+        display = SignageDisplay(business_id=BUSINESS, name="Window", status="offline")
+        device = DeviceRegistry(
+            business_id=BUSINESS, device_id="ipad-1", device_name="iPad",
+            user_id=uuid.uuid4(), last_sync_time=NOW - timedelta(days=1), is_active=False,
+        )
+        db.add_all([display, device])
+        db.commit()
+        display_id = str(display.id)
+        db.close()
+
+        buffer = HeartbeatBuffer(session_factory=session_factory)
+        buffer.record(SIGNAGE_DISPLAY, entity_key(BUSINESS, display_id), NOW)
+        buffer.record(SIGNAGE_DISPLAY, entity_key(uuid.uuid4(), display_id), NOW + timedelta(hours=1))
+        buffer.record(DEVICE, entity_key(BUSINESS, "ipad-1"), NOW)
+        buffer.flush()
+
+        db = session_factory()
+        display = db.query(SignageDisplay).one()
+        device = db.query(DeviceRegistry).one()
+        assert display.status == "online"
+        assert display.last_heartbeat_at.replace(tzinfo=timezone.utc) == NOW
+        assert device.is_active is True
+        assert device.last_sync_time.replace(tzinfo=timezone.utc) == NOW
+
+    def test_failed_flush_keeps_the_heartbeats(self, session_factory):
+        ids = _displays(session_factory, 1)
+        buffer = HeartbeatBuffer(session_factory=session_factory)
+        buffer.record(CUSTOMER_DISPLAY, ids[0], NOW)
+
+        with patch.object(heartbeat_service, "_UPDATES", {}):
+            assert buffer.flush() == 0
+
+        buffer.record(CUSTOMER_DISPLAY, ids[0], NOW - timedelta(seconds=5))
+        assert buffer.pending_seen(CUSTOMER_DISPLAY, ids[0]) == NOW
+        assert buffer.stats()["failed"] == 1
+        assert buffer.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_what_is_pending(self, session_factory):
+        ids = _displays(session_factory, 1)
+        buffer = HeartbeatBuffer(flush_seconds=3600, session_factory=session_factory)
+        buffer.start()
+        buffer.record(CUSTOMER_DISPLAY, ids[0], NOW)
+
+        await buffer.stop()
+
+        assert not buffer.running
+        assert buffer.stats()["written"] == 1
+
+
+class TestPresence:
+    def test_status_follows_the_last_heartbeat(self):
+        key = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
+        assert presence(CUSTOMER_DISPLAY, key, "online", now - timedelta(seconds=10))[0] == "online"
+        assert presence(CUSTOMER_DISPLAY, key, "online", now - timedelta(hours=1))[0] == "offline"
+        assert presence(CUSTOMER_DISPLAY, key, "offline", None) == ("offline", None)
+        # Set by staff, not by heartbeats
+        assert presence(CUSTOMER_DISPLAY, key, "pairing", None)[0] == "pairing"
+
+    def test_unflushed_heartbeat_counts(self):
+        key = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
+        buffer = HeartbeatBuffer()
+        buffer.record(CUSTOMER_DISPLAY, key, now)
+
+        with patch.object(heartbeat_service, "heartbeat_buffer", buffer):
+            status, seen_at = presence(CUSTOMER_DISPLAY, key, "offline", now - timedelta(days=2))
+
+        assert (status, seen_at) == ("online", now)
+
+    @pytest.mark.asyncio
+    async def test_record_heartbeat_sets_presence_and_buffers(self):
+        buffer = HeartbeatBuffer()
+        redis_set = AsyncMock(return_value=True)
+
+        with patch.object(heartbeat_service, "heartbeat_buffer", buffer), \
+                patch.object(heartbeat_service.redis_manager, "set", redis_set):
+            seen_at = await heartbeat_service.record_heartbeat(DEVICE, "b:ipad-1")
+
+        key, value = redis_set.await_args.args
+        assert key == "bizpilot:presence:device:b:ipad-1"
+        assert value == seen_at.isoformat()
+        assert redis_set.await_args.kwargs["ttl_seconds"] == heartbeat_service.settings.HEARTBEAT_PRESENCE_TTL_SECONDS
+        assert buffer.pending_seen(DEVICE, "b:ipad-1") == seen_at
+
+
+class TestHeartbeatEndpoints:
+    @pytest.fixture
+    def redis(self):
+        store = {}
+
+        async def get(key):
+            return store.get(key)
+
+        async def set_(key, value, ttl_seconds=None):
+            store[key] = value
+            return True
+
+        with patch.object(heartbeat_service.redis_manager, "get", get), \
+                patch.object(heartbeat_service.redis_manager, "set", set_), \
+                patch.object(heartbeat_service, "heartbeat_buffer", HeartbeatBuffer()):
+            yield store
+
+    @pytest.mark.asyncio
+    async def test_display_heartbeat_returns_the_display_from_its_cached_row(self, session_factory, redis):
+        from app.api.customer_displays import heartbeat
+        from app.schemas.customer_display import CustomerDisplayResponse
+
+        (display_id,) = _displays(session_factory, 1)
+        db = session_factory()
+        try:
+            first = await heartbeat(uuid.UUID(display_id), db)
+            statements = _count_statements(db.get_bind())
+            second = await heartbeat(uuid.UUID(display_id), db)
+        finally:
+            db.close()
+
+        assert isinstance(second, CustomerDisplayResponse)
+        assert (second.name, second.business_id, second.status) == ("Till 0", BUSINESS, "online")
+        assert second.last_seen_at >= first.last_seen_at
+        assert statements == []
+
+    @pytest.mark.asyncio
+    async def test_signage_heartbeat_returns_the_display(self, session_factory, redis):
+        from app.api.signage import display_heartbeat
+        from app.schemas.signage import SignageDisplayResponse
+
+        db = session_factory()
+        display = SignageDisplay(business_id=BUSINESS, name="Window", status="offline")
+        db.add(display)
+        db.commit()
+        try:
+            response = await display_heartbeat(display.id, str(BUSINESS), db, None)
+        finally:
+            db.close()
+
+        assert isinstance(response, SignageDisplayResponse)
+        assert (response.name, response.status) == ("Window", "online")
+        assert response.last_heartbeat_at == response.updated_at
+
+    @pytest.mark.asyncio
+    async def test_unknown_display_is_not_found(self, session_factory, redis):
+        from fastapi import HTTPException
+
+        from app.api.customer_displays import heartbeat
+
+        db = session_factory()
+        try:
+            with pytest.raises(HTTPException) as exc:
+                await heartbeat(uuid.uuid4(), db)
+        finally:
+            db.close()
+        assert exc.value.status_code == 404
+        assert redis == {}
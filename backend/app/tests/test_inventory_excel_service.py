@@ -3,6 +3,8 @@
 import uuid
 from decimal import Decimal
 from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 from openpyxl import Workbook, load_workbook
@@ -28,6 +30,18 @@ class FakeQuery:
     def order_by(self, *args, **kwargs):
         return self
 
+    def with_entities(self, *args, **kwargs):
+        return self
+
+    def yield_per(self, count):
+        return self
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def count(self):
+        return len(self._items)
+
     def all(self):
         return self._items
 
@@ -108,6 +122,23 @@ def _make_inventory_item(
     return item
 
 
+def _export_row(item: InventoryItem, product: Product) -> SimpleNamespace:
+    """Shape an item/product pair like a row from the export column query."""
+    return SimpleNamespace(
+        sku=product.sku,
+        name=product.name,
+        quantity_on_hand=item.quantity_on_hand,
+        quantity_reserved=item.quantity_reserved,
+        quantity_incoming=item.quantity_incoming,
+        reorder_point=item.reorder_point,
+        reorder_quantity=item.reorder_quantity,
+        location=item.location,
+        bin_location=item.bin_location,
+        average_cost=item.average_cost,
+        last_cost=item.last_cost,
+    )
+
+
 class TestGenerateTemplate:
     """Tests for template generation."""
 
@@ -179,10 +210,7 @@ class TestExportInventory:
         product = _make_product(business_id, "SKU001", "Test Product")
         item = _make_inventory_item(business_id, product.id, qty=25, location="Warehouse A")
 
-        db = FakeSession(
-            data_by_model={},
-            join_results=[(item, product)]
-        )
+        db = FakeSession(data_by_model={InventoryItem: [_export_row(item, product)]})
         service = InventoryExcelService(db)
 
         output = service.export_inventory(business_id)
@@ -195,6 +223,10 @@ class TestExportInventory:
         assert "Product Name" in headers
         assert "Quantity On Hand" in headers
 
+        row = [cell.value for cell in ws[2]]
+        assert row[:3] == ["SKU001", "Test Product", 25]
+        assert row[7] == "Warehouse A"
+
     def test_export_includes_metadata_sheet(self, business_id):
         """Export should include metadata sheet with export info."""
         db = FakeSession(data_by_model={}, join_results=[])
@@ -207,6 +239,27 @@ class TestExportInventory:
         meta = wb["Export Info"]
         assert meta["A1"].value == "Export Date:"
         assert meta["A2"].value == "Total Items:"
+        assert meta["B2"].value == 0
+
+    def test_write_export_to_file_reports_progress(self, business_id, tmp_path):
+        """Large exports stream to a file and report progress per batch."""
+        product = _make_product(business_id, "SKU001", "Test Product")
+        rows = [
+            _export_row(_make_inventory_item(business_id, product.id, qty=i), product)
+            for i in range(3)
+        ]
+        service = InventoryExcelService(FakeSession(data_by_model={InventoryItem: rows}))
+        seen = []
+
+        with patch("app.services.inventory_excel_service.EXPORT_YIELD_PER", 2):
+            written = service.write_inventory_export(
+                business_id, tmp_path / "inventory.xlsx", progress=seen.append
+            )
+
+        assert written == 3
+        assert seen == [2]
+        ws = load_workbook(tmp_path / "inventory.xlsx")["Inventory"]
+        assert ws.max_row == 4
 
 
 class TestImportInventory:
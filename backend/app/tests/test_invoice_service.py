@@ -97,7 +97,7 @@ class TestGetInvoices:
         db.query.return_value = chain
         svc.get_invoices(BIZ_ID, page=3, per_page=10)
         chain.offset.assert_called_with(20)
-        chain.limit.assert_called_with(10)
+        chain.limit.assert_called_with(11)  # one extra row tells whether there is a next page
 
     def test_search_filter(self, svc, db):
         chain = _chain(rows=[], count=0)
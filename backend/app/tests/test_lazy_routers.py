@@ -0,0 +1,118 @@
+"""Tests for API router inclusion and lazy router mounting."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.lazy_routers import LazyRouters, LazyRoutersMiddleware
+
+
+def _app(load_calls, gate=None, failures=0):
+    app = FastAPI()
+
+    @app.get("/health/liveness")
+    async def liveness():
+        return {"status": "alive"}
+
+    api = APIRouter()
+
+    @api.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    def load():
+        load_calls.append(threading.current_thread().name)
+        if gate is not None:
+            gate.wait(5)
+        if len(load_calls) <= failures:
+            raise ImportError("broken router module")
+        app.include_router(api, prefix="/api/v1")
+
+    routers = LazyRouters(load)
+    app.add_middleware(LazyRoutersMiddleware, routers=routers)
+    return app, routers
+
+
+class TestLazyRouters:
+    def test_liveness_does_not_load_the_routers(self):
+        calls = []
+        app, routers = _app(calls)
+
+        response = TestClient(app).get("/health/liveness")
+
+        assert response.status_code == 200
+        assert not routers.loaded and calls == []
+
+    def test_first_api_request_loads_once(self):
+        calls = []
+        app, routers = _app(calls)
+        client = TestClient(app)
+
+        assert client.get("/api/v1/ping").json() == {"ok": True}
+        assert client.get("/api/v1/ping").status_code == 200
+        assert routers.loaded and len(calls) == 1
+        assert calls[0] != threading.main_thread().name
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_share_one_load(self):
+        calls = []
+        gate = threading.Event()
+        _, routers = _app(calls, gate)
+
+        routers.start_background_load()
+        waiters = [asyncio.ensure_future(routers.ensure_loaded()) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        assert not any(waiter.done() for waiter in waiters)
+
+        gate.set()
+        await asyncio.gather(*waiters)
+
+        assert routers.loaded and len(calls) == 1
+
+    def test_failed_load_is_retried_by_the_next_request(self, caplog):
+        calls = []
+        app, routers = _app(calls, failures=1)
+        client = TestClient(app, raise_server_exceptions=False)
+
+        assert client.get("/api/v1/ping").status_code == 500
+        assert not routers.loaded
+        assert "Loading the API routers failed" in caplog.text
+
+        assert client.get("/api/v1/ping").json() == {"ok": True}
+        assert routers.loaded and len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_background_load_is_forgotten(self):
+        calls = []
+        _, routers = _app(calls, failures=1)
+
+        routers.start_background_load()
+        with pytest.raises(ImportError):
+            await asyncio.shield(routers._task)
+        await asyncio.sleep(0)
+        assert routers._task is None
+
+        await routers.ensure_loaded()
+        assert routers.loaded and len(calls) == 2
+
+
+class TestIncludeRouters:
+    def test_app_routes_match_the_aggregate_router(self):
+        import app.api
+        from app.main import app as application
+
+        aggregate = {route.path for route in app.api.router.routes}
+        mounted = {
+            route.path[len("/api/v1"):] for route in application.routes
+            if route.path.startswith("/api/v1")
+        }
+
+        assert aggregate == mounted
+        assert "/" in aggregate
+        assert any(path.startswith("/scheduler/") for path in aggregate)
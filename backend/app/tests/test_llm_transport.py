@@ -0,0 +1,253 @@
+"""Tests for the shared LLM transport against a local OpenAI-compatible server.
+
+A small Starlette app served by uvicorn on a random port plays the model
+provider.  Each model name maps to a behaviour (ok, failing, slow) so the
+fallback chain, circuit breakers and hedging can be exercised over real
+HTTP, and the server records which client port every request came from so
+connection reuse is observable.
+"""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core import ai_models
+from app.core.ai_models import MODEL_REGISTRY, ModelExecutionError, TaskType, execute_task, run_groq
+from app.core.config import settings
+from app.core.llm_transport import CircuitBreaker, Histogram, LLMTransport, hedged_call
+
+SLOW_SECONDS = 1.0
+
+
+class MockOpenAIServer:
+    """OpenAI-compatible /v1/chat/completions endpoint with per-model behaviour."""
+
+    def __init__(self):
+        self.requests = []  # (model, client_port)
+        self.app = Starlette(routes=[Route("/v1/chat/completions", self.chat, methods=["POST"])])
+
+    async def chat(self, request):
+        body = await request.json()
+        model = body["model"]
+        self.requests.append((model, request.client.port))
+        if model.startswith("failing"):
+            return JSONResponse({"error": {"message": "upstream exploded"}}, status_code=500)
+        if model.startswith("slow"):
+            await asyncio.sleep(SLOW_SECONDS)
+        return JSONResponse({
+            "choices": [{"message": {"content": f"hello from {model}"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 30, "completion_tokens": 12, "total_tokens": 42},
+        })
+
+    def calls(self, model):
+        return sum(1 for m, _ in self.requests if m == model)
+
+
+@pytest.fixture(scope="module")
+def server():
+    mock = MockOpenAIServer()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    uv = uvicorn.Server(uvicorn.Config(mock.app, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=uv.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not uv.started and time.monotonic() < deadline:
+        time.sleep(0.01)
+    mock.base_url = f"http://127.0.0.1:{port}/v1"
+    yield mock
+    uv.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def transport(server, monkeypatch):
+    server.requests.clear()
+    transport = LLMTransport(base_url=server.base_url, http2=False, breaker_failures=2, breaker_reset_seconds=60)
+    monkeypatch.setattr(ai_models, "get_llm_transport", lambda: transport)
+    monkeypatch.setattr(settings, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "LLM_HEDGE_DELAY_MS", 0)
+    return transport
+
+
+def _chain(monkeypatch, models, fallback=("ok-fallback",)):
+    monkeypatch.setitem(MODEL_REGISTRY, "fast", list(models))
+    monkeypatch.setitem(MODEL_REGISTRY, "fallback", list(fallback))
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestPooledClient:
+    @pytest.mark.asyncio
+    async def test_requests_reuse_one_keep_alive_connection(self, server, transport):
+        for _ in range(5):
+            response = await run_groq("ok-model", MESSAGES)
+            assert response.content == "hello from ok-model"
+        await transport.aclose()
+
+        assert len(server.requests) == 5
+        assert len({port for _, port in server.requests}) == 1
+
+    @pytest.mark.asyncio
+    async def test_http_errors_become_model_errors(self, transport):
+        with pytest.raises(ModelExecutionError) as exc_info:
+            await run_groq("failing-model", MESSAGES)
+        await transport.aclose()
+
+        assert exc_info.value.status_code == 500
+        assert "upstream exploded" in exc_info.value.error
+
+    @pytest.mark.asyncio
+    async def test_stats_record_latency_and_tokens(self, transport):
+        await run_groq("ok-model", MESSAGES)
+        await run_groq("ok-model", MESSAGES)
+        with pytest.raises(ModelExecutionError):
+            await run_groq("failing-model", MESSAGES)
+        await transport.aclose()
+
+        stats = transport.stats()["models"]
+        assert stats["ok-model"]["successes"] == 2
+        assert stats["ok-model"]["latency_ms"]["count"] == 2
+        assert stats["ok-model"]["total_tokens"]["sum"] == 84
+        assert stats["ok-model"]["total_tokens"]["buckets"]["64"] == 2
+        assert stats["failing-model"]["failures"] == 1
+        assert stats["failing-model"]["circuit"] == CircuitBreaker.CLOSED
+
+
+class TestFallbackChain:
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_known_bad_model(self, server, transport, monkeypatch):
+        _chain(monkeypatch, ["failing-primary", "ok-secondary"])
+
+        for _ in range(3):
+            response = await execute_task(TaskType.FAST, MESSAGES)
+            assert response.model_used == "ok-secondary"
+        await transport.aclose()
+
+        # Two failures open the circuit; the third task goes straight to the secondary
+        assert server.calls("failing-primary") == 2
+        assert server.calls("ok-secondary") == 3
+        assert transport.breaker("failing-primary").state == CircuitBreaker.OPEN
+
+    @pytest.mark.asyncio
+    async def test_all_circuits_open_still_attempts_chain(self, server, transport, monkeypatch):
+        _chain(monkeypatch, ["failing-a"], fallback=["failing-b"])
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="All Groq models failed"):
+                await execute_task(TaskType.FAST, MESSAGES)
+        await transport.aclose()
+
+        assert server.calls("failing-a") == 3
+        assert server.calls("failing-b") == 3
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_beats_slow_model(self, server, transport, monkeypatch):
+        _chain(monkeypatch, ["slow-primary", "ok-secondary"])
+        monkeypatch.setattr(settings, "LLM_HEDGE_DELAY_MS", 50)
+
+        started = time.perf_counter()
+        response = await execute_task(TaskType.FAST, MESSAGES)
+        elapsed = time.perf_counter() - started
+        await transport.aclose()
+
+        assert response.model_used == "ok-secondary"
+        assert elapsed < SLOW_SECONDS / 2
+        assert server.calls("slow-primary") == 1
+
+    @pytest.mark.asyncio
+    async def test_without_hedging_slow_model_is_waited_out(self, server, transport, monkeypatch):
+        _chain(monkeypatch, ["slow-primary", "ok-secondary"])
+
+        response = await execute_task(TaskType.FAST, MESSAGES)
+        await transport.aclose()
+
+        assert response.model_used == "slow-primary"
+        assert server.calls("ok-secondary") == 0
+
+
+class TestCircuitBreaker:
+    def test_state_transitions(self):
+        now = [0.0]
+        breaker = CircuitBreaker("m", failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+        breaker.record_failure()
+        assert breaker.available()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN and not breaker.available()
+
+        now[0] = 10
+        assert breaker.state == CircuitBreaker.HALF_OPEN and breaker.available()
+        breaker.record_failure()  # failed probe re-opens immediately
+        assert breaker.state == CircuitBreaker.OPEN
+
+        now[0] = 20
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_lets_one_probe_through(self):
+        now = [0.0]
+        breaker = CircuitBreaker("m", failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+
+        now[0] = 10
+        assert breaker.available()
+        assert not breaker.available()  # probe in flight
+        breaker.record_failure()
+        now[0] = 15
+        assert not breaker.available()  # re-opened by the failed probe
+
+        now[0] = 20
+        assert breaker.available()
+        now[0] = 29
+        assert not breaker.available()
+        now[0] = 30  # probe never reported back: the next caller probes
+        assert breaker.available()
+        breaker.record_success()
+        assert breaker.available() and breaker.available()
+
+    def test_success_resets_consecutive_count(self):
+        breaker = CircuitBreaker("m", failure_threshold=2, reset_timeout=10)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestHelpers:
+    def test_histogram_cumulative_buckets(self):
+        histogram = Histogram([10, 100])
+        for value in (5, 10, 50, 500):
+            histogram.observe(value)
+        assert histogram.snapshot() == {"count": 4, "sum": 565, "buckets": {"10": 2, "100": 3, "+Inf": 4}}
+
+    @pytest.mark.asyncio
+    async def test_hedged_call_returns_none_when_all_fail(self):
+        failed = []
+
+        async def call(model):
+            raise ValueError(model)
+
+        result = await hedged_call(["a", "b"], call, retry_on=(ValueError,), on_failure=lambda m, e: failed.append(m))
+        assert result == (None, None)
+        assert failed == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_hedged_call_propagates_unexpected_errors(self):
+        async def call(model):
+            raise KeyError(model)
+
+        with pytest.raises(KeyError):
+            await hedged_call(["a", "b"], call, retry_on=(ValueError,))
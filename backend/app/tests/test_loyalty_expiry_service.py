@@ -0,0 +1,157 @@
+"""Tests for the set-based loyalty points expiry engine and its scheduler job."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.loyalty import CustomerLoyalty, LoyaltyTier, PointsTransaction, PointsTransactionType
+from app.scheduler.jobs.loyalty_expiry_job import loyalty_points_expiry_job
+from app.services.loyalty_expiry_service import LoyaltyExpiryService
+from app.services.loyalty_service import LoyaltyService
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[CustomerLoyalty.__table__, PointsTransaction.__table__])
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _member(db, business_id, balance):
+    customer_id = uuid.uuid4()
+    db.execute(insert(CustomerLoyalty).values(
+        customer_id=customer_id,
+        business_id=business_id,
+        points_balance=balance,
+        lifetime_points=balance,
+        tier=LoyaltyTier.BRONZE,
+    ))
+    return customer_id
+
+
+def _earn(db, business_id, customer_id, points, expires_in_days):
+    db.execute(insert(PointsTransaction).values(
+        customer_id=customer_id,
+        business_id=business_id,
+        transaction_type=PointsTransactionType.EARN,
+        points=points,
+        balance_after=points,
+        expires_at=NOW + timedelta(days=expires_in_days),
+    ))
+
+
+def _balance(db, customer_id):
+    return db.execute(
+        select(CustomerLoyalty.points_balance).where(CustomerLoyalty.customer_id == customer_id)
+    ).scalar_one()
+
+
+def _expire_rows(db, customer_id=None):
+    query = select(PointsTransaction).where(PointsTransaction.transaction_type == PointsTransactionType.EXPIRE)
+    if customer_id is not None:
+        query = query.where(PointsTransaction.customer_id == customer_id)
+    return db.execute(query).scalars().all()
+
+
+@pytest.fixture
+def ledger(db):
+    """Two businesses; a mix of expired, unexpired and already-redeemed points."""
+    shop, cafe = uuid.uuid4(), uuid.uuid4()
+    alice = _member(db, shop, 300)
+    _earn(db, shop, alice, 100, -30)
+    _earn(db, shop, alice, 50, -1)
+    _earn(db, shop, alice, 150, 10)      # not yet due
+
+    bob = _member(db, shop, 40)          # redeemed most of his 100 already
+    _earn(db, shop, bob, 100, -5)
+
+    carol = _member(db, shop, 0)
+    _earn(db, shop, carol, 20, -5)
+
+    dave = _member(db, cafe, 500)
+    _earn(db, cafe, dave, 200, -2)
+    db.commit()
+    return {"shop": shop, "cafe": cafe, "alice": alice, "bob": bob, "carol": carol, "dave": dave}
+
+
+class TestExpirePoints:
+    def test_expires_all_businesses_in_one_pass(self, db, ledger):
+        result = LoyaltyExpiryService(db).expire_points(now=NOW)
+
+        assert result == {
+            "customers": 4,
+            "expire_transactions": 3,
+            "points_expired": 150 + 40 + 200,
+            "earn_transactions": 5,
+        }
+        assert _balance(db, ledger["alice"]) == 150
+        assert _balance(db, ledger["bob"]) == 0
+        assert _balance(db, ledger["carol"]) == 0
+        assert _balance(db, ledger["dave"]) == 300
+
+        (alice_row,) = _expire_rows(db, ledger["alice"])
+        assert alice_row.points == -150
+        assert alice_row.balance_after == 150
+        assert alice_row.business_id == ledger["shop"]
+        assert _expire_rows(db, ledger["bob"])[0].points == -40
+        assert _expire_rows(db, ledger["carol"]) == []
+
+    def test_processed_earns_are_retired_and_rerun_is_noop(self, db, ledger):
+        service = LoyaltyExpiryService(db)
+        service.expire_points(now=NOW)
+
+        live_earns = db.execute(
+            select(PointsTransaction.points).where(
+                PointsTransaction.transaction_type == PointsTransactionType.EARN,
+                PointsTransaction.deleted_at.is_(None),
+            )
+        ).scalars().all()
+        assert live_earns == [150]
+
+        assert service.expire_points(now=NOW)["customers"] == 0
+        assert len(_expire_rows(db)) == 3
+
+    def test_business_filter(self, db, ledger):
+        result = LoyaltyExpiryService(db).expire_points(business_id=ledger["cafe"], now=NOW)
+
+        assert result["customers"] == 1
+        assert _balance(db, ledger["dave"]) == 300
+        assert _balance(db, ledger["alice"]) == 300
+
+    def test_small_batches_give_same_result(self, db, ledger):
+        result = LoyaltyExpiryService(db).expire_points(now=NOW, batch_size=1)
+
+        assert result["customers"] == 4
+        assert result["points_expired"] == 390
+        assert _balance(db, ledger["alice"]) == 150
+
+    def test_loyalty_service_delegates(self, db, ledger):
+        with patch("app.services.loyalty_expiry_service.utc_now", return_value=NOW):
+            assert LoyaltyService(db).expire_old_points(ledger["shop"]) == 2
+        assert _balance(db, ledger["alice"]) == 150
+        assert _balance(db, ledger["dave"]) == 500
+
+
+class TestExpiryJob:
+    def test_job_expires_overdue_points(self, db, ledger):
+        with patch("app.scheduler.jobs.loyalty_expiry_job.SessionLocal", return_value=db), \
+                patch("app.scheduler.jobs.loyalty_expiry_job.datetime") as clock:
+            clock.now.return_value = NOW
+            result = loyalty_points_expiry_job()
+
+        assert result["errors"] == []
+        assert result["points_expired"] == 390
@@ -52,6 +52,7 @@ def _mock_order(**kw):
     o.shipping_amount = kw.get("shipping_amount", Decimal("0"))
     o.amount_paid = kw.get("amount_paid", Decimal("0"))
     o.items = kw.get("items", [])
+    o.created_at = kw.get("created_at", datetime(2025, 1, 1))
     o.deleted_at = None
     o.shipped_date = None
     o.delivered_date = None
@@ -145,12 +146,13 @@ class TestGetOrders:
 
     def test_pagination(self):
         svc, db = _svc()
-        chain = _chain(rows=[_mock_order()], count=50)
+        chain = _chain(rows=[_mock_order(created_at=datetime(2025, 1, 1)) for _ in range(11)], count=50)
         db.query.return_value = chain
         orders, total = svc.get_orders(BIZ, page=3, per_page=10)
         assert total == 50
+        assert len(orders) == 10
         chain.offset.assert_called_with(20)
-        chain.limit.assert_called_with(10)
+        chain.limit.assert_called_with(11)
 
 
 # ── get_order / get_order_by_number ──────────────────────────────────
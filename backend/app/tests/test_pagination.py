@@ -0,0 +1,171 @@
+"""Tests for shared list pagination (app.core.pagination)."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  - register all mappers
+from app.core import pagination
+from app.core.database import Base
+from app.core.pagination import (
+    PaginationError,
+    TotalMode,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from app.models.product import Product
+from app.models.product_ingredient import ProductIngredient
+from app.models.stock_reservation import StockReservation
+from app.services.product_service import ProductService
+
+BUSINESS = uuid.uuid4()
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(
+        engine, tables=[Product.__table__, ProductIngredient.__table__, StockReservation.__table__]
+    )
+    session = sessionmaker(bind=engine)()
+    for i in range(25):
+        session.add(Product(
+            business_id=BUSINESS,
+            name=f"Product {i:02d}",
+            sku=f"SKU-{i:02d}" if i % 2 else None,
+            selling_price=Decimal("10.00"),
+            # Pairs share a timestamp, so the id has to break ties
+            created_at=START + timedelta(minutes=i // 2),
+        ))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _query(db):
+    return db.query(Product).filter(Product.business_id == BUSINESS)
+
+
+def _count_calls(db):
+    return patch.object(type(_query(db)), "count", autospec=True, side_effect=lambda q: 25)
+
+
+class TestTotals:
+    def test_exact_counts_inner_pages(self, db):
+        with _count_calls(db) as count:
+            page = paginate(_query(db).order_by(Product.name), page=2, per_page=10)
+
+        assert page.total == 25 and page.pages == 3
+        assert page.has_more
+        assert [p.name for p in page.items][0] == "Product 10"
+        assert count.call_count == 1
+
+    def test_last_page_total_needs_no_count(self, db):
+        with _count_calls(db) as count:
+            page = paginate(_query(db).order_by(Product.name), page=3, per_page=10)
+
+        assert page.total == 25
+        assert not page.has_more
+        assert len(page.items) == 5
+        assert count.call_count == 0
+
+    def test_none_mode_reports_has_more_only(self, db):
+        with _count_calls(db) as count:
+            page = paginate(_query(db).order_by(Product.name), per_page=10, total_mode=TotalMode.NONE)
+
+        assert page.total is None and page.pages is None
+        assert page.has_more
+        assert count.call_count == 0
+
+    def test_window_mode_counts_in_the_page_query(self, db):
+        with _count_calls(db) as count:
+            page = paginate(_query(db).order_by(Product.name), per_page=10, total_mode=TotalMode.WINDOW)
+
+        assert page.total == 25
+        assert all(isinstance(item, Product) for item in page.items)
+        assert count.call_count == 0
+
+    def test_estimate_falls_back_to_count_off_postgres(self, db):
+        page = paginate(_query(db).order_by(Product.name), per_page=10, total_mode=TotalMode.ESTIMATE)
+
+        assert page.total == 25
+        assert not page.total_estimated
+
+    def test_large_estimate_is_used(self, db):
+        with patch.object(pagination, "estimate_count", return_value=5000):
+            page = paginate(_query(db).order_by(Product.name), per_page=10, total_mode=TotalMode.ESTIMATE)
+
+        assert page.total == 5000
+        assert page.total_estimated
+
+
+class TestKeyset:
+    def test_cursor_walks_every_row_once(self, db):
+        seen, cursor = [], None
+        while True:
+            page = paginate(
+                _query(db), per_page=7, cursor=cursor,
+                keyset=(Product.created_at, Product.id), descending=True,
+            )
+            seen.extend(page.items)
+            cursor = page.next_cursor
+            if not page.has_more:
+                break
+
+        assert cursor is None
+        assert len(seen) == len({p.id for p in seen}) == 25
+        assert [p.created_at for p in seen] == sorted((p.created_at for p in seen), reverse=True)
+
+    def test_nullable_keyset_orders_but_refuses_cursors(self, db):
+        page = paginate(_query(db), per_page=5, keyset=(Product.sku, Product.id))
+
+        assert page.next_cursor is None
+        with pytest.raises(PaginationError):
+            paginate(_query(db), per_page=5, cursor="abc", keyset=(Product.sku, Product.id))
+
+    def test_invalid_cursor_is_rejected(self):
+        with pytest.raises(PaginationError):
+            decode_cursor("not a cursor", 2)
+        with pytest.raises(PaginationError):
+            decode_cursor(encode_cursor(["x"]), 2)
+
+    def test_cursor_round_trips_typed_values(self):
+        values = [START, uuid.uuid4(), Decimal("1.50"), "name", 3]
+
+        assert decode_cursor(encode_cursor(values), len(values)) == values
+
+
+class TestServices:
+    def test_product_listing_pages_by_cursor(self, db):
+        service = ProductService(db)
+        first = service.get_products(BUSINESS, per_page=20, total_mode=TotalMode.NONE)
+        second = service.get_products(BUSINESS, per_page=20, cursor=first.next_cursor)
+
+        assert first.total is None and first.has_more
+        assert len(first.items) + len(second.items) == 25
+        assert not {p.id for p in first.items} & {p.id for p in second.items}
+        products, total = second
+        assert products == second.items and total == second.total
+
+
+def test_explain_compiles_for_postgresql(db):
+    statement = pagination._Explain(_query(db).statement)
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
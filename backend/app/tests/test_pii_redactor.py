@@ -0,0 +1,48 @@
+"""Tests for the single-pass PII redactor."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import re
+
+from app.agents.pii_redactor import PIIRedactor, _trie_pattern
+
+
+class TestTriePattern:
+    def test_shared_prefixes_are_factored(self):
+        assert _trie_pattern({"jane", "jane smith", "john"}) == r"j(?:ane(?:\ smith)?|ohn)"
+
+    def test_matches_exactly_the_words(self):
+        words = {"al", "alan", "alana", "bo", "bob", "o'neil", "x.y"}
+        pattern = re.compile(f"(?:{_trie_pattern(words)})$")
+        for word in words:
+            assert pattern.match(word)
+        for other in ("a", "ala", "alanas", "b", "oneil", "xzy"):
+            assert not pattern.match(other)
+
+
+class TestSinglePassRedaction:
+    def test_longest_name_wins(self):
+        r = PIIRedactor(known_names=["Jane", "Jane Smith"])
+        assert r.redact("Jane Smith and Jane") == "[NAME] and [NAME]"
+
+    def test_names_match_whole_words_only(self):
+        r = PIIRedactor(known_names=["Al", "Jane Smith"])
+        assert r.redact("Also Al, and Jane Smithers") == "Also [NAME], and Jane Smithers"
+
+    def test_email_takes_priority_over_name_inside_it(self):
+        r = PIIRedactor(known_names=["jane"])
+        assert r.redact("Mail jane@example.com or ask Jane") == "Mail [EMAIL] or ask [NAME]"
+
+    def test_all_classes_in_one_pass(self):
+        r = PIIRedactor(known_names=["Thandi Nkosi"])
+        text = "thandi nkosi 9001015800085 +27821234567 t@n.co.za"
+        assert r.redact(text) == "[NAME] [SA_ID] [PHONE] [EMAIL]"
+
+    def test_large_name_list(self):
+        names = [f"Customer{i} Surname{i}" for i in range(5000)]
+        r = PIIRedactor(known_names=names)
+        assert r.name_count == 5000
+        assert r.redact("Paid by customer4321 surname4321 today") == "Paid by [NAME] today"
+        assert r.redact("Customer43210 is unknown") == "Customer43210 is unknown"
+
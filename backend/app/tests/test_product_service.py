@@ -28,7 +28,7 @@ from app.schemas.product import (
     ProductCategoryUpdate,
     ProductIngredientCreate,
 )
-from app.services.product_service import ProductService
+from app.services.product_service import DuplicateProductCodeError, ProductService
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -141,7 +141,7 @@ class TestGetProducts:
         assert products == rows
         assert total == 2
         chain.offset.assert_called_once_with(0)
-        chain.limit.assert_called_once_with(20)
+        chain.limit.assert_called_once_with(21)  # one extra row tells whether there is a next page
 
     def test_pagination_page_two(self):
         svc, db = _svc()
@@ -152,7 +152,7 @@ class TestGetProducts:
 
         assert total == 25
         chain.offset.assert_called_once_with(10)
-        chain.limit.assert_called_once_with(10)
+        chain.limit.assert_called_once_with(11)
 
     def test_search_filter(self):
         svc, db = _svc()
@@ -287,6 +287,16 @@ class TestCreateProduct:
         assert db.add.call_count >= 2
         db.commit.assert_called_once()
 
+    def test_create_product_duplicate_sku(self):
+        svc, db = _svc()
+        db.query.return_value = _chain(first=("SKU-1",))
+        data = ProductCreate(name="Dup", selling_price=Decimal("10.00"), sku="SKU-1")
+
+        with pytest.raises(DuplicateProductCodeError, match="SKU 'SKU-1' already exists"):
+            svc.create_product(BIZ, data)
+
+        db.add.assert_not_called()
+
 
 class TestUpdateProduct:
     def test_update_product_basic(self):
@@ -319,6 +329,19 @@ class TestUpdateProduct:
         # replace_product_ingredients queries existing + adds new
         assert db.add.call_count >= 1
 
+    def test_update_product_sku_taken_by_another_product(self):
+        svc, db = _svc()
+        product = _mock_product()
+        chain = _chain(first=("SKU-2",))
+        db.query.return_value = chain
+
+        with pytest.raises(DuplicateProductCodeError):
+            svc.update_product(product, ProductUpdate(sku="SKU-2"))
+
+        # The product itself is excluded from the check
+        assert chain.filter.call_count == 2
+        db.commit.assert_not_called()
+
 
 class TestDeleteProduct:
     def test_delete_product_soft(self):
@@ -403,6 +426,18 @@ class TestBulkCreateProducts:
         db.commit.assert_called_once()
         assert db.refresh.call_count == 2
 
+    def test_bulk_create_repeated_sku(self):
+        svc, db = _svc()
+        items = [
+            ProductCreate(name="P1", selling_price=Decimal("10"), sku="SKU-1"),
+            ProductCreate(name="P2", selling_price=Decimal("20"), sku="SKU-1"),
+        ]
+
+        with pytest.raises(DuplicateProductCodeError, match="used more than once"):
+            svc.bulk_create_products(BIZ, items)
+
+        db.add.assert_not_called()
+
 
 class TestBulkDeleteProducts:
     def test_bulk_delete_success(self):
@@ -0,0 +1,148 @@
+"""Tests for the real-time push hub (app.core.realtime)."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import asyncio
+import json
+import threading
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core import realtime
+from app.core.realtime import RealtimeEventType, RealtimeHub, encode_event
+
+BUSINESS = str(uuid.uuid4())
+OTHER_BUSINESS = str(uuid.uuid4())
+
+
+@pytest.fixture
+def no_redis():
+    with patch.object(realtime.redis_manager, "get_client", return_value=None):
+        yield
+
+
+async def _started_hub():
+    hub = RealtimeHub()
+    hub.start()
+    return hub
+
+
+class TestFanOut:
+    @pytest.mark.asyncio
+    async def test_emit_from_a_worker_thread_reaches_the_business(self, no_redis):
+        hub = await _started_hub()
+        try:
+            mine = hub.subscribe(BUSINESS)
+            theirs = hub.subscribe(OTHER_BUSINESS)
+
+            thread = threading.Thread(
+                target=hub.emit,
+                args=(BUSINESS, RealtimeEventType.ORDER_STATUS_CHANGED, {"order_id": "o1", "status": "ready"}),
+            )
+            thread.start()
+            thread.join()
+
+            event_type, raw = await mine.next_event(timeout=1)
+            assert event_type == "order.status_changed"
+            assert json.loads(raw)["data"] == {"order_id": "o1", "status": "ready"}
+            assert await theirs.next_event(timeout=0.05) is None
+        finally:
+            await hub.stop()
+
+    def test_filters_by_user_type_and_display(self):
+        hub = RealtimeHub()
+        alice = hub.subscribe(BUSINESS, user_id="alice")
+        bob_orders = hub.subscribe(BUSINESS, user_id="bob", event_types=["order.status_changed"])
+        display = hub.subscribe(BUSINESS, event_types=["display.cart_updated"], display_id="d1")
+
+        hub.deliver(BUSINESS, encode_event(
+            RealtimeEventType.NOTIFICATION_CREATED, BUSINESS, {"title": "hi"}, user_id="alice",
+        ))
+        hub.deliver(BUSINESS, encode_event(RealtimeEventType.DISPLAY_CART_UPDATED, BUSINESS, {"display_id": "d2"}))
+        hub.deliver(BUSINESS, encode_event(RealtimeEventType.DISPLAY_CART_UPDATED, BUSINESS, {"display_id": "d1"}))
+
+        assert [t for t, _ in _drain(alice)] == ["notification.created", "display.cart_updated", "display.cart_updated"]
+        assert _drain(bob_orders) == []
+        assert [json.loads(raw)["data"] for _, raw in _drain(display)] == [{"display_id": "d1"}]
+
+    def test_slow_connection_gets_a_single_resync(self):
+        hub = RealtimeHub()
+        subscription = hub.subscribe(BUSINESS)
+        capacity = subscription.queue.maxsize
+
+        for i in range(capacity + 5):
+            hub.deliver(BUSINESS, encode_event(RealtimeEventType.ORDER_STATUS_CHANGED, BUSINESS, {"i": i}))
+
+        types = [t for t, _ in _drain(subscription)]
+        assert types[0] == "resync"
+        assert len(types) == 5
+        assert subscription.dropped == capacity + 1
+
+    def test_unsubscribe_forgets_empty_businesses(self):
+        hub = RealtimeHub()
+        subscription = hub.subscribe(BUSINESS)
+        assert hub.stats()["connections"] == 1
+
+        hub.unsubscribe(subscription)
+
+        assert hub.stats()["businesses"] == 0
+        assert hub.deliver(BUSINESS, encode_event(RealtimeEventType.PING, BUSINESS, {})) == 0
+
+    def test_emit_before_start_is_a_no_op(self):
+        hub = RealtimeHub()
+        subscription = hub.subscribe(BUSINESS)
+        hub.emit(BUSINESS, RealtimeEventType.ORDER_STATUS_CHANGED, {})
+        assert subscription.queue.empty()
+
+
+class TestRedisBackbone:
+    @pytest.mark.asyncio
+    async def test_publishes_on_the_business_channel(self):
+        client = MagicMock()
+        client.publish = AsyncMock()
+        hub = RealtimeHub()
+        subscription = hub.subscribe(BUSINESS)
+
+        with patch.object(realtime.redis_manager, "get_client", return_value=client):
+            await hub.publish(BUSINESS, RealtimeEventType.MENU_AVAILABILITY_CHANGED, {"modifier_id": "m1"})
+
+        channel, raw = client.publish.await_args.args
+        assert channel == f"bizpilot:realtime:{BUSINESS}"
+        assert json.loads(raw)["type"] == "menu.availability_changed"
+        # The worker's own listener delivers it, not the publisher
+        assert subscription.queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_delivery_when_publish_fails(self):
+        client = MagicMock()
+        client.publish = AsyncMock(side_effect=ConnectionError("down"))
+        hub = RealtimeHub()
+        subscription = hub.subscribe(BUSINESS)
+
+        with patch.object(realtime.redis_manager, "get_client", return_value=client):
+            await hub.publish(BUSINESS, RealtimeEventType.ORDER_STATUS_CHANGED, {})
+
+        assert subscription.queue.qsize() == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_events(self, no_redis):
+        hub = await _started_hub()
+        subscription = hub.subscribe(BUSINESS)
+        hub.emit(BUSINESS, RealtimeEventType.NOTIFICATION_CREATED, {"title": "x"})
+        # Let call_soon_threadsafe run, but not the publisher
+        await asyncio.sleep(0)
+
+        await hub.stop()
+
+        assert subscription.queue.qsize() == 1
+        assert not hub.running
+
+
+def _drain(subscription):
+    items = []
+    while not subscription.queue.empty():
+        items.append(subscription.queue.get_nowait())
+    return items
@@ -0,0 +1,144 @@
+"""Tests for the fused request pipeline middleware (request ID, timing, CORS, CSRF)."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware.request_pipeline import (
+    CSRF_EXEMPT_PATHS,
+    PathPrefixTrie,
+    RequestPipelineMiddleware,
+)
+
+ORIGIN = "http://localhost:3000"
+
+
+async def _echo(request: Request):
+    return JSONResponse({"request_id": request.state.request_id})
+
+
+async def _login(request: Request):
+    request.session["csrf_token"] = "token-1"
+    return JSONResponse({"ok": True})
+
+
+async def _boom(request: Request):
+    raise RuntimeError("boom")
+
+
+async def _stream(request: Request):
+    async def chunks():
+        for i in range(3):
+            yield f"chunk{i};".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[
+            Route("/echo", _echo, methods=["GET", "POST"]),
+            Route("/api/v1/auth/login", _login, methods=["POST"]),
+            Route("/boom", _boom),
+            Route("/stream", _stream),
+        ],
+        middleware=[
+            Middleware(SessionMiddleware, secret_key="test-secret"),
+            Middleware(RequestPipelineMiddleware),
+        ],
+    )
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestRequestIdAndTiming:
+    def test_client_request_id_is_kept(self, client):
+        response = client.get("/echo", headers={"X-Request-ID": "abc-123"})
+
+        assert response.headers["X-Request-ID"] == "abc-123"
+        assert response.json() == {"request_id": "abc-123"}
+        assert response.headers["X-Response-Time"].endswith("ms")
+
+    def test_request_id_is_generated(self, client):
+        response = client.get("/echo")
+
+        assert len(response.headers["X-Request-ID"]) == 36
+        assert response.json()["request_id"] == response.headers["X-Request-ID"]
+
+    def test_streaming_body_passes_through(self, client):
+        response = client.get("/stream")
+
+        assert response.text == "chunk0;chunk1;chunk2;"
+        assert "X-Request-ID" in response.headers
+
+
+class TestCors:
+    def test_allowed_origin_gets_headers(self, client):
+        response = client.get("/echo", headers={"Origin": ORIGIN})
+
+        assert response.headers["Access-Control-Allow-Origin"] == ORIGIN
+        assert response.headers["Access-Control-Allow-Credentials"] == "true"
+
+    def test_other_origin_gets_none(self, client):
+        response = client.get("/echo", headers={"Origin": "https://evil.example"})
+
+        assert "Access-Control-Allow-Origin" not in response.headers
+
+    def test_options_is_answered_directly(self, client):
+        response = client.options("/anything", headers={"Origin": ORIGIN})
+
+        assert response.status_code == 200
+        assert response.json() == {"detail": "OK"}
+        assert response.headers["Access-Control-Allow-Origin"] == ORIGIN
+
+    def test_unhandled_error_is_a_500_with_cors_headers(self, client):
+        response = client.get("/boom", headers={"Origin": ORIGIN})
+
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+        assert response.headers["Access-Control-Allow-Origin"] == ORIGIN
+
+
+class TestCsrf:
+    def test_cookie_client_without_token_is_rejected(self, client):
+        response = client.post("/echo")
+
+        assert response.status_code == 403
+        assert "X-Request-ID" in response.headers
+
+    def test_token_matching_the_session_passes(self, client):
+        assert client.post("/api/v1/auth/login").status_code == 200
+
+        assert client.post("/echo", headers={"X-CSRF-Token": "token-1"}).status_code == 200
+        assert client.post("/echo", headers={"X-CSRF-Token": "wrong"}).status_code == 403
+
+    @pytest.mark.parametrize("headers", [
+        {"X-Client-Type": "Mobile"},
+        {"Authorization": "Bearer abc"},
+    ])
+    def test_mobile_and_bearer_clients_are_exempt(self, client, headers):
+        assert client.post("/echo", headers=headers).status_code == 200
+
+
+class TestPathPrefixTrie:
+    @pytest.mark.parametrize("path", [
+        "/health", "/healthz", "/api/v1/oauth/google/callback", "/api/v1/auth/login",
+        "/api/v1/payments/webhook/payfast", "/api/v1/contact", "/", "/api/v1/oauth",
+        "/api/v1/auth/logout", "/api/v1/products",
+    ])
+    def test_matches_like_startswith(self, path):
+        trie = PathPrefixTrie(CSRF_EXEMPT_PATHS)
+
+        assert trie.matches(path) == any(path.startswith(prefix) for prefix in CSRF_EXEMPT_PATHS)
+
+    def test_empty_prefix_matches_everything(self):
+        assert PathPrefixTrie([""]).matches("/anything")
+        assert not PathPrefixTrie([]).matches("/anything")
@@ -0,0 +1,273 @@
+"""Tests for barcode/SKU scan lookups and their per-business maps."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import asyncio
+import contextlib
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.order import Order
+from app.models.product import Product
+from app.models.product_ingredient import ProductIngredient
+from app.models.stock_reservation import StockReservation
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services import scan_lookup
+from app.services.scan_lookup import build_codes, lookup_codes
+
+BUSINESS = uuid.uuid4()
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    # orders.tags is a Postgres ARRAY; store it as JSON on SQLite
+    monkeypatch.setattr(Order.__table__.c.tags, "type", JSON())
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=[
+        Product.__table__, ProductIngredient.__table__, StockReservation.__table__, Order.__table__,
+    ])
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def _clean_maps():
+    scan_lookup.invalidate_scan_index(None)
+    yield
+    scan_lookup.invalidate_scan_index(None)
+
+
+@pytest.fixture
+def no_redis():
+    with patch.object(scan_lookup.redis_manager, "get", AsyncMock(return_value=None)), \
+            patch.object(scan_lookup.redis_manager, "incr", AsyncMock(return_value=None)) as incr:
+        yield incr
+
+
+def _product(db, name, sku=None, barcode=None, business_id=BUSINESS, **kwargs):
+    product = Product(
+        business_id=business_id, name=name, sku=sku, barcode=barcode,
+        selling_price=kwargs.pop("selling_price", Decimal("10.00")), **kwargs,
+    )
+    db.add(product)
+    db.flush()
+    return product
+
+
+@contextlib.asynccontextmanager
+async def _invalidation():
+    await scan_lookup.start_scan_index()
+    try:
+        yield
+    finally:
+        await scan_lookup.stop_scan_index()
+
+
+async def _drain():
+    # The publish is scheduled thread-safely, then runs as its own task
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestBuildCodes:
+    def test_maps_skus_and_barcodes_of_live_products(self, db):
+        shirt = _product(db, "Shirt", sku="SH-1", barcode="6001", tax_rate=Decimal("15"))
+        _product(db, "Gone", sku="OLD-1", deleted_at=scan_lookup.utc_now())
+        db.commit()
+
+        codes = build_codes(db, BUSINESS)
+
+        assert set(codes) == {"SH-1", "6001"}
+        assert codes["SH-1"] is codes["6001"]
+        assert codes["6001"]["id"] == str(shirt.id)
+        assert codes["6001"]["selling_price"] == Decimal("10.00")
+        assert codes["6001"]["tax_rate"] == Decimal("15")
+
+    def test_barcode_wins_over_another_products_sku(self, db):
+        _product(db, "By SKU", sku="12345")
+        _product(db, "By barcode", barcode="12345")
+        _product(db, "Other business", barcode="999", business_id=uuid.uuid4())
+        db.commit()
+
+        codes = build_codes(db, BUSINESS)
+
+        assert codes["12345"]["name"] == "By barcode"
+        assert "999" not in codes
+
+
+class TestLookup:
+    @pytest.mark.asyncio
+    async def test_batch_lookup_builds_once(self, db, no_redis):
+        _product(db, "Shirt", sku="SH-1", barcode="6001")
+        db.commit()
+        build = MagicMock(side_effect=lambda: build_codes(db, BUSINESS))
+
+        first = await lookup_codes(BUSINESS, ["6001", " SH-1 ", "nope"], build)
+        second = await lookup_codes(BUSINESS, ["SH-1"], build)
+
+        assert first["6001"]["name"] == "Shirt"
+        assert first[" SH-1 "] is first["6001"]
+        assert first["nope"] is None
+        assert second["SH-1"] is first["6001"]
+        assert build.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_generation_bumped_elsewhere_rebuilds(self, monkeypatch):
+        monkeypatch.setattr(scan_lookup.settings, "SCAN_INDEX_CHECK_SECONDS", 0)
+        generations = {"own": "1"}
+        redis_get = AsyncMock(side_effect=lambda key: generations["own"] if key.endswith(str(BUSINESS)) else None)
+        build = MagicMock(return_value={})
+
+        with patch.object(scan_lookup.redis_manager, "get", redis_get):
+            await scan_lookup.get_scan_index(BUSINESS, build)
+            await scan_lookup.get_scan_index(BUSINESS, build)
+            generations["own"] = "2"
+            await scan_lookup.get_scan_index(BUSINESS, build)
+
+        assert build.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_map_is_evicted(self, monkeypatch, no_redis):
+        monkeypatch.setattr(scan_lookup.settings, "SCAN_INDEX_MAX_BUSINESSES", 2)
+        first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+        for business_id in (first, second, first, third):
+            await scan_lookup.get_scan_index(business_id, dict)
+
+        assert list(scan_lookup._indexes) == [str(first), str(third)]
+
+
+class TestInvalidation:
+    @pytest.fixture
+    def hooks(self, monkeypatch, no_redis):
+        monkeypatch.setattr(scan_lookup.settings, "SCAN_INDEX_WARM_BUSINESSES", 0)
+        return no_redis
+
+    async def _cached(self, db):
+        await scan_lookup.get_scan_index(BUSINESS, lambda: build_codes(db, BUSINESS))
+        return str(BUSINESS) in scan_lookup._indexes
+
+    @pytest.mark.asyncio
+    async def test_price_change_drops_the_map_and_bumps_the_generation(self, db, hooks):
+        async with _invalidation():
+            product = _product(db, "Shirt", barcode="6001")
+            db.commit()
+            assert await self._cached(db)
+
+            product.selling_price = Decimal("12.00")
+            db.commit()
+            await _drain()
+
+            assert str(BUSINESS) not in scan_lookup._indexes
+            assert hooks.await_args.args[0] == f"bizpilot:scan_gen:{BUSINESS}"
+            found = await lookup_codes(BUSINESS, ["6001"], lambda: build_codes(db, BUSINESS))
+            assert found["6001"]["selling_price"] == Decimal("12.00")
+
+    @pytest.mark.asyncio
+    async def test_stock_movement_keeps_the_map(self, db, hooks):
+        async with _invalidation():
+            product = _product(db, "Shirt", barcode="6001", quantity=5)
+            db.commit()
+            assert await self._cached(db)
+
+            product.quantity = 4
+            db.commit()
+
+            assert str(BUSINESS) in scan_lookup._indexes
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_drops_every_map(self, db, hooks):
+        async with _invalidation():
+            _product(db, "Shirt", barcode="6001")
+            db.commit()
+            assert await self._cached(db)
+
+            db.query(Product).filter(Product.business_id == BUSINESS).update(
+                {"selling_price": Decimal("9.00")}, synchronize_session=False
+            )
+            db.commit()
+            await _drain()
+
+            assert not scan_lookup._indexes
+            assert hooks.await_args.args[0] == "bizpilot:scan_gen:all"
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_changes_keep_the_map(self, db, hooks):
+        async with _invalidation():
+            product = _product(db, "Shirt", barcode="6001")
+            db.commit()
+            assert await self._cached(db)
+
+            product.name = "Renamed"
+            db.flush()
+            db.rollback()
+
+            assert str(BUSINESS) in scan_lookup._indexes
+
+
+class TestWarm:
+    @pytest.mark.asyncio
+    async def test_warms_businesses_that_sold_recently(self, session_factory, db, no_redis):
+        quiet = uuid.uuid4()
+        _product(db, "Shirt", barcode="6001")
+        _product(db, "Mug", barcode="7001", business_id=quiet)
+        db.add(Order(business_id=BUSINESS, order_number="ORD-1", total=10))
+        db.commit()
+
+        warmed = await scan_lookup.warm_scan_indexes(session_factory)
+
+        assert warmed == 1
+        assert list(scan_lookup._indexes) == [str(BUSINESS)]
+        assert "6001" in scan_lookup._indexes[str(BUSINESS)].codes
+
+
+class TestUniqueBarcode:
+    def test_create_with_taken_barcode_is_a_conflict(self, db):
+        from app.api.products import create_product
+
+        _product(db, "Shirt", barcode="6001")
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(create_product(
+                ProductCreate(name="Copy", selling_price=Decimal("5"), barcode="6001"),
+                current_user=MagicMock(), business_id=BUSINESS, db=db,
+            ))
+
+        assert exc.value.status_code == 409
+        assert "barcode '6001'" in exc.value.detail
+
+    def test_update_to_taken_barcode_is_a_conflict(self, db):
+        from app.api.products import update_product
+
+        _product(db, "Shirt", barcode="6001")
+        hat = _product(db, "Hat", barcode="6002")
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(update_product(
+                hat.id, ProductUpdate(barcode="6001"),
+                current_user=MagicMock(), business_id=BUSINESS, db=db,
+            ))
+
+        assert exc.value.status_code == 409
+        assert db.get(Product, hat.id).barcode == "6002"
@@ -0,0 +1,147 @@
+"""Tests for the shared search builder (app.core.search)."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import importlib.util
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.core.search import apply_search, contains, escape_like
+from app.models.product import Product
+from app.models.product_ingredient import ProductIngredient
+from app.models.stock_reservation import StockReservation
+from app.services.customer_service import CUSTOMER_SEARCH
+from app.services.order_service import ORDER_SEARCH
+from app.services.product_service import PRODUCT_SEARCH, ProductService
+
+BUSINESS = uuid.uuid4()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(
+        engine, tables=[Product.__table__, ProductIngredient.__table__, StockReservation.__table__]
+    )
+    session = sessionmaker(bind=engine)()
+    for name, description, sku, barcode in [
+        ("Red Cotton Shirt", "Short sleeves", "SH-RED", "6001234500011"),
+        ("Shirt, blue", "Cotton, red stitching", "SH-BLU", "6001234500028"),
+        ("Redbush Tea", "Rooibos, 50% off", "TEA-RB", "6001234500035"),
+        ("Green Tea", "Loose leaf", "TEA-GR", "6001234500042"),
+        ("Rooibos 100g", None, "RED", None),
+    ]:
+        session.add(Product(
+            business_id=BUSINESS, name=name, description=description, sku=sku,
+            barcode=barcode, selling_price=Decimal("10"),
+        ))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _names(products):
+    return [p.name for p in products]
+
+
+def _search(db, term):
+    query = db.query(Product).filter(Product.business_id == BUSINESS)
+    query, rank = apply_search(query, PRODUCT_SEARCH, term)
+    return query, rank
+
+
+class TestMatching:
+    def test_substring_on_any_column(self, db):
+        query, _ = _search(db, "rooibos")
+
+        assert sorted(_names(query.all())) == ["Redbush Tea", "Rooibos 100g"]
+
+    def test_wildcards_in_the_term_are_literal(self, db):
+        assert escape_like("50%_a/b") == "50/%/_a//b"
+        assert _names(_search(db, "50%")[0].all()) == ["Redbush Tea"]
+        assert _search(db, "_")[0].all() == []
+
+    def test_every_word_matches_in_any_order(self, db):
+        query, _ = _search(db, "shirt red")
+
+        assert sorted(_names(query.all())) == ["Red Cotton Shirt", "Shirt, blue"]
+
+    def test_blank_term_is_no_search(self, db):
+        query, rank = _search(db, "   ")
+
+        assert rank is None
+        assert query.count() == 5
+
+    def test_contains_for_single_column_searches(self, db):
+        rows = db.query(Product).filter(contains([Product.sku], "tea-")).all()
+
+        assert sorted(_names(rows)) == ["Green Tea", "Redbush Tea"]
+
+
+class TestRanking:
+    def test_exact_code_then_prefix_then_substring(self, db):
+        query, rank = _search(db, "RED")
+
+        ranked = _names(query.order_by(rank.desc(), Product.name).all())
+
+        assert ranked[0] == "Rooibos 100g"  # SKU "RED"
+        assert ranked[1:3] == ["Red Cotton Shirt", "Redbush Tea"]
+        assert ranked[3:] == ["Shirt, blue"]
+
+    def test_product_listing_sorts_by_relevance(self, db):
+        products, total = ProductService(db).get_products(BUSINESS, search="tea", sort_by="relevance")
+
+        assert total == 2
+        assert _names(products) == ["Redbush Tea", "Green Tea"] or _names(products) == ["Green Tea", "Redbush Tea"]
+        assert {p.sku for p in products} == {"TEA-RB", "TEA-GR"}
+
+    def test_scanned_code_skips_the_text_search(self, db):
+        products, total = ProductService(db).get_products(BUSINESS, search="6001234500028")
+
+        assert total == 1
+        assert _names(products) == ["Shirt, blue"]
+
+
+class TestPostgresExpressions:
+    def _migration(self):
+        path = Path(__file__).resolve().parents[2] / "alembic" / "versions" / "114_search_indexes.py"
+        spec = importlib.util.spec_from_file_location("search_indexes_migration", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    @pytest.mark.parametrize("table, search", [
+        ("products", PRODUCT_SEARCH),
+        ("customers", CUSTOMER_SEARCH),
+        ("orders", ORDER_SEARCH),
+    ])
+    def test_vector_matches_the_index_expression(self, table, search):
+        migration = self._migration()
+
+        assert [c.name for c in search.fulltext] == migration.FULLTEXT_COLUMNS[table]
+        assert set(c.name for c in search.columns) <= set(migration.TRIGRAM_COLUMNS[table])
+        sql = str(search.vector().compile(dialect=postgresql.dialect()))
+        # Inline constants only: bind parameters would not match the index
+        assert sql.startswith("to_tsvector('simple', ")
+        assert "%(" not in sql
+
+    def test_postgres_filter_uses_the_fulltext_index_for_several_words(self):
+        from app.core.search import search_filter
+
+        sql = str(search_filter(PRODUCT_SEARCH, "red shirt", postgres=True).compile(dialect=postgresql.dialect()))
+
+        assert "@@ plainto_tsquery('simple'" in sql
+        assert "products.sku = " in sql
@@ -0,0 +1,192 @@
+"""Tests for the streaming export helpers and background export jobs."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.bulk_operation import BulkOperation, BulkOperationType, OperationStatus
+from app.models.inventory import InventoryItem
+from app.models.product import Product, ProductStatus
+from app.services.product_excel_service import ProductExcelService
+from app.services.streaming_export_service import (
+    add_info_sheet,
+    add_table_sheet,
+    column_widths,
+    export_job_file,
+    iter_csv,
+    new_export_workbook,
+    run_export_job,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Product.__table__, InventoryItem.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def business_id():
+    return uuid.uuid4()
+
+
+def _seed_products(db, business_id, count):
+    for i in range(count):
+        db.add(Product(
+            business_id=business_id,
+            name=f"Product {i:03d}",
+            sku=f"SKU-{i:03d}",
+            selling_price=Decimal("9.99"),
+            quantity=i,
+            is_taxable=True,
+            status=ProductStatus.ACTIVE,
+        ))
+    db.commit()
+
+
+class TestIterCsv:
+    def test_header_then_rows(self):
+        chunks = list(iter_csv(["a", "b"], [[1, "x"], [2, "y,z"]]))
+        assert "".join(chunks) == 'a,b\r\n1,x\r\n2,"y,z"\r\n'
+
+    def test_flushes_every_n_rows(self):
+        chunks = list(iter_csv(["n"], ([i] for i in range(5)), flush_rows=2))
+        assert chunks == ["n\r\n0\r\n1\r\n", "2\r\n3\r\n", "4\r\n"]
+
+    def test_empty_rows_still_yield_header(self):
+        assert list(iter_csv(["n"], [])) == ["n\r\n"]
+
+
+class TestWorkbookHelpers:
+    def test_table_sheet_has_styled_frozen_header(self, tmp_path):
+        wb = new_export_workbook()
+        ws = add_table_sheet(wb, "Data", ["SKU", "Name"], [15, None])
+        ws.append(["A1", "Apple"])
+        add_info_sheet(wb, "Export Info", [("Total:", 1)])
+        wb.save(tmp_path / "out.xlsx")
+
+        result = load_workbook(tmp_path / "out.xlsx")
+        assert result.sheetnames == ["Data", "Export Info"]
+        data = result["Data"]
+        assert data.freeze_panes == "A2"
+        assert data["A1"].font.bold is True
+        assert data.column_dimensions["A"].width == 15
+        assert [c.value for c in data[2]] == ["A1", "Apple"]
+        assert result["Export Info"]["B1"].value == 1
+
+    def test_column_widths_fit_content_with_cap(self):
+        widths = column_widths(["Id", "Name"], [[1, "x" * 100], [None, "abc"]])
+        assert widths == [6, 40]
+
+
+class TestProductExport:
+    def test_writes_all_rows_with_progress(self, db, business_id, tmp_path):
+        _seed_products(db, business_id, 5)
+        seen = []
+
+        with patch("app.services.product_excel_service.EXPORT_YIELD_PER", 2):
+            written = ProductExcelService(db).write_products_export(
+                business_id, tmp_path / "products.xlsx", progress=seen.append
+            )
+
+        assert written == 5
+        assert seen == [2, 4]
+        wb = load_workbook(tmp_path / "products.xlsx")
+        ws = wb["Products"]
+        assert ws.max_row == 6
+        assert [c.value for c in ws[2]][:3] == ["SKU-000", "Product 000", None]
+        assert wb["Export Info"]["B2"].value == 5
+
+    def test_progress_can_stop_export(self, db, business_id, tmp_path):
+        _seed_products(db, business_id, 5)
+
+        with patch("app.services.product_excel_service.EXPORT_YIELD_PER", 2):
+            written = ProductExcelService(db).write_products_export(
+                business_id, tmp_path / "products.xlsx", progress=lambda n: False
+            )
+
+        assert written == 2
+
+    def test_in_memory_export_still_returns_bytes(self, db, business_id):
+        _seed_products(db, business_id, 1)
+        output = ProductExcelService(db).export_products(business_id)
+        assert output.read(2) == b"PK"
+
+
+class TestExportJob:
+    def _run(self, operation, tmp_path, write):
+        job_db = MagicMock()
+        job_db.query.return_value.filter.return_value.first.return_value = operation
+        with patch("app.core.database.SessionLocal", return_value=job_db), \
+                patch("app.services.streaming_export_service.settings.EXPORT_DIR", str(tmp_path)), \
+                patch.object(ProductExcelService, "count_products_export", return_value=3), \
+                patch.object(ProductExcelService, "write_products_export", side_effect=write):
+            run_export_job(str(operation.id), "products", str(operation.business_id))
+        job_db.close.assert_called_once()
+
+    def _operation(self):
+        return BulkOperation(
+            id=uuid.uuid4(),
+            operation_type=BulkOperationType.EXPORT.value,
+            status=OperationStatus.PENDING.value,
+            business_id=uuid.uuid4(),
+            parameters={"entity": "products"},
+        )
+
+    def test_job_writes_file_and_marks_completed(self, tmp_path):
+        operation = self._operation()
+
+        def write(business_id, path, progress):
+            assert progress(2) is True
+            assert operation.processed_records == 2
+            with open(path, "wb") as fh:
+                fh.write(b"PK")
+            return 3
+
+        self._run(operation, tmp_path, write)
+
+        assert operation.status == OperationStatus.COMPLETED.value
+        assert operation.total_records == 3
+        assert operation.processed_records == 3
+        export = export_job_file(operation)
+        assert export["path"] == str(tmp_path / f"{operation.id}.xlsx")
+        assert export["filename"].startswith("products_export_")
+
+    def test_cancelled_job_discards_file(self, tmp_path):
+        operation = self._operation()
+
+        def write(business_id, path, progress):
+            operation.status = OperationStatus.CANCELLED.value
+            assert progress(2) is False
+            with open(path, "wb") as fh:
+                fh.write(b"PK")
+            return 2
+
+        self._run(operation, tmp_path, write)
+
+        assert operation.status == OperationStatus.CANCELLED.value
+        assert export_job_file(operation) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_job_failure_is_recorded(self, tmp_path):
+        operation = self._operation()
+
+        self._run(operation, tmp_path, RuntimeError("disk full"))
+
+        assert operation.status == OperationStatus.FAILED.value
+        assert operation.error_summary == "disk full"
+        assert export_job_file(operation) is None
@@ -0,0 +1,251 @@
+"""Tests for the streaming product/inventory import pipeline."""
+
+import os
+os.environ.setdefault("SECRET_KEY", "test-secret-key-32-bytes-minimum")
+
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
+from app.models.inventory import InventoryItem
+from app.models.product import Product, ProductStatus
+from app.services.streaming_import_service import (
+    ImportFileError,
+    StreamingImportService,
+    chunked,
+    open_sheet_rows,
+    parse_inventory_row,
+    parse_product_row,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Product.__table__, InventoryItem.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def business_id():
+    return str(uuid.uuid4())
+
+
+def _products(db):
+    rows = db.execute(
+        select(Product.sku, Product.name, Product.selling_price, Product.quantity, Product.description)
+        .order_by(Product.sku)
+    ).all()
+    return {r.sku: r for r in rows}
+
+
+def _xlsx(headers, rows, title="Products") -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = title
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+    out = BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+class TestSheetReader:
+    def test_csv_headers_are_normalised(self):
+        sheet = open_sheet_rows(b"SKU,Product Name\nA1,Apple\n", [], "items.csv")
+        assert sheet.headers == {"sku": 0, "product_name": 1}
+        assert list(sheet.rows) == [(2, ["A1", "Apple"])]
+
+    def test_csv_blank_cells_become_none(self):
+        sheet = open_sheet_rows(b"SKU,Name\nA1,\n", [], "items.csv")
+        assert list(sheet.rows) == [(2, ["A1", None])]
+
+    def test_xlsx_prefers_named_sheet(self):
+        content = _xlsx(["SKU"], [["A1"], ["A2"]], title="Inventory")
+        sheet = open_sheet_rows(content, ["Inventory"])
+        assert sheet.headers == {"sku": 0}
+        assert [values[0] for _, values in sheet.rows] == ["A1", "A2"]
+        assert sheet.estimated_total == 2
+
+    def test_malformed_file_raises(self):
+        with pytest.raises(ImportFileError, match="Failed to read Excel file"):
+            open_sheet_rows(b"not an excel file", ["Products"])
+
+
+class TestChunked:
+    def test_splits_into_fixed_size_chunks(self):
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_empty_iterable(self):
+        assert list(chunked([], 3)) == []
+
+
+class TestRowParsing:
+    def test_product_row_only_includes_present_columns(self):
+        data = {"product_name": "Tea", "selling_price": "12.5"}
+        values, error = parse_product_row(lambda *keys: next((data[k] for k in keys if k in data), None))
+        assert error is None
+        assert values == {"name": "Tea", "selling_price": Decimal("12.5"), "status": ProductStatus.ACTIVE}
+
+    def test_product_row_invalid_price(self):
+        data = {"product_name": "Tea", "selling_price": "abc"}
+        values, error = parse_product_row(lambda *keys: next((data[k] for k in keys if k in data), None))
+        assert values is None
+        assert error == "Invalid selling price value"
+
+    def test_blank_product_row_is_skipped_silently(self):
+        assert parse_product_row(lambda *keys: None) == (None, None)
+
+    def test_inventory_row_invalid_quantity(self):
+        data = {"sku": "A1", "quantity_on_hand": "lots"}
+        values, error = parse_inventory_row(lambda *keys: next((data[k] for k in keys if k in data), None))
+        assert values is None
+        assert error.startswith("Invalid value")
+
+
+class TestImportProducts:
+    def test_creates_products_and_inventory(self, db, business_id):
+        service = StreamingImportService(db)
+        csv_data = b"SKU,Product Name,Selling Price,Initial Quantity\nA1,Apple,1.50,5\n,Loose Item,3,\n"
+
+        result = service.import_products(business_id, csv_data, "catalog.csv")
+
+        assert result["success"] is True
+        assert result["created"] == 2
+        assert result["updated"] == 0
+        assert db.query(InventoryItem).count() == 2
+        quantities = sorted(db.execute(select(InventoryItem.quantity_on_hand)).scalars())
+        assert quantities == [0, 5]
+
+    def test_upserts_existing_sku_across_chunks(self, db, business_id):
+        service = StreamingImportService(db, chunk_size=1)
+        csv_data = b"SKU,Product Name,Selling Price\nA1,Apple,1.50\nA1,Green Apple,1.75\n"
+
+        result = service.import_products(business_id, csv_data, "catalog.csv")
+
+        assert result["created"] == 1
+        assert result["updated"] == 1
+        products = _products(db)
+        assert products["A1"].name == "Green Apple"
+        assert products["A1"].selling_price == Decimal("1.75")
+
+    def test_update_keeps_columns_missing_from_file(self, db, business_id):
+        service = StreamingImportService(db)
+        service.import_products(
+            business_id,
+            b"SKU,Product Name,Selling Price,Description,Initial Quantity\nA1,Apple,1.50,Crunchy,7\n",
+            "catalog.csv",
+        )
+
+        result = service.import_products(
+            business_id, b"SKU,Name,Selling Price\nA1,Apple,2.00\n", "catalog.csv"
+        )
+
+        assert result["updated"] == 1
+        product = _products(db)["A1"]
+        assert product.description == "Crunchy"
+        assert product.quantity == 7
+        assert product.selling_price == Decimal("2.00")
+        # Existing product must not get a second inventory row
+        assert db.query(InventoryItem).count() == 1
+
+    def test_duplicate_sku_in_chunk_last_row_wins(self, db, business_id):
+        service = StreamingImportService(db)
+        csv_data = b"SKU,Product Name,Selling Price\nA1,First,1\nA1,Second,2\n"
+
+        result = service.import_products(business_id, csv_data, "catalog.csv")
+
+        assert result["created"] == 1
+        assert result["updated"] == 1
+        assert _products(db)["A1"].name == "Second"
+
+    def test_reports_row_errors(self, db, business_id):
+        service = StreamingImportService(db)
+        csv_data = b"SKU,Product Name,Selling Price\nA1,Apple,abc\nA2,Pear,\nA3,Plum,3\n"
+
+        result = service.import_products(business_id, csv_data, "catalog.csv")
+
+        assert result["created"] == 1
+        assert result["skipped"] == 2
+        assert "Row 2: Invalid selling price value" in result["errors"]
+        assert "Row 3: Missing selling price" in result["errors"]
+
+    def test_missing_required_columns(self, db, business_id):
+        service = StreamingImportService(db)
+
+        result = service.import_products(business_id, b"SKU,Description\nA1,x\n", "catalog.csv")
+
+        assert result["success"] is False
+        assert any("Missing required columns" in e for e in result["errors"])
+
+    def test_reads_xlsx_in_read_only_mode(self, db, business_id):
+        service = StreamingImportService(db)
+        content = _xlsx(["SKU", "Product Name", "Selling Price"], [["X1", "Widget", 9.99]])
+
+        result = service.import_products(business_id, content)
+
+        assert result["success"] is True
+        assert _products(db)["X1"].name == "Widget"
+
+    def test_progress_callback_can_cancel(self, db, business_id):
+        service = StreamingImportService(db, chunk_size=1)
+        csv_data = b"SKU,Product Name,Selling Price\nA1,Apple,1\nA2,Pear,2\nA3,Plum,3\n"
+        calls = []
+
+        def progress(result):
+            calls.append(result["processed"])
+            return False
+
+        result = service.import_products(business_id, csv_data, "catalog.csv", progress=progress)
+
+        assert calls == [1]
+        assert result["created"] == 1
+        assert "Import cancelled" in result["errors"]
+
+
+class TestImportInventory:
+    def _seed(self, db, business_id, *skus):
+        StreamingImportService(db).import_products(
+            business_id,
+            ("SKU,Product Name,Selling Price\n" + "".join(f"{s},{s},1\n" for s in skus)).encode(),
+            "catalog.csv",
+            auto_create_inventory=False,
+        )
+
+    def test_creates_and_updates_items(self, db, business_id):
+        self._seed(db, business_id, "A1", "A2")
+        service = StreamingImportService(db)
+
+        first = service.import_inventory(business_id, b"SKU,Quantity On Hand\nA1,10\n", "stock.csv")
+        second = service.import_inventory(
+            business_id, b"SKU,Quantity On Hand,Location\nA1,12,Front\nA2,3,\n", "stock.csv"
+        )
+
+        assert first["created"] == 1
+        assert second["updated"] == 1
+        assert second["created"] == 1
+        items = {
+            r.quantity_on_hand: r.location
+            for r in db.execute(select(InventoryItem.quantity_on_hand, InventoryItem.location))
+        }
+        assert items == {12: "Front", 3: None}
+
+    def test_unknown_sku_is_reported(self, db, business_id):
+        service = StreamingImportService(db)
+
+        result = service.import_inventory(business_id, b"SKU,Quantity On Hand\nNOPE,1\n", "stock.csv")
+
+        assert result["success"] is False
+        assert result["skipped"] == 1
+        assert any("not found" in e for e in result["errors"])
@@ -114,7 +114,7 @@ class TestGetSuppliers:
         svc.get_suppliers(BIZ, page=1, per_page=20)
 
         chain.offset.assert_called_once_with(0)
-        chain.limit.assert_called_once_with(20)
+        chain.limit.assert_called_once_with(21)  # one extra row tells whether there is a next page
 
     def test_pagination_offset_limit_page2(self):
         svc, db = _svc()
@@ -124,7 +124,7 @@ class TestGetSuppliers:
         svc.get_suppliers(BIZ, page=2, per_page=10)
 
         chain.offset.assert_called_once_with(10)
-        chain.limit.assert_called_once_with(10)
+        chain.limit.assert_called_once_with(11)
 
     def test_pagination_offset_limit_page3(self):
         svc, db = _svc()
@@ -134,7 +134,7 @@ class TestGetSuppliers:
         svc.get_suppliers(BIZ, page=3, per_page=15)
 
         chain.offset.assert_called_once_with(30)
-        chain.limit.assert_called_once_with(15)
+        chain.limit.assert_called_once_with(16)
 
     def test_sort_order_desc(self):
         svc, db = _svc()
@@ -184,7 +184,7 @@ class TestListPending:
 
         svc.list_pending(str(BIZ))
         chain.offset.assert_called_once_with(0)   # (1-1)*50
-        chain.limit.assert_called_once_with(50)
+        chain.limit.assert_called_once_with(51)  # one extra row tells whether there is a next page
 
     def test_list_pending_pagination_custom(self):
         svc, db = _svc()
@@ -193,7 +193,7 @@ class TestListPending:
 
         svc.list_pending(str(BIZ), page=3, per_page=20)
         chain.offset.assert_called_once_with(40)   # (3-1)*20
-        chain.limit.assert_called_once_with(20)
+        chain.limit.assert_called_once_with(21)
 
     def test_list_pending_empty(self):
         svc, db = _svc()
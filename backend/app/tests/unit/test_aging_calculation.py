@@ -16,59 +16,41 @@ Tests validate:
 import uuid
 from decimal import Decimal
 from datetime import datetime, timedelta, date
-from typing import Any, List, Optional
+from typing import Optional
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
 from app.models.customer_account import (
     CustomerAccount,
     AccountStatus,
     AccountTransaction,
+    AccountPayment,
+    AccountOpenItem,
+    PaymentAllocation,
     TransactionType,
 )
 from app.services.customer_account_service import CustomerAccountService
 
 
-class FakeQuery:
-    """Fake query object for testing."""
-
-    def __init__(self, items: List[Any]):
-        self._items = list(items)
-        self._filters = []
-        self._scalar_value = None
-
-    def filter(self, *args, **kwargs):
-        """Apply filter."""
-        self._filters.append((args, kwargs))
-        return self
-
-    def scalar(self):
-        """Return scalar value (for aggregate queries)."""
-        return self._scalar_value
-
-    def all(self):
-        """Return all items."""
-        return self._items
-
-
-class FakeSession:
-    """Fake database session for testing."""
-
-    def __init__(self, transactions: List[AccountTransaction], allocations: Optional[dict] = None):
-        self.transactions = transactions
-        self.allocations = allocations or {}
-
-    def query(self, model_or_expr):
-        """Create a query for the given model."""
-        # Check if it's the AccountTransaction model by checking the class name
-        if hasattr(model_or_expr, '__name__') and model_or_expr.__name__ == 'AccountTransaction':
-            query = FakeQuery(self.transactions)
-            return query
-        # Handle aggregate queries (func.sum)
-        else:
-            query = FakeQuery([])
-            query._scalar_value = Decimal('0')  # Default: no allocations
-            return query
+@pytest.fixture
+def db():
+    """In-memory SQLite session with the customer account tables."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        CustomerAccount.__table__,
+        AccountTransaction.__table__,
+        AccountPayment.__table__,
+        PaymentAllocation.__table__,
+        AccountOpenItem.__table__,
+    ])
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
 
 
 @pytest.fixture
@@ -94,7 +76,7 @@ def _make_account(
         id=uuid.uuid4(),
         customer_id=customer_id,
         business_id=business_id,
-        account_number="ACC-TEST-00001",
+        account_number=f"ACC-TEST-{uuid.uuid4().hex[:8]}",
         status=AccountStatus.ACTIVE,
         credit_limit=Decimal("5000"),
         current_balance=Decimal("0"),
@@ -122,15 +104,31 @@ def _make_transaction(
     )
 
 
+def _allocate(transaction: AccountTransaction, amount: Decimal) -> PaymentAllocation:
+    """Create an allocation of ``amount`` against a charge."""
+    return PaymentAllocation(
+        payment_id=uuid.uuid4(),
+        transaction_id=transaction.id,
+        amount=amount,
+    )
+
+
+def _seed(db, account: CustomerAccount, *rows) -> CustomerAccountService:
+    """Persist the account with its transactions/allocations and return a service."""
+    db.add(account)
+    db.add_all(rows)
+    db.commit()
+    return CustomerAccountService(db)
+
+
 # ============================================================================
 # Test: Empty Account (No Transactions)
 # ============================================================================
 
-def test_calculate_aging_empty_account(business_id, customer_id):
+def test_calculate_aging_empty_account(db, business_id, customer_id):
     """Test aging calculation for account with no transactions."""
     account = _make_account(customer_id, business_id)
-    db = FakeSession(transactions=[])
-    service = CustomerAccountService(db)
+    service = _seed(db, account)
     
     aging = service.calculate_aging(account)
     
@@ -145,7 +143,7 @@ def test_calculate_aging_empty_account(business_id, customer_id):
 # Test: Current Balance (Not Yet Due)
 # ============================================================================
 
-def test_calculate_aging_current_not_due(business_id, customer_id):
+def test_calculate_aging_current_not_due(db, business_id, customer_id):
     """Test aging calculation for charges not yet due."""
     account = _make_account(customer_id, business_id, payment_terms=30)
     today = datetime.utcnow()
@@ -158,8 +156,7 @@ def test_calculate_aging_current_not_due(business_id, customer_id):
         created_at=today,
     )
     
-    db = FakeSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge)
     
     aging = service.calculate_aging(account, as_of_date=today)
 
@@ -175,7 +172,7 @@ def test_calculate_aging_current_not_due(business_id, customer_id):
 # Test: 1-30 Days Overdue
 # ============================================================================
 
-def test_calculate_aging_30_days_overdue(business_id, customer_id):
+def test_calculate_aging_30_days_overdue(db, business_id, customer_id):
     """Test aging calculation for charges 1-30 days overdue."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -188,8 +185,7 @@ def test_calculate_aging_30_days_overdue(business_id, customer_id):
         created_at=today - timedelta(days=45),
     )
     
-    db = FakeSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge)
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -204,7 +200,7 @@ def test_calculate_aging_30_days_overdue(business_id, customer_id):
 # Test: 31-60 Days Overdue
 # ============================================================================
 
-def test_calculate_aging_60_days_overdue(business_id, customer_id):
+def test_calculate_aging_60_days_overdue(db, business_id, customer_id):
     """Test aging calculation for charges 31-60 days overdue."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -217,8 +213,7 @@ def test_calculate_aging_60_days_overdue(business_id, customer_id):
         created_at=today - timedelta(days=75),
     )
     
-    db = FakeSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge)
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -234,7 +229,7 @@ def test_calculate_aging_60_days_overdue(business_id, customer_id):
 # Test: 61+ Days Overdue (90+ bucket)
 # ============================================================================
 
-def test_calculate_aging_90_plus_days_overdue(business_id, customer_id):
+def test_calculate_aging_90_plus_days_overdue(db, business_id, customer_id):
     """Test aging calculation for charges 61+ days overdue."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -255,8 +250,7 @@ def test_calculate_aging_90_plus_days_overdue(business_id, customer_id):
         created_at=today - timedelta(days=150),
     )
     
-    db = FakeSession(transactions=[charge1, charge2])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge1, charge2)
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -271,7 +265,7 @@ def test_calculate_aging_90_plus_days_overdue(business_id, customer_id):
 # Test: Mixed Aging Buckets
 # ============================================================================
 
-def test_calculate_aging_mixed_buckets(business_id, customer_id):
+def test_calculate_aging_mixed_buckets(db, business_id, customer_id):
     """Test aging calculation with charges in all buckets."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -304,8 +298,7 @@ def test_calculate_aging_mixed_buckets(business_id, customer_id):
         due_date=(today - timedelta(days=100)).date(),
     )
     
-    db = FakeSession(transactions=[charge1, charge2, charge3, charge4])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge1, charge2, charge3, charge4)
     
     aging = service.calculate_aging(account, as_of_date=today)
 
@@ -321,7 +314,7 @@ def test_calculate_aging_mixed_buckets(business_id, customer_id):
 # Test: Boundary Conditions
 # ============================================================================
 
-def test_calculate_aging_boundary_exactly_30_days(business_id, customer_id):
+def test_calculate_aging_boundary_exactly_30_days(db, business_id, customer_id):
     """Test aging calculation for charge exactly 30 days overdue."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -333,8 +326,7 @@ def test_calculate_aging_boundary_exactly_30_days(business_id, customer_id):
         due_date=(today - timedelta(days=30)).date(),
     )
     
-    db = FakeSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge)
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -344,7 +336,7 @@ def test_calculate_aging_boundary_exactly_30_days(business_id, customer_id):
     assert aging['days_90_plus'] == Decimal('0')
 
 
-def test_calculate_aging_boundary_exactly_60_days(business_id, customer_id):
+def test_calculate_aging_boundary_exactly_60_days(db, business_id, customer_id):
     """Test aging calculation for charge exactly 60 days overdue."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -356,8 +348,7 @@ def test_calculate_aging_boundary_exactly_60_days(business_id, customer_id):
         due_date=(today - timedelta(days=60)).date(),
     )
     
-    db = FakeSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge)
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -367,7 +358,7 @@ def test_calculate_aging_boundary_exactly_60_days(business_id, customer_id):
     assert aging['days_90_plus'] == Decimal('0')
 
 
-def test_calculate_aging_boundary_exactly_61_days(business_id, customer_id):
+def test_calculate_aging_boundary_exactly_61_days(db, business_id, customer_id):
     """Test aging calculation for charge exactly 61 days overdue."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -379,8 +370,7 @@ def test_calculate_aging_boundary_exactly_61_days(business_id, customer_id):
         due_date=(today - timedelta(days=61)).date(),
     )
     
-    db = FakeSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge)
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -395,7 +385,7 @@ def test_calculate_aging_boundary_exactly_61_days(business_id, customer_id):
 # Test: No Due Date (Uses Payment Terms)
 # ============================================================================
 
-def test_calculate_aging_no_due_date_uses_payment_terms(business_id, customer_id):
+def test_calculate_aging_no_due_date_uses_payment_terms(db, business_id, customer_id):
     """Test aging calculation when charge has no due_date (uses payment terms)."""
     account = _make_account(customer_id, business_id, payment_terms=30)
     today = datetime.utcnow()
@@ -409,8 +399,7 @@ def test_calculate_aging_no_due_date_uses_payment_terms(business_id, customer_id
         created_at=today - timedelta(days=50),
     )
     
-    db = FakeSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge)
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -425,7 +414,7 @@ def test_calculate_aging_no_due_date_uses_payment_terms(business_id, customer_id
 # Test: Custom as_of_date
 # ============================================================================
 
-def test_calculate_aging_custom_as_of_date(business_id, customer_id):
+def test_calculate_aging_custom_as_of_date(db, business_id, customer_id):
     """Test aging calculation with custom as_of_date."""
     account = _make_account(customer_id, business_id)
     
@@ -439,8 +428,7 @@ def test_calculate_aging_custom_as_of_date(business_id, customer_id):
         due_date=date(2023, 12, 1),
     )
     
-    db = FakeSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge)
     
     aging = service.calculate_aging(account, as_of_date=as_of_date)
     
@@ -455,7 +443,7 @@ def test_calculate_aging_custom_as_of_date(business_id, customer_id):
 # Test: Fully Paid Charges (Should Be Excluded)
 # ============================================================================
 
-def test_calculate_aging_excludes_fully_paid_charges(business_id, customer_id):
+def test_calculate_aging_excludes_fully_paid_charges(db, business_id, customer_id):
     """Test that fully paid charges are excluded from aging."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -467,18 +455,7 @@ def test_calculate_aging_excludes_fully_paid_charges(business_id, customer_id):
         due_date=(today - timedelta(days=40)).date(),
     )
     
-    # Mock the session to return full payment allocation
-    class FullyPaidSession(FakeSession):
-        def query(self, model_or_expr):
-            if hasattr(model_or_expr, '__name__') and model_or_expr.__name__ == 'AccountTransaction':
-                return FakeQuery([charge])
-            # Mock sum query for allocations
-            query = FakeQuery([])
-            query._scalar_value = Decimal('500.00')  # Fully paid
-            return query
-    
-    db = FullyPaidSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge, _allocate(charge, Decimal('500.00')))
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -495,7 +472,7 @@ def test_calculate_aging_excludes_fully_paid_charges(business_id, customer_id):
 # Test: Partially Paid Charges
 # ============================================================================
 
-def test_calculate_aging_partially_paid_charges(business_id, customer_id):
+def test_calculate_aging_partially_paid_charges(db, business_id, customer_id):
     """Test aging calculation with partially paid charges."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -507,18 +484,7 @@ def test_calculate_aging_partially_paid_charges(business_id, customer_id):
         due_date=(today - timedelta(days=25)).date(),
     )
     
-    # Mock the session to return partial payment allocation
-    class PartiallyPaidSession(FakeSession):
-        def query(self, model_or_expr):
-            if hasattr(model_or_expr, '__name__') and model_or_expr.__name__ == 'AccountTransaction':
-                return FakeQuery([charge])
-            # Mock sum query for allocations
-            query = FakeQuery([])
-            query._scalar_value = Decimal('600.00')  # Partially paid
-            return query
-    
-    db = PartiallyPaidSession(transactions=[charge])
-    service = CustomerAccountService(db)
+    service = _seed(db, account, charge, _allocate(charge, Decimal('600.00')))
     
     aging = service.calculate_aging(account, as_of_date=today)
     
@@ -534,7 +500,7 @@ def test_calculate_aging_partially_paid_charges(business_id, customer_id):
 # Test: Multiple Charges with Different Payment Status
 # ============================================================================
 
-def test_calculate_aging_mixed_payment_status(business_id, customer_id):
+def test_calculate_aging_mixed_payment_status(db, business_id, customer_id):
     """Test aging with mix of unpaid, partially paid, and fully paid charges."""
     account = _make_account(customer_id, business_id)
     today = datetime.utcnow()
@@ -563,24 +529,17 @@ def test_calculate_aging_mixed_payment_status(business_id, customer_id):
     )
     charge3.id = uuid.UUID('00000000-0000-0000-0000-000000000003')
     
-    # Mock session with different allocations per charge
-    class MixedPaymentSession(FakeSession):
-        def query(self, model_or_expr):
-            if hasattr(model_or_expr, '__name__') and model_or_expr.__name__ == 'AccountTransaction':
-                return FakeQuery([charge1, charge2, charge3])
-            # Mock sum query - return different amounts based on transaction
-            query = FakeQuery([])
-            # This is a simplified mock - in reality would need to track which charge
-            # For this test, we'll return 0 for charge1, 300 for charge2, 200 for charge3
-            query._scalar_value = Decimal('0')  # Default to unpaid
-            return query
-    
-    db = MixedPaymentSession(transactions=[charge1, charge2, charge3])
-    service = CustomerAccountService(db)
-    
-    # Note: This test has limitations due to mock complexity
-    # In real implementation, allocations are queried per charge
+    service = _seed(
+        db, account, charge1, charge2, charge3,
+        _allocate(charge2, Decimal('300.00')),
+        _allocate(charge3, Decimal('200.00')),
+    )
+    
     aging = service.calculate_aging(account, as_of_date=today)
     
-    # All charges treated as unpaid in this simplified mock
-    assert aging['total'] == Decimal('1000.00')
+    # charge1 unpaid, charge2 has 200 left, charge3 is fully paid
+    assert aging['current'] == Decimal('0')
+    assert aging['days_30'] == Decimal('300.00')
+    assert aging['days_60'] == Decimal('200.00')
+    assert aging['days_90_plus'] == Decimal('0')
+    assert aging['total'] == Decimal('500.00')
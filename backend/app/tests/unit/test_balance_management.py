@@ -19,11 +19,16 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
+import app.models  # noqa: F401  - register all mappers
+from app.core.database import Base
 from app.models.customer_account import (
     CustomerAccount,
     AccountStatus,
     AccountTransaction,
+    PaymentAllocation,
     TransactionType,
 )
 from app.services.customer_account_service import CustomerAccountService
@@ -433,7 +438,17 @@ def test_get_balance_with_aging_breakdown(business_id, customer_id):
         ),
     ]
     
-    db = FakeSession(data_by_model={AccountTransaction: transactions})
+    # Aging is a grouped SQL query, so this test needs a real session
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        CustomerAccount.__table__,
+        AccountTransaction.__table__,
+        PaymentAllocation.__table__,
+    ])
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    db.add(account)
+    db.add_all(transactions)
+    db.commit()
     svc = CustomerAccountService(db)
     
     balance = svc.get_balance(account, include_aging=True)
@@ -442,6 +457,12 @@ def test_get_balance_with_aging_breakdown(business_id, customer_id):
     # Aging is returned as a dict
     assert isinstance(balance.aging, dict)
     assert 'total' in balance.aging
+    assert balance.aging['days_30'] == Decimal("100")
+    assert balance.aging['days_60'] == Decimal("150")
+    assert balance.aging['days_90_plus'] == Decimal("250")
+    assert balance.aging['total'] == Decimal("500")
+    db.close()
+    engine.dispose()
 
 
 def test_get_balance_without_aging_breakdown(business_id, customer_id):
@@ -0,0 +1,114 @@
+"""
+Benchmark agent step logging: per-step flush vs. the buffered writer.
+
+Writes N agent_logs rows to a file-backed SQLite database and times:
+
+- inline:   the old path — ``db.add`` + ``db.flush`` on the request session
+            for every step, committing at the end (what the agent waited for)
+- buffered: ``log_agent_step`` with the background writer running; the
+            caller only pays for the enqueue, the writer inserts in batches
+- drain:    time for the writer to persist everything after the last step
+
+Usage:
+    python scripts/benchmarks/bench_agent_log_buffer.py
+    python scripts/benchmarks/bench_agent_log_buffer.py --steps 20000 --batch 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+
+def _engine(path: str):
+    from sqlalchemy import create_engine
+
+    from app.core.database import Base
+    from app.models.agent_log import AgentLog
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[AgentLog.__table__])
+    return engine
+
+
+def _log(lib, db, user_id, business_id, step):
+    lib.log_agent_step(
+        db=db,
+        session_id="bench",
+        user_id=user_id,
+        business_id=business_id,
+        agent_name="chat_agent",
+        step_number=step,
+        action_type="HOTL",
+        tokens_used=120,
+        tool_name="get_sales_summary",
+        result_summary="ok",
+        latency_ms=40.0,
+    )
+
+
+def run_inline(steps: int, path: str) -> float:
+    from sqlalchemy.orm import Session
+
+    from app.agents.lib import observability_logger as lib
+
+    user_id, business_id = str(uuid.uuid4()), str(uuid.uuid4())
+    with Session(_engine(path)) as db:
+        started = time.perf_counter()
+        for step in range(steps):
+            _log(lib, db, user_id, business_id, step)
+        db.commit()
+        return time.perf_counter() - started
+
+
+async def run_buffered(steps: int, batch: int, path: str) -> tuple[float, float, dict]:
+    from sqlalchemy.orm import sessionmaker
+
+    from app.agents.lib import observability_logger as lib
+
+    buffer = lib.AgentLogBuffer(
+        capacity=max(steps, 1), batch_size=batch, flush_interval=0.5,
+        session_factory=sessionmaker(bind=_engine(path)),
+    )
+    lib.log_buffer = buffer
+    buffer.start()
+    user_id, business_id = str(uuid.uuid4()), str(uuid.uuid4())
+
+    started = time.perf_counter()
+    for step in range(steps):
+        _log(lib, None, user_id, business_id, step)
+    enqueue = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await buffer.stop()
+    drain = time.perf_counter() - started
+    return enqueue, drain, buffer.stats()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inline = run_inline(args.steps, os.path.join(tmp, "inline.db"))
+        enqueue, drain, stats = asyncio.run(run_buffered(args.steps, args.batch, os.path.join(tmp, "buffered.db")))
+
+    print(f"{'mode':<10} {'total ms':>9} {'us/step':>8}")
+    print(f"{'inline':<10} {inline * 1000:>9.1f} {inline / args.steps * 1e6:>8.1f}")
+    print(f"{'buffered':<10} {enqueue * 1000:>9.1f} {enqueue / args.steps * 1e6:>8.1f}")
+    print(f"{'drain':<10} {drain * 1000:>9.1f} {'-':>8}")
+    print(f"written={stats['written']} dropped={stats['dropped']} failed_batches={stats['failed_batches']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
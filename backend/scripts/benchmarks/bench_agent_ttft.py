@@ -0,0 +1,100 @@
+"""
+Benchmark time to first token for streamed vs. buffered LLM calls.
+
+A mock OpenAI-compatible provider (httpx.MockTransport) emits N content
+tokens with a fixed inter-token delay, in SSE format when ``stream`` is
+set and as one JSON body otherwise.  For each token count the script
+measures:
+
+- buffered: execute_task, where the first visible text is the whole answer
+- streamed: execute_task_stream, time to the first delta and to the end
+
+Usage:
+    python scripts/benchmarks/bench_agent_ttft.py
+    python scripts/benchmarks/bench_agent_ttft.py --tokens 50 400 --delay-ms 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_TOKENS = [50, 200]
+MODEL = "mock-model"
+
+
+def _provider(tokens: int, delay: float):
+    import httpx
+
+    words = [f"w{i} " for i in range(tokens)]
+
+    async def sse():
+        for word in words:
+            await asyncio.sleep(delay)
+            chunk = {"choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    async def handler(request):
+        if json.loads(request.content).get("stream"):
+            return httpx.Response(200, content=sse())
+        await asyncio.sleep(delay * tokens)
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": "".join(words)}, "finish_reason": "stop"}],
+            "usage": {"total_tokens": tokens},
+        })
+
+    return httpx.MockTransport(handler)
+
+
+async def run_one(tokens: int, delay: float) -> dict:
+    from app.core import ai_models
+    from app.core.ai_models import MODEL_REGISTRY, TaskType, execute_task, execute_task_stream
+    from app.core.config import settings
+    from app.core.llm_transport import LLMTransport
+
+    transport = LLMTransport(base_url="http://llm.mock/v1", http2=False, http_transport=_provider(tokens, delay))
+    ai_models.get_llm_transport = lambda: transport
+    settings.GROQ_API_KEY = settings.GROQ_API_KEY or "benchmark-key"
+    MODEL_REGISTRY["fast"] = [MODEL]
+
+    started = time.perf_counter()
+    await execute_task(TaskType.FAST, [{"role": "user", "content": "hi"}])
+    buffered = time.perf_counter() - started
+
+    started = time.perf_counter()
+    first = None
+    async for chunk in execute_task_stream(TaskType.FAST, [{"role": "user", "content": "hi"}]):
+        if first is None and chunk.delta:
+            first = time.perf_counter() - started
+    streamed = time.perf_counter() - started
+    await transport.aclose()
+
+    return {"tokens": tokens, "buffered": buffered, "ttft": first, "streamed": streamed}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, nargs="+", default=DEFAULT_TOKENS)
+    parser.add_argument("--delay-ms", type=float, default=20.0, help="inter-token delay of the mock provider")
+    args = parser.parse_args()
+
+    print(f"{'tokens':>7} {'buffered ms':>11} {'ttft ms':>8} {'stream ms':>9} {'ttft gain':>9}")
+    for tokens in args.tokens:
+        r = asyncio.run(run_one(tokens, args.delay_ms / 1000))
+        gain = r["buffered"] / r["ttft"] if r["ttft"] else 0
+        print(
+            f"{r['tokens']:>7} {r['buffered'] * 1000:>11.0f} {r['ttft'] * 1000:>8.1f} "
+            f"{r['streamed'] * 1000:>9.0f} {gain:>8.0f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
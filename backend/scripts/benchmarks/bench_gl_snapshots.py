@@ -0,0 +1,199 @@
+"""
+Benchmark snapshot-backed general ledger reports on a large ledger.
+
+Seeds an in-memory SQLite ledger with N journal lines spread over 36 months
+and 50 accounts, builds the monthly gl_account_balances snapshots, then
+times an "as of" trial-balance query two ways:
+
+- full scan: aggregate every posted journal line (the old report query)
+- snapshot:  whole months from gl_account_balances plus the lines since the
+  start of the as-of month (GLBalanceSnapshotService.account_totals)
+
+The two results are compared, and the snapshot consistency checker is
+timed as well.
+
+Usage:
+    python scripts/benchmarks/bench_gl_snapshots.py
+    python scripts/benchmarks/bench_gl_snapshots.py --sizes 100000 2000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+MONTHS = 36
+ACCOUNTS = 50
+LINES_PER_ENTRY = 2
+
+
+def _seed(lines: int):
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+
+    import app.models  # noqa: F401
+    from app.core.database import Base
+    from app.models.general_ledger import (
+        AccountType,
+        ChartOfAccount,
+        GLAccountBalance,
+        JournalEntry,
+        JournalEntryStatus,
+        JournalLine,
+    )
+    from app.models.user import User
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__,
+        ChartOfAccount.__table__,
+        JournalEntry.__table__,
+        JournalLine.__table__,
+        GLAccountBalance.__table__,
+    ])
+    db = sessionmaker(bind=engine)()
+    business_id = uuid.uuid4()
+
+    types = list(AccountType)
+    accounts = []
+    for i in range(ACCOUNTS):
+        account_type = types[i % len(types)]
+        accounts.append({
+            "id": uuid.uuid4(),
+            "business_id": business_id,
+            "account_code": f"{1000 + i}",
+            "name": f"Account {i}",
+            "account_type": account_type,
+            "normal_balance": "debit" if account_type in (AccountType.ASSET, AccountType.EXPENSE) else "credit",
+        })
+    db.execute(insert(ChartOfAccount), accounts)
+
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    span = timedelta(days=MONTHS * 30)
+    entries_total = lines // LINES_PER_ENTRY
+    entries, journal_lines = [], []
+    for i in range(entries_total):
+        entry_id = uuid.uuid4()
+        amount = Decimal(10 + i % 900) / 4
+        entries.append({
+            "id": entry_id,
+            "business_id": business_id,
+            "entry_number": f"JE-{i:08d}",
+            "entry_date": start + span * (i / entries_total),
+            "description": "benchmark",
+            "status": JournalEntryStatus.POSTED,
+        })
+        debit = accounts[i % ACCOUNTS]["id"]
+        credit = accounts[(i * 7 + 3) % ACCOUNTS]["id"]
+        journal_lines.append({"id": uuid.uuid4(), "entry_id": entry_id, "account_id": debit, "debit": amount, "credit": 0})
+        journal_lines.append({"id": uuid.uuid4(), "entry_id": entry_id, "account_id": credit, "debit": 0, "credit": amount})
+        if len(journal_lines) >= 20_000:
+            db.execute(insert(JournalEntry), entries)
+            db.execute(insert(JournalLine), journal_lines)
+            entries, journal_lines = [], []
+    if entries:
+        db.execute(insert(JournalEntry), entries)
+        db.execute(insert(JournalLine), journal_lines)
+    db.commit()
+    return db, business_id, start + span * 0.9
+
+
+def _full_scan(db, business_id, as_of):
+    from sqlalchemy import func
+
+    from app.models.general_ledger import ChartOfAccount, JournalEntry, JournalEntryStatus, JournalLine
+
+    rows = (
+        db.query(
+            ChartOfAccount.id,
+            func.coalesce(func.sum(JournalLine.debit), 0),
+            func.coalesce(func.sum(JournalLine.credit), 0),
+        )
+        .join(JournalLine, JournalLine.account_id == ChartOfAccount.id)
+        .join(JournalEntry, JournalLine.entry_id == JournalEntry.id)
+        .filter(
+            ChartOfAccount.business_id == business_id,
+            JournalEntry.status == JournalEntryStatus.POSTED,
+            JournalEntry.entry_date <= as_of,
+            JournalEntry.deleted_at.is_(None),
+            JournalLine.deleted_at.is_(None),
+        )
+        .group_by(ChartOfAccount.id)
+        .all()
+    )
+    return {r[0]: (Decimal(str(r[1])), Decimal(str(r[2]))) for r in rows}
+
+
+def _snapshot(db, business_id, as_of):
+    from app.services.gl_balance_snapshot_service import GLBalanceSnapshotService
+
+    rows = GLBalanceSnapshotService(db).account_totals(business_id, end=as_of).all()
+    return {r.account_id: (Decimal(str(r.total_debit)), Decimal(str(r.total_credit))) for r in rows}
+
+
+def _timed(fn, *args, repeat: int = 3):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_one(lines: int) -> dict:
+    from app.services.gl_balance_snapshot_service import GLBalanceSnapshotService
+
+    db, business_id, as_of = _seed(lines)
+    snapshots = GLBalanceSnapshotService(db)
+
+    started = time.perf_counter()
+    snapshot_rows = snapshots.rebuild(business_id)
+    db.commit()
+    rebuild = time.perf_counter() - started
+
+    scan_seconds, scan = _timed(_full_scan, db, business_id, as_of)
+    snap_seconds, snap = _timed(_snapshot, db, business_id, as_of)
+
+    started = time.perf_counter()
+    mismatches = len(snapshots.verify(business_id)["mismatches"])
+    verify = time.perf_counter() - started
+    db.close()
+
+    return {
+        "lines": lines,
+        "snapshots": snapshot_rows,
+        "rebuild": rebuild,
+        "scan": scan_seconds,
+        "snapshot": snap_seconds,
+        "verify": verify,
+        "match": scan == snap and mismatches == 0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(f"{'lines':>9} {'snapshots':>9} {'rebuild s':>9} {'scan s':>8} {'snap s':>8} {'speedup':>8} {'verify s':>8} match")
+    for lines in args.sizes:
+        r = run_one(lines)
+        speedup = r["scan"] / r["snapshot"] if r["snapshot"] else 0
+        print(
+            f"{r['lines']:>9} {r['snapshots']:>9} {r['rebuild']:>9.2f} {r['scan']:>8.3f} "
+            f"{r['snapshot']:>8.3f} {speedup:>7.1f}x {r['verify']:>8.2f} {r['match']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
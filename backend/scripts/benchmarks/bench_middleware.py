@@ -0,0 +1,155 @@
+"""
+Benchmark the HTTP middleware stack in requests/sec.
+
+Serves a trivial endpoint in-process (httpx over ASGI, no network) behind
+two stacks and reports requests/sec:
+
+- before: the BaseHTTPMiddleware layers app.main used to stack
+  (request ID, timing, CORS headers, CSRF), reproduced below
+- after: app.middleware.request_pipeline.RequestPipelineMiddleware
+
+Both run inside the same GZip, session and CORS middleware as app.main.
+
+Usage:
+    python scripts/benchmarks/bench_middleware.py
+    python scripts/benchmarks/bench_middleware.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_REQUESTS = 3000
+ORIGIN = "http://localhost:3000"
+
+
+def _legacy_middleware():
+    """The BaseHTTPMiddleware layers as app.main stacked them before."""
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from starlette.responses import JSONResponse
+
+    from app.core.config import settings
+    from app.middleware.request_pipeline import CSRF_EXEMPT_PATHS
+
+    class RequestIDMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+            request.state.request_id = request_id
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+
+    class TimingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            start_time = time.perf_counter()
+            response = await call_next(request)
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
+            return response
+
+    class CORSDebugMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            if request.method == "OPTIONS":
+                response = JSONResponse(content={"detail": "OK"}, status_code=200)
+            else:
+                try:
+                    response = await call_next(request)
+                except Exception:
+                    response = JSONResponse(content={"detail": "Internal server error"}, status_code=500)
+            origin = request.headers.get("origin", "")
+            if origin in settings.CORS_ORIGINS or "*" in settings.CORS_ORIGINS:
+                response.headers["Access-Control-Allow-Origin"] = origin
+                response.headers["Access-Control-Allow-Credentials"] = "true"
+            return response
+
+    class CSRFMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            if request.method in {"GET", "HEAD", "OPTIONS"}:
+                return await call_next(request)
+            if any(request.url.path.startswith(path) for path in CSRF_EXEMPT_PATHS):
+                return await call_next(request)
+            if request.headers.get("Authorization", "").startswith("Bearer "):
+                return await call_next(request)
+            csrf_token = request.headers.get("X-CSRF-Token")
+            session_csrf = request.session.get("csrf_token")
+            if not csrf_token or not session_csrf or csrf_token != session_csrf:
+                return JSONResponse(status_code=403, content={"detail": "CSRF token missing or invalid"})
+            return await call_next(request)
+
+    # Added innermost first, like app.main
+    return [CSRFMiddleware, "session", RequestIDMiddleware, TimingMiddleware, CORSDebugMiddleware]
+
+
+def _app(legacy: bool):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.middleware.gzip import GZipMiddleware
+    from starlette.middleware.sessions import SessionMiddleware
+
+    from app.core.config import settings
+    from app.middleware.request_pipeline import RequestPipelineMiddleware
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/ping")
+    async def ping_post():
+        return {"ok": True}
+
+    app.add_middleware(GZipMiddleware, minimum_size=500)
+    layers = _legacy_middleware() if legacy else [RequestPipelineMiddleware, "session"]
+    for layer in layers:
+        if layer == "session":
+            app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+        else:
+            app.add_middleware(layer)
+    app.add_middleware(CORSMiddleware, allow_origins=settings.CORS_ORIGINS, allow_credentials=True)
+    return app
+
+
+async def _requests_per_second(app, method: str, count: int) -> float:
+    import httpx
+
+    headers = {"Origin": ORIGIN, "Authorization": "Bearer benchmark"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.request(method, "/ping", headers=headers)
+        started = time.perf_counter()
+        for _ in range(count):
+            response = await client.request(method, "/ping", headers=headers)
+        elapsed = time.perf_counter() - started
+    assert response.status_code == 200 and "x-request-id" in response.headers
+    return count / elapsed
+
+
+def run_one(method: str, count: int) -> dict:
+    before = asyncio.run(_requests_per_second(_app(legacy=True), method, count))
+    after = asyncio.run(_requests_per_second(_app(legacy=False), method, count))
+    return {"method": method, "before": before, "after": after}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    args = parser.parse_args()
+
+    print(f"{'method':>6} {'before req/s':>13} {'after req/s':>12} {'speedup':>8}")
+    for method in ("GET", "POST"):
+        r = run_one(method, args.requests)
+        print(f"{r['method']:>6} {r['before']:>13.0f} {r['after']:>12.0f} {r['after'] / r['before']:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark list pagination totals and deep pages.
+
+Seeds N products for one business into an in-memory SQLite database and
+times ProductService.get_products the way the list endpoints call it:
+the first page with each total mode (exact count, count(*) OVER (), none),
+and a deep page reached by OFFSET versus by next_cursor.
+
+Estimated totals need PostgreSQL and are not timed here; on SQLite they
+fall back to the exact count.
+
+Usage:
+    python scripts/benchmarks/bench_pagination.py
+    python scripts/benchmarks/bench_pagination.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+PER_PAGE = 20
+
+
+def _session(n: int):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    import app.models  # noqa: F401
+    from app.core.database import Base
+    from app.models.product import Product
+    from app.models.product_ingredient import ProductIngredient
+    from app.models.stock_reservation import StockReservation
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(
+        engine, tables=[Product.__table__, ProductIngredient.__table__, StockReservation.__table__]
+    )
+    business_id = uuid.uuid4()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "business_id": business_id,
+            "name": f"Product {i}",
+            "selling_price": 10,
+            "is_taxable": True,
+            "status": "active",
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": start,
+        }
+        for i in range(n)
+    ]
+    with engine.begin() as conn:
+        for begin in range(0, n, 10000):
+            conn.execute(Product.__table__.insert(), rows[begin:begin + 10000])
+    return sessionmaker(bind=engine)(), business_id, engine
+
+
+def _timed(fn, repeat: int = 5):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_one(n: int) -> dict:
+    from app.core.pagination import TotalMode
+    from app.services.product_service import ProductService
+
+    db, business_id, engine = _session(n)
+    service = ProductService(db)
+    deep = max(1, (n // PER_PAGE) * 9 // 10)
+
+    def first(mode):
+        return lambda: service.get_products(business_id, per_page=PER_PAGE, total_mode=mode)
+
+    def deep_offset():
+        return service.get_products(business_id, page=deep, per_page=PER_PAGE, total_mode=TotalMode.NONE)
+
+    # The cursor of the page just before the deep page
+    before = service.get_products(business_id, page=deep - 1, per_page=PER_PAGE, total_mode=TotalMode.NONE) \
+        if deep > 1 else None
+    cursor = before.next_cursor if before else None
+
+    def deep_cursor():
+        return service.get_products(business_id, per_page=PER_PAGE, total_mode=TotalMode.NONE, cursor=cursor)
+
+    exact_seconds, page = _timed(first(TotalMode.EXACT))
+    window_seconds, _ = _timed(first(TotalMode.WINDOW))
+    none_seconds, _ = _timed(first(TotalMode.NONE))
+    offset_seconds, by_offset = _timed(deep_offset)
+    cursor_seconds, by_cursor = _timed(deep_cursor)
+    assert page.total == n
+    assert [p.id for p in by_offset.items] == [p.id for p in by_cursor.items]
+
+    db.close()
+    engine.dispose()
+    return {
+        "products": n,
+        "exact_ms": exact_seconds * 1000,
+        "window_ms": window_seconds * 1000,
+        "none_ms": none_seconds * 1000,
+        "offset_ms": offset_seconds * 1000,
+        "cursor_ms": cursor_seconds * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(
+        f"{'products':>9} {'exact ms':>9} {'window ms':>10} {'none ms':>8} "
+        f"{'deep offset ms':>15} {'deep cursor ms':>15}"
+    )
+    for n in args.sizes:
+        r = run_one(n)
+        print(
+            f"{r['products']:>9} {r['exact_ms']:>9.2f} {r['window_ms']:>10.2f} {r['none_ms']:>8.2f} "
+            f"{r['offset_ms']:>15.2f} {r['cursor_ms']:>15.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Benchmark one ReAct step that calls several read-only tools.
+
+Each fake tool runs a blocking "query" through asyncio.to_thread, as the
+real tools do with their sync services, with latencies spread between
+--min-ms and --max-ms.  The step is timed two ways:
+
+- serial:     the tools one after another (the old orchestrator loop)
+- concurrent: Orchestrator._execute_hotl_batch, one session per tool
+
+and compared with the slowest single tool, which is the lower bound.
+
+Usage:
+    python scripts/benchmarks/bench_parallel_tools.py
+    python scripts/benchmarks/bench_parallel_tools.py --tools 2 4 8 --max-ms 300
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_TOOLS = [2, 4, 8]
+
+
+def _calls(count: int, min_ms: float, max_ms: float):
+    from app.agents.tool_registry import ToolDefinition
+
+    def make(seconds):
+        async def handler(db, user, **kwargs):
+            await asyncio.to_thread(time.sleep, seconds)
+            return {"slept": seconds}
+        return handler
+
+    step = (max_ms - min_ms) / max(count - 1, 1)
+    latencies = [(min_ms + i * step) / 1000 for i in range(count)]
+    calls = [
+        {
+            "id": f"call_{i}",
+            "name": f"tool_{i}",
+            "arguments": {},
+            "tool_def": ToolDefinition(f"tool_{i}", "", {}, make(seconds), read_only=True),
+            "read_only": True,
+        }
+        for i, seconds in enumerate(latencies)
+    ]
+    return calls, latencies
+
+
+async def run_one(count: int, min_ms: float, max_ms: float) -> dict:
+    from app.agents.orchestrator import Orchestrator
+
+    orchestrator = Orchestrator(MagicMock(), session_factory=MagicMock)
+    calls, latencies = _calls(count, min_ms, max_ms)
+    user = MagicMock()
+
+    started = time.perf_counter()
+    for call in calls:
+        await orchestrator._run_tool(call, orchestrator.db, user, "bench")
+    serial = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await orchestrator._execute_hotl_batch(calls, user, "bench")
+    concurrent = time.perf_counter() - started
+
+    return {"tools": count, "sum": sum(latencies), "max": max(latencies), "serial": serial, "concurrent": concurrent}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", type=int, nargs="+", default=DEFAULT_TOOLS)
+    parser.add_argument("--min-ms", type=float, default=50.0)
+    parser.add_argument("--max-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    print(f"{'tools':>5} {'sum ms':>7} {'max ms':>7} {'serial ms':>9} {'concurrent ms':>13} {'speedup':>8}")
+    for count in args.tools:
+        r = asyncio.run(run_one(count, args.min_ms, args.max_ms))
+        print(
+            f"{r['tools']:>5} {r['sum'] * 1000:>7.0f} {r['max'] * 1000:>7.0f} {r['serial'] * 1000:>9.0f} "
+            f"{r['concurrent'] * 1000:>13.0f} {r['serial'] / r['concurrent']:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
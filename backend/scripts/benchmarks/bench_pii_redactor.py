@@ -0,0 +1,113 @@
+"""
+Benchmark PII redaction against large customer name lists.
+
+Generates N synthetic "First Last" customer names and a ~4 KB prompt
+(a tool result listing customers with emails and phones), then times:
+
+- build:  compiling the single-pass redactor (done once per name list)
+- redact: one redaction of the prompt with the single-pass redactor
+- legacy: the previous approach (one regex per name applied in sequence,
+          then one pass per fixed pattern), measured on the same text;
+          skipped above --legacy-max names because it grows linearly
+
+and checks both produce the same output.
+
+Usage:
+    python scripts/benchmarks/bench_pii_redactor.py
+    python scripts/benchmarks/bench_pii_redactor.py --sizes 100 10000 100000
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_SIZES = [100, 10_000, 100_000]
+
+
+def _names(count: int, rng: random.Random) -> list[str]:
+    def word() -> str:
+        return rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+    return [f"{word()} {word()}" for _ in range(count)]
+
+
+def _prompt(names: list[str], rng: random.Random) -> str:
+    lines = ["Top customers this week:"]
+    for i, name in enumerate(rng.sample(names, min(40, len(names)))):
+        lines.append(f"{i + 1}. {name} <c{i}@example.co.za> 07{rng.randint(10000000, 99999999)} spent R{rng.randint(100, 9999)}")
+    lines.append("Ask me anything about these customers or your sales.")
+    return "\n".join(lines)
+
+
+def _legacy(names: list[str]):
+    from app.agents.pii_redactor import _EMAIL_PATTERN, _SA_ID_PATTERN, _SA_PHONE_PATTERN
+
+    patterns = [re.compile(r"(?<!\w)" + re.escape(n) + r"(?!\w)", re.IGNORECASE) for n in names]
+
+    def redact(text: str) -> str:
+        text = _SA_ID_PATTERN.sub("[SA_ID]", text)
+        text = _SA_PHONE_PATTERN.sub("[PHONE]", text)
+        text = _EMAIL_PATTERN.sub("[EMAIL]", text)
+        for pattern in patterns:
+            text = pattern.sub("[NAME]", text)
+        return text
+    return redact
+
+
+def _best(fn, *args, repeat: int = 5):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_one(count: int, legacy_max: int) -> dict:
+    from app.agents.pii_redactor import PIIRedactor
+
+    rng = random.Random(count)
+    names = _names(count, rng)
+    prompt = _prompt(names, rng)
+
+    started = time.perf_counter()
+    redactor = PIIRedactor(known_names=names)
+    build = time.perf_counter() - started
+    redact, output = _best(redactor.redact, prompt)
+
+    legacy, match = None, None
+    if count <= legacy_max:
+        legacy_redact = _legacy(names)
+        legacy, legacy_output = _best(legacy_redact, prompt, repeat=1)
+        match = legacy_output == output
+    return {"names": count, "chars": len(prompt), "build": build, "redact": redact, "legacy": legacy, "match": match}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--legacy-max", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'names':>7} {'chars':>6} {'build s':>8} {'redact ms':>9} {'legacy ms':>10} {'speedup':>8} match")
+    for count in args.sizes:
+        r = run_one(count, args.legacy_max)
+        legacy = f"{r['legacy'] * 1000:>10.1f}" if r["legacy"] is not None else f"{'-':>10}"
+        speedup = f"{r['legacy'] / r['redact']:>7.0f}x" if r["legacy"] is not None else f"{'-':>8}"
+        print(
+            f"{r['names']:>7} {r['chars']:>6} {r['build']:>8.2f} {r['redact'] * 1000:>9.2f} "
+            f"{legacy} {speedup} {r['match'] if r['match'] is not None else '-'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Benchmark idle realtime connections per worker and event fan-out.
+
+Starts one uvicorn worker (child process) serving the gateway's connection
+loop (``serve_websocket`` / the SSE generator, authentication bypassed) with
+the hub running, opens N idle connections to it, then:
+
+- memory:  worker RSS before and after the connections (per-connection cost)
+- fan-out: time from emitting one event until every connection received it
+
+SSE clients are raw sockets (no extra dependency); ``--transport ws`` needs
+the ``websockets`` package, which uvicorn also needs to serve WebSockets.
+
+Usage:
+    python scripts/benchmarks/bench_realtime_connections.py
+    python scripts/benchmarks/bench_realtime_connections.py --connections 5000 --transport ws
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+BUSINESS_ID = "00000000-0000-0000-0000-0000000000b1"
+
+
+def _raise_fd_limit() -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _serve(port: int) -> None:
+    import uvicorn
+    from fastapi import FastAPI, WebSocket
+    from fastapi.responses import StreamingResponse
+
+    # Importing app.api.realtime pulls in every router (app.api package)
+    from app.api.realtime import _sse_events, serve_websocket
+    from app.core import realtime
+    from app.core.realtime import RealtimeEventType, realtime_hub
+
+    _raise_fd_limit()
+    app = FastAPI(on_startup=[realtime.start_realtime_hub], on_shutdown=[realtime.stop_realtime_hub])
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await websocket.accept()
+        subscription = realtime_hub.subscribe(BUSINESS_ID)
+        try:
+            await serve_websocket(websocket, subscription)
+        finally:
+            realtime_hub.unsubscribe(subscription)
+
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(_sse_events(realtime_hub.subscribe(BUSINESS_ID)), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return {**realtime_hub.stats(), "rss_mb": _rss_mb()}
+
+    @app.post("/emit")
+    async def emit():
+        await realtime_hub.publish(BUSINESS_ID, RealtimeEventType.ORDER_STATUS_CHANGED, {"sent": time.time()})
+        return {}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+
+
+async def _request(port: int, method: str, path: str) -> dict:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    body = (await reader.read()).split(b"\r\n\r\n", 1)[1]
+    writer.close()
+    return json.loads(body) if body.strip() else {}
+
+
+async def _sse_client(port: int, connected: asyncio.Event, received: list, total: int) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: bench\r\nAccept: text/event-stream\r\n\r\n")
+    await writer.drain()
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        if line.startswith(b"retry:"):
+            received.append(None)
+            if len(received) == total:
+                connected.set()
+        elif line.startswith(b"data:") and b"order.status_changed" in line:
+            received.append(time.perf_counter())
+
+
+async def _ws_client(port: int, connected: asyncio.Event, received: list, total: int) -> None:
+    import websockets
+
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws", ping_interval=None) as ws:
+        received.append(None)
+        if len(received) == total:
+            connected.set()
+        async for message in ws:
+            if "order.status_changed" in message:
+                received.append(time.perf_counter())
+
+
+async def run(connections: int, transport: str, port: int) -> None:
+    _raise_fd_limit()
+    base = await _request(port, "GET", "/stats")
+
+    client = _sse_client if transport == "sse" else _ws_client
+    connected = asyncio.Event()
+    received: list = []
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(client(port, connected, received, connections)) for _ in range(connections)]
+    await asyncio.wait_for(connected.wait(), timeout=120)
+    connect_s = time.perf_counter() - started
+    await asyncio.sleep(1.0)
+    idle = await _request(port, "GET", "/stats")
+
+    received.clear()
+    sent = time.perf_counter()
+    await _request(port, "POST", "/emit")
+    while len(received) < connections:
+        await asyncio.sleep(0.005)
+    latencies = sorted((t - sent) * 1000 for t in received)
+
+    per_conn_kb = (idle["rss_mb"] - base["rss_mb"]) * 1024 / connections
+    print(f"transport={transport} connections={idle['connections']} connect={connect_s:.2f}s")
+    print(f"worker rss: {base['rss_mb']:.1f} MB -> {idle['rss_mb']:.1f} MB (~{per_conn_kb:.1f} KB per connection)")
+    print(
+        f"fan-out of one event: p50 {statistics.median(latencies):.1f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms, last {latencies[-1]:.1f} ms"
+    )
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--transport", choices=["sse", "ws"], default="sse")
+    args = parser.parse_args()
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    server = multiprocessing.Process(target=_serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        asyncio.run(run(args.connections, args.transport, port))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
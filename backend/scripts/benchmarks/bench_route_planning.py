@@ -0,0 +1,108 @@
+"""
+Benchmark multi-drop route planning for one driver.
+
+Scatters N drops around a depot (a ~15 km city radius) and times
+delivery_route_service.plan_route: nearest neighbour plus 2-opt over a
+NumPy distance matrix, with cumulative ETAs.  Route lengths are compared
+with visiting the drops in the order they were placed and with nearest
+neighbour alone.  Also times one cheapest-insertion ETA (what auto_assign
+computes per candidate driver) against a route of N drops.
+
+Usage:
+    python scripts/benchmarks/bench_route_planning.py
+    python scripts/benchmarks/bench_route_planning.py --sizes 10 50 200 500
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+import numpy as np
+
+DEFAULT_SIZES = [10, 50, 200]
+DEPOT = (-26.2041, 28.0473)
+RADIUS_DEGREES = 0.14
+
+
+def _drops(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    angles = rng.uniform(0, 2 * np.pi, n)
+    radii = RADIUS_DEGREES * np.sqrt(rng.uniform(0, 1, n))
+    return [
+        {"delivery_id": f"d{i}", "lat": DEPOT[0] + r * np.sin(a), "lng": DEPOT[1] + r * np.cos(a)}
+        for i, (a, r) in enumerate(zip(angles, radii))
+    ]
+
+
+def _length(order) -> float:
+    from app.services.geo_index import haversine_km_many
+
+    lats = np.array([DEPOT[0]] + [s["lat"] for s in order])
+    lngs = np.array([DEPOT[1]] + [s["lng"] for s in order])
+    return float(haversine_km_many(lats[:-1], lngs[:-1], lats[1:], lngs[1:]).sum())
+
+
+def _nearest_neighbour_only(drops):
+    from app.services.delivery_route_service import _nearest_neighbour
+    from app.services.geo_index import haversine_km_many
+
+    n = len(drops)
+    lats = np.array([DEPOT[0]] + [s["lat"] for s in drops])
+    lngs = np.array([DEPOT[1]] + [s["lng"] for s in drops])
+    dist = np.zeros((n + 2, n + 2))
+    dist[:-1, :-1] = haversine_km_many(lats[:, None], lngs[:, None], lats[None, :], lngs[None, :])
+    return [drops[node - 1] for node in _nearest_neighbour(dist)[1:-1]]
+
+
+def _timed(fn, *args, repeat: int = 5):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_one(n: int, seed: int = 7) -> dict:
+    from app.services.delivery_route_service import _order_located, insertion_eta_minutes, plan_route
+
+    drops = _drops(n, seed)
+    plan_seconds, _ = _timed(plan_route, DEPOT, drops)
+    order, _ = _order_located(DEPOT, drops)
+    new_drop = _drops(1, seed + 1)[0]
+    insert_seconds, _ = _timed(insertion_eta_minutes, DEPOT, drops, new_drop)
+
+    return {
+        "drops": n,
+        "given_km": _length(drops),
+        "nn_km": _length(_nearest_neighbour_only(drops)),
+        "planned_km": _length(order),
+        "plan_ms": plan_seconds * 1000,
+        "insert_ms": insert_seconds * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(f"{'drops':>6} {'given km':>9} {'nn km':>8} {'2-opt km':>9} {'saved':>6} {'plan ms':>8} {'insert ms':>9}")
+    for n in args.sizes:
+        r = run_one(n)
+        saved = 1 - r["planned_km"] / r["given_km"] if r["given_km"] else 0
+        print(
+            f"{r['drops']:>6} {r['given_km']:>9.1f} {r['nn_km']:>8.1f} {r['planned_km']:>9.1f} "
+            f"{saved:>6.0%} {r['plan_ms']:>8.2f} {r['insert_ms']:>9.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Benchmark barcode/SKU scan lookups.
+
+Seeds N products for one business into an in-memory SQLite database and
+compares resolving a scanned barcode three ways: the general product
+listing (ProductService.get_products with the code as the search term),
+one indexed equality query, and app.services.scan_lookup (the per-business
+in-memory map).  Also times building the map, as done once per business
+and after product writes, and a batch of 20 buffered codes.
+
+Redis is not used: the generation check runs against the disconnected
+manager, like a deployment without Redis.
+
+Usage:
+    python scripts/benchmarks/bench_scan_lookup.py
+    python scripts/benchmarks/bench_scan_lookup.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+BATCH = 20
+
+
+def _session(n: int):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    import app.models  # noqa: F401
+    from app.core.database import Base
+    from app.models.product import Product
+    from app.models.product_ingredient import ProductIngredient
+    from app.models.stock_reservation import StockReservation
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(
+        engine, tables=[Product.__table__, ProductIngredient.__table__, StockReservation.__table__]
+    )
+    business_id = uuid.uuid4()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "business_id": business_id,
+            "name": f"Product {i}",
+            "sku": f"SKU-{i:07d}",
+            "barcode": f"600{i:010d}",
+            "selling_price": 10,
+            "is_taxable": True,
+            "status": "active",
+        }
+        for i in range(n)
+    ]
+    with engine.begin() as conn:
+        for start in range(0, n, 10000):
+            conn.execute(Product.__table__.insert(), rows[start:start + 10000])
+    return sessionmaker(bind=engine)(), business_id, engine
+
+
+def _timed(fn, repeat: int = 50):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_one(n: int) -> dict:
+    from sqlalchemy import or_
+
+    from app.models.product import Product
+    from app.services import scan_lookup
+    from app.services.product_service import ProductService
+
+    db, business_id, engine = _session(n)
+    code = f"600{n // 2:010d}"
+    batch = [f"600{i * (n // BATCH):010d}" for i in range(BATCH)]
+    build = lambda: scan_lookup.build_codes(db, business_id)  # noqa: E731
+    loop = asyncio.new_event_loop()
+
+    def listing():
+        return ProductService(db).get_products(business_id, search=code, per_page=1)
+
+    def equality():
+        return db.query(*scan_lookup._RECORD_COLUMNS).filter(
+            Product.business_id == business_id,
+            Product.deleted_at.is_(None),
+            or_(Product.barcode == code, Product.sku == code),
+        ).first()
+
+    def mapped(codes):
+        return lambda: loop.run_until_complete(scan_lookup.lookup_codes(business_id, codes, build))
+
+    build_seconds, codes = _timed(build, repeat=3)
+    mapped([code])()  # build the map once
+    listing_seconds, _ = _timed(listing, repeat=5)
+    equality_seconds, _ = _timed(equality)
+    map_seconds, found = _timed(mapped([code]))
+    batch_seconds, _ = _timed(mapped(batch))
+    assert found[code] is not None
+
+    loop.close()
+    scan_lookup.invalidate_scan_index(None)
+    db.close()
+    engine.dispose()
+    return {
+        "products": n,
+        "codes": len(codes),
+        "build_ms": build_seconds * 1000,
+        "listing_ms": listing_seconds * 1000,
+        "equality_ms": equality_seconds * 1000,
+        "map_us": map_seconds * 1e6,
+        "batch_us": batch_seconds * 1e6,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(
+        f"{'products':>9} {'codes':>7} {'build ms':>9} {'listing ms':>11} {'equality ms':>12} "
+        f"{'map us':>7} {'batch' + str(BATCH) + ' us':>10}"
+    )
+    for n in args.sizes:
+        r = run_one(n)
+        print(
+            f"{r['products']:>9} {r['codes']:>7} {r['build_ms']:>9.2f} {r['listing_ms']:>11.2f} "
+            f"{r['equality_ms']:>12.3f} {r['map_us']:>7.1f} {r['batch_us']:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
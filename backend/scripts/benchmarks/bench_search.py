@@ -0,0 +1,142 @@
+"""
+Benchmark product list search.
+
+Seeds N products into an in-memory SQLite database and times one page of
+ProductService-style listing for a few search shapes: the old hand-built
+``ILIKE '%term%'`` OR across four columns, app.core.search.apply_search
+(escaped substring, every-word and exact-code matching), and apply_search
+ordered by relevance.  A scanned barcode is timed through the equality
+path, which the sku and barcode b-tree indexes serve.
+
+SQLite has no pg_trgm or tsvector, so this measures the query-building and
+matching overhead only; the trigram and full-text GIN indexes from
+migration 114 need PostgreSQL (compare ``EXPLAIN ANALYZE`` there).
+
+Usage:
+    python scripts/benchmarks/bench_search.py
+    python scripts/benchmarks/bench_search.py --sizes 1000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_SIZES = [1000, 100000]
+PAGE = 50
+WORDS = ["red", "blue", "cotton", "shirt", "tea", "rooibos", "loose", "leaf", "linen", "mug", "steel", "oak"]
+
+
+def _session(n: int, seed: int):
+    import random
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    import app.models  # noqa: F401
+    from app.core.database import Base
+    from app.models.product import Product
+    from app.models.product_ingredient import ProductIngredient
+    from app.models.stock_reservation import StockReservation
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(
+        engine, tables=[Product.__table__, ProductIngredient.__table__, StockReservation.__table__]
+    )
+    business_id = uuid.uuid4()
+    rng = random.Random(seed)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "business_id": business_id,
+            "name": " ".join(rng.sample(WORDS, 3)).title(),
+            "description": " ".join(rng.sample(WORDS, 5)),
+            "sku": f"SKU-{i:07d}",
+            "barcode": f"600{i:010d}",
+            "selling_price": 10,
+            "is_active": True,
+        }
+        for i in range(n)
+    ]
+    with engine.begin() as conn:
+        for start in range(0, n, 10000):
+            conn.execute(Product.__table__.insert(), rows[start:start + 10000])
+    return sessionmaker(bind=engine)(), business_id, engine
+
+
+def _timed(fn, repeat: int = 3):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_one(n: int, seed: int = 7) -> dict:
+    from sqlalchemy import or_
+
+    from app.core.search import apply_search
+    from app.models.product import Product
+    from app.services.product_service import PRODUCT_SEARCH
+
+    db, business_id, engine = _session(n, seed)
+    base = db.query(Product.id).filter(Product.business_id == business_id)
+    term, words, code = "cotton", "shirt red", f"600{n // 2:010d}"
+
+    def legacy():
+        pattern = f"%{term}%"
+        return base.filter(or_(
+            Product.name.ilike(pattern), Product.description.ilike(pattern),
+            Product.sku.ilike(pattern), Product.barcode.ilike(pattern),
+        )).order_by(Product.created_at.desc()).limit(PAGE).all()
+
+    def shared(value, relevance=False):
+        def run():
+            query, rank = apply_search(base, PRODUCT_SEARCH, value)
+            order = (rank.desc(), Product.created_at.desc()) if relevance else (Product.created_at.desc(),)
+            return query.order_by(*order).limit(PAGE).all()
+        return run
+
+    def scanned():
+        return base.filter(or_(Product.sku == code, Product.barcode == code)).all()
+
+    result = {"rows": n}
+    for key, fn in [
+        ("legacy_ms", legacy),
+        ("term_ms", shared(term)),
+        ("words_ms", shared(words)),
+        ("relevance_ms", shared(term, relevance=True)),
+        ("scan_ms", scanned),
+    ]:
+        seconds, _ = _timed(fn)
+        result[key] = seconds * 1000
+    db.close()
+    engine.dispose()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'legacy ms':>10} {'term ms':>9} {'words ms':>9} {'ranked ms':>10} {'scan ms':>8}")
+    for n in args.sizes:
+        r = run_one(n)
+        print(
+            f"{r['rows']:>8} {r['legacy_ms']:>10.2f} {r['term_ms']:>9.2f} {r['words_ms']:>9.2f} "
+            f"{r['relevance_ms']:>10.2f} {r['scan_ms']:>8.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Benchmark worker start: time to first request and RSS.
+
+Starts the app under uvicorn as a fresh process, eager (the default) and
+with LAZY_API_ROUTERS, and reports:
+
+- live: seconds until ``/health/liveness`` answers
+- api: seconds until an API route (``/api/v1/``) answers
+- RSS of the worker once live, and after its first API request
+
+With ``--importtime N`` it instead prints a ``python -X importtime``
+profile of ``import app.main``: the N slowest modules (cumulative and
+self) and the self time per top-level package.
+
+Redis, the database and the scheduler are whatever the environment
+provides; their startup cost is included in both modes.
+
+Usage:
+    python scripts/benchmarks/bench_startup.py
+    python scripts/benchmarks/bench_startup.py --runs 3
+    python scripts/benchmarks/bench_startup.py --importtime 30
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+TIMEOUT_SECONDS = 120
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, started: float, process: subprocess.Popen) -> float:
+    while time.perf_counter() - started < TIMEOUT_SECONDS:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=TIMEOUT_SECONDS):
+                return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.02)
+    raise TimeoutError(url)
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run_one(lazy: bool) -> dict:
+    port = _free_port()
+    env = dict(os.environ, LAZY_API_ROUTERS="true" if lazy else "false")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        live = _wait_for(f"{base}/health/liveness", started, process)
+        rss_live = _rss_mb(process.pid)
+        api = _wait_for(f"{base}/api/v1/", started, process)
+        rss = _rss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return {
+        "mode": "lazy" if lazy else "eager",
+        "live_s": live,
+        "api_s": api,
+        "rss_live_mb": rss_live,
+        "rss_mb": rss,
+    }
+
+
+def importtime_report(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND,
+        env=dict(os.environ, LAZY_API_ROUTERS="false"),
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+
+    packages = Counter()
+    for self_us, _, name in rows:
+        packages[name.split(".")[0]] += self_us
+
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}")
+    print()
+    print(f"{'self ms':>8}  package")
+    for package, self_us in packages.most_common(top):
+        print(f"{self_us / 1000:>8.1f}  {package}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--importtime", type=int, metavar="N", help="print the N slowest imports instead")
+    args = parser.parse_args()
+
+    if args.importtime:
+        importtime_report(args.importtime)
+        return 0
+
+    print(f"{'mode':>6} {'live s':>7} {'api s':>6} {'live rss MB':>12} {'api rss MB':>11}")
+    for _ in range(args.runs):
+        for lazy in (False, True):
+            r = run_one(lazy)
+            print(
+                f"{r['mode']:>6} {r['live_s']:>7.2f} {r['api_s']:>6.2f} "
+                f"{r['rss_live_mb']:>12.1f} {r['rss_mb']:>11.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
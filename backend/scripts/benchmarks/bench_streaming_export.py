@@ -0,0 +1,112 @@
+"""
+Benchmark the streaming product export against large catalogs.
+
+Seeds an in-memory SQLite database with N products
+and writes them with ProductExcelService.write_products_export, reporting
+wall time, rows/second, output size and peak Python heap.  Peak memory
+should stay roughly flat as N grows because rows are read with yield_per
+and written through an openpyxl write-only workbook.  Install lxml (listed
+in requirements.txt) or openpyxl falls back to a much slower XML writer.
+
+Usage:
+    python scripts/benchmarks/bench_streaming_export.py
+    python scripts/benchmarks/bench_streaming_export.py --sizes 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def _seed(rows: int):
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+
+    import app.models  # noqa: F401
+    from app.core.database import Base
+    from app.models.inventory import InventoryItem
+    from app.models.product import Product, ProductStatus
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Product.__table__, InventoryItem.__table__])
+    db = sessionmaker(bind=engine)()
+    business_id = uuid.uuid4()
+    batch = []
+    for i in range(rows):
+        batch.append({
+            "id": uuid.uuid4(),
+            "business_id": business_id,
+            "name": f"Benchmark product {i}",
+            "sku": f"SKU-{i:07d}",
+            "description": f"Generated row {i} for export benchmarking",
+            "selling_price": 10 + (i % 500) * 0.37,
+            "quantity": i % 250,
+            "is_taxable": True,
+            "status": ProductStatus.ACTIVE,
+        })
+        if len(batch) == 5000:
+            db.execute(insert(Product), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Product), batch)
+    db.commit()
+    return db, business_id
+
+
+def run_one(rows: int) -> dict:
+    from app.services.product_excel_service import ProductExcelService
+
+    db, business_id = _seed(rows)
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+
+    service = ProductExcelService(db)
+    started = time.perf_counter()
+    written = service.write_products_export(business_id, path)
+    elapsed = time.perf_counter() - started
+
+    # Second pass for memory: tracemalloc slows the run down several-fold
+    tracemalloc.start()
+    service.write_products_export(business_id, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = os.path.getsize(path)
+    os.remove(path)
+    db.close()
+    return {
+        "rows": written,
+        "seconds": elapsed,
+        "rows_per_sec": written / elapsed if elapsed else 0,
+        "file_mb": size / (1024 * 1024),
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'seconds':>9} {'rows/s':>10} {'file MB':>9} {'peak MB':>9}")
+    for rows in args.sizes:
+        r = run_one(rows)
+        print(
+            f"{r['rows']:>8} {r['seconds']:>9.2f} {r['rows_per_sec']:>10.0f} "
+            f"{r['file_mb']:>9.1f} {r['peak_mb']:>9.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())